@@ -47,6 +47,46 @@ class Settings(BaseSettings):
     WHATSAPP_API_VERSION: str = "v18.0"
     WHATSAPP_API_BASE_URL: str = "https://graph.facebook.com"
     
+    # WhatsApp Message Processing
+    WHATSAPP_DISPATCH_LANES: int = 8  # Senders are hashed onto this many ordered lanes
+    WHATSAPP_DISPATCH_MAX_BACKLOG: int = 0  # Per-lane queue bound (0 = unbounded)
+    WHATSAPP_DEDUP_BACKEND: str = "memory"  # memory, mongo, redis
+    WHATSAPP_DEDUP_WINDOW_SECONDS: int = 86400  # Meta retries redeliveries for up to a day
+    WHATSAPP_DEDUP_MAX_ENTRIES: int = 200000
+    
+    # WhatsApp Outbound Sending
+    WHATSAPP_RATE_LIMIT_PER_SECOND: float = 80.0  # Meta default throughput per phone number
+    WHATSAPP_RATE_LIMIT_BURST: int = 80
+    WHATSAPP_HTTP_MAX_CONNECTIONS: int = 50
+    WHATSAPP_SEND_MAX_RETRIES: int = 3  # Inline retries on HTTP 429
+    WHATSAPP_RETRY_QUEUE_MAX_ATTEMPTS: int = 8  # Queued attempts before dead-lettering
+    WHATSAPP_RETRY_LEASE_SECONDS: int = 120  # How long a worker owns a claimed retry before others may take it
+    
+    # Conversation Sessions
+    CONVERSATION_STORE_BACKEND: str = "memory"  # memory, mongo, redis
+    CONVERSATION_IDLE_TTL_SECONDS: int = 86400  # Sessions idle this long are dropped
+    CONVERSATION_CACHE_MAX_ENTRIES: int = 100000  # Local session cache bound (LRU)
+    CONVERSATION_CACHE_REFRESH_SECONDS: float = 2.0  # Cached sessions older than this are re-read from the shared backend
+    CONVERSATION_WRITE_DEBOUNCE_SECONDS: float = 0.2  # Session changes are coalesced and written in batches
+    COMPLAINT_NUDGE_AFTER_MINUTES: float = 15  # Remind citizens of an unfinished complaint after this idle time (0 = off)
+    COMPLAINT_EXPIRE_AFTER_MINUTES: float = 60  # Discard an unfinished complaint flow after this idle time
+    COMPLAINT_WRITE_BATCH_SIZE: int = 100  # Confirmed WhatsApp complaints inserted per batch
+    COMPLAINT_WRITE_FLUSH_SECONDS: float = 0.5  # Write-behind flush interval
+    COMPLAINT_WRITE_MAX_BACKOFF_SECONDS: float = 30.0  # Retry backoff cap while MongoDB is unavailable
+    COMPLAINT_JOURNAL_DIR: str = ""  # Per-worker journals of unwritten complaints and dead letters ("" = backend/data/complaint_journal)
+    PIN_DIRECTORY_ENABLED: bool = False  # Suggest post offices and district from the PIN (the bundled table is only a sample)
+    PIN_DIRECTORY_PATH: str = ""  # Memory-mapped PIN table ("" = bundled app/data/pin_directory.bin)
+    PIN_DIRECTORY_STRICT: bool = False  # Reject PINs missing from the table and answers outside its suggestions (only with a complete table)
+    DISTRICT_GAZETTEER_PATH: str = ""  # Canonical districts and aliases ("" = bundled app/data/districts.json)
+    
+    # Campaign Dispatch
+    CAMPAIGN_BATCH_SIZE: int = 50  # Concurrent sends per batch (throughput is set by the rate limiter)
+    CAMPAIGN_STATS_FLUSH_EVERY: int = 500  # Messages between $inc stats/checkpoint flushes
+    CAMPAIGN_LEASE_SECONDS: int = 120  # A worker's claim on a running campaign, renewed at every flush
+    CAMPAIGN_STATUS_INDEX_TTL_SECONDS: int = 259200  # How long sent message IDs are matched to status callbacks (3 days)
+    CAMPAIGN_STATUS_FLUSH_INTERVAL: float = 5.0  # Seconds between batched delivery/read stat flushes
+    CAMPAIGN_STATUS_MAX_QUEUED: int = 100000  # Distinct message IDs with callbacks awaiting a flush; more are dropped
+    
     # NCRP Integration (National Cybercrime Reporting Portal)
     NCRP_API_URL: str = "https://cybercrime.gov.in/api"
     NCRP_CLIENT_ID: str = "dev_client_id"
@@ -57,6 +97,8 @@ class Settings(BaseSettings):
     # Security & JWT
     SECRET_KEY: str = "dev_secret_key_change_in_production_1234567890abcdef"
     ENCRYPTION_KEY: str = "dev_encryption_key_256_bit_change_in_prod_12345678"
+    BLIND_INDEX_KEY: str = ""  # HMAC key for searchable PII indexes (empty = derived from ENCRYPTION_KEY)
+    FIELD_ENCRYPTION_ENABLED: bool = False  # Encrypt complaint phone and account fields at rest
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
@@ -80,6 +122,17 @@ class Settings(BaseSettings):
     RASA_ENABLED: bool = True
     NLP_CONFIDENCE_THRESHOLD: float = 0.6
     
+    # Rule-based NLU
+    NLU_BATCH_WORKERS: int = 0  # Worker processes for batch re-classification (0 = one per CPU)
+    NLU_BATCH_CHUNK_SIZE: int = 500  # Messages sent to a worker per task
+    NLU_MEMO_MAX_ENTRIES: int = 4096  # Memoized analyze_message results (0 = off)
+    NLU_MEMO_MAX_TEXT_LENGTH: int = 64  # Longer messages bypass the memo
+    NLU_SCORER_ENABLED: bool = True  # Score messages no rule matched with the n-gram intent model
+    NLU_SCORER_MODEL_PATH: str = ""  # Intent scorer .npz artifact ("" = bundled app/data/intent_scorer.npz)
+    NLU_SPELL_CORRECTION_ENABLED: bool = True  # Correct misspelt keywords when no rule matched
+    NLU_SPELL_MAX_DISTANCE: int = 2  # Largest edit distance corrected
+    NLU_SPELL_MAX_INDEX_ENTRIES: int = 200000  # Deletion index budget; the distance drops to stay under it
+    
     # Helpline
     HELPLINE_NUMBER: str = "1930"
     HELPLINE_EMAIL: str = "support@cybercrime.gov.in"
@@ -98,6 +151,7 @@ class Settings(BaseSettings):
     # Monitoring & Logging
     SENTRY_DSN: Optional[str] = None
     LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    LOG_MASK_PII: bool = True  # Mask phones, emails and Aadhaar numbers in emitted log lines
     ENABLE_METRICS: bool = True
     
     # File Upload
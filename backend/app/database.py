@@ -12,6 +12,10 @@ from app.models.user import UserDocument
 from app.models.audit_log import AuditLogDocument
 from app.models.campaign import CampaignDocument
 from app.models.analytics import AnalyticsEventDocument
+from app.models.processed_message import ProcessedMessageDocument
+from app.models.campaign_message import CampaignMessageDocument
+from app.models.outbound_message import OutboundMessageDocument
+from app.models.conversation_session import ConversationSessionDocument
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +70,10 @@ class Database:
                     AuditLogDocument,
                     CampaignDocument,
                     AnalyticsEventDocument,
+                    ProcessedMessageDocument,
+                    CampaignMessageDocument,
+                    OutboundMessageDocument,
+                    ConversationSessionDocument,
                 ]
             )
             
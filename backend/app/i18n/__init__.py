@@ -1,25 +1,98 @@
 """
 Internationalization (i18n) Module for CyberSathi
-Supports English (en) and Odia (od) languages
+Supports English (en), Odia (od) and Hindi (hi) languages
+
+Translation files are compiled once at load: nested keys are flattened to
+dotted keys, keys missing from a language are filled from the default
+language, and every template is pre-parsed, so `get` is one dict lookup plus
+formatting. `validate` reports keys and placeholders that differ from the
+default language.
 """
 
 import json
-import os
+import logging
 from pathlib import Path
-from typing import Dict, Optional
+from string import Formatter
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+from app.services.language_id import language_identifier
+
+
+class Template:
+    """
+    Pre-parsed `str.format` template.
+
+    Templates whose fields are all plain names are rendered from their parsed
+    parts; anything else (attribute or index access, conversions, format
+    specs) is rendered with `str.format`. Missing arguments leave the
+    template unformatted.
+    """
+
+    __slots__ = ("text", "constant", "fields", "parts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts: Optional[Tuple[Tuple[str, Optional[str]], ...]] = None
+        fields = []
+        parts = []
+        simple = True
+        try:
+            for literal, field, spec, conversion in Formatter().parse(text):
+                if field is not None:
+                    fields.append(field)
+                    if not field.isidentifier() or spec or conversion:
+                        simple = False
+                parts.append((literal, field))
+        except ValueError:  # unbalanced braces; str.format would fail the same way
+            simple = False
+        self.fields = frozenset(fields)
+        # Text without fields still has "{{"/"}}" escapes to resolve
+        self.constant = "".join(literal for literal, _ in parts) if simple and not fields else text
+        if simple and fields:
+            self.parts = tuple(parts)
+
+    def render(self, kwargs: Mapping[str, object]) -> str:
+        """Format the template, or return it as-is if an argument is missing"""
+        if not self.fields:
+            return self.constant
+        if self.parts is None:
+            try:
+                return self.text.format(**kwargs)
+            except (KeyError, IndexError, ValueError, AttributeError):
+                return self.text
+        try:
+            return "".join(
+                literal if field is None else literal + str(kwargs[field])
+                for literal, field in self.parts
+            )
+        except KeyError:
+            return self.text
+
+
+def _flatten(tree: Mapping, prefix: str = "") -> Iterator[Tuple[str, object]]:
+    """(dotted key, leaf) pairs of a nested translation dict"""
+    for key, value in tree.items():
+        if isinstance(value, Mapping):
+            yield from _flatten(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
 
 
 class I18nService:
     """
     Service for managing multilingual content.
-    Loads and provides translations for English and Odia languages.
+    Loads and provides translations for English, Odia and Hindi.
     """
     
     def __init__(self):
         self.translations: Dict[str, Dict] = {}
+        self.catalogs: Dict[str, Dict[str, Template]] = {}
         self.default_language = "en"
-        self.supported_languages = ["en", "od"]
+        self.supported_languages = ["en", "od", "hi"]
         self._load_translations()
+        self._compile()
     
     def _load_translations(self):
         """Load all translation files from the i18n directory."""
@@ -39,50 +112,77 @@ class I18nService:
                 print(f"Translation file not found: {file_path}")
                 self.translations[lang] = {}
     
+    def _compile(self):
+        """Build one flat, fallback-resolved catalog of parsed templates per language."""
+        default = {
+            key: Template(value)
+            for key, value in _flatten(self.translations.get(self.default_language, {}))
+            if isinstance(value, str)
+        }
+        for lang in self.supported_languages:
+            own = {
+                key: Template(value)
+                for key, value in _flatten(self.translations.get(lang, {}))
+                if isinstance(value, str)
+            }
+            self.catalogs[lang] = {**default, **own}
+        
+        report = self.validate()
+        for lang, problems in report.items():
+            if problems["missing"]:
+                logger.warning(f"i18n: {len(problems['missing'])} keys missing from {lang}.json, using {self.default_language}")
+            if problems["placeholders"]:
+                logger.warning(f"i18n: placeholders differ from {self.default_language} in {lang}.json: {problems['placeholders']}")
+    
+    def validate(self) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Compare each language's translation file with the default language.
+        
+        Returns:
+            Per language: "missing" keys (served from the default language),
+            "extra" keys not in the default language, and keys whose
+            "placeholders" differ from the default language
+        """
+        default = dict(_flatten(self.translations.get(self.default_language, {})))
+        report = {}
+        for lang in self.supported_languages:
+            if lang == self.default_language:
+                continue
+            own = dict(_flatten(self.translations.get(lang, {})))
+            placeholders = [
+                key for key, value in own.items()
+                if isinstance(value, str) and isinstance(default.get(key), str)
+                and Template(value).fields != Template(default[key]).fields
+            ]
+            report[lang] = {
+                "missing": sorted(set(default) - set(own)),
+                "extra": sorted(set(own) - set(default)),
+                "placeholders": sorted(placeholders),
+            }
+        return report
+    
     def get(self, key: str, language: str = "en", **kwargs) -> str:
         """
         Get translated text by key.
         
         Args:
             key: Dot-notation key (e.g., "greeting.welcome")
-            language: Language code (en, od)
+            language: Language code (en, od, hi)
             **kwargs: Variables to format into the translation
             
         Returns:
             Translated and formatted text
         """
-        if language not in self.supported_languages:
-            language = self.default_language
-        
-        keys = key.split('.')
-        translation = self.translations.get(language, {})
-        
-        for k in keys:
-            if isinstance(translation, dict):
-                translation = translation.get(k)
-            else:
-                break
-        
-        if translation is None or not isinstance(translation, str):
-            translation = self.translations.get(self.default_language, {})
-            for k in keys:
-                if isinstance(translation, dict):
-                    translation = translation.get(k)
-                else:
-                    break
-        
-        if isinstance(translation, str):
-            try:
-                return translation.format(**kwargs)
-            except KeyError:
-                return translation
-        
-        return key
+        catalog = self.catalogs.get(language) or self.catalogs[self.default_language]
+        template = catalog.get(key)
+        if template is None:
+            return key
+        return template.render(kwargs)
     
     def detect_language(self, text: str) -> str:
         """
         Detect language from user input.
-        Simple detection based on character sets and keywords.
+        Delegates to the shared script-aware language identifier.
         
         Args:
             text: User input text
@@ -90,18 +190,7 @@ class I18nService:
         Returns:
             Detected language code
         """
-        if not text:
-            return self.default_language
-        
-        odia_chars = any(char in text for char in 'ଅଆଇଈଉଊଋଏଐଓଔକଖଗଘଙଚଛଜଝଞଟଠଡଢଣତଥଦଧନପଫବଭମଯରଲଳଵଶଷସହୟ')
-        if odia_chars:
-            return "od"
-        
-        odia_keywords = ['ନମସ୍କାର', 'ସାହାଯ୍ୟ', 'ରିପୋର୍ଟ', 'ଅଭିଯୋଗ']
-        if any(keyword in text for keyword in odia_keywords):
-            return "od"
-        
-        return "en"
+        return language_identifier.detect(text)
     
     def get_all(self, language: str = "en") -> Dict:
         """
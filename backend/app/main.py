@@ -10,8 +10,16 @@ from starlette.responses import JSONResponse
 
 from app.config import settings
 from app.database import db
-from app.routers import auth, complaints, tracking, escalation, whatsapp_webhook, analytics
+from app.routers import auth, complaints, tracking, escalation, whatsapp_webhook, analytics, campaigns
 from app.services.auth import AuthService
+from app.services.campaign_runner import campaign_runner
+from app.services.campaign_status import campaign_status_tracker
+from app.services.complaint_writer import complaint_writer
+from app.services.message_dispatcher import message_dispatcher
+from app.services.whatsapp_service import whatsapp_service
+from app.services.nlp_service import nlp_service
+from app.services.pii_masking import install_pii_log_filter
+from app.services.whatsapp_conversation import conversation_handler
 from app.models.user import UserDocument, UserRole, UserStatus
 
 # Configure logging
@@ -19,6 +27,8 @@ logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+if settings.LOG_MASK_PII:
+    install_pii_log_filter()
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +36,9 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown."""
     # Startup
+    if settings.LOG_MASK_PII:
+        # uvicorn configures its own handlers after this module is imported
+        install_pii_log_filter("uvicorn", "uvicorn.error", "uvicorn.access")
     logger.info("🚀 Starting CyberSathi Backend...")
     
     db_connected = False
@@ -38,12 +51,24 @@ async def lifespan(app: FastAPI):
         # Create default admin user if not exists
         await create_default_admin()
         
+        # Resume campaigns interrupted by a restart
+        resumed = await campaign_runner.resume_interrupted()
+        if resumed:
+            logger.info(f"📣 Resuming {resumed} interrupted campaign(s)")
+        
     except Exception as e:
         logger.warning(f"⚠️  MongoDB connection failed: {e}")
         logger.warning("⚠️  Starting in limited mode - database features unavailable")
         logger.warning("ℹ️  Please configure MONGODB_URL in backend/.env with your MongoDB Atlas connection string")
         logger.warning("ℹ️  Get free MongoDB Atlas at: https://www.mongodb.com/cloud/atlas")
     
+    await message_dispatcher.start()
+    await whatsapp_service.start()
+    await campaign_status_tracker.start()
+    await complaint_writer.start()
+    await nlp_service.session_timers.start()
+    await conversation_handler.session_timers.start()
+    
     logger.info(f"🌟 CyberSathi v{settings.APP_VERSION} is ready!")
     logger.info(f"📊 API Docs: http://{settings.HOST}:{settings.PORT}/docs")
     if not db_connected:
@@ -53,6 +78,15 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 Shutting down CyberSathi Backend...")
+    await campaign_runner.stop()
+    await campaign_status_tracker.stop()
+    await complaint_writer.stop()
+    await message_dispatcher.stop()
+    await nlp_service.session_timers.stop()
+    await conversation_handler.session_timers.stop()
+    await nlp_service.conversation_state.store.close()
+    await conversation_handler.conversation_state.store.close()
+    await whatsapp_service.close()
     if db_connected:
         await db.close_db()
     logger.info("✅ Cleanup completed")
@@ -111,6 +145,7 @@ app.include_router(complaints.router, prefix="/api/v1/complaints", tags=["Compla
 app.include_router(tracking.router, prefix="/api/v1/tracking", tags=["Tracking"])
 app.include_router(escalation.router, prefix="/api/v1/escalation", tags=["Escalation"])
 app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
+app.include_router(campaigns.router, prefix="/api/v1/campaigns", tags=["Campaigns"])
 app.include_router(whatsapp_webhook.router, prefix="", tags=["WhatsApp"])
 
 # Import and include new routers
@@ -4,11 +4,15 @@ from datetime import datetime
 from typing import Optional
 from enum import Enum
 
-from beanie import Document
+from beanie import Document, Insert, Replace, Save, after_event, before_event
 from pydantic import BaseModel, EmailStr, Field
 
+from app.services.encryption_service import ProtectedEmail, ProtectedStr
 from .complaint import Gender
 
+# Fields encrypted at rest when FIELD_ENCRYPTION_ENABLED is set
+UNFREEZE_ENCRYPTED_FIELDS = ("phone", "email", "account_number")
+
 
 class UnfreezeStatus(str, Enum):
     """Account unfreeze request status."""
@@ -28,8 +32,8 @@ class UnfreezeRequestDocument(Document):
     name: str
     guardian_name: str
     date_of_birth: datetime
-    phone: str
-    email: Optional[EmailStr] = None
+    phone: ProtectedStr
+    email: Optional[ProtectedEmail] = None
     gender: Gender
     village: str
     post_office: str
@@ -38,7 +42,7 @@ class UnfreezeRequestDocument(Document):
     pin_code: str
     
     # Account Details
-    account_number: str = Field(..., description="Bank account number to unfreeze")
+    account_number: ProtectedStr = Field(..., description="Bank account number to unfreeze")
     bank_name: Optional[str] = None
     ifsc_code: Optional[str] = None
     
@@ -63,17 +67,44 @@ class UnfreezeRequestDocument(Document):
     source: str = "whatsapp"
     wa_conversation_id: Optional[str] = None
     
+    # Blind indexes (HMAC) of the phone, email and account number, set on write
+    phone_bidx: Optional[str] = None
+    email_bidx: Optional[str] = None
+    account_bidx: Optional[str] = None
+    pii_protection: Optional[str] = None  # "indexed" or "encrypted": how protect_fields last wrote it
+    
     class Settings:
         name = "account_unfreeze_requests"
         indexes = [
             "reference_number",
-            "phone",
-            "account_number",
+            "phone_bidx",
+            "email_bidx",
+            "account_bidx",
             "status",
             "created_at",
             [("status", 1), ("created_at", -1)],
         ]
     
+    @before_event(Insert, Replace, Save)
+    def protect_fields(self):
+        """Refresh blind indexes and, when enabled, encrypt protected fields."""
+        from app.config import settings
+        from app.services.encryption_service import blind_index, encrypt_fields, field_cipher, protection_level
+        
+        self.phone_bidx = blind_index.compute("phone", field_cipher.decrypt(self.phone))
+        self.email_bidx = blind_index.compute("email", field_cipher.decrypt(self.email))
+        self.account_bidx = blind_index.compute("account", field_cipher.decrypt(self.account_number))
+        self.pii_protection = protection_level()
+        if settings.FIELD_ENCRYPTION_ENABLED:
+            encrypt_fields(self, UNFREEZE_ENCRYPTED_FIELDS)
+    
+    @after_event(Insert, Replace, Save)
+    def reveal_fields(self):
+        """Restore plaintext in memory once the encrypted copy is written."""
+        from app.services.encryption_service import decrypt_fields
+        
+        decrypt_fields(self, UNFREEZE_ENCRYPTED_FIELDS)
+    
     @staticmethod
     def generate_reference_number() -> str:
         """Generate unfreeze request reference number."""
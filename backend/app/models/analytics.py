@@ -12,6 +12,7 @@ class EventType(str, Enum):
     """Types of analytics events."""
     COMPLAINT_REGISTERED = "complaint_registered"
     COMPLAINT_RESOLVED = "complaint_resolved"
+    COMPLAINT_ABANDONED = "complaint_abandoned"
     USER_INTERACTION = "user_interaction"
     WHATSAPP_MESSAGE = "whatsapp_message"
     CAMPAIGN_SENT = "campaign_sent"
@@ -60,6 +61,7 @@ class AnalyticsEventDocument(Document):
         district: Optional[str] = None,
         incident_type: Optional[str] = None,
         value: Optional[float] = None,
+        duration: Optional[int] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ):
         """Track an analytics event."""
@@ -71,6 +73,7 @@ class AnalyticsEventDocument(Document):
             district=district,
             incident_type=incident_type,
             value=value,
+            duration=duration,
             metadata=metadata,
         )
         await event.insert()
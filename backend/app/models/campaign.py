@@ -50,6 +50,7 @@ class CampaignStats(BaseModel):
     delivered: int = 0
     read: int = 0
     failed: int = 0
+    queued: int = 0  # Sends that failed transiently and went to the outbound retry queue
     replied: int = 0
 
 
@@ -71,6 +72,13 @@ class CampaignDocument(Document):
     
     stats: CampaignStats = Field(default_factory=CampaignStats)
     
+    # Last recipient (in dispatch order) whose batch was sent; resume point after a crash
+    checkpoint: Optional[str] = None
+    
+    # Worker dispatching the campaign and when its claim lapses unless renewed
+    owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    
     created_by: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -82,6 +90,7 @@ class CampaignDocument(Document):
             "created_at",
             "scheduled_at",
             [("status", 1), ("scheduled_at", 1)],
+            [("status", 1), ("lease_expires_at", 1)],
         ]
 
 
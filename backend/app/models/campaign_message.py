@@ -0,0 +1,28 @@
+# backend/app/models/campaign_message.py
+"""Sent campaign message IDs used to attribute WhatsApp status callbacks."""
+from datetime import datetime
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from app.config import settings
+
+
+class CampaignMessageDocument(Document):
+    """MongoDB document mapping a sent WhatsApp message ID to its campaign."""
+
+    message_id: str
+    campaign_id: str
+    state: int = 0  # Status bits already counted (see app.services.campaign_status)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "campaign_messages"
+        indexes = [
+            IndexModel([("message_id", ASCENDING)], unique=True),
+            IndexModel(
+                [("created_at", ASCENDING)],
+                expireAfterSeconds=settings.CAMPAIGN_STATUS_INDEX_TTL_SECONDS,
+            ),
+        ]
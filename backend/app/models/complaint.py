@@ -5,8 +5,10 @@ from typing import Optional, List
 from enum import Enum
 import uuid
 
-from beanie import Document
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from beanie import Document, Insert, Replace, Save, after_event, before_event
+from pydantic import BaseModel, Field, field_validator
+
+from app.services.encryption_service import ProtectedEmail, ProtectedStr
 
 
 class Gender(str, Enum):
@@ -116,8 +118,8 @@ class ReporterInfo(BaseModel):
     name: str
     guardian_name: str  # Father/Spouse/Guardian name
     date_of_birth: datetime
-    phone: str  # E.164 format
-    email: Optional[EmailStr] = None
+    phone: ProtectedStr  # E.164 format
+    email: Optional[ProtectedEmail] = None
     gender: Gender
     village: str
     post_office: str
@@ -139,9 +141,9 @@ class IncidentDetails(BaseModel):
     description: str = Field(..., min_length=10)
     incident_date: Optional[datetime] = None
     amount_lost: Optional[float] = Field(None, ge=0)
-    account_number: Optional[str] = None
+    account_number: Optional[ProtectedStr] = None
     transaction_reference: Optional[str] = None
-    beneficiary_account: Optional[str] = None
+    beneficiary_account: Optional[ProtectedStr] = None
     beneficiary_name: Optional[str] = None
     transaction_date: Optional[datetime] = None
     fraud_url: Optional[str] = None
@@ -209,6 +211,17 @@ class ComplaintUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+# Fields encrypted at rest when FIELD_ENCRYPTION_ENABLED is set, and the
+# fields covered by each blind index
+ENCRYPTED_FIELDS = (
+    "phone", "reporter_info.phone", "email", "reporter_info.email", "bank_account",
+    "incident_details.account_number", "incident_details.beneficiary_account",
+)
+PHONE_FIELDS = ("phone", "reporter_info.phone", "wa_phone_number")
+EMAIL_FIELDS = ("email", "reporter_info.email")
+ACCOUNT_FIELDS = ("bank_account", "incident_details.account_number", "incident_details.beneficiary_account")
+
+
 class ComplaintDocument(Document):
     """MongoDB document model for complaints (PS-2 Enhanced)."""
     
@@ -223,8 +236,8 @@ class ComplaintDocument(Document):
     
     # Legacy fields (kept for backward compatibility)
     name: Optional[str] = None
-    phone: Optional[str] = None
-    email: Optional[str] = None
+    phone: Optional[ProtectedStr] = None
+    email: Optional[ProtectedStr] = None
     language: str = "en"
     
     # PS-2 Fraud Classification
@@ -243,9 +256,10 @@ class ComplaintDocument(Document):
     amount: Optional[float] = None
     platform: Optional[str] = None
     txn_id: Optional[str] = None
-    bank_account: Optional[str] = None
+    bank_account: Optional[ProtectedStr] = None
     suspect_info: Optional[str] = None
     location: Optional[Location] = None
+    district_code: Optional[int] = None  # Canonical district (app/data/districts.json), set on write
     
     # Attachments/Evidence
     attachments: List[Attachment] = Field(default_factory=list)
@@ -275,26 +289,95 @@ class ComplaintDocument(Document):
     
     # WhatsApp specific
     wa_conversation_id: Optional[str] = None
-    wa_phone_number: Optional[str] = None
+    wa_phone_number: Optional[str] = None  # Delivery address for replies and campaigns, never encrypted
+    
+    # Blind indexes (HMAC) of every phone, email and account number on the complaint, set on write
+    phone_bidx: List[str] = Field(default_factory=list)
+    email_bidx: List[str] = Field(default_factory=list)
+    account_bidx: List[str] = Field(default_factory=list)
+    pii_protection: Optional[str] = None  # "indexed" or "encrypted": how protect_fields last wrote it
     
     class Settings:
         name = "complaints"
         indexes = [
             "reference_id",
             "ps2_acknowledgement",
-            "phone",
-            "reporter_info.phone",
-            "reporter_info.email",
+            "phone_bidx",
+            "email_bidx",
+            "account_bidx",
             "status",
             "fraud_category",
             "source",
             "created_at",
             "assignee",
-            [("phone", 1), ("created_at", -1)],
+            [("phone_bidx", 1), ("created_at", -1)],
             [("status", 1), ("created_at", -1)],
             [("fraud_category", 1), ("created_at", -1)],
+            [("district_code", 1), ("created_at", -1)],
         ]
     
+    @before_event(Insert, Replace, Save)
+    def assign_district_code(self):
+        """Resolve the free-text district to its canonical code and state.
+        
+        Runs on every write (resolution is cached), so the code follows
+        edits to the district text instead of keeping the first one.
+        """
+        from app.services.gazetteer import resolve_district
+        
+        district = resolve_district(
+            self.location.district if self.location else None,
+            self.reporter_info.district if self.reporter_info else None,
+        )
+        self.district_code = district.code if district else None
+        if district is None:
+            return
+        if self.location is None:
+            self.location = Location(district=self.reporter_info.district)
+        if not self.location.state:
+            self.location.state = district.state
+    
+    @before_event(Insert, Replace, Save)
+    def protect_fields(self):
+        """Refresh blind indexes and, when enabled, encrypt protected fields."""
+        from app.config import settings
+        from app.services.encryption_service import blind_index, encrypt_fields, field_values, protection_level
+        
+        self.phone_bidx = blind_index.compute_many("phone", field_values(self, PHONE_FIELDS))
+        self.email_bidx = blind_index.compute_many("email", field_values(self, EMAIL_FIELDS))
+        self.account_bidx = blind_index.compute_many("account", field_values(self, ACCOUNT_FIELDS))
+        self.pii_protection = protection_level()
+        if settings.FIELD_ENCRYPTION_ENABLED:
+            encrypt_fields(self, ENCRYPTED_FIELDS)
+    
+    @after_event(Insert, Replace, Save)
+    def reveal_fields(self):
+        """Restore plaintext in memory once the encrypted copy is written."""
+        from app.services.encryption_service import decrypt_fields
+        
+        decrypt_fields(self, ENCRYPTED_FIELDS)
+    
+    @classmethod
+    def phone_query(cls, phone: str) -> dict:
+        """Filter for complaints involving a phone number (indexed equality on the blind index)."""
+        from app.services.encryption_service import blind_index
+        
+        return {"phone_bidx": blind_index.compute("phone", phone)}
+    
+    @classmethod
+    def email_query(cls, email: str) -> dict:
+        """Filter for complaints involving an email address (case and surrounding spaces ignored)."""
+        from app.services.encryption_service import blind_index
+        
+        return {"email_bidx": blind_index.compute("email", email)}
+    
+    @classmethod
+    def account_query(cls, account: str) -> dict:
+        """Filter for complaints involving a bank account, as victim or beneficiary."""
+        from app.services.encryption_service import blind_index
+        
+        return {"account_bidx": blind_index.compute("account", account)}
+    
     @staticmethod
     def generate_ps2_acknowledgement() -> str:
         """Generate PS-2 format acknowledgement number: CS-YYYY-XXX."""
@@ -0,0 +1,27 @@
+# backend/app/models/conversation_session.py
+"""Persisted chatbot conversation sessions shared across workers."""
+from datetime import datetime
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from app.config import settings
+
+
+class ConversationSessionDocument(Document):
+    """MongoDB document holding one user's serialized conversation state."""
+
+    key: str  # "<namespace>:<user_id>"
+    payload: bytes
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "conversation_sessions"
+        indexes = [
+            IndexModel([("key", ASCENDING)], unique=True),
+            IndexModel(
+                [("updated_at", ASCENDING)],
+                expireAfterSeconds=settings.CONVERSATION_IDLE_TTL_SECONDS,
+            ),
+        ]
@@ -0,0 +1,42 @@
+# backend/app/models/outbound_message.py
+"""Outbound WhatsApp messages awaiting retry or parked as dead letters."""
+from datetime import datetime
+from typing import Optional, Dict, Any
+from enum import Enum
+
+from beanie import Document
+from pydantic import Field
+
+
+class OutboundStatus(str, Enum):
+    """Delivery state of a queued outbound message."""
+    PENDING = "pending"
+    IN_FLIGHT = "in_flight"  # Claimed by a worker for a retry attempt
+    SENT = "sent"
+    DEAD = "dead"
+
+
+class OutboundMessageDocument(Document):
+    """MongoDB document for a failed WhatsApp send kept for retry."""
+
+    to: str
+    payload: Dict[str, Any]
+    phone_number_id: str
+
+    status: OutboundStatus = Field(default=OutboundStatus.PENDING)
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = None
+    claimed_by: Optional[str] = None  # Worker holding the retry lease
+    lease_expires_at: Optional[datetime] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "outbound_messages"
+        indexes = [
+            "status",
+            [("status", 1), ("next_attempt_at", 1)],
+            [("status", 1), ("lease_expires_at", 1)],
+        ]
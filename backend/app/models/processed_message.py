@@ -0,0 +1,26 @@
+# backend/app/models/processed_message.py
+"""Processed WhatsApp message IDs used for webhook deduplication."""
+from datetime import datetime
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from app.config import settings
+
+
+class ProcessedMessageDocument(Document):
+    """MongoDB document marking a webhook message ID as already handled."""
+
+    message_id: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "processed_messages"
+        indexes = [
+            IndexModel([("message_id", ASCENDING)], unique=True),
+            IndexModel(
+                [("created_at", ASCENDING)],
+                expireAfterSeconds=settings.WHATSAPP_DEDUP_WINDOW_SECONDS,
+            ),
+        ]
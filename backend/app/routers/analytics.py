@@ -1,16 +1,88 @@
 # backend/app/routers/analytics.py
 """Analytics router for dashboard statistics and insights."""
 from fastapi import APIRouter, Depends, Query
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, Iterable, List, Optional
 from datetime import datetime, timedelta
+import csv
+import io
+import json
 
 from app.models.user import UserDocument
 from app.models.complaint import ComplaintDocument, ComplaintStatus, IncidentType
 from app.models.analytics import AnalyticsSummary
 from app.services.auth import get_current_admin_user
+from app.services.gazetteer import gazetteer
+from app.services.redaction import RedactionPolicy, aredact_stream, get_path, get_policy
 
 router = APIRouter()
 
+# Columns of the CSV export, as dotted paths into the redacted complaint
+EXPORT_COLUMNS = (
+    "reference_id", "status", "created_at", "incident_type", "fraud_category",
+    "financial_fraud_type", "social_media_fraud_type", "amount", "incident_details.amount_lost",
+    "name", "phone", "email", "reporter_info.name", "reporter_info.phone", "reporter_info.email",
+    "reporter_info.date_of_birth", "reporter_info.gender", "reporter_info.district", "reporter_info.pin_code",
+    "location.district", "location.state", "district_code", "description", "incident_details.description", "portal_case_id",
+)
+
+# Complaint counts per district code and incident type. Complaints without a
+# code (not yet backfilled, or unresolvable) are grouped on their own text.
+DISTRICT_STATS_PIPELINE = [
+    {"$match": {"$or": [
+        {"district_code": {"$ne": None}},
+        {"location.district": {"$nin": [None, ""]}},
+    ]}},
+    {"$group": {
+        "_id": {
+            "code": "$district_code",
+            "district": {"$cond": [{"$eq": [{"$ifNull": ["$district_code", None]}, None]}, "$location.district", None]},
+            "state": {"$cond": [{"$eq": [{"$ifNull": ["$district_code", None]}, None]}, "$location.state", None]},
+            "incident_type": "$incident_type",
+        },
+        "count": {"$sum": 1},
+        "amount": {"$sum": {"$ifNull": ["$amount", 0]}},
+    }},
+]
+
+
+def district_label(code: Optional[int], text: Optional[str]) -> Optional[str]:
+    """Canonical district name for a code, else the district as typed."""
+    district = gazetteer.get(code) if gazetteer is not None and code is not None else None
+    return district.name if district else text
+
+
+def fold_district_stats(rows: Iterable[Dict]) -> List[Dict]:
+    """
+    Combine DISTRICT_STATS_PIPELINE rows into one entry per district.
+    
+    Args:
+        rows: Aggregation output
+        
+    Returns:
+        Per-district totals with an incident type breakdown
+    """
+    stats: Dict[tuple, Dict] = {}
+    for row in rows:
+        key = row["_id"]
+        code = key.get("code")
+        district = gazetteer.get(code) if gazetteer is not None and code is not None else None
+        name = district.name if district else key.get("district")
+        state = district.state if district else key.get("state")
+        entry = stats.setdefault((code, name), {
+            "district_code": code,
+            "district": name,
+            "state": state,
+            "total_complaints": 0,
+            "total_amount": 0.0,
+            "incident_types": {},
+        })
+        entry["total_complaints"] += row["count"]
+        entry["total_amount"] += row["amount"] or 0.0
+        incident_type = key.get("incident_type") or "other"
+        entry["incident_types"][incident_type] = entry["incident_types"].get(incident_type, 0) + row["count"]
+    return sorted(stats.values(), key=lambda entry: -entry["total_complaints"])
+
 
 @router.get("/dashboard", response_model=AnalyticsSummary)
 async def get_dashboard_stats(
@@ -55,11 +127,11 @@ async def get_dashboard_stats(
         incident = complaint.incident_type.value
         incident_dist[incident] = incident_dist.get(incident, 0) + 1
     
-    # District distribution
+    # District distribution (canonical districts where the code is known)
     district_dist = {}
     for complaint in all_complaints:
-        if complaint.location and complaint.location.district:
-            district = complaint.location.district
+        district = district_label(complaint.district_code, complaint.location.district if complaint.location else None)
+        if district:
             district_dist[district] = district_dist.get(district, 0) + 1
     
     # Average resolution time (simplified - calculate from status history)
@@ -148,38 +220,38 @@ async def get_district_stats(
     """
     Get district-wise complaint statistics (Admin only).
     
-    Returns complaint counts by district for heatmap visualization.
+    Returns complaint counts by district for heatmap visualization,
+    grouped on the canonical district code.
     """
-    district_stats = {}
-    
-    complaints = await ComplaintDocument.find_all().to_list()
-    
-    for complaint in complaints:
-        if complaint.location and complaint.location.district:
-            district = complaint.location.district
-            state = complaint.location.state or "Odisha"
-            
-            key = f"{district}, {state}"
-            
-            if key not in district_stats:
-                district_stats[key] = {
-                    "district": district,
-                    "state": state,
-                    "total_complaints": 0,
-                    "total_amount": 0.0,
-                    "incident_types": {}
-                }
-            
-            district_stats[key]["total_complaints"] += 1
-            
-            if complaint.amount:
-                district_stats[key]["total_amount"] += complaint.amount
-            
-            incident_type = complaint.incident_type.value
-            district_stats[key]["incident_types"][incident_type] = \
-                district_stats[key]["incident_types"].get(incident_type, 0) + 1
+    rows = await ComplaintDocument.aggregate(DISTRICT_STATS_PIPELINE).to_list()
+    return {"districts": fold_district_stats(rows)}
+
+
+async def export_rows(documents, policy: RedactionPolicy, format: str) -> AsyncIterator[str]:
+    """
+    Redact complaints one at a time and serialize them as CSV or NDJSON.
     
-    return {"districts": list(district_stats.values())}
+    Args:
+        documents: Async cursor over complaints
+        policy: Redaction policy applied to every complaint
+        format: "csv" or "json" (one JSON object per line)
+        
+    Yields:
+        Chunks of the export file
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if format == "csv":
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+    async for complaint in aredact_stream(documents, policy):
+        if format == "json":
+            yield json.dumps(complaint, ensure_ascii=False, default=str) + "\n"
+            continue
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(["" if (value := get_path(complaint, column)) is None else value for column in EXPORT_COLUMNS])
+        yield buffer.getvalue()
 
 
 @router.get("/export")
@@ -193,13 +265,15 @@ async def export_complaints(
     """
     Export complaints data (Admin only).
     
+    Complaints are streamed from the database and masked with the export
+    redaction policy as they are written, so exports of any size use
+    constant memory. JSON exports are newline-delimited.
+    
     - **format**: Export format (csv, pdf, json)
     - **status_filter**: Filter by status
     - **start_date**: Start date for filtering
     - **end_date**: End date for filtering
     """
-    # TODO: Implement actual export logic with pandas/reportlab
-    
     query = {}
     if status_filter:
         query["status"] = status_filter
@@ -208,17 +282,18 @@ async def export_complaints(
     if end_date:
         query.setdefault("created_at", {})["$lte"] = end_date
     
-    complaints = await ComplaintDocument.find(query).to_list()
-    
-    # For now, return JSON
-    data = [c.to_dict() for c in complaints]
+    if format == "pdf":
+        # TODO: Implement PDF export with reportlab
+        count = await ComplaintDocument.find(query).count()
+        return {"format": format, "count": count, "data": None, "message": "PDF export is not available yet"}
     
-    return {
-        "format": format,
-        "count": len(data),
-        "data": data if format == "json" else None,
-        "message": f"Export ready: {len(data)} complaints" if format != "json" else None
-    }
+    documents = ComplaintDocument.find(query).sort("+created_at")
+    filename = f"complaints-{datetime.utcnow():%Y%m%d-%H%M%S}.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        export_rows(documents, get_policy("export"), format),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/incident-types")
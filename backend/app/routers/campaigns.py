@@ -0,0 +1,142 @@
+# backend/app/routers/campaigns.py
+"""Campaign management router for awareness and alert broadcasts."""
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import List, Optional
+from datetime import datetime
+
+from beanie import PydanticObjectId, UpdateResponse
+
+from app.models.campaign import (
+    CampaignCreate, CampaignResponse, CampaignDocument, CampaignStatus
+)
+from app.models.user import UserDocument
+from app.services.auth import get_current_admin_user
+from app.services.campaign_runner import campaign_runner
+
+router = APIRouter()
+
+
+def _to_response(campaign: CampaignDocument) -> CampaignResponse:
+    """Convert a campaign document to its API response."""
+    return CampaignResponse(
+        id=str(campaign.id),
+        title=campaign.title,
+        campaign_type=campaign.campaign_type,
+        status=campaign.status,
+        stats=campaign.stats,
+        scheduled_at=campaign.scheduled_at,
+        created_at=campaign.created_at,
+    )
+
+
+async def _get_campaign(campaign_id: str) -> CampaignDocument:
+    """Load a campaign or raise 404."""
+    try:
+        campaign = await CampaignDocument.get(PydanticObjectId(campaign_id))
+    except Exception:
+        campaign = None
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found"
+        )
+    return campaign
+
+
+@router.post("/", response_model=CampaignResponse, status_code=status.HTTP_201_CREATED)
+async def create_campaign(
+    payload: CampaignCreate,
+    current_user: UserDocument = Depends(get_current_admin_user)
+):
+    """
+    Create a campaign draft (Admin only).
+
+    - **messages**: Message content keyed by language code
+    - **target**: Audience (all users, segments, districts, explicit numbers)
+    """
+    campaign = CampaignDocument(
+        title=payload.title,
+        description=payload.description,
+        campaign_type=payload.campaign_type,
+        messages=payload.messages,
+        target=payload.target,
+        scheduled_at=payload.scheduled_at,
+        status=CampaignStatus.SCHEDULED if payload.scheduled_at else CampaignStatus.DRAFT,
+        created_by=str(current_user.id),
+    )
+    await campaign.insert()
+    return _to_response(campaign)
+
+
+@router.get("/", response_model=List[CampaignResponse])
+async def list_campaigns(
+    limit: int = Query(50, le=500),
+    skip: int = Query(0, ge=0),
+    status_filter: Optional[CampaignStatus] = None,
+    current_user: UserDocument = Depends(get_current_admin_user)
+):
+    """List campaigns with delivery statistics (Admin only)."""
+    query = {"status": status_filter} if status_filter else {}
+    campaigns = await CampaignDocument.find(query)\
+        .sort("-created_at")\
+        .skip(skip)\
+        .limit(limit)\
+        .to_list()
+    return [_to_response(c) for c in campaigns]
+
+
+@router.get("/{campaign_id}", response_model=CampaignResponse)
+async def get_campaign(
+    campaign_id: str,
+    current_user: UserDocument = Depends(get_current_admin_user)
+):
+    """Get a campaign and its delivery statistics (Admin only)."""
+    return _to_response(await _get_campaign(campaign_id))
+
+
+@router.post("/{campaign_id}/dispatch", status_code=status.HTTP_202_ACCEPTED)
+async def dispatch_campaign(
+    campaign_id: str,
+    current_user: UserDocument = Depends(get_current_admin_user)
+):
+    """
+    Start sending a campaign in the background (Admin only).
+
+    Dispatch is resumable: an interrupted campaign continues from its checkpoint.
+    """
+    campaign = await _get_campaign(campaign_id)
+    if campaign.status in (CampaignStatus.COMPLETED, CampaignStatus.CANCELLED):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Campaign is {campaign.status.value}"
+        )
+    started = campaign_runner.start(campaign_id)
+    return {"campaign_id": campaign_id, "started": started}
+
+
+@router.post("/{campaign_id}/cancel", response_model=CampaignResponse)
+async def cancel_campaign(
+    campaign_id: str,
+    current_user: UserDocument = Depends(get_current_admin_user)
+):
+    """
+    Cancel a campaign (Admin only).
+
+    A running dispatch stops at its next statistics flush.
+    """
+    campaign = await _get_campaign(campaign_id)
+    # A conditional $set, not save(): the dispatcher keeps writing stats and
+    # its checkpoint to the same document while the request is handled
+    cancelled = await CampaignDocument.find_one({
+        "_id": campaign.id,
+        "status": {"$ne": CampaignStatus.COMPLETED.value},
+    }).update(
+        {"$set": {"status": CampaignStatus.CANCELLED.value, "updated_at": datetime.utcnow()}},
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+    if cancelled is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Campaign already completed"
+        )
+    return _to_response(cancelled)
@@ -165,10 +165,10 @@ async def check_complaint_status(identifier: str):
         ComplaintDocument.ps2_acknowledgement == identifier
     )
     
-    # If not found, try by phone
+    # If not found, try by phone (an indexed lookup on the phone blind index)
     if not complaint:
         complaint = await ComplaintDocument.find_one(
-            ComplaintDocument.reporter_info.phone == identifier
+            ComplaintDocument.phone_query(identifier)
         )
     
     if not complaint:
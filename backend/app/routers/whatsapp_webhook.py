@@ -1,11 +1,19 @@
 import hashlib
 import hmac
 import json
-from fastapi import APIRouter, Request, Response, HTTPException, Header
+from fastapi import APIRouter, Request, Response, HTTPException, Header, Depends
 from typing import Optional
 from app.config import settings
+from app.models.user import UserDocument
+from app.services.auth import get_current_admin_user
 from app.services.whatsapp_service import whatsapp_service
 from app.services.nlp_service import nlp_service
+from app.services.whatsapp_conversation import conversation_handler
+from app.services.nlu import nlu_service
+from app.services.message_dispatcher import message_dispatcher
+from app.services.message_dedup import message_deduplicator
+from app.services.campaign_status import campaign_status_tracker
+from app.services.complaint_writer import complaint_writer
 import logging
 
 router = APIRouter()
@@ -76,9 +84,16 @@ async def handle_webhook(
                 if change.get("field") == "messages":
                     value = change.get("value", {})
                     
+                    for status in value.get("statuses", []):
+                        campaign_status_tracker.record_status(status)
+                    
                     messages = value.get("messages", [])
                     for message in messages:
-                        await process_message(message, value)
+                        if await message_deduplicator.is_duplicate(message.get("id")):
+                            logger.info(f"Skipping redelivered message {message.get('id')}")
+                            continue
+                        campaign_status_tracker.record_reply(message)
+                        await message_dispatcher.submit(message.get("from"), process_message, message, value)
         
         return {"status": "ok"}
     
@@ -89,6 +104,38 @@ async def handle_webhook(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/webhook/whatsapp/stats")
+async def get_webhook_stats(
+    current_user: UserDocument = Depends(get_current_admin_user)
+):
+    """Get WhatsApp processing pipeline statistics (Admin only)."""
+    return {
+        "dispatcher": message_dispatcher.stats(),
+        "deduplication": message_deduplicator.stats(),
+        "outbound": await whatsapp_service.get_stats(),
+        "campaign_status": campaign_status_tracker.stats(),
+        "conversations": nlp_service.conversation_state.store.stats(),
+        "complaint_writer": complaint_writer.stats(),
+        "nlu_memo": nlu_service.memo_stats(),
+        "nlu_spelling": nlu_service.spell_index.stats() if nlu_service.spell_index else None,
+        "session_timers": {
+            "chatbot": nlp_service.session_timers.stats(),
+            "complaint_flow": conversation_handler.session_timers.stats(),
+        },
+    }
+
+
+@router.get("/webhook/whatsapp/sessions")
+async def get_session_memory(
+    current_user: UserDocument = Depends(get_current_admin_user)
+):
+    """Get conversation session counts, memory per session and evictions (Admin only)."""
+    return {
+        "complaint_flow": conversation_handler.conversation_state.store.memory_stats(),
+        "chatbot": nlp_service.conversation_state.store.memory_stats(),
+    }
+
+
 async def process_message(message: dict, value: dict):
     try:
         from_number = message.get("from")
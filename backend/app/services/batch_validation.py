@@ -0,0 +1,401 @@
+"""
+Columnar batch validation for CyberSathi
+
+`ValidationService` checks one value per call, which is millions of Python
+calls for a large CSV import. `BatchValidator` takes whole columns (lists or
+NumPy string arrays) and applies the same rules to every row at once: each
+column is stripped with `np.char`, viewed as a matrix of code points (one
+row per value, zero-padded) and checked with array comparisons. Dates are
+parsed the same way - digit columns are combined arithmetically, checked
+against month lengths and leap years, and built into a `datetime64` array.
+
+A row's result is a bitmask of `RowError` flags, 0 for a valid row, so a
+bad row costs no exception object; `describe` turns a code into field names
+only when a report needs them. Without NumPy the validator falls back to
+`ValidationService` row by row and returns lists instead of arrays.
+"""
+
+import re
+import string
+from dataclasses import dataclass
+from datetime import datetime
+from enum import IntFlag
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+    NUMPY_AVAILABLE = False
+
+from app.services.validation import ValidationService
+
+GENDERS = ("male", "female", "other", "prefer_not_to_say")
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+MAX_NAME_LENGTH = 100
+MIN_DESCRIPTION_LENGTH = 10
+
+# What the model's EmailStr accepts, for ASCII addresses: an atext local
+# part and hostname labels, dots only between characters, and a top-level
+# domain that is neither numeric nor reserved. Non-ASCII addresses are
+# refused here although EmailStr would take them.
+EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + "!#$%&'*+-/=?^_`{|}~.")
+EMAIL_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + "-.")
+EMAIL_RESERVED_TLDS = ("arpa", "invalid", "local", "localhost", "onion", "test")
+MAX_EMAIL_LENGTH = 254
+MAX_EMAIL_LOCAL_LENGTH = 64
+MAX_DOMAIN_LABEL_LENGTH = 63
+DOMAIN_LABEL_REGEX = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?")
+
+
+class RowError(IntFlag):
+    """Per-row error flags; a row's code is the OR of its failed checks"""
+    NONE = 0
+    NAME = 1
+    PHONE = 2
+    EMAIL = 4
+    PIN_CODE = 8
+    DOB = 16
+    GENDER = 32
+    DESCRIPTION = 64
+    INCIDENT_DATE = 128
+    AMOUNT = 256
+    MISSING = 512  # a required column is blank
+
+
+# Column name -> (check, error flag)
+COLUMN_CHECKS = {
+    "name": ("name", RowError.NAME),
+    "phone": ("phone", RowError.PHONE),
+    "email": ("email", RowError.EMAIL),
+    "pin_code": ("pin", RowError.PIN_CODE),
+    "dob": ("date", RowError.DOB),
+    "gender": ("gender", RowError.GENDER),
+    "description": ("description", RowError.DESCRIPTION),
+    "incident_date": ("date", RowError.INCIDENT_DATE),
+    "amount": ("amount", RowError.AMOUNT),
+}
+
+
+def describe(code: int) -> List[str]:
+    """
+    Names of the checks a row failed.
+
+    Args:
+        code: Row code from `BatchResult.codes`
+
+    Returns:
+        Lowercase flag names, e.g. ["phone", "dob"]
+    """
+    return [flag.name.lower() for flag in RowError if flag and flag & code]
+
+
+if NUMPY_AVAILABLE:
+    # str.isspace is what \s matches; indices past the table are clamped to a non-space
+    _SPACE_TABLE = np.array([chr(c).isspace() for c in range(0x3002)])
+    _DAYS_IN_MONTH = np.array(DAYS_IN_MONTH, dtype=np.int64)
+    # Allowed ASCII characters; index 128 stands for every non-ASCII code point
+    _LOCAL_TABLE = np.array([chr(c) in EMAIL_LOCAL_CHARS for c in range(129)])
+    _DOMAIN_TABLE = np.array([chr(c) in EMAIL_DOMAIN_CHARS for c in range(129)])
+
+
+def _strings(column) -> "np.ndarray":
+    """Column as a stripped NumPy unicode array, None as empty"""
+    if isinstance(column, np.ndarray) and column.dtype.kind == "U":
+        values = column
+    else:
+        objects = np.empty(len(column), dtype=object)
+        objects[:] = list(column)
+        objects[np.equal(objects, None)] = ""
+        values = objects.astype(str) if len(objects) else np.zeros(0, dtype="<U1")
+    return np.char.strip(values)
+
+
+def _codepoints(values: "np.ndarray", min_width: int):
+    """Code point matrix (rows x width, zero-padded) and string lengths"""
+    width = max(values.dtype.itemsize // 4, min_width, 1)
+    fixed = np.ascontiguousarray(values.astype(f"<U{width}"))
+    return fixed.view(np.uint32).reshape(len(values), width).astype(np.int64), np.char.str_len(fixed)
+
+
+def is_model_email(value: str) -> bool:
+    """Whether an address passes the rules the email column is checked with"""
+    local, at, domain = value.partition("@")
+    labels = domain.split(".")
+    return (
+        bool(at) and 0 < len(local) <= MAX_EMAIL_LOCAL_LENGTH and len(value) <= MAX_EMAIL_LENGTH
+        and set(local) <= EMAIL_LOCAL_CHARS
+        and not local.startswith(".") and not local.endswith(".") and ".." not in local
+        and len(labels) > 1
+        and all(len(label) <= MAX_DOMAIN_LABEL_LENGTH and DOMAIN_LABEL_REGEX.fullmatch(label) for label in labels)
+        and not labels[-1].isdigit() and labels[-1].lower() not in EMAIL_RESERVED_TLDS
+    )
+
+
+def _digits(matrix: "np.ndarray") -> "np.ndarray":
+    """Which code points are ASCII digits"""
+    return (matrix >= 48) & (matrix <= 57)
+
+
+def _number(digits: "np.ndarray", columns: Sequence[int]) -> "np.ndarray":
+    """Integer value of the digit columns read left to right"""
+    value = np.zeros(len(digits), dtype=np.int64)
+    for column in columns:
+        value = value * 10 + digits[:, column]
+    return value
+
+
+@dataclass
+class BatchResult:
+    """Validation result for a batch of rows"""
+    valid: Any  # bool per row
+    codes: Any  # RowError bitmask per row, 0 if valid
+    values: Dict[str, Any]  # normalized column values
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def accepted(self) -> List[int]:
+        """Indices of valid rows"""
+        if NUMPY_AVAILABLE and isinstance(self.valid, np.ndarray):
+            return np.flatnonzero(self.valid).tolist()
+        return [index for index, ok in enumerate(self.valid) if ok]
+
+    def rejected(self) -> List[int]:
+        """Indices of invalid rows"""
+        if NUMPY_AVAILABLE and isinstance(self.valid, np.ndarray):
+            return np.flatnonzero(~self.valid).tolist()
+        return [index for index, ok in enumerate(self.valid) if not ok]
+
+    def accepted_rows(self) -> Iterator[Dict[str, Any]]:
+        """Normalized values of each valid row, as plain Python objects"""
+        if NUMPY_AVAILABLE and isinstance(self.valid, np.ndarray):
+            columns = {name: values[self.valid].tolist() for name, values in self.values.items()}
+        else:
+            columns = {
+                name: [value for value, ok in zip(values, self.valid) if ok]
+                for name, values in self.values.items()
+            }
+        names = list(columns)
+        for row in zip(*columns.values()):
+            yield dict(zip(names, row))
+
+
+class BatchValidator:
+    """Vectorized counterpart of ValidationService for whole columns"""
+
+    def validate(
+        self,
+        columns: Mapping[str, Sequence[str]],
+        optional: Iterable[str] = (),
+        required: Iterable[str] = (),
+    ) -> BatchResult:
+        """
+        Validate equally long columns.
+
+        Columns named in COLUMN_CHECKS get their check; any other column is
+        only stripped, and checked for blanks if it is listed in `required`.
+
+        Args:
+            columns: Column name -> values
+            optional: Checked columns where a blank value is accepted
+            required: Unchecked columns that must not be blank
+
+        Returns:
+            BatchResult with normalized values: phones in E.164, dates as
+            datetime (datetime64[us] with NumPy, NaT/None when invalid or
+            blank), gender lowercased with underscores, amounts as float
+            (NaN/None when blank), everything else stripped
+        """
+        if not NUMPY_AVAILABLE:
+            return self._validate_rows(columns, set(optional), set(required))
+
+        optional, required = set(optional), set(required)
+        size = len(next(iter(columns.values()), ()))
+        codes = np.zeros(size, dtype=np.uint16)
+        values = {}
+        for name, column in columns.items():
+            strings = _strings(column)
+            if len(strings) != size:
+                raise ValueError(f"Column {name!r} has {len(strings)} rows, expected {size}")
+            blank = np.char.str_len(strings) == 0
+            check = COLUMN_CHECKS.get(name)
+            if check is None:
+                values[name] = strings
+                if name in required:
+                    codes[blank] |= np.uint16(RowError.MISSING)
+                continue
+            kind, flag = check
+            ok, values[name] = getattr(self, f"_{kind}")(strings)
+            if name in optional:
+                ok |= blank
+            codes[~ok] |= np.uint16(flag)
+        return BatchResult(valid=codes == 0, codes=codes, values=values)
+
+    def _name(self, strings):
+        lengths = np.char.str_len(strings)
+        return (lengths >= 2) & (lengths <= MAX_NAME_LENGTH), strings
+
+    def _description(self, strings):
+        return np.char.str_len(strings) >= MIN_DESCRIPTION_LENGTH, strings
+
+    def _phone(self, strings):
+        clean = np.char.replace(np.char.replace(np.char.replace(strings, "+91", ""), " ", ""), "-", "")
+        matrix, lengths = _codepoints(clean, 10)
+        ok = (
+            (lengths == 10)
+            & _digits(matrix[:, :10]).all(axis=1)
+            & (matrix[:, 0] >= ord("6")) & (matrix[:, 0] <= ord("9"))
+        )
+        return ok, np.where(ok, np.char.add("+91", clean), "")
+
+    def _pin(self, strings):
+        matrix, lengths = _codepoints(strings, 6)
+        ok = (lengths == 6) & _digits(matrix[:, :6]).all(axis=1) & (matrix[:, 0] != ord("0"))
+        return ok, strings
+
+    def _email(self, strings):
+        # is_model_email on the code point matrix: regions either side of the
+        # single '@', allowed characters per region, forbidden neighbours
+        # (a dot next to the '@', another dot or, in the domain, a hyphen)
+        # and the label runs between the domain's dots
+        matrix, lengths = _codepoints(strings, 2)
+        positions = np.arange(matrix.shape[1])
+        inside = positions < lengths[:, None]
+        at = matrix == ord("@")
+        at_position = at.argmax(axis=1)
+        local = positions < at_position[:, None]
+        domain = inside & (positions > at_position[:, None])
+        ascii_codes = np.minimum(matrix, 128)
+
+        dot = matrix == ord(".")
+        hyphen = matrix == ord("-")
+        boundary = dot | at
+        previous, current = boundary[:, :-1], boundary[:, 1:]
+        dot_pairs = (dot[:, :-1] & boundary[:, 1:]) | (boundary[:, :-1] & dot[:, 1:])
+        hyphen_pairs = (previous & hyphen[:, 1:]) | (hyphen[:, :-1] & current)
+        hyphen_pairs &= domain[:, 1:]
+
+        rows = np.arange(len(matrix))
+        last = matrix[rows, np.maximum(lengths - 1, 0)]
+        label_start = np.maximum.accumulate(np.where(boundary & ~local, positions, -1), axis=1)
+        last_dot = np.where(dot & domain, positions, -1).max(axis=1)
+        tld_length = lengths - last_dot - 1
+        tld_digits = (_digits(matrix) & (positions > last_dot[:, None]) & inside).sum(axis=1)
+        lowered = np.char.lower(strings)
+        reserved = np.zeros(len(strings), dtype=bool)
+        for tld in EMAIL_RESERVED_TLDS:
+            reserved |= np.char.endswith(lowered, "." + tld)
+
+        ok = (
+            (at.sum(axis=1) == 1) & (at_position >= 1) & (at_position <= MAX_EMAIL_LOCAL_LENGTH)
+            & (lengths <= MAX_EMAIL_LENGTH)
+            & ~(local & ~_LOCAL_TABLE[ascii_codes]).any(axis=1)
+            & ~(domain & ~_DOMAIN_TABLE[ascii_codes]).any(axis=1)
+            & (matrix[:, 0] != ord(".")) & (last != ord(".")) & (last != ord("-"))
+            & ~dot_pairs.any(axis=1) & ~hyphen_pairs.any(axis=1)
+            & ~(domain & (positions - label_start > MAX_DOMAIN_LABEL_LENGTH)).any(axis=1)
+            & (last_dot > at_position) & (tld_digits < tld_length) & ~reserved
+        )
+        return ok, strings
+
+    def _gender(self, strings):
+        normalized = np.char.replace(np.char.lower(strings), " ", "_")
+        return np.isin(normalized, GENDERS), normalized
+
+    def _amount(self, strings):
+        clean = np.char.replace(np.char.replace(strings, ",", ""), "₹", "")
+        matrix, lengths = _codepoints(clean, 1)
+        dots = (matrix == ord(".")).sum(axis=1)
+        digits = _digits(matrix).sum(axis=1)
+        ok = (lengths > 0) & (digits + dots == lengths) & (dots <= 1) & (digits > 0)
+        return ok, np.where(ok, clean, "nan").astype(np.float64)
+
+    def _date(self, strings):
+        # DD-MM-YYYY, DD/MM/YYYY, DDMMYYYY and YYYY-MM-DD, as in ValidationService.is_valid_dob
+        matrix, lengths = _codepoints(strings, 10)
+        matrix = matrix[:, :10]
+        digit = _digits(matrix)
+        separator = (matrix == ord("-")) | (matrix == ord("/"))
+        numbers = np.where(digit, matrix - 48, 0)
+
+        day_first = (lengths == 10) & digit[:, [0, 1, 3, 4, 6, 7, 8, 9]].all(axis=1) & separator[:, 2] & separator[:, 5]
+        compact = (lengths == 8) & digit[:, :8].all(axis=1)
+        year_first = (lengths == 10) & digit[:, [0, 1, 2, 3, 5, 6, 8, 9]].all(axis=1) & separator[:, 4] & separator[:, 7]
+
+        day = np.select([day_first | compact, year_first], [_number(numbers, (0, 1)), _number(numbers, (8, 9))], 0)
+        month = np.select(
+            [day_first, compact, year_first],
+            [_number(numbers, (3, 4)), _number(numbers, (2, 3)), _number(numbers, (5, 6))], 0,
+        )
+        year = np.select(
+            [day_first, compact, year_first],
+            [_number(numbers, (6, 7, 8, 9)), _number(numbers, (4, 5, 6, 7)), _number(numbers, (0, 1, 2, 3))], 0,
+        )
+
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        month_length = _DAYS_IN_MONTH[np.clip(month, 1, 12) - 1] + (leap & (month == 2))
+        ok = (
+            (day_first | compact | year_first)
+            & (year >= 1) & (month >= 1) & (month <= 12)
+            & (day >= 1) & (day <= month_length)
+        )
+
+        years = np.where(ok, year - 1970, 0).astype("datetime64[Y]")
+        months = years.astype("datetime64[M]") + np.where(ok, month - 1, 0)
+        dates = (months.astype("datetime64[D]") + np.where(ok, day - 1, 0)).astype("datetime64[us]")
+        dates[~ok] = np.datetime64("NaT")
+        return ok, dates
+
+    def _validate_rows(self, columns, optional, required) -> BatchResult:
+        """Row-by-row fallback through ValidationService when NumPy is missing"""
+        size = len(next(iter(columns.values()), ()))
+        codes = [0] * size
+        values = {}
+        for name, column in columns.items():
+            strings = [(value or "").strip() for value in column]
+            if len(strings) != size:
+                raise ValueError(f"Column {name!r} has {len(strings)} rows, expected {size}")
+            check = COLUMN_CHECKS.get(name)
+            normalized = []
+            for index, value in enumerate(strings):
+                if check is None:
+                    ok, result = bool(value) or name not in required, value
+                    flag = RowError.MISSING
+                else:
+                    kind, flag = check
+                    ok, result = self._check_value(kind, value)
+                    ok = ok or (name in optional and not value)
+                if not ok:
+                    codes[index] |= flag
+                normalized.append(result)
+            values[name] = normalized
+        return BatchResult(valid=[code == 0 for code in codes], codes=codes, values=values)
+
+    def _check_value(self, kind: str, value: str):
+        """(ok, normalized value) of one value"""
+        if kind == "name":
+            return ValidationService.validate_name(value)[0], value
+        if kind == "description":
+            return ValidationService.validate_description(value, MIN_DESCRIPTION_LENGTH)[0], value
+        if kind == "phone":
+            ok = ValidationService.is_valid_phone(value)
+            return ok, "+91" + value.replace("+91", "").replace(" ", "").replace("-", "") if ok else ""
+        if kind == "pin":
+            return ValidationService.is_valid_pin(value), value
+        if kind == "email":
+            return is_model_email(value), value
+        if kind == "gender":
+            normalized = value.lower().replace(" ", "_")
+            return ValidationService.validate_gender(normalized)[0], normalized
+        if kind == "amount":
+            clean = value.replace(",", "").replace("₹", "")
+            if not clean.replace(".", "", 1).isdigit():
+                return False, None
+            return True, float(clean)
+        ok, normalized = ValidationService.is_valid_dob(value)
+        return ok, datetime.strptime(normalized, "%d-%m-%Y") if ok else None
+
+
+batch_validator = BatchValidator()
@@ -0,0 +1,402 @@
+"""
+Campaign Dispatch Engine for CyberSathi
+Sends awareness/alert campaigns (CampaignDocument) to their target audience
+
+Recipients are streamed in ascending phone-number order from a MongoDB
+aggregation (spilling to disk for large audiences) merged with the explicit
+phone list, so deduplication only needs to compare adjacent numbers and the
+last completed number is a resumable checkpoint. Statistics are flushed as
+periodic `$inc` updates instead of one write per message.
+
+Every worker process resumes interrupted campaigns at startup, so a campaign
+is claimed atomically (owner plus lease expiry) before dispatch and the lease
+is renewed at every flush. Only one worker sends a campaign at a time; if it
+dies, another takes over from the checkpoint once the lease has lapsed.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId, UpdateResponse
+
+from app.config import settings
+from app.models.campaign import CampaignDocument, CampaignMessage, CampaignStatus, CampaignTarget
+from app.models.complaint import ComplaintDocument, ComplaintStatus
+from app.services.encryption_service import ENCRYPTED_PREFIX
+from app.services.campaign_status import campaign_status_tracker
+from app.services.whatsapp_service import whatsapp_service
+from app.services.worker_identity import lease_until, worker_id
+
+logger = logging.getLogger(__name__)
+
+Recipient = Tuple[str, Optional[str]]  # (phone, language)
+
+NON_DIGITS = re.compile(r'\D')
+
+# Audience segments resolvable from the complaints collection
+SEGMENT_FILTERS: Dict[str, Dict] = {
+    "complainants": {},
+    "whatsapp_users": {"source": "whatsapp"},
+    "open_cases": {"status": {"$nin": [ComplaintStatus.RESOLVED.value, ComplaintStatus.CLOSED.value]}},
+}
+
+
+def normalize_recipient(phone: Optional[str]) -> Optional[str]:
+    """
+    Normalize a phone number to WhatsApp recipient format (country code, no '+').
+
+    Args:
+        phone: Phone number in any common format
+
+    Returns:
+        Digits-only number with 91 prefix, or None if not a valid mobile
+    """
+    if not phone:
+        return None
+    digits = NON_DIGITS.sub('', phone)
+    if len(digits) == 10 and digits[0] in "6789":
+        return "91" + digits
+    if len(digits) == 12 and digits.startswith("91") and digits[2] in "6789":
+        return digits
+    return None
+
+
+class CampaignRunner:
+    """
+    Streams a campaign's recipients and fans messages out in rate-controlled batches.
+
+    Outbound throughput is bounded by the WhatsApp sender's token bucket;
+    `batch_size` only controls how many sends are in flight at once.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        flush_every: int = 500,
+        flush_interval: float = 5.0,
+        lease_seconds: float = 120.0,
+    ):
+        self.batch_size = batch_size
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.lease_seconds = lease_seconds
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _complaint_pipeline(self, target: CampaignTarget, after: Optional[str]) -> Optional[List[Dict]]:
+        """Build the aggregation that yields sorted, distinct complainant numbers."""
+        if not (target.all_users or target.user_segments or target.districts or target.language):
+            return None
+
+        filters: List[Dict] = []
+        if not target.all_users and target.user_segments:
+            for segment in target.user_segments:
+                if segment not in SEGMENT_FILTERS:
+                    logger.warning(f"Unknown campaign segment ignored: {segment}")
+            segment_filters = [SEGMENT_FILTERS[s] for s in target.user_segments if s in SEGMENT_FILTERS]
+            if not segment_filters:
+                return None
+            filters.append({"$or": segment_filters})
+
+        if target.districts:
+            filters.append({"$or": [
+                {"location.district": {"$in": target.districts}},
+                {"reporter_info.district": {"$in": target.districts}},
+            ]})
+        if target.language:
+            filters.append({"language": target.language})
+
+        digits = {"$replaceAll": {"input": {"$replaceAll": {"input": {"$replaceAll": {
+            "input": "$raw", "find": "+", "replacement": ""}}, "find": " ", "replacement": ""}},
+            "find": "-", "replacement": ""}}
+        national = {"$substrCP": ["$$d", {"$subtract": [{"$strLenCP": "$$d"}, 10]}, 10]}
+
+        pipeline: List[Dict] = [
+            {"$match": {"$and": filters} if filters else {}},
+            {"$project": {
+                "language": 1,
+                "raw": {"$ifNull": ["$wa_phone_number", {"$ifNull": ["$reporter_info.phone", "$phone"]}]},
+            }},
+            # Phones encrypted at rest (FIELD_ENCRYPTION_ENABLED) cannot be read here;
+            # those complainants are reached through wa_phone_number
+            {"$match": {"raw": {"$type": "string", "$not": {"$regex": f"^{ENCRYPTED_PREFIX}"}}}},
+            {"$project": {
+                "language": 1,
+                "phone": {"$let": {"vars": {"d": digits}, "in": {"$cond": [
+                    {"$gte": [{"$strLenCP": "$$d"}, 10]}, {"$concat": ["91", national]}, None,
+                ]}}},
+            }},
+            {"$match": {"phone": {"$regex": r"^91[6-9]\d{9}$"}}},
+            {"$group": {"_id": "$phone", "language": {"$first": "$language"}}},
+            {"$sort": {"_id": 1}},
+        ]
+        if after:
+            pipeline.append({"$match": {"_id": {"$gt": after}}})
+        return pipeline
+
+    async def _complaint_recipients(self, target: CampaignTarget, after: Optional[str]) -> AsyncIterator[Recipient]:
+        """Stream complainant recipients from MongoDB in phone order."""
+        pipeline = self._complaint_pipeline(target, after)
+        if pipeline is None:
+            return
+        async for row in ComplaintDocument.aggregate(pipeline, allowDiskUse=True):
+            yield row["_id"], row.get("language")
+
+    @staticmethod
+    async def _explicit_recipients(target: CampaignTarget, after: Optional[str]) -> AsyncIterator[Recipient]:
+        """Stream the campaign's explicit phone list in phone order."""
+        phones = sorted({p for p in map(normalize_recipient, target.phone_numbers) if p})
+        for phone in phones:
+            if after is None or phone > after:
+                yield phone, target.language
+
+    async def recipients(self, target: CampaignTarget, after: Optional[str] = None) -> AsyncIterator[Recipient]:
+        """
+        Stream distinct recipients for a target in ascending phone order.
+
+        Args:
+            target: Campaign target definition
+            after: Resume checkpoint; only numbers greater than this are yielded
+
+        Yields:
+            (phone, language) tuples, each phone exactly once
+        """
+        streams = [
+            self._complaint_recipients(target, after).__aiter__(),
+            self._explicit_recipients(target, after).__aiter__(),
+        ]
+        heads: List[Optional[Recipient]] = []
+        for stream in streams:
+            heads.append(await anext(stream, None))
+
+        last_phone = None
+        while True:
+            live = [i for i, head in enumerate(heads) if head is not None]
+            if not live:
+                return
+            index = min(live, key=lambda i: heads[i][0])
+            phone, language = heads[index]
+            heads[index] = await anext(streams[index], None)
+            if phone == last_phone:
+                continue
+            last_phone = phone
+            yield phone, language
+
+    @staticmethod
+    def _message_for(campaign: CampaignDocument, language: Optional[str]) -> Optional[CampaignMessage]:
+        """Pick the campaign message for a recipient language, falling back to English."""
+        messages = campaign.messages
+        return messages.get(language or "en") or messages.get("en") or next(iter(messages.values()), None)
+
+    async def _send_one(self, phone: str, message: CampaignMessage, language: Optional[str]) -> Dict:
+        """Send a campaign message to one recipient."""
+        if message.template_name:
+            return await whatsapp_service.send_template_message(
+                to=phone, template_name=message.template_name, language_code=language or "en"
+            )
+        buttons = [{"id": f"campaign_reply_{i}", "title": reply} for i, reply in enumerate(message.quick_replies)]
+        return await whatsapp_service.send_message(to=phone, message=message.text, buttons=buttons)
+
+    async def _claim(self, campaign_id: PydanticObjectId) -> Optional[CampaignDocument]:
+        """
+        Take the campaign for this worker unless another worker holds a live lease.
+
+        Returns:
+            The claimed campaign, or None if it is finished or owned elsewhere
+        """
+        now = datetime.utcnow()
+        campaign = await CampaignDocument.find_one({
+            "_id": campaign_id,
+            "status": {"$nin": [CampaignStatus.COMPLETED.value, CampaignStatus.CANCELLED.value]},
+            "$or": [{"owner": None}, {"owner": worker_id()}, {"lease_expires_at": {"$lte": now}}],
+        }).update({"$set": {
+            "status": CampaignStatus.RUNNING.value,
+            "owner": worker_id(),
+            "lease_expires_at": lease_until(self.lease_seconds),
+            "updated_at": now,
+        }}, response_type=UpdateResponse.NEW_DOCUMENT)
+        if campaign is not None and campaign.started_at is None:
+            await CampaignDocument.find_one({"_id": campaign_id, "started_at": None}).update(
+                {"$set": {"started_at": now}}
+            )
+        return campaign
+
+    async def _flush(
+        self,
+        campaign_id: PydanticObjectId,
+        counts: Dict[str, int],
+        checkpoint: Optional[str],
+        release: bool = False,
+    ) -> Optional[CampaignStatus]:
+        """
+        Apply accumulated stats and checkpoint and renew (or release) this worker's lease.
+
+        Returns:
+            The campaign's current status, or None if it was deleted or taken over
+        """
+        update: Dict = {"$set": {
+            "updated_at": datetime.utcnow(),
+            "owner": None if release else worker_id(),
+            "lease_expires_at": None if release else lease_until(self.lease_seconds),
+        }}
+        increments = {f"stats.{key}": value for key, value in counts.items() if value}
+        if increments:
+            update["$inc"] = increments
+        if checkpoint:
+            update["$set"]["checkpoint"] = checkpoint
+        current = await CampaignDocument.find_one({"_id": campaign_id, "owner": worker_id()}).update(
+            update, response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if current is None and increments:
+            # The lease lapsed, but these messages were sent all the same
+            await CampaignDocument.find_one(CampaignDocument.id == campaign_id).update({"$inc": increments})
+        for key in counts:
+            counts[key] = 0
+        return current.status if current else None
+
+    async def _complete(self, campaign_id: PydanticObjectId):
+        """Mark a campaign this worker dispatched as completed, unless it was cancelled meanwhile."""
+        await CampaignDocument.find_one({
+            "_id": campaign_id,
+            "owner": worker_id(),
+            "status": {"$ne": CampaignStatus.CANCELLED.value},
+        }).update({"$set": {
+            "status": CampaignStatus.COMPLETED.value,
+            "completed_at": datetime.utcnow(),
+            "owner": None,
+            "lease_expires_at": None,
+        }})
+
+    async def on_sent(self, campaign: CampaignDocument, results: List[Dict]):
+        """Record a batch's sent message IDs so delivery/read callbacks reach the campaign."""
+        await campaign_status_tracker.register(
+            (message.get("id") for result in results for message in result.get("messages", [])),
+            str(campaign.id),
+        )
+
+    async def run(self, campaign_id: str):
+        """
+        Dispatch a campaign, resuming from its checkpoint if it was interrupted.
+
+        Args:
+            campaign_id: Campaign document ID
+        """
+        campaign = await self._claim(PydanticObjectId(campaign_id))
+        if not campaign:
+            logger.info(f"Campaign {campaign_id} not dispatched: finished, missing or claimed by another worker")
+            return
+        logger.info(f"Dispatching campaign {campaign_id} from checkpoint {campaign.checkpoint or 'start'}")
+
+        counts = {"total_targeted": 0, "sent": 0, "queued": 0, "failed": 0}
+        pending = 0
+        last_flush = time.monotonic()
+        batch: List[Recipient] = []
+        checkpoint: Optional[str] = None  # Last phone of the last fully sent batch
+
+        async def send_batch(recipients: List[Recipient]):
+            results = await asyncio.gather(*(
+                self._send_one(phone, message, language)
+                for phone, language, message in (
+                    (phone, language, self._message_for(campaign, language)) for phone, language in recipients
+                )
+                if message is not None
+            ), return_exceptions=True)
+            sent = []
+            for result in results:
+                counts["total_targeted"] += 1
+                if isinstance(result, dict) and "error" not in result:
+                    counts["sent"] += 1
+                    sent.append(result)
+                elif isinstance(result, dict) and result.get("queued"):
+                    counts["queued"] += 1
+                else:
+                    counts["failed"] += 1
+            await self.on_sent(campaign, sent)
+
+        try:
+            async for recipient in self.recipients(campaign.target, after=campaign.checkpoint):
+                batch.append(recipient)
+                if len(batch) < self.batch_size:
+                    continue
+                await send_batch(batch)
+                pending += len(batch)
+                checkpoint = batch[-1][0]
+                batch = []
+
+                if pending >= self.flush_every or time.monotonic() - last_flush >= self.flush_interval:
+                    status = await self._flush(campaign.id, counts, checkpoint)
+                    pending = 0
+                    last_flush = time.monotonic()
+                    if status is None:
+                        logger.warning(f"Campaign {campaign_id} lease lost; another worker continues it")
+                        return
+                    if status == CampaignStatus.CANCELLED:
+                        logger.info(f"Campaign {campaign_id} cancelled during dispatch")
+                        return
+
+            if batch:
+                await send_batch(batch)
+                checkpoint = batch[-1][0]
+            await self._flush(campaign.id, counts, checkpoint)
+        except asyncio.CancelledError:
+            # Counts and checkpoint cover completed batches only; the interrupted
+            # batch is resent on resume. Releasing the lease lets that happen at once.
+            await self._flush(campaign.id, counts, checkpoint, release=True)
+            raise
+
+        await self._complete(campaign.id)
+        logger.info(f"Campaign {campaign_id} completed")
+
+    def start(self, campaign_id: str) -> bool:
+        """
+        Start dispatching a campaign in the background.
+
+        Args:
+            campaign_id: Campaign document ID
+
+        Returns:
+            False if the campaign is already being dispatched
+        """
+        task = self._tasks.get(campaign_id)
+        if task and not task.done():
+            return False
+        task = asyncio.create_task(self.run(campaign_id), name=f"campaign-{campaign_id}")
+        task.add_done_callback(lambda t: self._tasks.pop(campaign_id, None))
+        self._tasks[campaign_id] = task
+        return True
+
+    async def resume_interrupted(self) -> int:
+        """
+        Restart RUNNING campaigns whose dispatching worker is gone.
+
+        Only campaigns without a live lease are started, and each start
+        claims its campaign atomically, so when several workers boot at
+        once every campaign is resumed by exactly one of them.
+
+        Returns:
+            Number of orphaned campaigns started (each is sent by the worker that claims it)
+        """
+        orphaned = await CampaignDocument.find({
+            "status": CampaignStatus.RUNNING.value,
+            "$or": [{"owner": None}, {"lease_expires_at": {"$lte": datetime.utcnow()}}],
+        }).to_list()
+        for campaign in orphaned:
+            self.start(str(campaign.id))
+        return len(orphaned)
+
+    async def stop(self):
+        """Cancel in-flight dispatches; they resume from their checkpoint on restart."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+campaign_runner = CampaignRunner(
+    batch_size=settings.CAMPAIGN_BATCH_SIZE,
+    flush_every=settings.CAMPAIGN_STATS_FLUSH_EVERY,
+    lease_seconds=settings.CAMPAIGN_LEASE_SECONDS,
+)
@@ -0,0 +1,268 @@
+"""
+Campaign delivery status tracking for CyberSathi
+
+Meta reports delivery, read and failure of every sent message as a `statuses`
+callback carrying the message ID. Campaign sends record their message IDs in
+the `campaign_messages` TTL collection, so a callback is attributed whichever
+worker receives it.
+
+The webhook only queues callbacks in memory (merging redeliveries of the
+same message). Every flush interval the queue is resolved in batches: one
+`$in` lookup finds the campaign of each queued message, and one
+`update_many` per campaign and status bit sets the bit on the records where
+it is still clear. Its modified count is the number of messages newly in
+that state, so each state is counted once across all workers without a
+write per callback. The counts are then written as one `$inc` per campaign.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+
+from app.config import settings
+from app.models.campaign import CampaignDocument
+
+logger = logging.getLogger(__name__)
+
+# Status bits stored on each campaign message record
+DELIVERED = 1
+READ = 2
+REPLIED = 4
+FAILED = 8
+STATUS_BITS = ((DELIVERED, "delivered"), (READ, "read"), (REPLIED, "replied"), (FAILED, "failed"))
+RESOLVE_BATCH_SIZE = 1000  # queued message IDs per $in lookup
+
+
+class MongoCampaignMessageStore:
+    """Campaign message index in the shared `campaign_messages` collection."""
+
+    async def add(self, message_ids: Iterable[str], campaign_id: str):
+        """
+        Record sent message IDs for a campaign.
+
+        Args:
+            message_ids: WhatsApp message IDs returned by the send API
+            campaign_id: Campaign document ID
+        """
+        from app.models.campaign_message import CampaignMessageDocument
+
+        documents = [CampaignMessageDocument(message_id=m, campaign_id=campaign_id) for m in message_ids]
+        if not documents:
+            return
+        try:
+            await CampaignMessageDocument.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # IDs already recorded (a resumed batch) keep their counted bits
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+
+    async def campaigns(self, message_ids: List[str]) -> Dict[str, str]:
+        """
+        Campaigns of recorded messages, with one query.
+
+        Args:
+            message_ids: WhatsApp message IDs
+
+        Returns:
+            message ID -> campaign ID, for the IDs that are campaign messages
+        """
+        from app.models.campaign_message import CampaignMessageDocument
+
+        records = await CampaignMessageDocument.find({"message_id": {"$in": message_ids}}).to_list()
+        return {record.message_id: record.campaign_id for record in records}
+
+    async def mark(self, message_ids: List[str], bit: int) -> int:
+        """
+        Set one status bit on recorded messages where it is still clear.
+
+        Args:
+            message_ids: WhatsApp message IDs (of one campaign)
+            bit: Status bit to set
+
+        Returns:
+            Number of messages the bit was newly set on
+        """
+        from app.models.campaign_message import CampaignMessageDocument
+
+        result = await CampaignMessageDocument.find(
+            {"message_id": {"$in": message_ids}, "state": {"$bitsAllClear": bit}}
+        ).update({"$bit": {"state": {"or": bit}}})
+        return result.modified_count if result else 0
+
+
+class CampaignStatusTracker:
+    """
+    Attributes WhatsApp status callbacks and replies to campaigns.
+
+    Each message contributes at most once to each of delivered, read,
+    replied and failed, so redelivered or out-of-order callbacks (read
+    before delivered) do not skew the statistics.
+    """
+
+    def __init__(self, store=None, flush_interval: float = 5.0, max_queued: int = 100_000):
+        self.store = store or MongoCampaignMessageStore()
+        self.flush_interval = flush_interval
+        self.max_queued = max_queued
+        self._queued: Dict[str, int] = {}  # message ID -> status bits from callbacks not yet resolved
+        self._pending: Dict[str, Counter] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.callbacks_matched = 0
+        self.callbacks_unmatched = 0
+        self.callbacks_dropped = 0
+        self.store_errors = 0
+        self.flush_errors = 0
+
+    async def register(self, message_ids: Iterable[Optional[str]], campaign_id: str):
+        """
+        Record that messages were sent as part of a campaign.
+
+        Args:
+            message_ids: WhatsApp message IDs returned by the send API
+            campaign_id: Campaign document ID
+        """
+        message_ids = [message_id for message_id in message_ids if message_id]
+        try:
+            await self.store.add(message_ids, campaign_id)
+        except Exception as e:
+            self.store_errors += 1
+            logger.warning(f"Could not record {len(message_ids)} messages of campaign {campaign_id}: {e}")
+
+    def _queue(self, message_id: Optional[str], bits: int) -> bool:
+        """Queue status bits for a message until the next flush resolves them."""
+        if not message_id:
+            return False
+        if message_id not in self._queued and len(self._queued) >= self.max_queued:
+            self.callbacks_dropped += 1
+            return False
+        self._queued[message_id] = self._queued.get(message_id, 0) | bits
+        return True
+
+    def record_status(self, status: Dict) -> bool:
+        """
+        Queue one entry of a webhook `statuses` array.
+
+        Args:
+            status: Status object with `id` and `status` (sent/delivered/read/failed)
+
+        Returns:
+            True if the status was queued for attribution
+        """
+        state = status.get("status")
+        if state == "delivered":
+            bits = DELIVERED
+        elif state == "read":
+            bits = DELIVERED | READ  # a read message was necessarily delivered
+        elif state == "failed":
+            bits = FAILED
+        else:
+            return False
+        return self._queue(status.get("id"), bits)
+
+    def record_reply(self, message: Dict) -> bool:
+        """
+        Queue an inbound message that may reply to a campaign message.
+
+        Args:
+            message: Inbound webhook message; replies carry `context.id`
+
+        Returns:
+            True if the reply was queued for attribution
+        """
+        context = message.get("context") or {}
+        return self._queue(context.get("id"), REPLIED)
+
+    async def resolve(self):
+        """Attribute queued callbacks to campaigns and count newly set states."""
+        queued, self._queued = self._queued, {}
+        message_ids = list(queued)
+        for start in range(0, len(message_ids), RESOLVE_BATCH_SIZE):
+            chunk = message_ids[start:start + RESOLVE_BATCH_SIZE]
+            try:
+                owners = await self.store.campaigns(chunk)
+            except Exception as e:
+                self.store_errors += 1
+                logger.warning(f"Campaign status lookup failed for {len(chunk)} messages, will retry: {e}")
+                self._requeue(queued, chunk)
+                continue
+            self.callbacks_matched += len(owners)
+            self.callbacks_unmatched += len(chunk) - len(owners)
+
+            groups: Dict[tuple, List[str]] = {}
+            for message_id, campaign_id in owners.items():
+                for bit, _ in STATUS_BITS:
+                    if queued[message_id] & bit:
+                        groups.setdefault((campaign_id, bit), []).append(message_id)
+            for (campaign_id, bit), ids in groups.items():
+                try:
+                    newly_set = await self.store.mark(ids, bit)
+                except Exception as e:
+                    self.store_errors += 1
+                    logger.warning(f"Campaign status update failed for campaign {campaign_id}, will retry: {e}")
+                    for message_id in ids:
+                        self._queued[message_id] = self._queued.get(message_id, 0) | bit
+                    continue
+                if newly_set:
+                    self._pending.setdefault(campaign_id, Counter())[dict(STATUS_BITS)[bit]] += newly_set
+
+    def _requeue(self, queued: Dict[str, int], message_ids: List[str]):
+        """Put callbacks back in the queue after a failed lookup."""
+        for message_id in message_ids:
+            self._queued[message_id] = self._queued.get(message_id, 0) | queued[message_id]
+
+    async def flush(self):
+        """Resolve queued callbacks, then write counts as one `$inc` update per campaign."""
+        await self.resolve()
+        if not self._pending:
+            return
+        pending = list(self._pending.items())
+        self._pending = {}
+        for campaign_id, counts in pending:
+            try:
+                await CampaignDocument.find_one(
+                    CampaignDocument.id == PydanticObjectId(campaign_id)
+                ).update({"$inc": {f"stats.{key}": value for key, value in counts.items()}})
+            except Exception as e:
+                self.flush_errors += 1
+                logger.warning(f"Campaign stats flush failed for {campaign_id}, will retry: {e}")
+                self._pending.setdefault(campaign_id, Counter()).update(counts)
+
+    async def _run_flusher(self):
+        """Flush accumulated counts periodically."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        """Start the background flusher."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._run_flusher(), name="campaign-status-flush")
+
+    async def stop(self):
+        """Stop the flusher and write any remaining callbacks and counts."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    def stats(self) -> Dict:
+        """Get status tracking statistics."""
+        return {
+            "queued_callbacks": len(self._queued),
+            "pending_campaign_updates": len(self._pending),
+            "callbacks_matched": self.callbacks_matched,
+            "callbacks_unmatched": self.callbacks_unmatched,
+            "callbacks_dropped": self.callbacks_dropped,
+            "store_errors": self.store_errors,
+            "flush_errors": self.flush_errors,
+        }
+
+
+campaign_status_tracker = CampaignStatusTracker(
+    flush_interval=settings.CAMPAIGN_STATUS_FLUSH_INTERVAL,
+    max_queued=settings.CAMPAIGN_STATUS_MAX_QUEUED,
+)
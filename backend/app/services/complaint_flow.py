@@ -0,0 +1,439 @@
+"""
+Declarative complaint collection flow for CyberSathi WhatsApp
+
+The flow is written as a list of steps (field, prompt, validator, next field)
+and compiled once at import into a transition table keyed by ComplaintField.
+Compilation resolves validators to precompiled callables, resolves A1/A2
+branch conditions into a per-branch lookup and pre-renders every prompt and
+error message for each supported language, so handling a message is a
+handful of dict lookups with no string building.
+
+Steps can also offer options derived from earlier answers: after the PIN
+code, the post office and district questions offer that PIN's post offices
+and district as buttons. Options are suggestions - the user confirms one by
+choosing it and may type anything else - unless PIN_DIRECTORY_STRICT says
+the directory is complete, when other answers are rejected. They come from
+the memory-mapped PIN directory and are skipped when it is not available.
+
+The module has no dependency on the conversation handler and can be tested
+or benchmarked on its own.
+"""
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Container, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from app.config import settings
+from app.i18n import i18n
+from app.services.entity_extractor import EntitySpan
+from app.services.pin_directory import pin_directory
+from app.services.validation import validation_service
+
+
+class ComplaintField(str, Enum):
+    """Complaint collection fields - PS2.pdf compliant with all 13 mandatory reporter fields"""
+    FRAUD_TYPE = "fraud_type"
+    INCIDENT_DESCRIPTION = "incident_description"
+    INCIDENT_DATE = "incident_date"
+    INCIDENT_TIME = "incident_time"
+    AMOUNT_LOST = "amount_lost"
+    SUSPECT_INFO = "suspect_info"
+    SUSPECT_CONTACT = "suspect_contact"
+    VICTIM_NAME = "victim_name"
+    GUARDIAN_NAME = "guardian_name"
+    DOB = "dob"
+    VICTIM_PHONE = "victim_phone"
+    VICTIM_EMAIL = "victim_email"
+    GENDER = "gender"
+    VILLAGE = "village"
+    POST_OFFICE = "post_office"
+    POLICE_STATION = "police_station"
+    DISTRICT = "district"
+    PIN_CODE = "pin_code"
+    LOCATION = "location"
+    POLICE_REPORT_FILED = "police_report_filed"
+    ADDITIONAL_INFO = "additional_info"
+
+
+# Validators return (is_valid, value_to_store)
+Validator = Callable[[str], Tuple[bool, Optional[str]]]
+
+INCIDENT_DATE_REGEX = re.compile(r'^\d{1,2}[/-]\d{1,2}[/-]\d{4}$')
+
+
+def _accept(text: str) -> Tuple[bool, Optional[str]]:
+    """Accept any answer as typed"""
+    return True, text
+
+
+def _incident_date(text: str) -> Tuple[bool, Optional[str]]:
+    """DD/MM/YYYY or DD-MM-YYYY, stored as typed"""
+    return (True, text) if INCIDENT_DATE_REGEX.match(text.strip()) else (False, None)
+
+
+def _predicate(check: Callable[[str], bool]) -> Validator:
+    """Adapt a boolean check into a validator that stores the answer as typed"""
+    def validate(text: str) -> Tuple[bool, Optional[str]]:
+        return (True, text) if check(text) else (False, None)
+    return validate
+
+
+def _pin(text: str) -> Tuple[bool, Optional[str]]:
+    """6-digit PIN; in strict mode it must also be in the PIN directory"""
+    pin = text.strip()
+    if not validation_service.is_valid_pin(pin):
+        return False, None
+    if settings.PIN_DIRECTORY_STRICT and pin_directory is not None and pin not in pin_directory:
+        return False, None
+    return True, pin
+
+
+VALIDATORS: Dict[str, Validator] = {
+    "incident_date": _incident_date,
+    "dob": validation_service.is_valid_dob,  # normalizes to DD-MM-YYYY
+    "phone": _predicate(validation_service.is_valid_phone),
+    "email": _predicate(validation_service.is_valid_email),
+    "pin": _pin,
+}
+
+
+def _pin_offices(values: Mapping["ComplaintField", str]) -> List:
+    """Directory entries for the PIN already given"""
+    pin = values.get(ComplaintField.PIN_CODE)
+    return pin_directory.lookup(pin) if pin and pin_directory is not None else []
+
+
+def _post_office_options(values: Mapping["ComplaintField", str]) -> List[str]:
+    """Post offices of the PIN already given"""
+    return [office.office for office in _pin_offices(values)]
+
+
+def _district_options(values: Mapping["ComplaintField", str]) -> List[str]:
+    """District of the PIN already given, if the directory has only one"""
+    districts = {office.district for office in _pin_offices(values)}
+    return list(districts) if len(districts) == 1 else []
+
+
+# Options return the answers a step suggests given the fields answered so
+# far (empty = none); with PIN_DIRECTORY_STRICT they are the only answers
+OPTIONS: Dict[str, Callable[[Mapping["ComplaintField", str]], List[str]]] = {
+    "post_office": _post_office_options,
+    "district": _district_options,
+}
+MAX_OPTION_BUTTONS = 10  # WhatsApp list messages show at most 10 rows
+
+
+def _match_option(answer: str, options: Sequence[str]) -> Optional[str]:
+    """The option an answer names, ignoring case, spacing and dots"""
+    key = _option_key(answer)
+    return next((option for option in options if _option_key(option) == key), None)
+
+
+def _option_key(text: str) -> str:
+    return "".join(text.replace(".", " ").split()).casefold()
+
+# Next field: a single field, None to finish, or a mapping from fraud branch
+# (A1/A2) to next field with "*" as the fallback branch
+NextStep = Union[None, ComplaintField, Mapping[str, Optional[ComplaintField]]]
+
+
+@dataclass(frozen=True)
+class FlowStep:
+    """Declarative definition of one question in the flow"""
+    field: ComplaintField
+    prompt: str
+    next: NextStep = None
+    validator: Optional[str] = None
+    error: Optional[str] = None
+    buttons: Tuple[Tuple[str, str], ...] = ()
+    options: Optional[str] = None
+
+
+COMPLAINT_FLOW: Tuple[FlowStep, ...] = (
+    FlowStep(ComplaintField.INCIDENT_DESCRIPTION, "complaint_flow.ask_description",
+             next=ComplaintField.INCIDENT_DATE),
+    FlowStep(ComplaintField.INCIDENT_DATE, "complaint_flow.ask_incident_date",
+             next=ComplaintField.INCIDENT_TIME,
+             validator="incident_date", error="validation.invalid_date"),
+    # Social media cases (A2) rarely involve a transfer; skip the loss amount
+    FlowStep(ComplaintField.INCIDENT_TIME, "complaint_flow.ask_incident_time",
+             next={"A2": ComplaintField.SUSPECT_INFO, "*": ComplaintField.AMOUNT_LOST}),
+    FlowStep(ComplaintField.AMOUNT_LOST, "complaint_flow.ask_amount",
+             next=ComplaintField.SUSPECT_INFO),
+    FlowStep(ComplaintField.SUSPECT_INFO, "complaint_flow.ask_suspect_info",
+             next=ComplaintField.SUSPECT_CONTACT),
+    FlowStep(ComplaintField.SUSPECT_CONTACT, "complaint_flow.ask_suspect_contact",
+             next=ComplaintField.VICTIM_NAME),
+    FlowStep(ComplaintField.VICTIM_NAME, "complaint_flow.ask_name",
+             next=ComplaintField.GUARDIAN_NAME),
+    FlowStep(ComplaintField.GUARDIAN_NAME, "complaint_flow.ask_guardian",
+             next=ComplaintField.DOB),
+    FlowStep(ComplaintField.DOB, "complaint_flow.ask_dob",
+             next=ComplaintField.GENDER,
+             validator="dob", error="validation.invalid_dob"),
+    FlowStep(ComplaintField.GENDER, "complaint_flow.select_gender",
+             next=ComplaintField.VICTIM_PHONE,
+             buttons=(("male", "Male"), ("female", "Female"), ("other", "Other"),
+                      ("prefer_not_to_say", "Prefer not to say"))),
+    FlowStep(ComplaintField.VICTIM_PHONE, "complaint_flow.ask_phone",
+             next=ComplaintField.VICTIM_EMAIL,
+             validator="phone", error="validation.invalid_phone"),
+    FlowStep(ComplaintField.VICTIM_EMAIL, "complaint_flow.ask_email",
+             next=ComplaintField.PIN_CODE,
+             validator="email", error="validation.invalid_email"),
+    # The PIN comes first among the address fields so it can suggest the rest
+    FlowStep(ComplaintField.PIN_CODE, "complaint_flow.ask_pin",
+             next=ComplaintField.VILLAGE,
+             validator="pin", error="validation.invalid_pin"),
+    FlowStep(ComplaintField.VILLAGE, "complaint_flow.ask_village",
+             next=ComplaintField.POST_OFFICE),
+    FlowStep(ComplaintField.POST_OFFICE, "complaint_flow.ask_post_office",
+             next=ComplaintField.POLICE_STATION,
+             error="validation.invalid_post_office", options="post_office"),
+    FlowStep(ComplaintField.POLICE_STATION, "complaint_flow.ask_police_station",
+             next=ComplaintField.DISTRICT),
+    FlowStep(ComplaintField.DISTRICT, "complaint_flow.ask_district",
+             next=ComplaintField.LOCATION,
+             error="validation.invalid_district", options="district"),
+    FlowStep(ComplaintField.LOCATION, "complaint_flow.ask_location",
+             next=ComplaintField.POLICE_REPORT_FILED),
+    FlowStep(ComplaintField.POLICE_REPORT_FILED, "complaint_flow.ask_police_report",
+             next=ComplaintField.ADDITIONAL_INFO,
+             buttons=(("yes_police_report", "Yes, I have filed FIR"),
+                      ("no_police_report", "No, not yet"))),
+    FlowStep(ComplaintField.ADDITIONAL_INFO, "complaint_flow.ask_additional_info"),
+)
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """A flow step with its validator, transitions and texts resolved"""
+    field: ComplaintField
+    validate: Validator
+    next_by_branch: Mapping[str, Optional[ComplaintField]]
+    prompts: Mapping[str, Dict]
+    errors: Mapping[str, Dict]
+    options: Optional[Callable[[Mapping[ComplaintField, str]], List[str]]] = None
+
+    def next_field(self, branch: Optional[str]) -> Optional[ComplaintField]:
+        """Field to ask after this one for the given fraud branch"""
+        nexts = self.next_by_branch
+        return nexts[branch] if branch in nexts else nexts["*"]
+
+
+@dataclass(frozen=True)
+class StepResult:
+    """Outcome of answering the current step"""
+    valid: bool
+    value: Optional[str]
+    next_field: Optional[ComplaintField]
+    response: Optional[Dict]  # None when the flow is complete
+
+    @property
+    def completed(self) -> bool:
+        return self.valid and self.next_field is None
+
+
+class CompiledFlow:
+    """
+    Transition table built from a declarative flow definition.
+
+    Args:
+        steps: Ordered flow steps; the first one is asked first
+        languages: Languages to pre-render prompts for
+    """
+
+    def __init__(self, steps: Tuple[FlowStep, ...], languages: Tuple[str, ...]):
+        self.languages = tuple(languages)
+        self.default_language = self.languages[0]
+        self.first_field = steps[0].field
+        self.table: Dict[ComplaintField, CompiledStep] = {}
+
+        defined = {step.field for step in steps}
+        for step in steps:
+            if step.field in self.table:
+                raise ValueError(f"Duplicate flow step: {step.field.value}")
+            if step.validator is not None and step.validator not in VALIDATORS:
+                raise ValueError(f"Unknown validator '{step.validator}' for {step.field.value}")
+            if step.options is not None and step.options not in OPTIONS:
+                raise ValueError(f"Unknown options '{step.options}' for {step.field.value}")
+
+            next_by_branch = dict(step.next) if isinstance(step.next, Mapping) else {"*": step.next}
+            if "*" not in next_by_branch:
+                raise ValueError(f"Branching step {step.field.value} needs a '*' fallback")
+            for target in next_by_branch.values():
+                if target is not None and target not in defined:
+                    raise ValueError(f"{step.field.value} leads to undefined step {target.value}")
+
+            buttons = [{"id": button_id, "title": title} for button_id, title in step.buttons]
+            prompts = {}
+            errors = {}
+            for lang in self.languages:
+                prompt = {"text": i18n.get(step.prompt, lang)}
+                if buttons:
+                    prompt["buttons"] = buttons
+                prompts[lang] = prompt
+                if step.error:
+                    errors[lang] = {"text": i18n.get(step.error, lang)}
+
+            self.table[step.field] = CompiledStep(
+                field=step.field,
+                validate=VALIDATORS[step.validator] if step.validator else _accept,
+                next_by_branch=next_by_branch,
+                prompts=prompts,
+                errors=errors,
+                options=OPTIONS[step.options] if step.options else None,
+            )
+
+    def next_unanswered(self, complaint_field: Optional[ComplaintField], branch: Optional[str] = None,
+                        answered: Container[ComplaintField] = ()) -> Optional[ComplaintField]:
+        """
+        First field from `complaint_field` on that is not already answered.
+
+        Args:
+            complaint_field: Field the walk starts at (None for the end of the flow)
+            branch: Fraud branch (A1/A2) of the complaint
+            answered: Fields that already have a value (e.g. pre-filled)
+
+        Returns:
+            Field to ask, or None if every remaining field is answered
+        """
+        while complaint_field is not None and complaint_field in answered:
+            complaint_field = self.table[complaint_field].next_field(branch)
+        return complaint_field
+
+    def prompt(self, complaint_field: ComplaintField, language: str = "en",
+               values: Optional[Mapping[ComplaintField, str]] = None) -> Dict:
+        """
+        Pre-rendered question for a field.
+
+        Args:
+            complaint_field: Field to ask for
+            language: Language code; unknown languages use the default
+            values: Answers so far, for fields whose options depend on them
+
+        Returns:
+            Response dict with text and optional buttons
+        """
+        step = self.table[complaint_field]
+        prompt = step.prompts.get(language) or step.prompts[self.default_language]
+        if step.options is not None and values:
+            prompt = _with_options(prompt, step.options(values))
+        return prompt
+
+    def advance(self, complaint_field: ComplaintField, answer: str,
+                branch: Optional[str] = None, language: str = "en",
+                answered: Container[ComplaintField] = ()) -> Optional[StepResult]:
+        """
+        Validate an answer to the current field and resolve the next step.
+
+        Args:
+            complaint_field: Field currently being asked
+            answer: User's message text
+            branch: Fraud branch (A1/A2) of the complaint
+            language: Language code for the response
+            answered: Fields that already have a value; they are skipped.
+                Pass the field -> value mapping so answers can be checked
+                against earlier ones (e.g. post office against PIN)
+
+        Returns:
+            StepResult, or None if the field is not part of the flow
+        """
+        step = self.table.get(complaint_field)
+        if step is None:
+            return None
+
+        values = answered if isinstance(answered, Mapping) else {}
+        options = step.options(values) if step.options is not None else ()
+        valid, value = step.validate(answer)
+        if valid and options:
+            chosen = _match_option(value, options)
+            if chosen is not None:
+                value = chosen
+            elif settings.PIN_DIRECTORY_STRICT:
+                valid = False
+        if not valid:
+            errors = step.errors
+            return StepResult(False, None, complaint_field,
+                              _with_options(errors.get(language) or errors[self.default_language], options))
+
+        next_field = self.next_unanswered(step.next_field(branch), branch, answered)
+        if next_field is None:
+            return StepResult(True, value, None, None)
+        response = self.prompt(next_field, language, {**values, complaint_field: value})
+        return StepResult(True, value, next_field, response)
+
+
+def _with_options(response: Dict, options: Sequence[str]) -> Dict:
+    """A response with one button per option"""
+    if not options:
+        return response
+    buttons = [{"id": option, "title": option} for option in options[:MAX_OPTION_BUTTONS]]
+    return {**response, "buttons": buttons}
+
+
+MIN_DESCRIPTION_WORDS = 5  # shorter opening messages ("help", "i got scammed") are not a description
+
+# The nearest of these words before a phone number or VPA says whose it is
+SUSPECT_CUES = frozenset({
+    "to", "from", "by", "paid", "sent", "transferred", "scammer", "scammers", "fraudster",
+    "fraudsters", "fraud", "caller", "suspect", "accused", "cheater",
+})
+SELF_CUES = frozenset({"my", "me", "mine", "myself", "our", "us"})
+CUE_WINDOW_WORDS = 4
+WORD_REGEX = re.compile(r"[a-z]+")
+
+
+def _is_suspect_contact(text: str, span: EntitySpan) -> bool:
+    """Whether the words just before a contact attribute it to the suspect"""
+    words = WORD_REGEX.findall(text[max(0, span.start - 60):span.start].lower())[-CUE_WINDOW_WORDS:]
+    for word in reversed(words):
+        if word in SELF_CUES:
+            return False
+        if word in SUSPECT_CUES:
+            return True
+    return False
+
+
+def prefill_fields(text: str, spans: Sequence[EntitySpan]) -> Dict[ComplaintField, str]:
+    """
+    Complaint fields answered by a free-text message.
+
+    Only values whose meaning is unambiguous are taken; everything else is
+    still asked. The message itself becomes the incident description; a
+    date or amount fills its field only if it is the only one in the
+    message; and a phone number or UPI VPA becomes a suspect contact only
+    when the words before it say so ("paid to", "call from") rather than
+    pointing at the user ("my number"). Values use the formats the flow's
+    own questions store.
+
+    Args:
+        text: User's message text
+        spans: Entities extracted from the message
+
+    Returns:
+        Mapping of field to value for the fields found
+    """
+    fields: Dict[ComplaintField, str] = {}
+    if len(text.split()) >= MIN_DESCRIPTION_WORDS:
+        fields[ComplaintField.INCIDENT_DESCRIPTION] = text.strip()
+
+    dates = {span.value for span in spans if span.type == "date"}
+    if len(dates) == 1:
+        year, month, day = dates.pop().split("-")
+        fields[ComplaintField.INCIDENT_DATE] = f"{day}/{month}/{year}"
+    amounts = {span.value for span in spans if span.type == "amount"}
+    if len(amounts) == 1:
+        fields[ComplaintField.AMOUNT_LOST] = str(amounts.pop())
+
+    contacts = []
+    for span in spans:
+        if span.type in ("phone", "upi_vpa") and span.value not in contacts and _is_suspect_contact(text, span):
+            contacts.append(span.value)
+    if contacts:
+        fields[ComplaintField.SUSPECT_CONTACT] = ", ".join(contacts)
+    return fields
+
+
+complaint_flow = CompiledFlow(COMPLAINT_FLOW, tuple(i18n.supported_languages))
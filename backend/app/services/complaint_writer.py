@@ -0,0 +1,470 @@
+"""
+Write-behind persistence for WhatsApp-collected complaints
+
+Confirming a complaint on WhatsApp maps the conversation session onto the
+PS-2 complaint model and queues it here; the citizen gets their ticket
+immediately. A background worker inserts queued complaints in batches and
+retries with capped exponential backoff while MongoDB is unavailable, so a
+slow or briefly unreachable database never loses a complaint or delays the
+reply.
+
+Each complaint is appended (and fsynced) to the worker's own journal file
+before `submit` returns, so it survives a crash, not only a graceful stop.
+The journal is truncated whenever everything in it has been written. A
+worker holds an exclusive lock on its journal; at startup, journals whose
+lock is free belong to dead workers and are taken over. A complaint the
+database rejects (rather than failing to reach) is isolated by bisecting its
+batch and moved to a dead-letter file with the error, so it cannot block
+the queue.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from beanie import PydanticObjectId
+from beanie.exceptions import CollectionWasNotInitialized
+from pydantic import ValidationError
+from pymongo.errors import ConnectionFailure
+
+try:
+    import fcntl
+except ImportError:  # Windows development setups: journals are not locked
+    fcntl = None
+
+from app.config import settings
+from app.models.complaint import (
+    ComplaintStatus, FinancialFraudType, FraudCategory, Gender, IncidentDetails, IncidentType,
+    Location, ReporterInfo, SocialMediaFraudType, SocialMediaPlatform, StatusHistory,
+)
+from app.services.gazetteer import resolve_district
+
+logger = logging.getLogger(__name__)
+
+AMOUNT_RE = re.compile(r'\d+(?:\.\d+)?')
+
+# Errors meaning the database could not be reached; anything else is blamed on the records
+OUTAGE_ERRORS = (ConnectionFailure, CollectionWasNotInitialized)
+
+DEAD_LETTER_FILE = "dead_letters.jsonl"
+
+FRAUD_CATEGORY_BY_BRANCH = {
+    "A1": FraudCategory.FINANCIAL_FRAUD,
+    "A2": FraudCategory.SOCIAL_MEDIA_FRAUD,
+}
+
+# Fraud-type buttons offered by the complaint flow
+FINANCIAL_FRAUD_TYPES = {
+    "upi_fraud": FinancialFraudType.UPI_FRAUD,
+    "banking_fraud": FinancialFraudType.OTHERS,
+    "card_fraud": FinancialFraudType.DEBIT_CARD_FRAUD,
+    "investment_fraud": FinancialFraudType.INVESTMENT_TRADING_IPO,
+    "loan_fraud": FinancialFraudType.LOAN_APP_FRAUD,
+    "other_financial": FinancialFraudType.OTHERS,
+}
+SOCIAL_MEDIA_FRAUD_TYPES = {
+    "account_hacked": SocialMediaFraudType.HACKED_ACCOUNT,
+    "impersonation": SocialMediaFraudType.IMPERSONATION_ACCOUNT,
+    "obscene_content": SocialMediaFraudType.OBSCENE_CONTENT,
+}
+LEGACY_INCIDENT_TYPES = {
+    "upi_fraud": IncidentType.UPI_FRAUD,
+    "investment_fraud": IncidentType.INVESTMENT_FRAUD,
+    "account_hacked": IncidentType.SOCIAL_MEDIA_HACK,
+    "impersonation": IncidentType.IDENTITY_THEFT,
+}
+
+
+def _parse_date(value: Optional[str], time_value: Optional[str] = None) -> Optional[datetime]:
+    """Parse DD/MM/YYYY or DD-MM-YYYY, optionally with HH:MM."""
+    if not value:
+        return None
+    text = value.strip().replace('/', '-')
+    if time_value and re.match(r'^\d{1,2}:\d{2}$', time_value.strip()):
+        try:
+            return datetime.strptime(f"{text} {time_value.strip()}", "%d-%m-%Y %H:%M")
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(text, "%d-%m-%Y")
+    except ValueError:
+        return None
+
+
+def _parse_amount(value: Optional[str]) -> Optional[float]:
+    """Parse an amount such as '₹15,000' or '0'."""
+    if not value:
+        return None
+    match = AMOUNT_RE.search(value.replace(',', ''))
+    return float(match.group()) if match else None
+
+
+def _e164(phone: Optional[str]) -> Optional[str]:
+    """Format an Indian mobile number as E.164."""
+    if not phone:
+        return None
+    digits = re.sub(r'\D', '', phone)
+    if len(digits) == 10:
+        return f"+91{digits}"
+    if len(digits) == 12 and digits.startswith("91"):
+        return f"+{digits}"
+    return phone
+
+
+def _known(value: Optional[str]) -> Optional[str]:
+    """Drop placeholder answers like 'Unknown' or 'None'."""
+    if not value or value.strip().lower() in ("unknown", "none", "na", "n/a", "no", "-"):
+        return None
+    return value.strip()
+
+
+def session_to_complaint(session, user_id: str, ticket_id: str) -> Dict[str, Any]:
+    """
+    Map a confirmed complaint-flow session onto ComplaintDocument fields.
+
+    Structured PS-2 sections that fail validation are left out rather than
+    rejecting the complaint; the raw answers remain in the legacy fields.
+
+    Args:
+        session: ConversationSession in the confirmation stage
+        user_id: WhatsApp number the complaint came from
+        ticket_id: Ticket ID shown to the citizen
+
+    Returns:
+        Keyword arguments for ComplaintDocument
+    """
+    from app.services.whatsapp_conversation import ComplaintField
+
+    data = session.fields()
+    fraud_type = (data.get(ComplaintField.FRAUD_TYPE) or "").strip().lower()
+    category = FRAUD_CATEGORY_BY_BRANCH.get(session.fraud_branch, FraudCategory.OTHER)
+    platform = session.platform_intent if session.platform_intent in SocialMediaPlatform._value2member_map_ else None
+
+    description = data.get(ComplaintField.INCIDENT_DESCRIPTION) or ""
+    notes = [
+        f"{label}: {_known(data.get(field))}"
+        for label, field in (
+            ("Police report filed", ComplaintField.POLICE_REPORT_FILED),
+            ("Additional information", ComplaintField.ADDITIONAL_INFO),
+        )
+        if _known(data.get(field))
+    ]
+    full_description = "\n\n".join([description, *notes]) if notes else description
+    suspect = "; ".join(filter(None, (
+        _known(data.get(ComplaintField.SUSPECT_INFO)),
+        _known(data.get(ComplaintField.SUSPECT_CONTACT)),
+    ))) or None
+
+    incident_date = _parse_date(data.get(ComplaintField.INCIDENT_DATE), data.get(ComplaintField.INCIDENT_TIME))
+    amount = _parse_amount(data.get(ComplaintField.AMOUNT_LOST))
+    phone = _e164(data.get(ComplaintField.VICTIM_PHONE)) or _e164(user_id)
+    district = data.get(ComplaintField.DISTRICT)
+    canonical = resolve_district(district)
+    location = None
+    if district:
+        location = Location(district=district, state=canonical.state if canonical else None).model_dump()
+
+    reporter_info = None
+    try:
+        reporter_info = ReporterInfo(
+            name=data.get(ComplaintField.VICTIM_NAME),
+            guardian_name=data.get(ComplaintField.GUARDIAN_NAME),
+            date_of_birth=_parse_date(data.get(ComplaintField.DOB)),
+            phone=phone,
+            email=_known(data.get(ComplaintField.VICTIM_EMAIL)),
+            gender=Gender((data.get(ComplaintField.GENDER) or "").strip().lower().replace(" ", "_")),
+            village=data.get(ComplaintField.VILLAGE),
+            post_office=data.get(ComplaintField.POST_OFFICE),
+            police_station=data.get(ComplaintField.POLICE_STATION),
+            district=district,
+            pin_code=(data.get(ComplaintField.PIN_CODE) or "").strip(),
+        ).model_dump()
+    except (ValidationError, ValueError) as e:
+        logger.warning(f"Complaint {ticket_id}: reporter details incomplete, keeping raw fields ({e.__class__.__name__})")
+
+    incident_details = None
+    try:
+        incident_details = IncidentDetails(
+            description=full_description,
+            incident_date=incident_date,
+            amount_lost=amount,
+            suspect_info=suspect,
+        ).model_dump()
+    except ValidationError:
+        logger.warning(f"Complaint {ticket_id}: incident details incomplete, keeping raw fields")
+
+    now = datetime.utcnow()
+    return {
+        "reference_id": ticket_id,
+        "ps2_acknowledgement": ticket_id,
+        "reporter_info": reporter_info,
+        "name": data.get(ComplaintField.VICTIM_NAME),
+        "phone": phone,
+        "email": _known(data.get(ComplaintField.VICTIM_EMAIL)),
+        "fraud_category": category,
+        "financial_fraud_type": FINANCIAL_FRAUD_TYPES.get(fraud_type) if category == FraudCategory.FINANCIAL_FRAUD else None,
+        "social_media_platform": platform if category == FraudCategory.SOCIAL_MEDIA_FRAUD else None,
+        "social_media_fraud_type": SOCIAL_MEDIA_FRAUD_TYPES.get(fraud_type) if category == FraudCategory.SOCIAL_MEDIA_FRAUD else None,
+        "incident_details": incident_details,
+        "incident_type": LEGACY_INCIDENT_TYPES.get(fraud_type, IncidentType.OTHER),
+        "description": full_description,
+        "date_of_incident": incident_date,
+        "amount": amount,
+        "platform": platform,
+        "suspect_info": suspect,
+        "location": location,
+        "district_code": canonical.code if canonical else None,
+        "status": ComplaintStatus.REGISTERED,
+        "status_history": [StatusHistory(status=ComplaintStatus.REGISTERED, changed_by="whatsapp").model_dump()],
+        "source": "whatsapp",
+        "wa_phone_number": user_id,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+class ComplaintWriter:
+    """
+    Batched, retrying writer for confirmed complaints.
+
+    Inserts are idempotent across retries: before re-inserting a batch, the
+    reference IDs already stored by a partially successful attempt are
+    skipped. The same check makes replaying a journal safe.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_backoff: float = 30.0,
+        journal_dir: Optional[str] = None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+        self.journal_dir = Path(journal_dir) if journal_dir else None
+        self._journal = None
+        self._pending: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.queued = 0
+        self.written = 0
+        self.retries = 0
+        self.dead_lettered = 0
+
+    def _open_journal(self):
+        """Create this worker's journal, locked for as long as the worker lives."""
+        if self.journal_dir is None or self._journal is not None:
+            return
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        journal = open(self.journal_dir / f"complaints-{uuid.uuid4().hex}.jsonl", "a+", encoding="utf-8")
+        if fcntl is not None:
+            fcntl.flock(journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._journal = journal
+
+    def _append(self, records: List[Dict[str, Any]]):
+        """Durably append records to the journal."""
+        if self._journal is None:
+            return
+        self._journal.write("".join(json.dumps(record, default=str) + "\n" for record in records))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _truncate_journal(self):
+        """Empty the journal once every record in it is in the database."""
+        if self._journal is None or self._pending or not self._journal.tell():
+            return
+        self._journal.seek(0)
+        self._journal.truncate()
+        os.fsync(self._journal.fileno())
+
+    def submit(self, record: Dict[str, Any]):
+        """
+        Queue a complaint for writing, after journaling it.
+
+        Args:
+            record: Output of `session_to_complaint`
+
+        Raises:
+            OSError: If the complaint could not be journaled (it is not queued)
+        """
+        self._open_journal()
+        self._append([record])
+        self._pending.append(record)
+        self.queued += 1
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]):
+        """Insert a batch, skipping complaints already stored by an earlier attempt."""
+        from app.models.analytics import AnalyticsEventDocument, EventType
+        from app.models.complaint import ComplaintDocument
+
+        existing = {
+            doc.reference_id for doc in await ComplaintDocument.find(
+                {"reference_id": {"$in": [record["reference_id"] for record in batch]}}
+            ).to_list()
+        }
+        documents = [
+            ComplaintDocument(id=PydanticObjectId(), **record)
+            for record in batch if record["reference_id"] not in existing
+        ]
+        if documents:
+            for document in documents:
+                document.protect_fields()  # insert_many does not run document hooks
+            await ComplaintDocument.insert_many(documents)
+            try:
+                await AnalyticsEventDocument.insert_many([
+                    AnalyticsEventDocument(
+                        event_type=EventType.COMPLAINT_REGISTERED,
+                        complaint_id=str(document.id),
+                        language=document.language,
+                        district=document.location.district if document.location else None,
+                        incident_type=document.incident_type.value if document.incident_type else None,
+                        source="whatsapp",
+                        value=document.amount,
+                    )
+                    for document in documents
+                ])
+            except Exception as e:
+                logger.warning(f"Could not record analytics for written complaints: {e}")
+        self.written += len(batch)
+        logger.info(f"Persisted {len(documents)} WhatsApp complaint(s)")
+
+    async def _write_isolating(self, batch: List[Dict[str, Any]]):
+        """
+        Write a batch, bisecting it on record errors and dead-lettering bad records.
+
+        Raises:
+            OUTAGE_ERRORS: If the database is unreachable (the batch stays queued)
+        """
+        try:
+            await self._write_batch(batch)
+        except OUTAGE_ERRORS:
+            raise
+        except Exception as e:
+            if len(batch) == 1:
+                self._dead_letter(batch[0], e)
+                return
+            middle = len(batch) // 2
+            await self._write_isolating(batch[:middle])
+            await self._write_isolating(batch[middle:])
+
+    def _dead_letter(self, record: Dict[str, Any], error: Exception):
+        """Park a complaint the database rejects, with the reason."""
+        self.dead_lettered += 1
+        logger.error(f"Complaint {record.get('reference_id')} rejected, dead-lettered: {error!r}")
+        if self.journal_dir is None:
+            return
+        entry = {"failed_at": datetime.utcnow().isoformat(), "error": repr(error), "record": record}
+        with open(self.journal_dir / DEAD_LETTER_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def flush(self) -> bool:
+        """
+        Write everything queued so far, one batch at a time.
+
+        Returns:
+            True if the queue was drained, False if the database was unreachable
+        """
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            try:
+                await self._write_isolating(batch)
+            except OUTAGE_ERRORS as e:
+                logger.warning(f"Complaint batch write failed, will retry: {e}")
+                return False
+            del self._pending[:len(batch)]
+        self._truncate_journal()
+        return True
+
+    async def _run(self):
+        """Flush periodically, backing off while writes fail."""
+        backoff = self.flush_interval
+        while True:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            if await self.flush():
+                backoff = self.flush_interval
+            else:
+                self.retries += 1
+                backoff = min(self.max_backoff, backoff * 2)
+
+    def _recover_journals(self):
+        """Take over the journals of workers that are no longer running."""
+        if self.journal_dir is None or not self.journal_dir.is_dir():
+            return
+        self._open_journal()
+        for path in sorted(self.journal_dir.glob("complaints-*.jsonl")):
+            if path.name == Path(self._journal.name).name:
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue  # a live worker's journal
+                records = []
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping torn line in complaint journal {path.name}")
+                if records:
+                    self._append(records)
+                    self._pending.extend(records)
+                    logger.info(f"Re-queued {len(records)} complaint(s) from journal {path.name}")
+                path.unlink()
+
+    async def start(self):
+        """Start the background writer."""
+        if self._task is None:
+            self._recover_journals()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="complaint-writer")
+
+    async def stop(self):
+        """Stop the writer after a last attempt; unwritten complaints stay in the journal."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+        if self._pending:
+            logger.warning(f"{len(self._pending)} unwritten complaint(s) kept in the journal for the next start")
+        if self._journal is not None:
+            empty = not self._journal.tell()
+            self._journal.close()
+            if empty:
+                Path(self._journal.name).unlink(missing_ok=True)
+            self._journal = None
+
+    def stats(self) -> Dict:
+        """Get writer statistics."""
+        return {
+            "queued": self.queued,
+            "written": self.written,
+            "pending": len(self._pending),
+            "retries": self.retries,
+            "dead_lettered": self.dead_lettered,
+        }
+
+
+complaint_writer = ComplaintWriter(
+    batch_size=settings.COMPLAINT_WRITE_BATCH_SIZE,
+    flush_interval=settings.COMPLAINT_WRITE_FLUSH_SECONDS,
+    max_backoff=settings.COMPLAINT_WRITE_MAX_BACKOFF_SECONDS,
+    journal_dir=settings.COMPLAINT_JOURNAL_DIR or str(Path(__file__).resolve().parents[2] / "data" / "complaint_journal"),
+)
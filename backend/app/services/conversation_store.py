@@ -0,0 +1,489 @@
+"""
+Conversation session storage for CyberSathi chatbot flows
+
+Sessions live in a local LRU cache with an idle TTL. With the default
+in-memory backend that cache is the store; with a shared backend (MongoDB
+TTL collection or Redis) it acts as a read cache for hot sessions and the
+shared copy lets any worker or host continue a user's conversation.
+
+Handlers read and mutate sessions synchronously. Each chatbot turn starts
+with `await store.load(user_id)` to refresh the cached copy, and changes are
+marked dirty and written to the backend in debounced batches, so the several
+field updates of one turn cost a single write. Sessions are serialized with
+msgpack when it is installed, falling back to JSON.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+    logger.warning("msgpack not installed, conversation sessions will be serialized as JSON")
+
+
+def _plain(value: Any) -> Any:
+    """Reduce enums and other non-native values to serializable ones."""
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def pack_payload(value: Any) -> bytes:
+    """Serialize a value with msgpack, or JSON if msgpack is unavailable."""
+    if msgpack is not None:
+        return msgpack.packb(value, default=_plain, use_bin_type=True)
+    return json.dumps(value, default=_plain, separators=(",", ":")).encode()
+
+
+def unpack_payload(payload: bytes) -> Any:
+    """Deserialize a value written by `pack_payload`."""
+    if msgpack is not None:
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
+
+
+def encode_state(state: Dict) -> bytes:
+    """Serialize a dict session for the shared backend."""
+    return pack_payload(state)
+
+
+def decode_state(payload: bytes) -> Dict:
+    """Deserialize a dict session read from the shared backend."""
+    return unpack_payload(payload)
+
+
+def deep_sizeof(value: Any, seen: Optional[set] = None) -> int:
+    """
+    Approximate memory held by a session object.
+
+    Follows dicts, sequences and `__slots__` attributes. Enum members and
+    other shared singletons are not charged to the session.
+
+    Args:
+        value: Object to measure
+        seen: IDs already counted
+
+    Returns:
+        Size in bytes
+    """
+    if value is None or isinstance(value, (bool, Enum)):
+        return 0
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in value)
+    else:
+        for slot in getattr(type(value), "__slots__", ()):
+            size += deep_sizeof(getattr(value, slot, None), seen)
+    return size
+
+
+class MongoConversationBackend:
+    """Shared session backend using a TTL collection keyed by session key."""
+
+    name = "mongo"
+
+    async def load(self, key: str) -> Optional[bytes]:
+        """
+        Read one serialized session.
+
+        Args:
+            key: Session key
+
+        Returns:
+            Serialized session, or None if absent or expired
+        """
+        from app.models.conversation_session import ConversationSessionDocument
+
+        document = await ConversationSessionDocument.find_one(ConversationSessionDocument.key == key)
+        return document.payload if document else None
+
+    async def save_many(self, payloads: Dict[str, bytes]):
+        """
+        Upsert serialized sessions, refreshing their idle TTL.
+
+        Args:
+            payloads: Serialized sessions by key
+        """
+        from app.models.conversation_session import ConversationSessionDocument
+
+        now = datetime.utcnow()
+        await asyncio.gather(*(
+            ConversationSessionDocument.find_one(ConversationSessionDocument.key == key).update(
+                {"$set": {"payload": payload, "updated_at": now}}, upsert=True
+            )
+            for key, payload in payloads.items()
+        ))
+
+    async def delete_many(self, keys: List[str]):
+        """
+        Delete sessions.
+
+        Args:
+            keys: Session keys
+        """
+        from app.models.conversation_session import ConversationSessionDocument
+
+        await ConversationSessionDocument.find({"key": {"$in": keys}}).delete()
+
+
+class RedisConversationBackend:
+    """Shared session backend using Redis keys with expiry."""
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"cybersathi:conv:{key}"
+
+    async def load(self, key: str) -> Optional[bytes]:
+        """
+        Read one serialized session.
+
+        Args:
+            key: Session key
+
+        Returns:
+            Serialized session, or None if absent or expired
+        """
+        return await self.client.get(self._redis_key(key))
+
+    async def save_many(self, payloads: Dict[str, bytes]):
+        """
+        Write serialized sessions in one pipeline, refreshing their idle TTL.
+
+        Args:
+            payloads: Serialized sessions by key
+        """
+        pipeline = self.client.pipeline(transaction=False)
+        for key, payload in payloads.items():
+            pipeline.set(self._redis_key(key), payload, ex=self.ttl_seconds)
+        await pipeline.execute()
+
+    async def delete_many(self, keys: List[str]):
+        """
+        Delete sessions.
+
+        Args:
+            keys: Session keys
+        """
+        await self.client.delete(*(self._redis_key(key) for key in keys))
+
+
+class ConversationStore:
+    """
+    Session store with a local LRU/idle-TTL cache and optional shared backend.
+
+    Cache entries are kept in access order, so idle entries are always at
+    the front and expiry and LRU eviction are both O(1) per entry.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        backend=None,
+        max_entries: int = 100_000,
+        idle_ttl_seconds: float = 86400,
+        refresh_seconds: float = 2.0,
+        debounce_seconds: float = 0.2,
+        encode: Callable[[Any], bytes] = encode_state,
+        decode: Callable[[bytes], Any] = decode_state,
+    ):
+        self.namespace = namespace
+        self.backend = backend
+        self.max_entries = max_entries
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.refresh_seconds = refresh_seconds
+        self.debounce_seconds = debounce_seconds
+        self.encode = encode
+        self.decode = decode
+        # user_id -> [state, last_access, loaded_at]
+        self._cache: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._dirty: Dict[str, Dict] = {}
+        self._deleted: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.evictions_idle = 0
+        self.evictions_capacity = 0
+        self.cache_hits = 0
+        self.backend_reads = 0
+        self.backend_writes = 0
+        self.backend_errors = 0
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.namespace}:{user_id}"
+
+    def _purge_idle(self, now: float):
+        """Drop sessions idle longer than the TTL."""
+        cache = self._cache
+        cutoff = now - self.idle_ttl_seconds
+        while cache:
+            entry = next(iter(cache.values()))
+            if entry[1] > cutoff:
+                break
+            cache.popitem(last=False)
+            self.evictions_idle += 1
+
+    def _cache_put(self, user_id: str, state: Dict, now: float, loaded_at: float):
+        """Insert or replace a cache entry, evicting the LRU entry if full."""
+        self._cache[user_id] = [state, now, loaded_at]
+        self._cache.move_to_end(user_id)
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.evictions_capacity += 1
+
+    async def load(self, user_id: str) -> Optional[Dict]:
+        """
+        Make a user's session available to the synchronous accessors.
+
+        Reads through to the shared backend unless the cached copy is
+        fresh or has unwritten changes. Backend errors keep the cached copy.
+
+        Args:
+            user_id: WhatsApp user identifier
+
+        Returns:
+            Session state, or None if the user has no session
+        """
+        now = time.monotonic()
+        self._purge_idle(now)
+        entry = self._cache.get(user_id)
+        if self.backend is None or user_id in self._dirty or (
+            entry is not None and now - entry[2] < self.refresh_seconds
+        ):
+            return self.get(user_id)
+
+        self.backend_reads += 1
+        try:
+            payload = await self.backend.load(self._key(user_id))
+        except Exception as e:
+            self.backend_errors += 1
+            logger.warning(f"Conversation store read failed, using cached session: {e}")
+            return self.get(user_id)
+
+        if user_id in self._dirty:  # changed locally while the read was in flight
+            return self.get(user_id)
+        if payload is None:
+            self._cache.pop(user_id, None)
+            return None
+        try:
+            state = self.decode(payload)
+        except ValueError as e:
+            # Written by an incompatible release; start the user afresh
+            self.backend_errors += 1
+            logger.warning(f"Discarding unreadable conversation session: {e}")
+            self._cache.pop(user_id, None)
+            return None
+        self._cache_put(user_id, state, now, now)
+        return state
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        """
+        Get a cached session.
+
+        Args:
+            user_id: WhatsApp user identifier
+
+        Returns:
+            Session state (mutable; call `put` after changing it), or None
+        """
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now - entry[1] > self.idle_ttl_seconds:
+            del self._cache[user_id]
+            self.evictions_idle += 1
+            return None
+        entry[1] = now
+        self._cache.move_to_end(user_id)
+        self.cache_hits += 1
+        return entry[0]
+
+    def put(self, user_id: str, state: Dict):
+        """
+        Store a session and schedule it for writing.
+
+        Args:
+            user_id: WhatsApp user identifier
+            state: Session state
+        """
+        now = time.monotonic()
+        entry = self._cache.get(user_id)
+        self._cache_put(user_id, state, now, entry[2] if entry else now)
+        if self.backend is not None:
+            self._deleted.discard(user_id)
+            self._dirty[user_id] = state
+            self._schedule_flush()
+
+    def delete(self, user_id: str):
+        """
+        Remove a session.
+
+        Args:
+            user_id: WhatsApp user identifier
+        """
+        self._cache.pop(user_id, None)
+        if self.backend is not None:
+            self._dirty.pop(user_id, None)
+            self._deleted.add(user_id)
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Start the debounced writer if it is not already pending."""
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+            except RuntimeError:
+                pass  # No running loop; changes are written on the next flush()
+
+    async def _flush_later(self):
+        """Wait out the debounce window, then write pending changes."""
+        await asyncio.sleep(self.debounce_seconds)
+        await self.flush()
+
+    async def flush(self):
+        """Write all pending session changes to the shared backend."""
+        if self.backend is None or not (self._dirty or self._deleted):
+            return
+        dirty, self._dirty = self._dirty, {}
+        deleted, self._deleted = self._deleted, set()
+        try:
+            if dirty:
+                await self.backend.save_many({self._key(u): self.encode(s) for u, s in dirty.items()})
+                self.backend_writes += len(dirty)
+            if deleted:
+                await self.backend.delete_many([self._key(u) for u in deleted])
+                self.backend_writes += len(deleted)
+        except Exception as e:
+            self.backend_errors += 1
+            logger.warning(f"Conversation store write failed, will retry: {e}")
+            for user_id, state in dirty.items():
+                if user_id not in self._deleted:
+                    self._dirty.setdefault(user_id, state)
+            self._deleted |= {u for u in deleted if u not in self._dirty}
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None  # This writer is finishing; schedule a fresh one
+            self._schedule_flush()
+
+    async def close(self):
+        """Write pending changes and stop the debounced writer."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        self._flush_task = None
+        await self.flush()
+
+    def stats(self) -> Dict:
+        """Get session store statistics."""
+        return {
+            "namespace": self.namespace,
+            "backend": self.backend.name if self.backend else "memory",
+            "cached_sessions": len(self._cache),
+            "max_entries": self.max_entries,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "evictions_idle": self.evictions_idle,
+            "evictions_capacity": self.evictions_capacity,
+            "cache_hits": self.cache_hits,
+            "backend_reads": self.backend_reads,
+            "backend_writes": self.backend_writes,
+            "pending_writes": len(self._dirty) + len(self._deleted),
+            "backend_errors": self.backend_errors,
+        }
+
+    def memory_stats(self, sample_size: int = 200) -> Dict:
+        """
+        Estimate memory used by cached sessions from a random sample.
+
+        Args:
+            sample_size: Number of sessions to measure
+
+        Returns:
+            Session count, per-session in-memory and serialized sizes, and
+            eviction statistics
+        """
+        entries = list(self._cache.items())
+        sample = random.sample(entries, min(sample_size, len(entries)))
+        in_memory = [
+            deep_sizeof(user_id) + deep_sizeof(entry) for user_id, entry in sample
+        ]
+        serialized = [len(self.encode(entry[0])) for _, entry in sample]
+        bytes_per_session = sum(in_memory) / len(in_memory) if in_memory else 0
+        return {
+            "sessions": len(entries),
+            "sampled": len(sample),
+            "bytes_per_session": round(bytes_per_session),
+            "serialized_bytes_per_session": round(sum(serialized) / len(serialized)) if serialized else 0,
+            "estimated_total_bytes": round(bytes_per_session * len(entries)),
+            "serializer": "msgpack" if msgpack is not None else "json",
+            "evictions_idle": self.evictions_idle,
+            "evictions_capacity": self.evictions_capacity,
+            "max_entries": self.max_entries,
+        }
+
+
+def _create_backend():
+    """Create the configured shared backend, if any."""
+    backend = settings.CONVERSATION_STORE_BACKEND.lower()
+    if backend == "mongo":
+        return MongoConversationBackend()
+    if backend == "redis":
+        try:
+            return RedisConversationBackend(settings.REDIS_URL, settings.CONVERSATION_IDLE_TTL_SECONDS)
+        except ImportError:
+            logger.warning("redis package not installed, keeping conversations in memory only")
+    return None
+
+
+def create_conversation_store(
+    namespace: str,
+    encode: Callable[[Any], bytes] = encode_state,
+    decode: Callable[[bytes], Any] = decode_state,
+) -> ConversationStore:
+    """
+    Create a session store configured from settings.
+
+    Args:
+        namespace: Key prefix separating the sessions of different flows
+        encode: Session serializer
+        decode: Session deserializer
+
+    Returns:
+        Configured ConversationStore
+    """
+    return ConversationStore(
+        namespace,
+        backend=_create_backend(),
+        max_entries=settings.CONVERSATION_CACHE_MAX_ENTRIES,
+        idle_ttl_seconds=settings.CONVERSATION_IDLE_TTL_SECONDS,
+        refresh_seconds=settings.CONVERSATION_CACHE_REFRESH_SECONDS,
+        debounce_seconds=settings.CONVERSATION_WRITE_DEBOUNCE_SECONDS,
+        encode=encode,
+        decode=decode,
+    )
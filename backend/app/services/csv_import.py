@@ -0,0 +1,187 @@
+"""
+Streaming CSV import of complaints
+
+Rows are read with `csv.reader` in fixed-size batches and transposed into
+columns, so each batch is validated by `batch_validator` in a few vectorized
+passes rather than one call per cell. Valid rows become ComplaintDocument
+keyword arguments in the same shape as `session_to_complaint`; invalid rows
+are reported as (row number, RowError code) pairs and never raise. Only the
+current batch is held in memory.
+
+Expected header (case-insensitive, any order, extra columns ignored):
+    name, guardian_name, dob, phone, gender, village, post_office,
+    police_station, district, pin_code, description
+    optional: email, incident_date, amount, suspect_info, fraud_category
+"""
+
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from math import isnan
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from app.models.complaint import ComplaintStatus, FraudCategory, Gender, IncidentType, Location, StatusHistory
+from app.services.batch_validation import batch_validator
+from app.services.gazetteer import resolve_district
+from app.services.ticket_service import TicketService
+
+REQUIRED_COLUMNS = (
+    "name", "guardian_name", "dob", "phone", "gender", "village", "post_office",
+    "police_station", "district", "pin_code", "description",
+)
+OPTIONAL_COLUMNS = ("email", "incident_date", "amount", "suspect_info", "fraud_category")
+# Free-text columns with no format check, only a non-blank one
+TEXT_COLUMNS = ("guardian_name", "village", "post_office", "police_station", "district")
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+@dataclass
+class ImportBatch:
+    """One validated batch of CSV rows"""
+    first_row: int  # CSV row number of the batch's first record (the header is row 1)
+    accepted: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)  # (row number, ComplaintDocument kwargs)
+    rejected: List[Tuple[int, int]] = field(default_factory=list)  # (row number, RowError code)
+
+
+def read_batches(stream: TextIO, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Tuple[int, Dict[str, List[str]]]]:
+    """
+    Read a complaints CSV as batches of columns.
+
+    Args:
+        stream: Open text stream positioned at the header
+        batch_size: Records per batch
+
+    Returns:
+        Iterator of (first row number, column name -> values)
+
+    Raises:
+        ValueError: If the header lacks a required column
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip().lower() for name in header]
+    missing = [name for name in REQUIRED_COLUMNS if name not in header]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    wanted = [(index, name) for index, name in enumerate(header) if name in REQUIRED_COLUMNS + OPTIONAL_COLUMNS]
+    width = len(header)
+    padding = [""] * width
+    first_row = 2
+    while True:
+        records = list(islice(reader, batch_size))
+        if not records:
+            return
+        # Short or ragged rows are padded so the transpose keeps every row
+        records = [record if len(record) == width else (record + padding)[:width] for record in records]
+        transposed = list(zip(*records))
+        columns = {name: list(transposed[index]) for index, name in wanted}
+        for name in OPTIONAL_COLUMNS:
+            columns.setdefault(name, [""] * len(records))
+        yield first_row, columns
+        first_row += len(records)
+
+
+def row_to_complaint(row: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
+    """
+    Map a validated, normalized CSV row onto ComplaintDocument fields.
+
+    Args:
+        row: One row from `BatchResult.accepted_rows`
+        ticket_id: Ticket ID for the complaint
+
+    Returns:
+        Keyword arguments for ComplaintDocument
+    """
+    amount = row.get("amount")
+    if amount is not None and isnan(amount):
+        amount = None
+    category = FraudCategory._value2member_map_.get(row.get("fraud_category", "").lower(), FraudCategory.OTHER)
+    email = row.get("email") or None
+    suspect = row.get("suspect_info") or None
+    district = resolve_district(row["district"])
+
+    now = datetime.utcnow()
+    return {
+        "reference_id": ticket_id,
+        "ps2_acknowledgement": ticket_id,
+        "reporter_info": {
+            "name": row["name"],
+            "guardian_name": row["guardian_name"],
+            "date_of_birth": row["dob"],
+            "phone": row["phone"],
+            "email": email,
+            "gender": Gender(row["gender"]),
+            "village": row["village"],
+            "post_office": row["post_office"],
+            "police_station": row["police_station"],
+            "district": row["district"],
+            "pin_code": row["pin_code"],
+        },
+        "name": row["name"],
+        "phone": row["phone"],
+        "email": email,
+        "fraud_category": category,
+        "incident_details": {
+            "description": row["description"],
+            "incident_date": row.get("incident_date"),
+            "amount_lost": amount,
+            "suspect_info": suspect,
+        },
+        "incident_type": IncidentType.OTHER,
+        "description": row["description"],
+        "date_of_incident": row.get("incident_date"),
+        "amount": amount,
+        "suspect_info": suspect,
+        "location": Location(district=row["district"], state=district.state if district else None).model_dump(),
+        "district_code": district.code if district else None,
+        "status": ComplaintStatus.REGISTERED,
+        "status_history": [StatusHistory(status=ComplaintStatus.REGISTERED, changed_by="csv_import").model_dump()],
+        "source": "csv_import",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def import_batches(
+    stream: TextIO,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    ticket_factory: Optional[Callable[[], str]] = None,
+) -> Iterator[ImportBatch]:
+    """
+    Validate a complaints CSV batch by batch.
+
+    Args:
+        stream: Open text stream positioned at the header
+        batch_size: Records per batch
+        ticket_factory: Callable returning a new ticket ID (default: a
+            TicketService.ticket_sequence for this import, so IDs never repeat)
+
+    Returns:
+        Iterator of ImportBatch
+
+    Raises:
+        ValueError: If the header lacks a required column
+    """
+    ticket_factory = ticket_factory or TicketService.ticket_sequence()
+    for first_row, columns in read_batches(stream, batch_size):
+        result = batch_validator.validate(
+            columns,
+            optional=("email", "incident_date", "amount"),
+            required=TEXT_COLUMNS,
+        )
+        codes = result.codes
+        batch = ImportBatch(
+            first_row=first_row,
+            rejected=[(first_row + index, int(codes[index])) for index in result.rejected()],
+        )
+        batch.accepted = [
+            (first_row + index, row_to_complaint(row, ticket_factory()))
+            for index, row in zip(result.accepted(), result.accepted_rows())
+        ]
+        yield batch
+
@@ -1,10 +1,20 @@
 import base64
 import hashlib
+import hmac
+import os
+import re
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Sequence
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2
-from cryptography.hazmat.backends import default_backend
-from app.config import settings
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from pydantic import AfterValidator, BeforeValidator, EmailStr
+from app.config import Settings, settings
+
+ENCRYPTED_PREFIX = "enc1:"
+NONCE_SIZE = 12
+BLIND_INDEX_CHARS = 32  # hex characters kept (128 bits)
 
 
 class EncryptionService:
@@ -53,3 +63,266 @@ class EncryptionService:
 
 
 encryption_service = EncryptionService()
+
+
+def derive_key(secret: str, purpose: bytes) -> bytes:
+    """
+    Derive an independent 256-bit key for one purpose from a configured secret.
+    
+    Args:
+        secret: Configured key material
+        purpose: Label separating keys derived from the same secret
+        
+    Returns:
+        32-byte key
+    """
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=purpose).derive(secret.encode())
+
+
+class FieldCipher:
+    """
+    Authenticated encryption (AES-256-GCM) of individual document fields.
+    
+    Ciphertexts are "enc1:" followed by base64 of nonce + ciphertext, so
+    encrypted and not-yet-encrypted values can coexist during a migration:
+    `encrypt` leaves ciphertexts alone and `decrypt` returns plaintext as is.
+    Encryption is randomized; use `BlindIndex` to query encrypted fields.
+    
+    Args:
+        key: 32-byte key
+    """
+    
+    def __init__(self, key: bytes):
+        self._aead = AESGCM(key)
+    
+    @staticmethod
+    def is_encrypted(value) -> bool:
+        return isinstance(value, str) and value.startswith(ENCRYPTED_PREFIX)
+    
+    def _seal(self, value: str, nonce: bytes) -> str:
+        sealed = nonce + self._aead.encrypt(nonce, value.encode("utf-8"), None)
+        return ENCRYPTED_PREFIX + base64.urlsafe_b64encode(sealed).decode("ascii")
+    
+    def encrypt(self, value: Optional[str]) -> Optional[str]:
+        """Encrypt a value (None, empty and already-encrypted values are returned unchanged)"""
+        if not value or self.is_encrypted(value):
+            return value
+        return self._seal(value, os.urandom(NONCE_SIZE))
+    
+    def decrypt(self, value: Optional[str]) -> Optional[str]:
+        """
+        Decrypt a value produced by `encrypt`.
+        
+        Args:
+            value: Ciphertext, or plaintext (returned unchanged)
+            
+        Returns:
+            Plaintext
+            
+        Raises:
+            ValueError: If the ciphertext is corrupt or was made with another key
+        """
+        if not self.is_encrypted(value):
+            return value
+        try:
+            sealed = base64.urlsafe_b64decode(value[len(ENCRYPTED_PREFIX):])
+            return self._aead.decrypt(sealed[:NONCE_SIZE], sealed[NONCE_SIZE:], None).decode("utf-8")
+        except (InvalidTag, ValueError) as e:
+            raise ValueError("Field decryption failed") from e
+    
+    def encrypt_many(self, values: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Encrypt a batch of values, drawing all nonces with one random read.
+        
+        Args:
+            values: Values to encrypt
+            
+        Returns:
+            Ciphertexts in input order
+        """
+        values = list(values)
+        pending = [i for i, value in enumerate(values) if value and not self.is_encrypted(value)]
+        nonces = os.urandom(NONCE_SIZE * len(pending))
+        result = list(values)
+        for n, i in enumerate(pending):
+            result[i] = self._seal(values[i], nonces[n * NONCE_SIZE:(n + 1) * NONCE_SIZE])
+        return result
+    
+    def decrypt_many(self, values: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Decrypt a batch of values, e.g. one field across a page of documents.
+        
+        Args:
+            values: Ciphertexts or plaintexts
+            
+        Returns:
+            Plaintexts in input order
+        """
+        decrypt = self.decrypt
+        return [decrypt(value) for value in values]
+
+
+class BlindIndex:
+    """
+    Deterministic keyed hashes (HMAC-SHA256) of normalized PII values.
+    
+    A blind index is stored next to an encrypted field and supports equality
+    lookups without decrypting: the same phone number, however it was typed,
+    always hashes to the same value, and without the key the hash reveals
+    nothing about the number. Each kind of value is hashed separately, so
+    the index of a phone never matches that of an account number.
+    
+    Args:
+        key: 32-byte HMAC key (never the encryption key)
+    """
+    
+    NON_DIGIT = re.compile(r"\D")
+    NON_ALNUM = re.compile(r"[^0-9A-Z]")
+    
+    def __init__(self, key: bytes):
+        self._key = key
+    
+    @classmethod
+    def normalize(cls, kind: str, value: str) -> str:
+        """
+        Canonical form of a value before hashing.
+        
+        Phones keep their last 10 digits (the national number, so +91, 91 and
+        0 prefixes match), accounts their letters and digits in upper case,
+        emails are case-folded.
+        """
+        if kind == "phone":
+            return cls.NON_DIGIT.sub("", value)[-10:]
+        if kind == "account":
+            return cls.NON_ALNUM.sub("", value.upper())
+        if kind == "email":
+            return value.strip().casefold()
+        raise ValueError(f"Unknown blind index kind '{kind}'")
+    
+    def compute(self, kind: str, value: Optional[str]) -> Optional[str]:
+        """
+        Blind index of a value.
+        
+        Args:
+            kind: "phone", "account" or "email"
+            value: Plaintext value
+            
+        Returns:
+            Hex digest, or None for an empty value
+        """
+        if not value:
+            return None
+        normalized = self.normalize(kind, value)
+        if not normalized:
+            return None
+        message = kind.encode() + b"\x00" + normalized.encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).hexdigest()[:BLIND_INDEX_CHARS]
+    
+    def compute_many(self, kind: str, values: Iterable[Optional[str]]) -> List[str]:
+        """Distinct blind indexes of several values, in first-seen order"""
+        indexes = (self.compute(kind, value) for value in values)
+        return list(dict.fromkeys(index for index in indexes if index))
+
+
+DEFAULT_ENCRYPTION_KEY = Settings.model_fields["ENCRYPTION_KEY"].default
+
+
+def check_key_configuration(config=settings) -> None:
+    """
+    Refuse the public default ENCRYPTION_KEY where it would protect real data.
+    
+    The default key ships with the source, so field ciphertexts and blind
+    indexes derived from it (when BLIND_INDEX_KEY is empty) could be undone
+    or brute-forced by anyone who has read it.
+    
+    Args:
+        config: Settings to check
+        
+    Raises:
+        RuntimeError: In production, or with FIELD_ENCRYPTION_ENABLED, while the default key is in use
+    """
+    if config.ENCRYPTION_KEY != DEFAULT_ENCRYPTION_KEY:
+        return
+    if config.ENVIRONMENT.lower() == "production" or config.FIELD_ENCRYPTION_ENABLED:
+        raise RuntimeError(
+            "ENCRYPTION_KEY is still the default from the source code; set ENCRYPTION_KEY "
+            "(and BLIND_INDEX_KEY) before running in production or enabling field encryption"
+        )
+
+
+def protection_level() -> str:
+    """Level protect_fields hooks write records at now ("encrypted" or "indexed")"""
+    return "encrypted" if settings.FIELD_ENCRYPTION_ENABLED else "indexed"
+
+
+check_key_configuration()
+field_cipher = FieldCipher(derive_key(settings.ENCRYPTION_KEY, b"cybersathi field encryption"))
+blind_index = BlindIndex(derive_key(settings.BLIND_INDEX_KEY or settings.ENCRYPTION_KEY, b"cybersathi blind index"))
+
+
+def _parent(obj: Any, path: str):
+    """Object holding the last attribute of a dotted path, or None"""
+    *parents, leaf = path.split(".")
+    for name in parents:
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None, leaf
+    return obj, leaf
+
+
+def field_values(obj: Any, paths: Sequence[str]) -> List[Optional[str]]:
+    """Plaintext values at dotted attribute paths of a model"""
+    values = []
+    for path in paths:
+        parent, leaf = _parent(obj, path)
+        values.append(field_cipher.decrypt(getattr(parent, leaf, None)) if parent is not None else None)
+    return values
+
+
+def encrypt_fields(obj: Any, paths: Sequence[str]) -> None:
+    """Encrypt dotted attribute paths of a model in place (no validation runs)"""
+    for path in paths:
+        parent, leaf = _parent(obj, path)
+        if parent is not None and getattr(parent, leaf, None):
+            setattr(parent, leaf, field_cipher.encrypt(getattr(parent, leaf)))
+
+
+def decrypt_fields(obj: Any, paths: Sequence[str]) -> None:
+    """Decrypt dotted attribute paths of a model in place"""
+    for path in paths:
+        parent, leaf = _parent(obj, path)
+        if parent is not None and getattr(parent, leaf, None):
+            setattr(parent, leaf, field_cipher.decrypt(getattr(parent, leaf)))
+
+
+def decrypt_documents(documents: List[Dict], paths: Sequence[str]) -> List[Dict]:
+    """
+    Decrypt dotted key paths across a batch of raw documents in place.
+    
+    For bulk reads that bypass the models (aggregations, projections):
+    each path is decrypted column-wise over the whole batch.
+    
+    Args:
+        documents: Raw MongoDB documents
+        paths: Dotted key paths holding encrypted values
+        
+    Returns:
+        The same documents
+    """
+    for path in paths:
+        *parents, leaf = path.split(".")
+        holders = []
+        for document in documents:
+            for name in parents:
+                document = document.get(name) if isinstance(document, dict) else None
+            if isinstance(document, dict) and document.get(leaf):
+                holders.append(document)
+        for holder, value in zip(holders, field_cipher.decrypt_many(holder[leaf] for holder in holders)):
+            holder[leaf] = value
+    return documents
+
+
+# A string field that may be stored encrypted: model instances always hold the plaintext
+ProtectedStr = Annotated[str, AfterValidator(field_cipher.decrypt)]
+# An email field that may be stored encrypted: decrypted first, then validated as an address
+ProtectedEmail = Annotated[EmailStr, BeforeValidator(field_cipher.decrypt)]
@@ -0,0 +1,198 @@
+"""
+Entity extraction for CyberSathi messages
+
+All entity patterns are alternatives of one compiled regex, so a message is
+scanned once, left to right, and every entity is returned as a span with its
+offsets - a message with two UTRs or two phone numbers keeps both. The
+alternatives are grouped by what they start with (a digit, a word, "+91")
+behind lookaheads, so each position only tries the patterns that can start
+there; within a group they are tried in order, which settles overlaps such
+as a 12-digit UTR versus a 10-digit phone number. Emails and UPI VPAs are
+tried first, in a second compiled variant used only for text with an '@'.
+
+Values are normalized:
+    phone    E.164 string ("+919876543210")
+    amount   Decimal, with lakh/crore/k multipliers applied
+    date     ISO date string; day-first, two-digit years are 20xx, a missing
+             year is taken from the reference date
+    upi_vpa  lowercased VPA ("ravi@okaxis")
+    email    as typed
+    utr      digit string
+    ticket_id uppercased ticket ID
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+MONTH_NAME = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+MULTIPLIERS = {
+    "k": Decimal(1000), "thousand": Decimal(1000),
+    "lakh": Decimal(100000), "lakhs": Decimal(100000), "lac": Decimal(100000), "lacs": Decimal(100000),
+    "crore": Decimal(10000000), "crores": Decimal(10000000), "cr": Decimal(10000000),
+}
+MULTIPLIER = r"lakhs?|lacs?|crores?|cr|k|thousand"
+NUMBER = r"\d[\d,]*(?:\.\d+)?"
+
+CURRENCY = r"rupees?|rs\b\.?|inr\b|/-"
+
+# Entities starting with a digit
+DIGIT_PATTERNS = rf"""
+    (?P<date_dmy>(?<![\d.])(?P<d1>\d{{1,2}})[/.-](?P<m1>\d{{1,2}})[/.-](?P<y1>\d{{4}}|\d{{2}})(?![\d.]))
+  | (?P<date_iso>(?<!\w)(?P<y2>\d{{4}})-(?P<m2>\d{{1,2}})-(?P<d2>\d{{1,2}})\b)
+  | (?P<date_dm>(?<!\w)(?P<d3>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<mon3>{MONTH_NAME})\b\.?(?:,?\s*(?P<y3>\d{{4}})\b)?)
+  | (?P<phone>(?<![\w+])(?:91[\s-]|0)?[6-9]\d{{4}}[\s-]?\d{{5}}(?!\d))
+  | (?P<utr>(?<!\d)\d{{12,22}}(?!\d))
+  | (?P<amount_suffixed>(?<!\w)(?P<num2>{NUMBER})\s*(?:(?P<mult2>{MULTIPLIER})\b(?:\s*(?:{CURRENCY}))?|(?:{CURRENCY})))
+"""
+# Entities starting at a word boundary with a letter or the rupee sign
+WORD_PATTERNS = rf"""
+    (?P<ticket_id>(?:CS-\d{{8}}-\d{{6}}|NCRP-\d{{8}}(?:-\d{{6}})?)\b)
+  | (?P<date_md>(?P<mon4>{MONTH_NAME})\.?\s+(?P<d4>\d{{1,2}})(?:st|nd|rd|th)?\b(?:,?\s*(?P<y4>\d{{4}})\b)?)
+  | (?P<amount_prefixed>(?:₹|rs\b\.?|inr\b)\s*(?P<num1>{NUMBER})(?:\s*(?P<mult1>{MULTIPLIER})\b)?)
+"""
+# The lookaheads let each position try only the group that can start there
+ENTITY_PATTERNS = rf"""
+    (?=\d)(?:{DIGIT_PATTERNS})
+  | (?<!\w)(?=[a-z₹])(?:{WORD_PATTERNS})
+  | (?P<phone_intl>\+91[\s-]?[6-9]\d{{4}}[\s-]?\d{{5}}(?!\d))
+"""
+HANDLE_PATTERN = r"(?P<handle>(?<![\w.%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*) |"
+
+ENTITY_REGEX = re.compile(ENTITY_PATTERNS, re.IGNORECASE | re.VERBOSE)
+# Emails and VPAs are tried first, and only when the text has an '@'
+HANDLE_ENTITY_REGEX = re.compile(HANDLE_PATTERN + ENTITY_PATTERNS, re.IGNORECASE | re.VERBOSE)
+DIGIT_REGEX = re.compile(r"\d")
+
+EMAIL_DOMAIN = re.compile(r"\.[A-Za-z]{2,}$")
+VPA_HANDLE = re.compile(r"^[a-z][a-z0-9]{1,19}$")
+
+
+@dataclass(frozen=True)
+class EntitySpan:
+    """One extracted entity"""
+    type: str
+    start: int
+    end: int
+    text: str
+    value: Any
+
+
+def _e164(text: str) -> str:
+    """Indian mobile number as E.164"""
+    digits = re.sub(r"\D", "", text)
+    return f"+91{digits[-10:]}"
+
+
+def _amount(number: str, multiplier: Optional[str]) -> Optional[Decimal]:
+    """Decimal amount with an optional lakh/crore/k multiplier applied"""
+    try:
+        value = Decimal(number.replace(",", ""))
+    except InvalidOperation:
+        return None
+    if multiplier:
+        value *= MULTIPLIERS[multiplier.lower()]
+    if value == value.to_integral_value():
+        value = value.quantize(Decimal(1))
+    return value
+
+
+def _date(day: str, month: int, year: Optional[str], reference: date) -> Optional[str]:
+    """ISO date, or None if the parts do not form a real date"""
+    if year is None:
+        full_year = reference.year
+    else:
+        full_year = int(year) + 2000 if len(year) == 2 else int(year)
+    try:
+        return date(full_year, month, int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+class EntityExtractor:
+    """Single-pass multi-match entity extractor"""
+
+    def extract(self, text: str, reference: Optional[date] = None) -> List[EntitySpan]:
+        """
+        Extract every entity in a message.
+
+        Args:
+            text: User's message text
+            reference: Date used for dates written without a year (default today)
+
+        Returns:
+            Entity spans in order of appearance
+        """
+        if not text:
+            return []
+        if "@" in text:
+            regex = HANDLE_ENTITY_REGEX
+        elif DIGIT_REGEX.search(text):
+            regex = ENTITY_REGEX
+        else:
+            return []
+        reference = reference or date.today()
+        spans = []
+        for match in regex.finditer(text):
+            entity_type, value = self._normalize(match, reference)
+            if value is not None:
+                spans.append(EntitySpan(entity_type, match.start(), match.end(), match.group(), value))
+        return spans
+
+    def _normalize(self, match: re.Match, reference: date):
+        """Entity type and normalized value of a match (value None to drop it)"""
+        kind = match.lastgroup
+        groups = match.groupdict()
+        if kind == "handle":
+            domain = match.group().rpartition("@")[2]
+            if EMAIL_DOMAIN.search(domain):
+                return "email", match.group()
+            if VPA_HANDLE.match(domain.lower()):
+                return "upi_vpa", match.group().lower()
+            return "handle", None
+        if kind == "date_dmy":
+            return "date", _date(groups["d1"], int(groups["m1"]), groups["y1"], reference)
+        if kind == "date_iso":
+            return "date", _date(groups["d2"], int(groups["m2"]), groups["y2"], reference)
+        if kind == "date_dm":
+            return "date", _date(groups["d3"], MONTHS[groups["mon3"][:3].lower()], groups["y3"], reference)
+        if kind == "date_md":
+            return "date", _date(groups["d4"], MONTHS[groups["mon4"][:3].lower()], groups["y4"], reference)
+        if kind == "amount_prefixed":
+            return "amount", _amount(groups["num1"], groups["mult1"])
+        if kind == "amount_suffixed":
+            return "amount", _amount(groups["num2"], groups["mult2"])
+        if kind in ("phone", "phone_intl"):
+            return "phone", _e164(match.group())
+        if kind == "ticket_id":
+            return "ticket_id", match.group().upper()
+        return kind, match.group()
+
+    def group(self, spans: List[EntitySpan]) -> Dict[str, List[Any]]:
+        """
+        Normalized values by entity type, duplicates removed.
+
+        Args:
+            spans: Spans from `extract`
+
+        Returns:
+            Mapping of entity type to its distinct values in order
+        """
+        grouped: Dict[str, List[Any]] = {}
+        for span in spans:
+            values = grouped.setdefault(span.type, [])
+            if span.value not in values:
+                values.append(span.value)
+        return grouped
+
+
+entity_extractor = EntityExtractor()
@@ -0,0 +1,238 @@
+"""
+District gazetteer for CyberSathi
+
+Complaints carry the district as typed ("Khordha", "Khurda", "khorda dist",
+"Bhubaneswar, Odisha"). The gazetteer resolves such text to a canonical
+district with a small integer code, so analytics can group on the code
+instead of on every spelling.
+
+Canonical districts, their state and known aliases (other spellings, the
+Odia name, the headquarters town) live in app/data/districts.json. Codes
+are stable identifiers stored on complaints: never renumber them, append
+new districts with new codes.
+
+Resolution normalizes the text (casefold, drop words such as "dist" or
+"odisha", remove spaces and doubled letters) and tries, in order, an exact
+lookup of the whole text, of each comma-separated part and of each word,
+then a fuzzy match: candidates sharing character trigrams with the text are
+taken from an inverted index, ranked by trigram overlap, and the closest
+within a small edit distance wins. A fuzzy match must also start with the
+same letter and share most of its trigrams with the text, and none is tried
+when the text names a state the gazetteer does not cover, so another
+state's district ("Raipur", "Jaipur, Rajasthan") is left unresolved rather
+than bent onto a local one. Results are cached per input text, since
+district strings repeat heavily.
+"""
+
+import json
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from app.config import settings
+from app.services.spell_correction import edit_distance
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "data" / "districts.json"
+
+WORD_REGEX = re.compile(r"[^\W\d_]+")
+REPEATS_REGEX = re.compile(r"(.)\1+")
+NOISE_WORDS = frozenset({
+    "dist", "distt", "district", "dt", "zilla", "zila", "jilla", "jila", "sadar",
+    "odisha", "orissa", "india", "state", "city", "town", "po", "ps", "the", "of",
+})
+MAX_CANDIDATES = 8  # closest-by-trigram candidates checked with edit distance
+MIN_TRIGRAM_SIMILARITY = 0.55  # Dice coefficient of the trigram sets for a fuzzy match
+MAX_STATE_WORDS = 3  # longest state name, in words
+
+STATES = (
+    "Andaman and Nicobar Islands", "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar",
+    "Chandigarh", "Chhattisgarh", "Dadra and Nagar Haveli and Daman and Diu", "Delhi", "Goa",
+    "Gujarat", "Haryana", "Himachal Pradesh", "Jammu and Kashmir", "Jharkhand", "Karnataka",
+    "Kerala", "Ladakh", "Lakshadweep", "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya",
+    "Mizoram", "Nagaland", "Odisha", "Puducherry", "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu",
+    "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand", "West Bengal",
+)
+
+
+@dataclass(frozen=True)
+class District:
+    """A canonical district"""
+    code: int
+    name: str
+    state: str
+
+
+def normalize(text: str) -> str:
+    """Matching key: letters only, noise words dropped, no spaces or doubled letters"""
+    words = [word for word in WORD_REGEX.findall(text.casefold()) if word not in NOISE_WORDS]
+    return REPEATS_REGEX.sub(r"\1", "".join(words))
+
+
+def _trigrams(key: str) -> List[str]:
+    padded = f"^{key}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class Gazetteer:
+    """
+    Canonical districts with exact and fuzzy name resolution.
+
+    Args:
+        entries: Dicts with code, name, state and optional aliases
+        cache_size: Resolved texts kept in the LRU cache
+    """
+
+    def __init__(self, entries: Iterable[Dict], cache_size: int = 10_000):
+        self.districts: Dict[int, District] = {}
+        self._keys: Dict[str, District] = {}
+        for entry in entries:
+            district = District(int(entry["code"]), entry["name"], entry["state"])
+            if district.code in self.districts:
+                raise ValueError(f"Duplicate district code {district.code}")
+            self.districts[district.code] = district
+            for name in (district.name, *entry.get("aliases", ())):
+                key = normalize(name)
+                other = self._keys.setdefault(key, district)
+                if key and other is not district:
+                    logger.warning(f"Gazetteer alias '{name}' is ambiguous ({other.name}, {district.name})")
+
+        covered = {normalize(district.state) for district in self.districts.values()}
+        self._other_states = {normalize(state) for state in STATES} - covered - {""}
+
+        self._key_list = list(self._keys)
+        self._index: Dict[str, List[int]] = {}
+        for position, key in enumerate(self._key_list):
+            for gram in set(_trigrams(key)):
+                self._index.setdefault(gram, []).append(position)
+
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @classmethod
+    def load(cls, path=None) -> "Gazetteer":
+        """
+        Load a gazetteer from JSON.
+
+        Args:
+            path: Gazetteer file (defaults to the bundled one)
+
+        Returns:
+            Gazetteer
+        """
+        with open(path or DEFAULT_GAZETTEER_PATH, encoding="utf-8") as f:
+            return cls(json.load(f)["districts"])
+
+    def get(self, code: Optional[int]) -> Optional[District]:
+        """District for a code, if known"""
+        return self.districts.get(code)
+
+    def _resolve(self, text: Optional[str]) -> Optional[District]:
+        """
+        Canonical district named by free text.
+
+        Args:
+            text: District as typed
+
+        Returns:
+            District, or None if nothing matches closely enough
+        """
+        if not text:
+            return None
+        key = normalize(text)
+        if not key:
+            return None
+        parts = [normalize(part) for part in text.split(",")]
+        words = sorted({normalize(word) for word in WORD_REGEX.findall(text)}, key=len, reverse=True)
+        for candidate in (key, *parts, *words):
+            if candidate in self._keys:
+                return self._keys[candidate]
+        if self._names_other_state(text):
+            return None
+        for candidate in (key, *parts, *words):
+            district = self._fuzzy(candidate) if len(candidate) >= 4 else None
+            if district is not None:
+                return district
+        return None
+
+    def _names_other_state(self, text: str) -> bool:
+        """Whether the text names a state none of the districts belong to"""
+        words = [word for word in WORD_REGEX.findall(text.casefold()) if word != "and"]
+        for size in range(1, MAX_STATE_WORDS + 1):
+            for start in range(len(words) - size + 1):
+                if normalize("".join(words[start:start + size])) in self._other_states:
+                    return True
+        return False
+
+    def _fuzzy(self, key: str) -> Optional[District]:
+        """Closest alias by trigram overlap, then edit distance"""
+        grams = _trigrams(key)
+        overlap = Counter(position for gram in grams for position in self._index.get(gram, ()))
+        if not overlap:
+            return None
+        max_distance = 1 if len(key) <= 5 else 2
+        best, best_distance = None, max_distance + 1
+        for position, shared in overlap.most_common(MAX_CANDIDATES):
+            candidate = self._key_list[position]
+            if candidate[0] != key[0]:
+                continue
+            if 2 * shared / (len(grams) + len(candidate)) < MIN_TRIGRAM_SIMILARITY:
+                continue
+            distance = edit_distance(key, candidate, max_distance)
+            if distance < best_distance:
+                best, best_distance = self._keys[candidate], distance
+        return best
+
+    def stats(self) -> Dict:
+        """Size and cache effectiveness, for the admin stats endpoint"""
+        cache = self.resolve.cache_info()
+        lookups = cache.hits + cache.misses
+        return {
+            "districts": len(self.districts),
+            "names": len(self._keys),
+            "cache_entries": cache.currsize,
+            "hit_ratio": round(cache.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def load_gazetteer(path: Optional[str] = None) -> Optional[Gazetteer]:
+    """
+    Load the district gazetteer if its file is available.
+
+    Args:
+        path: Gazetteer path (defaults to the bundled one)
+
+    Returns:
+        Gazetteer, or None when it cannot be loaded
+    """
+    try:
+        return Gazetteer.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Could not load district gazetteer from {path or DEFAULT_GAZETTEER_PATH}: {e}")
+        return None
+
+
+gazetteer = load_gazetteer(settings.DISTRICT_GAZETTEER_PATH or None)
+
+
+def resolve_district(*texts: Optional[str]) -> Optional[District]:
+    """
+    First of several district fields that names a known district.
+
+    Args:
+        texts: District fields in order of preference
+
+    Returns:
+        District, or None
+    """
+    if gazetteer is None:
+        return None
+    for text in texts:
+        district = gazetteer.resolve(text)
+        if district is not None:
+            return district
+    return None
@@ -0,0 +1,233 @@
+"""
+Statistical intent scorer for CyberSathi NLU
+
+A linear (softmax regression) model over hashed character n-grams, used
+when the keyword/regex rules find no intent. Messages are stripped,
+lowercased, padded and cut into character 2-4-grams; each n-gram is hashed with a
+rolling polynomial hash computed over the whole code point array at once,
+so featurizing a batch is a few NumPy operations per n-gram size and
+scoring every intent for the batch is one matrix product.
+
+The model is a small `.npz` artifact (weights stored as float16) produced by
+scripts/train_intent_scorer.py. NumPy is optional: without it, or without an
+artifact, `load_intent_scorer` returns None and NLU stays rule-only.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parent.parent / "data" / "intent_scorer.npz"
+DEFAULT_CORPUS_PATH = Path(__file__).resolve().parent.parent / "data" / "intent_corpus.jsonl"
+
+HASH_MULTIPLIER = 1000003
+HASH_MASK = 0xFFFFFFFF
+
+
+class IntentScorer:
+    """
+    Hashed character n-gram softmax classifier.
+
+    Args:
+        weights: (n_features, n_labels) weight matrix
+        bias: (n_labels,) bias vector
+        labels: Intent value for each output column
+        ngram_sizes: Character n-gram lengths used as features
+    """
+
+    def __init__(self, weights, bias, labels: Sequence[str], ngram_sizes: Sequence[int] = (2, 3, 4)):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.labels = tuple(labels)
+        self.ngram_sizes = tuple(int(n) for n in ngram_sizes)
+        self.n_features = self.weights.shape[0]
+
+    def _hashes(self, text: str):
+        """Feature indices of all character n-grams of a text"""
+        text = text.strip().lower()
+        if not text:
+            return np.empty(0, dtype=np.int64)
+        padded = f" {text} "
+        codes = np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        parts = []
+        for n in self.ngram_sizes:
+            count = len(codes) - n + 1
+            if count <= 0:
+                continue
+            h = np.full(count, n, dtype=np.uint64)
+            for k in range(n):
+                h = (h * HASH_MULTIPLIER + codes[k:k + count]) & HASH_MASK
+            parts.append(h)
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return (np.concatenate(parts) % self.n_features).astype(np.int64)
+
+    def featurize(self, texts: Sequence[str]):
+        """
+        Build the L2-normalized feature matrix for a batch.
+
+        Args:
+            texts: Message texts
+
+        Returns:
+            (len(texts), n_features) float32 matrix
+        """
+        features = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indices = self._hashes(text)
+            if indices.size:
+                features[row] = np.bincount(indices, minlength=self.n_features)
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        np.divide(features, norms, out=features, where=norms > 0)
+        return features
+
+    def predict_proba(self, texts: Sequence[str]):
+        """
+        Probability of every intent for each text.
+
+        Args:
+            texts: Message texts
+
+        Returns:
+            (len(texts), n_labels) float32 matrix of softmax probabilities
+        """
+        return self.predict_proba_features(self.featurize(texts))
+
+    def predict(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """
+        Best intent and its confidence for each text.
+
+        Args:
+            texts: Message texts
+
+        Returns:
+            List of (intent value, confidence) pairs
+        """
+        if not texts:
+            return []
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[i], float(probabilities[row, i])) for row, i in enumerate(best)]
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        n_features: int = 4096,
+        ngram_sizes: Sequence[int] = (2, 3, 4),
+        epochs: int = 1000,
+        learning_rate: float = 4.0,
+        l2: float = 1e-4,
+    ) -> "IntentScorer":
+        """
+        Fit a softmax regression model with full-batch gradient descent.
+
+        Args:
+            texts: Training messages
+            labels: Intent value for each message
+            n_features: Size of the hashed feature space
+            ngram_sizes: Character n-gram lengths
+            epochs: Gradient descent iterations
+            learning_rate: Step size
+            l2: Weight decay
+
+        Returns:
+            Trained IntentScorer
+        """
+        label_set = tuple(sorted(set(labels)))
+        index = {label: i for i, label in enumerate(label_set)}
+        scorer = cls(np.zeros((n_features, len(label_set))), np.zeros(len(label_set)), label_set, ngram_sizes)
+
+        features = scorer.featurize(texts)
+        targets = np.zeros((len(texts), len(label_set)), dtype=np.float32)
+        targets[np.arange(len(texts)), [index[label] for label in labels]] = 1.0
+
+        for _ in range(epochs):
+            gradient = (scorer.predict_proba_features(features) - targets) / len(texts)
+            scorer.weights -= learning_rate * (features.T @ gradient + l2 * scorer.weights)
+            scorer.bias -= learning_rate * gradient.sum(axis=0)
+        return scorer
+
+    def predict_proba_features(self, features):
+        """Softmax probabilities for an already featurized batch"""
+        logits = features @ self.weights + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+        return logits
+
+    def save(self, path) -> None:
+        """Write the model as a compressed `.npz` artifact"""
+        np.savez_compressed(
+            path,
+            weights=self.weights.astype(np.float16),
+            bias=self.bias,
+            labels=np.array(self.labels),
+            ngram_sizes=np.array(self.ngram_sizes, dtype=np.int32),
+        )
+
+    @classmethod
+    def load(cls, path) -> "IntentScorer":
+        """Load a model written by `save`"""
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                artifact["weights"],
+                artifact["bias"],
+                [str(label) for label in artifact["labels"]],
+                artifact["ngram_sizes"].tolist(),
+            )
+
+
+def load_intent_scorer(path: Optional[str] = None) -> Optional[IntentScorer]:
+    """
+    Load the intent scorer artifact if NumPy and the artifact are available.
+
+    Args:
+        path: Artifact path (defaults to the bundled model)
+
+    Returns:
+        IntentScorer, or None when scoring is unavailable
+    """
+    if not NUMPY_AVAILABLE:
+        logger.info("NumPy not installed - NLU intent scorer disabled")
+        return None
+    model_path = Path(path) if path else DEFAULT_MODEL_PATH
+    if not model_path.exists():
+        logger.info(f"Intent scorer artifact not found at {model_path} - scorer disabled")
+        return None
+    try:
+        return IntentScorer.load(model_path)
+    except Exception as e:
+        logger.warning(f"Could not load intent scorer from {model_path}: {e}")
+        return None
+
+
+def load_corpus(path=None) -> Tuple[List[str], List[str]]:
+    """
+    Read a labelled JSONL corpus of {"text": ..., "intent": ...} rows.
+
+    Args:
+        path: Corpus path (defaults to the bundled seed corpus)
+
+    Returns:
+        (texts, intents)
+    """
+    texts, intents = [], []
+    with open(path or DEFAULT_CORPUS_PATH, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                texts.append(row["text"])
+                intents.append(row["intent"])
+    return texts, intents
@@ -0,0 +1,149 @@
+"""
+Language identification for CyberSathi messages
+
+Messages in a native script are identified from Unicode block ranges in a
+single pass over the text: Odia (U+0B00-U+0B7F) is "od" and Devanagari
+(U+0900-U+097F, U+A8E0-U+A8FF) is "hi". Pure ASCII text skips the scan.
+
+Latin-script text may be English or romanized Hindi/Odia ("paisa kat
+gaya", "taka kati gala"). It is classified with character-trigram
+profiles built once at import from app/data/language_seed.json: a naive
+Bayes log-likelihood per language, where romanized Hindi/Odia must beat
+English by a per-trigram margin and short texts default to English.
+
+Codes match the i18n catalog (en, od, hi).
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_LANGUAGE = "en"
+
+# (first code point, last code point, language) for native scripts
+SCRIPT_BLOCKS: Tuple[Tuple[int, int, str], ...] = (
+    (0x0900, 0x097F, "hi"),  # Devanagari
+    (0x0B00, 0x0B7F, "od"),  # Odia
+    (0xA8E0, 0xA8FF, "hi"),  # Devanagari Extended
+)
+
+SEED_PATH = Path(__file__).resolve().parent.parent / "data" / "language_seed.json"
+
+NON_LETTERS = re.compile(r"[^a-z]+")
+MIN_TRIGRAMS = 6  # fewer trigrams than this (about one short word) stays English
+MARGIN_PER_TRIGRAM = 0.15  # average log-likelihood lead over English required
+SMOOTHING = 0.5
+
+
+def _trigrams(text: str) -> List[str]:
+    """Character trigrams of lowercased letters, words padded with spaces"""
+    normalized = NON_LETTERS.sub(" ", text.lower()).strip()
+    if not normalized:
+        return []
+    padded = f" {normalized} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class TrigramProfile:
+    """Smoothed character-trigram log-probabilities for one language"""
+
+    def __init__(self, texts: Iterable[str]):
+        counts = Counter()
+        for text in texts:
+            counts.update(_trigrams(text))
+        total = sum(counts.values())
+        denominator = total + SMOOTHING * (len(counts) + 1)
+        self.log_probs: Dict[str, float] = {
+            trigram: math.log((count + SMOOTHING) / denominator) for trigram, count in counts.items()
+        }
+        self.unseen = math.log(SMOOTHING / denominator)
+
+    def score(self, trigrams: List[str]) -> float:
+        """Total log-likelihood of the trigrams"""
+        log_probs = self.log_probs
+        unseen = self.unseen
+        return sum(log_probs.get(trigram, unseen) for trigram in trigrams)
+
+
+class LanguageIdentifier:
+    """
+    Script-aware language identifier.
+
+    Args:
+        seed: Mapping of language code to sample romanized sentences; must
+            include the default language
+    """
+
+    def __init__(self, seed: Optional[Dict[str, List[str]]] = None):
+        if seed is None:
+            with open(SEED_PATH, encoding="utf-8") as f:
+                seed = json.load(f)
+        self.profiles = {language: TrigramProfile(texts) for language, texts in seed.items()}
+
+    def _native_script(self, text: str) -> Optional[str]:
+        """Dominant native script language, if native letters make up a third of the letters"""
+        native: Dict[str, int] = {}
+        latin = 0
+        for char in text:
+            code = ord(char)
+            if code < 0x80:
+                if char.isalpha():
+                    latin += 1
+                continue
+            for start, end, language in SCRIPT_BLOCKS:
+                if start <= code <= end:
+                    native[language] = native.get(language, 0) + 1
+                    break
+        if not native:
+            return None
+        language, count = max(native.items(), key=lambda item: item[1])
+        return language if 3 * sum(native.values()) >= latin else None
+
+    def _romanized(self, text: str) -> str:
+        """Classify Latin-script text with the trigram profiles"""
+        trigrams = _trigrams(text)
+        if len(trigrams) < MIN_TRIGRAMS:
+            return DEFAULT_LANGUAGE
+        scores = {language: profile.score(trigrams) for language, profile in self.profiles.items()}
+        language = max(scores, key=scores.get)
+        if language == DEFAULT_LANGUAGE:
+            return language
+        lead = scores[language] - scores[DEFAULT_LANGUAGE]
+        return language if lead >= MARGIN_PER_TRIGRAM * len(trigrams) else DEFAULT_LANGUAGE
+
+    def detect(self, text: str) -> str:
+        """
+        Identify the language of a message.
+
+        Args:
+            text: User input text
+
+        Returns:
+            Language code (en, od, hi)
+        """
+        if not text:
+            return DEFAULT_LANGUAGE
+        if not text.isascii():
+            native = self._native_script(text)
+            if native is not None:
+                return native
+        return self._romanized(text)
+
+    def detect_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Identify the language of several messages.
+
+        Args:
+            texts: User input texts
+
+        Returns:
+            Language code for each text, in order
+        """
+        detect = self.detect
+        return [detect(text) for text in texts]
+
+
+language_identifier = LanguageIdentifier()
@@ -5,6 +5,8 @@ import logging
 from typing import Optional
 import openai
 
+from app.services.pii_masking import PIIMaskingService
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +44,8 @@ class LLMChatbot:
         try:
             # System prompt for cybercrime assistant
             system_prompt = self._get_system_prompt(language)
+            # Phones, emails and Aadhaar numbers never leave for the model
+            user_message = PIIMaskingService.mask_for_logging(user_message)
             
             # Call OpenAI API
             response = openai.ChatCompletion.create(
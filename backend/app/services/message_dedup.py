@@ -0,0 +1,183 @@
+"""
+Webhook message deduplication for CyberSathi
+
+Meta redelivers webhook payloads when a response is slow, so the same
+WhatsApp message ID can arrive several times. Each ID is claimed once in a
+bounded, time-windowed in-memory set and, for multi-worker deployments, in an
+optional shared backend (MongoDB TTL collection or Redis).
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MongoDedupBackend:
+    """Shared dedup backend using a unique index on a TTL collection."""
+
+    name = "mongo"
+
+    async def claim(self, message_id: str) -> bool:
+        """
+        Claim a message ID.
+
+        Args:
+            message_id: WhatsApp message ID
+
+        Returns:
+            True if this worker claimed it first, False if already seen
+        """
+        from pymongo.errors import DuplicateKeyError
+        from app.models.processed_message import ProcessedMessageDocument
+
+        try:
+            await ProcessedMessageDocument(message_id=message_id).insert()
+            return True
+        except DuplicateKeyError:
+            return False
+
+
+class RedisDedupBackend:
+    """Shared dedup backend using Redis SET NX with expiry."""
+
+    name = "redis"
+
+    def __init__(self, url: str, window_seconds: int):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.window_seconds = window_seconds
+
+    async def claim(self, message_id: str) -> bool:
+        """
+        Claim a message ID.
+
+        Args:
+            message_id: WhatsApp message ID
+
+        Returns:
+            True if this worker claimed it first, False if already seen
+        """
+        created = await self.client.set(
+            f"cybersathi:wa:msg:{message_id}", 1, nx=True, ex=self.window_seconds
+        )
+        return bool(created)
+
+
+class MessageDeduplicator:
+    """
+    Time-windowed, size-bounded set of recently processed message IDs.
+
+    IDs are kept in insertion order with their expiry time, so expired
+    entries are always at the front and both checks and evictions are O(1).
+    """
+
+    def __init__(self, window_seconds: int = 3600, max_entries: int = 100_000, backend=None):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self.backend = backend
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self.duplicates_suppressed = 0
+        self.backend_errors = 0
+
+    def _purge_expired(self, now: float):
+        """Drop entries whose window has passed."""
+        seen = self._seen
+        while seen:
+            message_id, expires_at = next(iter(seen.items()))
+            if expires_at > now:
+                break
+            seen.popitem(last=False)
+
+    def seen_locally(self, message_id: str) -> bool:
+        """
+        Check-and-record a message ID in the local window only.
+
+        Args:
+            message_id: WhatsApp message ID
+
+        Returns:
+            True if the ID was already recorded within the window
+        """
+        now = time.monotonic()
+        self._purge_expired(now)
+
+        if message_id in self._seen:
+            return True
+
+        self._seen[message_id] = now + self.window_seconds
+        if len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+        return False
+
+    async def is_duplicate(self, message_id: Optional[str]) -> bool:
+        """
+        Check whether a webhook message was already processed.
+
+        Messages without an ID are never treated as duplicates. If the shared
+        backend is unavailable the message is processed (fail open) rather
+        than dropped.
+
+        Args:
+            message_id: WhatsApp message ID
+
+        Returns:
+            True if the message should be skipped
+        """
+        if not message_id:
+            return False
+
+        if self.seen_locally(message_id):
+            self.duplicates_suppressed += 1
+            return True
+
+        if self.backend is None:
+            return False
+
+        try:
+            claimed = await self.backend.claim(message_id)
+        except Exception as e:
+            self.backend_errors += 1
+            logger.warning(f"Dedup backend error, processing message anyway: {e}")
+            return False
+
+        if not claimed:
+            self.duplicates_suppressed += 1
+            return True
+        return False
+
+    def stats(self) -> Dict:
+        """Get deduplication statistics."""
+        return {
+            "backend": self.backend.name if self.backend else "memory",
+            "tracked_ids": len(self._seen),
+            "max_entries": self.max_entries,
+            "window_seconds": self.window_seconds,
+            "duplicates_suppressed": self.duplicates_suppressed,
+            "backend_errors": self.backend_errors,
+        }
+
+
+def _create_backend():
+    """Create the configured shared backend, if any."""
+    backend = settings.WHATSAPP_DEDUP_BACKEND.lower()
+    if backend == "mongo":
+        return MongoDedupBackend()
+    if backend == "redis":
+        try:
+            return RedisDedupBackend(settings.REDIS_URL, settings.WHATSAPP_DEDUP_WINDOW_SECONDS)
+        except ImportError:
+            logger.warning("redis package not installed, using in-memory dedup only")
+    return None
+
+
+message_deduplicator = MessageDeduplicator(
+    window_seconds=settings.WHATSAPP_DEDUP_WINDOW_SECONDS,
+    max_entries=settings.WHATSAPP_DEDUP_MAX_ENTRIES,
+    backend=_create_backend(),
+)
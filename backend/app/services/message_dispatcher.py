@@ -0,0 +1,153 @@
+"""
+Per-sender ordered message dispatcher for CyberSathi WhatsApp processing.
+
+Incoming messages are hashed on the sender's number onto a fixed set of
+worker lanes. Each lane is a FIFO queue drained by a single worker task, so
+messages from one sender are always handled strictly in arrival order while
+different senders are processed concurrently across lanes.
+"""
+
+import asyncio
+import logging
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MessageDispatcher:
+    """
+    Sharded dispatcher that keeps each sender's messages in order.
+
+    A sender is always mapped to the same lane (CRC32 of the sender key
+    modulo the lane count), so the conversation state machine never sees
+    two messages from the same user at once.
+    """
+
+    def __init__(self, lanes: int = 8, max_backlog: int = 0):
+        if lanes < 1:
+            raise ValueError("Dispatcher needs at least one lane")
+        self.lane_count = lanes
+        self.max_backlog = max_backlog
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+        self._processed = [0] * lanes
+        self._failed = [0] * lanes
+
+    @property
+    def is_running(self) -> bool:
+        """Check whether lane workers are active."""
+        return bool(self._workers)
+
+    def lane_for(self, sender: str) -> int:
+        """
+        Get the lane index for a sender.
+
+        Args:
+            sender: Sender identifier (WhatsApp number)
+
+        Returns:
+            Lane index in range [0, lane_count)
+        """
+        return zlib.crc32((sender or "").encode("utf-8")) % self.lane_count
+
+    async def start(self):
+        """Start one worker task per lane."""
+        if self._workers:
+            return
+        self._queues = [asyncio.Queue(maxsize=self.max_backlog) for _ in range(self.lane_count)]
+        self._workers = [
+            asyncio.create_task(self._run_lane(index), name=f"wa-dispatch-lane-{index}")
+            for index in range(self.lane_count)
+        ]
+        logger.info(f"Message dispatcher started with {self.lane_count} lanes")
+
+    async def stop(self, drain: bool = True):
+        """
+        Stop lane workers.
+
+        Args:
+            drain: Wait for queued messages to be processed before stopping
+        """
+        if not self._workers:
+            return
+        if drain:
+            await asyncio.gather(*(queue.join() for queue in self._queues))
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queues = []
+        logger.info("Message dispatcher stopped")
+
+    async def submit(
+        self,
+        sender: str,
+        handler: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> int:
+        """
+        Queue a handler call on the sender's lane.
+
+        Args:
+            sender: Sender identifier used for lane selection
+            handler: Coroutine function to run
+            *args: Arguments passed to the handler
+
+        Returns:
+            Lane index the work was queued on
+        """
+        if not self._workers:
+            await self.start()
+        lane = self.lane_for(sender)
+        await self._queues[lane].put((handler, args))
+        return lane
+
+    async def join(self):
+        """Wait until every lane has processed its backlog."""
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    def backlog(self) -> List[int]:
+        """Get the number of queued messages per lane."""
+        return [queue.qsize() for queue in self._queues] or [0] * self.lane_count
+
+    def stats(self) -> Dict:
+        """
+        Get dispatcher statistics.
+
+        Returns:
+            Dictionary with lane count, per-lane backlog and counters
+        """
+        backlog = self.backlog()
+        return {
+            "lanes": self.lane_count,
+            "running": self.is_running,
+            "backlog": backlog,
+            "total_backlog": sum(backlog),
+            "processed": list(self._processed),
+            "failed": list(self._failed),
+        }
+
+    async def _run_lane(self, index: int):
+        """Drain one lane sequentially."""
+        queue = self._queues[index]
+        while True:
+            handler, args = await queue.get()
+            try:
+                await handler(*args)
+                self._processed[index] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed[index] += 1
+                logger.error(f"Dispatcher lane {index} handler error: {e}")
+            finally:
+                queue.task_done()
+
+
+message_dispatcher = MessageDispatcher(
+    lanes=settings.WHATSAPP_DISPATCH_LANES,
+    max_backlog=settings.WHATSAPP_DISPATCH_MAX_BACKLOG,
+)
@@ -5,6 +5,7 @@ import logging
 from typing import Dict, Optional
 from functools import wraps
 from app.config import settings
+from app.services.redaction import redact
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,7 @@ class NCRPAdapter:
     @retry_with_backoff(max_retries=3)
     async def submit_complaint(self, complaint_data: Dict) -> Dict:
         endpoint = f"{self.base_url}/complaints"
+        complaint_data = redact(complaint_data, "ncrp")
         
         payload = {
             "complaint_type": complaint_data.get("incident_type"),
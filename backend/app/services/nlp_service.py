@@ -1,48 +1,112 @@
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 from app.config import settings
+from app.i18n import i18n
+from app.services.language_id import language_identifier
+from app.services.conversation_store import ConversationStore, create_conversation_store
+from app.services.message_dispatcher import message_dispatcher
+from app.services.session_timer import create_complaint_timers, record_drop_off
+from app.services.whatsapp_service import whatsapp_service
 
 logger = logging.getLogger(__name__)
 
 
 class ConversationState:
-    def __init__(self):
-        self.sessions = {}
+    def __init__(self, store: Optional[ConversationStore] = None):
+        self.store = store or create_conversation_store("nlp")
+    
+    async def load(self, user_id: str):
+        await self.store.load(user_id)
     
     def get_state(self, user_id: str) -> Dict:
-        return self.sessions.get(user_id, {"stage": "initial", "data": {}})
+        return self.store.get(user_id) or {"stage": "initial", "data": {}}
     
     def update_state(self, user_id: str, stage: str, data: Dict = None):
-        if user_id not in self.sessions:
-            self.sessions[user_id] = {"stage": stage, "data": data or {}}
+        state = self.store.get(user_id)
+        if state is None:
+            state = {"stage": stage, "data": data or {}}
         else:
-            self.sessions[user_id]["stage"] = stage
+            state["stage"] = stage
             if data:
-                self.sessions[user_id]["data"].update(data)
+                state["data"].update(data)
+        self.store.put(user_id, state)
+    
+    def touch(self, user_id: str, language: Optional[str] = None):
+        """Record activity (epoch seconds, shared across workers) and the user's language"""
+        state = self.store.get(user_id)
+        if state is None:
+            return
+        state["updated_at"] = time.time()
+        if language:
+            state["language"] = language
+        self.store.put(user_id, state)
     
     def clear_state(self, user_id: str):
-        if user_id in self.sessions:
-            del self.sessions[user_id]
+        self.store.delete(user_id)
 
 
 class NLPService:
     def __init__(self):
         self.conversation_state = ConversationState()
-        self.language_keywords = {
-            "english": ["hello", "hi", "help", "report", "complaint", "fraud", "scam", "track", "status"],
-            "odia": ["ନମସ୍କାର", "ସାହାଯ୍ୟ", "ରିପୋର୍ଟ", "ଅଭିଯୋଗ"]
-        }
-    
-    def detect_language(self, text: str) -> str:
-        text_lower = text.lower()
-        for lang, keywords in self.language_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return lang
-        return "english"
+        self.session_timers = create_complaint_timers(self._nudge_idle_complaint, self._expire_idle_complaint)
     
     async def process_message(self, user_id: str, text: str) -> Dict:
+        await self.conversation_state.load(user_id)
+        language = language_identifier.detect(text)
+        response = await self._route_message(user_id, text, language)
+        self._track_complaint_progress(user_id, language)
+        return response
+    
+    async def process_button_click(self, user_id: str, button_id: str) -> Dict:
+        await self.conversation_state.load(user_id)
+        response = await self._route_button_click(user_id, button_id)
+        self._track_complaint_progress(user_id)
+        return response
+    
+    def _track_complaint_progress(self, user_id: str, language: Optional[str] = None):
+        if self.conversation_state.get_state(user_id)["stage"] == "collecting_complaint":
+            self.conversation_state.touch(user_id, language)
+            self.session_timers.touch(user_id)
+        else:
+            self.session_timers.cancel(user_id)
+    
+    async def _nudge_idle_complaint(self, user_id: str, elapsed: float):
+        # Run on the user's lane so the check cannot race a message being handled
+        await message_dispatcher.submit(user_id, self._nudge_if_idle, user_id)
+    
+    async def _expire_idle_complaint(self, user_id: str, elapsed: float):
+        await message_dispatcher.submit(user_id, self._expire_if_idle, user_id, elapsed)
+    
+    async def _idle_complaint(self, user_id: str, idle_minutes: float) -> Optional[Dict]:
+        """The shared state of an in-progress complaint idle for `idle_minutes`, else None"""
+        await self.conversation_state.load(user_id)
+        state = self.conversation_state.store.get(user_id)
+        if state is None or state["stage"] != "collecting_complaint":
+            return None
+        if time.time() - state.get("updated_at", 0) < idle_minutes * 60 - 1:  # active on another worker
+            return None
+        return state
+    
+    async def _nudge_if_idle(self, user_id: str):
+        state = await self._idle_complaint(user_id, settings.COMPLAINT_NUDGE_AFTER_MINUTES)
+        if state is None:
+            return
+        minutes = round(settings.COMPLAINT_EXPIRE_AFTER_MINUTES - settings.COMPLAINT_NUDGE_AFTER_MINUTES)
+        await whatsapp_service.send_message(
+            to=user_id, message=i18n.get("complaint_flow.nudge", state.get("language", "en"), minutes=minutes)
+        )
+    
+    async def _expire_if_idle(self, user_id: str, elapsed: float):
+        state = await self._idle_complaint(user_id, settings.COMPLAINT_EXPIRE_AFTER_MINUTES)
+        if state is None:
+            return
+        self.conversation_state.clear_state(user_id)
+        await whatsapp_service.send_message(to=user_id, message=i18n.get("errors.timeout", state.get("language", "en")))
+        await record_drop_off(user_id, "chatbot", elapsed, {"step": state["data"].get("step")})
+    
+    async def _route_message(self, user_id: str, text: str, language: str) -> Dict:
         state = self.conversation_state.get_state(user_id)
-        language = self.detect_language(text)
         
         text_lower = text.lower()
         
@@ -67,26 +131,24 @@ class NLPService:
         else:
             return self._get_default_response(user_id, language)
     
-    async def process_button_click(self, user_id: str, button_id: str) -> Dict:
-        state = self.conversation_state.get_state(user_id)
-        
+    async def _route_button_click(self, user_id: str, button_id: str) -> Dict:
         if button_id == "report_fraud":
-            return self._start_complaint_flow(user_id, "english")
+            return self._start_complaint_flow(user_id, "en")
         elif button_id == "track_case":
-            return self._start_tracking_flow(user_id, "english")
+            return self._start_tracking_flow(user_id, "en")
         elif button_id == "awareness":
-            return self._get_awareness_content(user_id, "english")
+            return self._get_awareness_content(user_id, "en")
         elif button_id == "helpline":
             return {
                 "text": f"📞 For immediate assistance, call the National Cybercrime Helpline:\n\n{settings.HELPLINE_NUMBER}\n\nAvailable 24x7"
             }
         else:
-            return self._get_default_response(user_id, "english")
+            return self._get_default_response(user_id, "en")
     
     def _get_welcome_message(self, user_id: str, language: str) -> Dict:
         self.conversation_state.update_state(user_id, "initial")
         
-        if language == "odia":
+        if language == "od":
             text = "🛡️ ସାଇବରସାଥୀରେ ସ୍ୱାଗତ!\n\nମୁଁ ଆପଣଙ୍କୁ ସାଇବର ଅପରାଧ ରିପୋର୍ଟ କରିବାରେ ସାହାଯ୍ୟ କରିପାରିବି।"
         else:
             text = "🛡️ Welcome to CyberSathi!\n\nI'm your AI assistant for reporting cybercrimes and getting help with the National Cybercrime Helpline (1930).\n\nHow can I help you today?"
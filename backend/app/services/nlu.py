@@ -4,10 +4,23 @@ Implements keyword + regex based intent classification without ML/LLM
 Based on Prompt 3 requirements
 """
 
+import json
+import os
 import re
-from typing import Dict, Optional, List
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, List, Tuple
 from enum import Enum
 
+from app.config import settings
+from app.services.entity_extractor import EntitySpan, entity_extractor
+from app.services.intent_scorer import load_intent_scorer
+from app.services.language_id import SEED_PATH
+from app.services.spell_correction import SymSpellIndex
+
 
 class Intent(str, Enum):
     """Root intents for conversation routing"""
@@ -41,6 +54,139 @@ class Platform(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Intents in match priority order: most specific first, general last
+INTENT_PRIORITY = (
+    Intent.CHECK_STATUS,
+    Intent.ACCOUNT_UNFREEZE,
+    Intent.FINANCIAL_FRAUD,
+    Intent.FACEBOOK_FRAUD,
+    Intent.INSTAGRAM_FRAUD,
+    Intent.X_TWITTER_FRAUD,
+    Intent.WHATSAPP_FRAUD,
+    Intent.TELEGRAM_FRAUD,
+    Intent.GMAIL_FRAUD,
+    Intent.HACKED_ACCOUNT,
+    Intent.IMPERSONATION,
+    Intent.OBSCENE_CONTENT,
+    Intent.NEW_COMPLAINT,
+)
+
+# Platform substrings in match priority order
+PLATFORM_KEYWORDS = (
+    (Platform.FACEBOOK, ('facebook', 'fb')),
+    (Platform.INSTAGRAM, ('instagram', 'insta', 'ig')),
+    (Platform.X_TWITTER, ('twitter', 'x.com', 'tweet')),
+    (Platform.WHATSAPP, ('whatsapp', 'wa')),
+    (Platform.TELEGRAM, ('telegram',)),
+    (Platform.GMAIL, ('gmail', 'google account')),
+)
+
+# Word tokens as seen by `\b...\b` patterns, plus the rupee sign; Devanagari and
+# Odia vowel signs are not `\w`, so those blocks are listed to keep words whole
+TOKEN_REGEX = re.compile(r'[\w\u0900-\u097F\u0B00-\u0B7F]+|₹')
+DIGIT_REGEX = re.compile(r'\d')
+
+# Amount as the pre-extractor regex captured it: rupee sign and digits, no currency words
+LEGACY_AMOUNT_REGEX = re.compile(r'₹?\s*\d+(?:,\d+)*(?:\.\d{2})?')
+
+# extract_entities result keys for each extractor entity type
+ENTITY_KEYS = (
+    ('utr', 'utr_number'),
+    ('phone', 'phone_number'),
+    ('email', 'email'),
+    ('upi_vpa', 'upi_vpa'),
+    ('amount', 'amount'),
+    ('date', 'date'),
+    ('ticket_id', 'ticket_id'),
+)
+
+
+@dataclass(frozen=True)
+class IntentRules:
+    """
+    Match rules for one intent.
+
+    keywords: whole words, equivalent to `\bword\b` with IGNORECASE
+    phrases: (anchor, regex) pairs; the regex is only tried when a word in
+        the message equals the anchor, or starts with it if the anchor ends
+        in '*'
+    """
+    keywords: Tuple[str, ...] = ()
+    phrases: Tuple[Tuple[str, str], ...] = ()
+
+
+class IntentMatcher:
+    """
+    Combined single-pass matcher over all intent rules.
+
+    Keywords of every intent go into one hash table mapping a word to the
+    best (lowest) priority rank it signals, so one tokenizing pass finds all
+    keyword hits. Phrase regexes form a small residue indexed by anchor word;
+    only the ones anchored in the message and able to beat the best keyword
+    hit are run, in priority order.
+    """
+
+    def __init__(self, rules: Dict[Intent, IntentRules], priority: Tuple[Intent, ...]):
+        self.priority = priority
+        self.keyword_rank: Dict[str, int] = {}
+        self.anchored: Dict[str, List[Tuple[int, re.Pattern]]] = {}
+        self.prefixed: Dict[str, List[Tuple[int, re.Pattern]]] = {}
+
+        for rank, intent in enumerate(priority):
+            intent_rules = rules.get(intent, IntentRules())
+            for keyword in intent_rules.keywords:
+                self.keyword_rank.setdefault(keyword, rank)
+            for anchor, pattern in intent_rules.phrases:
+                entry = (rank, re.compile(pattern, re.IGNORECASE))
+                if anchor.endswith('*'):
+                    self.prefixed.setdefault(anchor[:-1], []).append(entry)
+                else:
+                    self.anchored.setdefault(anchor, []).append(entry)
+
+        self.prefix_lengths = tuple(sorted({len(anchor) for anchor in self.prefixed}))
+
+    def match(self, text: str, text_lower: str) -> Optional[Intent]:
+        """
+        Find the highest-priority intent with a hit in the text.
+
+        Args:
+            text: Message text (phrase regexes run on it case-insensitively)
+            text_lower: Lowercased message text
+
+        Returns:
+            Winning Intent, or None if nothing matched
+        """
+        best = len(self.priority)
+        keyword_rank = self.keyword_rank
+        anchored = self.anchored
+        prefixed = self.prefixed
+        prefix_lengths = self.prefix_lengths
+        candidates = []
+
+        for token in TOKEN_REGEX.findall(text_lower):
+            rank = keyword_rank.get(token)
+            if rank is not None and rank < best:
+                best = rank
+            entries = anchored.get(token)
+            if entries:
+                candidates.extend(entries)
+            for length in prefix_lengths:
+                entries = prefixed.get(token[:length])
+                if entries:
+                    candidates.extend(entries)
+
+        if candidates:
+            candidates.sort(key=lambda entry: entry[0])
+            for rank, pattern in candidates:
+                if rank >= best:
+                    break
+                if pattern.search(text):
+                    best = rank
+                    break
+
+        return self.priority[best] if best < len(self.priority) else None
+
+
 class NLUService:
     """
     Rule-based NLU service for intent detection and entity extraction
@@ -48,125 +194,161 @@ class NLUService:
     """
     
     def __init__(self):
-        self.intent_patterns = self._initialize_intent_patterns()
-        self.entity_patterns = self._initialize_entity_patterns()
+        self.intent_rules = self._initialize_intent_rules()
+        self.intent_matcher = IntentMatcher(self.intent_rules, INTENT_PRIORITY)
+        self.memo_max_entries = settings.NLU_MEMO_MAX_ENTRIES
+        self.memo_max_text_length = settings.NLU_MEMO_MAX_TEXT_LENGTH
+        self._memo: "OrderedDict[str, Mapping[str, Any]]" = OrderedDict()
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.memo_bypassed = 0
+        self.memo_evictions = 0
+        self.scorer = load_intent_scorer(settings.NLU_SCORER_MODEL_PATH or None) if settings.NLU_SCORER_ENABLED else None
+        self.confidence_threshold = settings.NLP_CONFIDENCE_THRESHOLD
+        self.spell_index = self._build_spell_index() if settings.NLU_SPELL_CORRECTION_ENABLED else None
     
-    def _initialize_intent_patterns(self) -> Dict[Intent, List[re.Pattern]]:
-        """Initialize regex patterns for each intent"""
+    def _initialize_intent_rules(self) -> Dict[Intent, IntentRules]:
+        """Initialize keyword and phrase rules for each intent"""
         return {
             # Root Intents
-            Intent.NEW_COMPLAINT: [
-                re.compile(r'\b(new\s+)?complaint\b', re.IGNORECASE),
-                re.compile(r'\bscam(med)?\b', re.IGNORECASE),
-                re.compile(r'\bfraud(ed)?\b', re.IGNORECASE),
-                re.compile(r'\bcyber\s*crime\b', re.IGNORECASE),
-                re.compile(r'\breport\b', re.IGNORECASE),
-                re.compile(r'\bhel+p\b', re.IGNORECASE),
-                re.compile(r'\bcheated\b', re.IGNORECASE),
-                re.compile(r'\bduped\b', re.IGNORECASE),
-                re.compile(r'\bfile\s+complaint\b', re.IGNORECASE),
-            ],
-            Intent.CHECK_STATUS: [
-                re.compile(r'\bstatus\b', re.IGNORECASE),
-                re.compile(r'\btrack(ing)?\b', re.IGNORECASE),
-                re.compile(r'\backnowledgement\b', re.IGNORECASE),
-                re.compile(r'\bticket\b', re.IGNORECASE),
-                re.compile(r'\bCS-\d+\b', re.IGNORECASE),
-                re.compile(r'\bNCRP-\d+\b', re.IGNORECASE),
-                re.compile(r'\bcheck\s+my\s+(case|complaint|status)\b', re.IGNORECASE),
-                re.compile(r'\bwhere\s+is\s+my\b', re.IGNORECASE),
-            ],
-            Intent.ACCOUNT_UNFREEZE: [
-                re.compile(r'\bunfreeze\b', re.IGNORECASE),
-                re.compile(r'\baccount.*(freez|frozen)\b', re.IGNORECASE),
-                re.compile(r'\bfrozen\b.*\baccount\b', re.IGNORECASE),
-                re.compile(r'\bblocked\b.*\baccount\b', re.IGNORECASE),
-                re.compile(r'\brestore\b.*\baccount\b', re.IGNORECASE),
-                re.compile(r'\baccount.*\b(blocked|locked)\b', re.IGNORECASE),
-            ],
+            Intent.NEW_COMPLAINT: IntentRules(
+                keywords=('complaint', 'scam', 'scammed', 'fraud', 'frauded', 'report', 'cheated', 'duped',
+                          'शिकायत', 'धोखा', 'ठगी', 'फ्रॉड', 'ଅଭିଯୋଗ', 'ଠକେଇ', 'ପ୍ରତାରଣା'),
+                phrases=(
+                    ('cyber*', r'\bcyber\s*crime\b'),
+                    ('hel*', r'\bhel+p\b'),
+                ),
+            ),
+            Intent.CHECK_STATUS: IntentRules(
+                keywords=('status', 'track', 'tracking', 'acknowledgement', 'ticket', 'स्थिति', 'स्टेटस', 'ସ୍ଥିତି'),
+                phrases=(
+                    ('cs', r'\bCS-\d+\b'),
+                    ('ncrp', r'\bNCRP-\d+\b'),
+                    ('check', r'\bcheck\s+my\s+(case|complaint|status)\b'),
+                    ('where', r'\bwhere\s+is\s+my\b'),
+                ),
+            ),
+            Intent.ACCOUNT_UNFREEZE: IntentRules(
+                keywords=('unfreeze', 'अनफ्रीज'),
+                phrases=(
+                    ('account*', r'\baccount.*(freez|frozen)\b'),
+                    ('frozen', r'\bfrozen\b.*\baccount\b'),
+                    ('blocked', r'\bblocked\b.*\baccount\b'),
+                    ('restore', r'\brestore\b.*\baccount\b'),
+                    ('account*', r'\baccount.*\b(blocked|locked)\b'),
+                ),
+            ),
             
             # Financial Fraud
-            Intent.FINANCIAL_FRAUD: [
-                re.compile(r'\bupi\b', re.IGNORECASE),
-                re.compile(r'\bmoney\b', re.IGNORECASE),
-                re.compile(r'\btransaction\b', re.IGNORECASE),
-                re.compile(r'\bdeducted\b', re.IGNORECASE),
-                re.compile(r'\bimps\b', re.IGNORECASE),
-                re.compile(r'\bneft\b', re.IGNORECASE),
-                re.compile(r'\brtgs\b', re.IGNORECASE),
-                re.compile(r'\bbank\b', re.IGNORECASE),
-                re.compile(r'\bpayment\b', re.IGNORECASE),
-                re.compile(r'\brupees?\b', re.IGNORECASE),
-                re.compile(r'₹\d+', re.IGNORECASE),
-                re.compile(r'\butr\b', re.IGNORECASE),
-                re.compile(r'\bonline\s+payment\b', re.IGNORECASE),
-                re.compile(r'\bpaytm\b', re.IGNORECASE),
-                re.compile(r'\bphonep(e|ay)\b', re.IGNORECASE),
-                re.compile(r'\bgpay\b', re.IGNORECASE),
-            ],
+            Intent.FINANCIAL_FRAUD: IntentRules(
+                keywords=('upi', 'money', 'transaction', 'deducted', 'imps', 'neft', 'rtgs', 'bank',
+                          'payment', 'rupee', 'rupees', 'utr', 'paytm', 'phonepe', 'phonepay', 'gpay',
+                          'पैसा', 'पैसे', 'रुपये', 'बैंक', 'ଟଙ୍କା', 'ବ୍ୟାଙ୍କ'),
+                phrases=(
+                    ('₹', r'₹\d+'),
+                ),
+            ),
             
             # Social Media Fraud
-            Intent.FACEBOOK_FRAUD: [
-                re.compile(r'\bfacebook\b', re.IGNORECASE),
-                re.compile(r'\bfb\b', re.IGNORECASE),
-                re.compile(r'\bmeta\b', re.IGNORECASE),
-            ],
-            Intent.INSTAGRAM_FRAUD: [
-                re.compile(r'\binstagram\b', re.IGNORECASE),
-                re.compile(r'\binsta\b', re.IGNORECASE),
-                re.compile(r'\big\b', re.IGNORECASE),
-            ],
-            Intent.X_TWITTER_FRAUD: [
-                re.compile(r'\btwitter\b', re.IGNORECASE),
-                re.compile(r'\bx\.com\b', re.IGNORECASE),
-                re.compile(r'\btweet\b', re.IGNORECASE),
-            ],
-            Intent.WHATSAPP_FRAUD: [
-                re.compile(r'\bwhatsapp\b', re.IGNORECASE),
-                re.compile(r'\bwa\b', re.IGNORECASE),
-                re.compile(r'\bwhats\s*app\b', re.IGNORECASE),
-            ],
-            Intent.TELEGRAM_FRAUD: [
-                re.compile(r'\btelegram\b', re.IGNORECASE),
-            ],
-            Intent.GMAIL_FRAUD: [
-                re.compile(r'\bgmail\b', re.IGNORECASE),
-                re.compile(r'\bgoogle\s+account\b', re.IGNORECASE),
-                re.compile(r'\bemail\s+hacked?\b', re.IGNORECASE),
-            ],
+            Intent.FACEBOOK_FRAUD: IntentRules(keywords=('facebook', 'fb', 'meta', 'फेसबुक', 'ଫେସବୁକ')),
+            Intent.INSTAGRAM_FRAUD: IntentRules(keywords=('instagram', 'insta', 'ig', 'इंस्टाग्राम', 'ଇନଷ୍ଟାଗ୍ରାମ')),
+            Intent.X_TWITTER_FRAUD: IntentRules(
+                keywords=('twitter', 'tweet'),
+                phrases=(
+                    ('x', r'\bx\.com\b'),
+                ),
+            ),
+            Intent.WHATSAPP_FRAUD: IntentRules(
+                keywords=('whatsapp', 'wa', 'व्हाट्सएप', 'ହ୍ୱାଟସଆପ'),
+                phrases=(
+                    ('whats', r'\bwhats\s*app\b'),
+                ),
+            ),
+            Intent.TELEGRAM_FRAUD: IntentRules(keywords=('telegram', 'टेलीग्राम', 'ଟେଲିଗ୍ରାମ')),
+            Intent.GMAIL_FRAUD: IntentRules(
+                keywords=('gmail',),
+                phrases=(
+                    ('google', r'\bgoogle\s+account\b'),
+                    ('email', r'\bemail\s+hacked?\b'),
+                ),
+            ),
             
             # Enhancement Intents
-            Intent.HACKED_ACCOUNT: [
-                re.compile(r'\bhacked?\b', re.IGNORECASE),
-                re.compile(r'\bhacking\b', re.IGNORECASE),
-                re.compile(r'\baccount\s+compromised\b', re.IGNORECASE),
-                re.compile(r'\bunauthori[sz]ed\s+access\b', re.IGNORECASE),
-            ],
-            Intent.IMPERSONATION: [
-                re.compile(r'\bimpersonat(e|ion)\b', re.IGNORECASE),
-                re.compile(r'\bfake\s+profile\b', re.IGNORECASE),
-                re.compile(r'\bpretending\s+to\s+be\b', re.IGNORECASE),
-                re.compile(r'\bidentity\s+theft\b', re.IGNORECASE),
-            ],
-            Intent.OBSCENE_CONTENT: [
-                re.compile(r'\bobscene\b', re.IGNORECASE),
-                re.compile(r'\bpornography\b', re.IGNORECASE),
-                re.compile(r'\bvulgar\b', re.IGNORECASE),
-                re.compile(r'\binappropriate\s+content\b', re.IGNORECASE),
-                re.compile(r'\bmorphed\s+photo\b', re.IGNORECASE),
-            ],
+            Intent.HACKED_ACCOUNT: IntentRules(
+                keywords=('hacke', 'hacked', 'hacking', 'हैक', 'ହ୍ୟାକ'),
+                phrases=(
+                    ('account', r'\baccount\s+compromised\b'),
+                    ('unauthorized', r'\bunauthori[sz]ed\s+access\b'),
+                    ('unauthorised', r'\bunauthori[sz]ed\s+access\b'),
+                ),
+            ),
+            Intent.IMPERSONATION: IntentRules(
+                keywords=('impersonate', 'impersonation'),
+                phrases=(
+                    ('fake', r'\bfake\s+profile\b'),
+                    ('pretending', r'\bpretending\s+to\s+be\b'),
+                    ('identity', r'\bidentity\s+theft\b'),
+                ),
+            ),
+            Intent.OBSCENE_CONTENT: IntentRules(
+                keywords=('obscene', 'pornography', 'vulgar', 'अश्लील', 'ଅଶ୍ଳୀଳ'),
+                phrases=(
+                    ('inappropriate', r'\binappropriate\s+content\b'),
+                    ('morphed', r'\bmorphed\s+photo\b'),
+                ),
+            ),
         }
     
-    def _initialize_entity_patterns(self) -> Dict[str, re.Pattern]:
-        """Initialize regex patterns for entity extraction"""
-        return {
-            'utr_number': re.compile(r'\b\d{12,16}\b'),
-            'phone_number': re.compile(r'\b[6-9]\d{9}\b'),
-            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-            'amount': re.compile(r'₹?\s*\d+(?:,\d+)*(?:\.\d{2})?'),
-            'date': re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'),
-            'ticket_id': re.compile(r'\b(CS|NCRP)-\d{8}-\d{6}\b', re.IGNORECASE),
+    def _build_spell_index(self) -> SymSpellIndex:
+        """
+        Build the typo-correction index over the intent vocabulary
+        Keywords and whole-word phrase anchors are ranked by intent priority;
+        words from the language seed sentences count as correctly spelt.
+        Only whole words are correction targets: stem anchors ("cyber*") and
+        keywords that exist to mirror an optional last letter ("hacke" for
+        `hacked?`) are left out, and agent nouns of -ed keywords ("hacker",
+        "scammer") count as known words, so they are never rewritten.
+        """
+        vocabulary: Dict[str, int] = {}
+        for rank, intent in enumerate(INTENT_PRIORITY):
+            intent_rules = self.intent_rules.get(intent, IntentRules())
+            anchors = [anchor for anchor, _ in intent_rules.phrases if not anchor.endswith('*')]
+            words = (*intent_rules.keywords, *anchors)
+            truncations = {word[:-1] for word in words}
+            for word in words:
+                if len(word) >= 4 and word not in truncations:
+                    vocabulary.setdefault(word, rank)
+
+        with open(SEED_PATH, encoding="utf-8") as f:
+            seed = json.load(f)
+        known_words = {
+            token for texts in seed.values() for text in texts for token in TOKEN_REGEX.findall(text.lower())
         }
+        known_words.update(
+            word[:-2] + suffix for word in vocabulary if word.endswith('ed') for suffix in ('er', 'ers')
+        )
+        return SymSpellIndex(
+            vocabulary,
+            max_distance=settings.NLU_SPELL_MAX_DISTANCE,
+            known_words=known_words,
+            max_index_entries=settings.NLU_SPELL_MAX_INDEX_ENTRIES,
+        )
+    
+    def _correct_spelling(self, text_lower: str) -> Optional[str]:
+        """Lowercased text with misspelt keywords corrected, or None if nothing changed"""
+        lookup = self.spell_index.lookup
+        changed = False
+        
+        def replace(match: re.Match) -> str:
+            nonlocal changed
+            correction = lookup(match.group())
+            if correction is None:
+                return match.group()
+            changed = True
+            return correction
+        
+        corrected = TOKEN_REGEX.sub(replace, text_lower)
+        return corrected if changed else None
     
     def detect_intent(self, text: str) -> Intent:
         """
@@ -182,31 +364,24 @@ class NLUService:
         if not text or not text.strip():
             return Intent.OTHER_QUERY
         
-        text = text.strip()
-        
-        intent_priority = [
-            Intent.CHECK_STATUS,
-            Intent.ACCOUNT_UNFREEZE,
-            Intent.FINANCIAL_FRAUD,
-            Intent.FACEBOOK_FRAUD,
-            Intent.INSTAGRAM_FRAUD,
-            Intent.X_TWITTER_FRAUD,
-            Intent.WHATSAPP_FRAUD,
-            Intent.TELEGRAM_FRAUD,
-            Intent.GMAIL_FRAUD,
-            Intent.HACKED_ACCOUNT,
-            Intent.IMPERSONATION,
-            Intent.OBSCENE_CONTENT,
-            Intent.NEW_COMPLAINT,
-        ]
-        
-        for intent in intent_priority:
-            patterns = self.intent_patterns.get(intent, [])
-            for pattern in patterns:
-                if pattern.search(text):
-                    return intent
+        return self._match_intent(text.strip())[0] or Intent.OTHER_QUERY
+    
+    def _match_intent(self, text: str) -> Tuple[Optional[Intent], str]:
+        """
+        Run the intent rules, retrying with corrected spelling if nothing matched
         
-        return Intent.OTHER_QUERY
+        Returns:
+            (matched Intent or None, lowercased text the rules matched on)
+        """
+        text_lower = text.lower()
+        intent = self.intent_matcher.match(text, text_lower)
+        if intent is None and self.spell_index is not None:
+            corrected = self._correct_spelling(text_lower)
+            if corrected is not None:
+                intent = self.intent_matcher.match(corrected, corrected)
+                if intent is not None:
+                    return intent, corrected
+        return intent, text_lower
     
     def detect_platform(self, text: str) -> Platform:
         """
@@ -218,26 +393,25 @@ class NLUService:
         Returns:
             Detected Platform enum value
         """
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['facebook', 'fb']):
-            return Platform.FACEBOOK
-        elif any(word in text_lower for word in ['instagram', 'insta', 'ig']):
-            return Platform.INSTAGRAM
-        elif any(word in text_lower for word in ['twitter', 'x.com', 'tweet']):
-            return Platform.X_TWITTER
-        elif 'whatsapp' in text_lower or 'wa' in text_lower:
-            return Platform.WHATSAPP
-        elif 'telegram' in text_lower:
-            return Platform.TELEGRAM
-        elif any(word in text_lower for word in ['gmail', 'google account']):
-            return Platform.GMAIL
+        return self._detect_platform_lower(text.lower())
+    
+    def _detect_platform_lower(self, text_lower: str) -> Platform:
+        """Platform detection on already lowercased text (substring match)"""
+        for platform, keywords in PLATFORM_KEYWORDS:
+            for keyword in keywords:
+                if keyword in text_lower:
+                    return platform
         
         return Platform.UNKNOWN
     
     def extract_entities(self, text: str) -> Dict[str, Optional[str]]:
         """
-        Extract entities from user message using regex patterns
+        Extract entities from user message
+        Returns the first occurrence of each entity type in the formats this
+        method has always produced: phone numbers as 10 digits without a
+        country code, amounts as the rupee sign and digits without currency
+        words ("Rs.1500" -> "1500"), everything else as typed. Use
+        extract_entity_spans for every occurrence and normalized values
         
         Args:
             text: User's message text
@@ -245,14 +419,36 @@ class NLUService:
         Returns:
             Dictionary of extracted entities
         """
-        entities = {}
-        
-        for entity_name, pattern in self.entity_patterns.items():
-            match = pattern.search(text)
-            entities[entity_name] = match.group(0) if match else None
-        
+        entities = dict.fromkeys(key for _, key in ENTITY_KEYS)
+        keys = dict(ENTITY_KEYS)
+        for span in entity_extractor.extract(text):
+            key = keys.get(span.type)
+            if key is not None and entities[key] is None:
+                entities[key] = self._legacy_entity_text(span)
         return entities
     
+    @staticmethod
+    def _legacy_entity_text(span: EntitySpan) -> str:
+        """An extracted entity in the extract_entities format"""
+        if span.type == "phone":
+            return span.value[-10:]
+        if span.type == "amount":
+            match = LEGACY_AMOUNT_REGEX.search(span.text)
+            return match.group() if match else str(span.value)
+        return span.text
+    
+    def extract_entity_spans(self, text: str) -> List[EntitySpan]:
+        """
+        Extract every entity in a message with offsets and normalized values
+        
+        Args:
+            text: User's message text
+            
+        Returns:
+            EntitySpan list in order of appearance
+        """
+        return entity_extractor.extract(text)
+    
     def classify_fraud_type(self, intent: Intent) -> str:
         """
         Classify fraud into A1 (Financial) or A2 (Social Media) branches
@@ -280,32 +476,213 @@ class NLUService:
         else:
             return "OTHER"
     
-    def analyze_message(self, text: str) -> Dict:
+    def analyze_message(self, text: str) -> Mapping[str, Any]:
         """
         Complete NLU analysis of user message
+        Short messages ("hi", "help", button titles) are memoized in a bounded
+        LRU keyed by normalized text; results are read-only and may be shared
+        between callers.
         
         Args:
             text: User's message text
             
         Returns:
-            Dictionary containing:
+            Read-only mapping containing:
                 - intent: Detected intent
                 - platform: Detected platform (if social media)
                 - fraud_type: A1/A2/OTHER classification
                 - entities: Extracted entities
+                - confidence: 1.0 for rule matches, model probability when scored
+                - intent_source: "rules", "scorer" or "fallback"
+                - original_text: The text as received
         """
-        intent = self.detect_intent(text)
-        platform = self.detect_platform(text)
-        fraud_type = self.classify_fraud_type(intent)
-        entities = self.extract_entities(text)
+        key = self._memo_key(text)
+        if key is None:
+            self.memo_bypassed += 1
+            return _freeze(self._analyze(text))
         
+        memo = self._memo
+        result = memo.get(key)
+        if result is not None:
+            self.memo_hits += 1
+            memo.move_to_end(key)
+            if result["original_text"] != text:
+                result = MappingProxyType({**result, "original_text": text})
+            return result
+        
+        self.memo_misses += 1
+        result = _freeze(self._analyze(text))
+        memo[key] = result
+        if len(memo) > self.memo_max_entries:
+            memo.popitem(last=False)
+            self.memo_evictions += 1
+        return result
+    
+    def _memo_key(self, text: str) -> Optional[str]:
+        """
+        Memo key for a message, or None if it should bypass the memo
+        Case and surrounding whitespace do not affect intent or platform, and
+        entities are always empty without a digit or @, so such messages are
+        keyed case-insensitively; anything else is keyed on the exact text.
+        """
+        if not self.memo_max_entries or not text or len(text) > self.memo_max_text_length:
+            return None
+        if '@' in text or DIGIT_REGEX.search(text):
+            return text
+        return text.strip().lower()
+    
+    def memo_stats(self) -> Dict:
+        """Get analyze_message memo statistics"""
+        lookups = self.memo_hits + self.memo_misses
         return {
-            "intent": intent,
-            "platform": platform,
-            "fraud_type": fraud_type,
-            "entities": entities,
-            "original_text": text
+            "entries": len(self._memo),
+            "max_entries": self.memo_max_entries,
+            "max_text_length": self.memo_max_text_length,
+            "hits": self.memo_hits,
+            "misses": self.memo_misses,
+            "bypassed": self.memo_bypassed,
+            "evictions": self.memo_evictions,
+            "hit_ratio": round(self.memo_hits / lookups, 4) if lookups else 0.0,
         }
+    
+    def _analyze(self, text: str) -> Dict:
+        """Uncached analysis returning a plain (picklable) dict"""
+        return self._analyze_batch([text])[0]
+    
+    def _analyze_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        Uncached analysis of several messages
+        Rules run per message; messages no rule matched are scored by the
+        intent model together in one batch, and take its prediction when the
+        confidence reaches NLP_CONFIDENCE_THRESHOLD.
+        """
+        results = []
+        unmatched = []
+        for text in texts:
+            intent, text_lower = self._match_intent(text.strip()) if text else (None, "")
+            intent = intent or Intent.OTHER_QUERY
+            matched = intent != Intent.OTHER_QUERY
+            if not matched and text and text.strip():
+                unmatched.append(len(results))
+            results.append({
+                "intent": intent,
+                "platform": self._detect_platform_lower(text_lower),
+                "fraud_type": self.classify_fraud_type(intent),
+                "entities": self.extract_entities(text),
+                "confidence": 1.0 if matched else 0.0,
+                "intent_source": "rules" if matched else "fallback",
+                "original_text": text
+            })
+        
+        if unmatched and self.scorer is not None:
+            predictions = self.scorer.predict([texts[i] for i in unmatched])
+            for i, (label, confidence) in zip(unmatched, predictions):
+                result = results[i]
+                result["confidence"] = confidence
+                if confidence >= self.confidence_threshold and label != Intent.OTHER_QUERY.value:
+                    result["intent"] = Intent(label)
+                    result["fraud_type"] = self.classify_fraud_type(result["intent"])
+                    result["intent_source"] = "scorer"
+        return results
+    
+    def analyze_many(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        executor: Optional[ProcessPoolExecutor] = None,
+    ) -> Iterator[Dict]:
+        """
+        Analyze a stream of messages across worker processes
+        Input is split into chunks analyzed in parallel; results are yielded
+        in input order as chunks complete. At most two chunks per worker are
+        in flight, so arbitrarily long inputs are processed in bounded memory.
+        Inputs that fit in one chunk are analyzed in-process.
+        
+        Args:
+            texts: Message texts (any iterable, e.g. a generator over a cursor)
+            workers: Worker processes (default NLU_BATCH_WORKERS, 0 = one per CPU)
+            chunk_size: Messages per worker task (default NLU_BATCH_CHUNK_SIZE)
+            executor: Reuse an existing pool from `create_nlu_pool`
+            
+        Yields:
+            Analysis dict for each text, in order
+        """
+        chunk_size = chunk_size or settings.NLU_BATCH_CHUNK_SIZE
+        if workers is None:
+            workers = settings.NLU_BATCH_WORKERS or os.cpu_count() or 1
+        
+        chunks = _chunked(texts, chunk_size)
+        first = next(chunks, None)
+        if first is None:
+            return
+        if len(first) < chunk_size or (executor is None and workers <= 1):
+            yield from self._analyze_batch(first)
+            for chunk in chunks:  # only when running in-process
+                yield from self._analyze_batch(chunk)
+            return
+        
+        pool = executor or create_nlu_pool(workers)
+        pending = deque([pool.submit(_analyze_chunk, first)])
+        try:
+            for chunk in chunks:
+                pending.append(pool.submit(_analyze_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if executor is None:
+                pool.shutdown(wait=True)
+
+
+def _freeze(result: Dict) -> Mapping[str, Any]:
+    """Read-only view of an analysis result, including its entities"""
+    result["entities"] = MappingProxyType(result["entities"])
+    return MappingProxyType(result)
+
+
+def _chunked(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split an iterable into lists of at most `size` items"""
+    iterator = iter(texts)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Per-process service for batch workers, built once by the pool initializer
+_worker_service: Optional[NLUService] = None
+
+
+def _init_worker():
+    """Compile the NLU rules once in each worker process"""
+    global _worker_service
+    _worker_service = NLUService()
+
+
+def _analyze_chunk(texts: List[str]) -> List[Dict]:
+    """Worker task: analyze one chunk of messages"""
+    service = _worker_service or nlu_service
+    return service._analyze_batch(texts)
+
+
+def create_nlu_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool for `NLUService.analyze_many`
+    
+    Args:
+        workers: Worker processes (default NLU_BATCH_WORKERS, 0 = one per CPU)
+        
+    Returns:
+        ProcessPoolExecutor whose workers have the NLU rules preloaded
+    """
+    if workers is None:
+        workers = settings.NLU_BATCH_WORKERS or os.cpu_count() or 1
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
 
 
 nlu_service = NLUService()
@@ -0,0 +1,202 @@
+"""
+Retry and dead-letter queue for failed outbound WhatsApp messages.
+
+Entries are persisted in MongoDB (`outbound_messages`) so queued sends
+survive restarts. When the database is unavailable the queue falls back to
+process memory so sends are still retried while the process lives.
+
+Every worker runs a retry loop over the same collection, so a persisted
+entry is claimed atomically (PENDING -> IN_FLIGHT with this worker as owner
+and a lease expiry) before it is resent; only the owner may record the
+outcome. An entry whose lease expired, because its worker died mid-send,
+can be claimed again.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Union
+
+from beanie import UpdateResponse
+
+from app.models.outbound_message import OutboundMessageDocument, OutboundStatus
+from app.services.worker_identity import lease_until, worker_id
+
+logger = logging.getLogger(__name__)
+
+QueueEntry = Union[OutboundMessageDocument, Dict[str, Any]]
+
+
+class OutboundRetryQueue:
+    """
+    Persistent retry queue with exponential backoff.
+
+    An entry is retried until it succeeds or reaches `max_attempts`, after
+    which it is parked with status DEAD for manual inspection.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 8,
+        base_delay: float = 5.0,
+        max_delay: float = 900.0,
+        lease_seconds: float = 120.0,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self._memory: List[Dict[str, Any]] = []
+        self.dead_letters = 0
+
+    def _backoff(self, attempts: int) -> timedelta:
+        """Delay before the next attempt."""
+        return timedelta(seconds=min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1))))
+
+    async def enqueue(
+        self,
+        to: str,
+        payload: Dict,
+        phone_number_id: str,
+        error: str,
+        attempts: int = 1,
+        dead: bool = False,
+    ):
+        """
+        Queue a failed send for retry.
+
+        Args:
+            to: Recipient number
+            payload: WhatsApp API payload
+            phone_number_id: Sending phone number ID
+            error: Last error message
+            attempts: Attempts already made
+            dead: Park directly as a dead letter (non-retryable failure)
+        """
+        now = datetime.utcnow()
+        if dead:
+            self.dead_letters += 1
+        entry = {
+            "to": to,
+            "payload": payload,
+            "phone_number_id": phone_number_id,
+            "status": OutboundStatus.DEAD if dead else OutboundStatus.PENDING,
+            "attempts": attempts,
+            "next_attempt_at": now + self._backoff(attempts),
+            "last_error": error,
+            "created_at": now,
+            "updated_at": now,
+        }
+        try:
+            await OutboundMessageDocument(**entry).insert()
+        except Exception as e:
+            if dead:
+                logger.error(f"Dead letter for {to} could not be persisted: {error}")
+                return
+            logger.warning(f"Retry queue not persisted, keeping in memory: {e}")
+            self._memory.append(entry)
+
+    async def claim_due(self, limit: int = 100) -> List[QueueEntry]:
+        """
+        Claim entries whose next attempt is due.
+
+        Each persisted entry is moved to IN_FLIGHT by one atomic
+        find-and-update, so no two workers resend the same message.
+
+        Args:
+            limit: Maximum entries to claim
+
+        Returns:
+            List of claimed queue entries (documents or in-memory dicts)
+        """
+        now = datetime.utcnow()
+        entries: List[QueueEntry] = [
+            entry for entry in self._memory
+            if entry["status"] == OutboundStatus.PENDING and entry["next_attempt_at"] <= now
+        ][:limit]
+
+        claimable = {"$or": [
+            {"status": OutboundStatus.PENDING, "next_attempt_at": {"$lte": now}},
+            {"status": OutboundStatus.IN_FLIGHT, "lease_expires_at": {"$lte": now}},
+        ]}
+        claim = {"$set": {
+            "status": OutboundStatus.IN_FLIGHT,
+            "claimed_by": worker_id(),
+            "lease_expires_at": lease_until(self.lease_seconds),
+            "updated_at": now,
+        }}
+        try:
+            while len(entries) < limit:
+                entry = await OutboundMessageDocument.find_one(claimable).update(
+                    claim, response_type=UpdateResponse.NEW_DOCUMENT
+                )
+                if entry is None:
+                    break
+                entries.append(entry)
+        except Exception as e:
+            logger.debug(f"Retry queue claim skipped: {e}")
+        return entries
+
+    async def _release(self, entry: OutboundMessageDocument, updates: Dict[str, Any]):
+        """Write the outcome of a claimed entry, if this worker still owns it."""
+        updates = {**updates, "claimed_by": None, "lease_expires_at": None}
+        await OutboundMessageDocument.find_one(
+            {"_id": entry.id, "claimed_by": worker_id()}
+        ).update({"$set": updates})
+
+    async def mark_sent(self, entry: QueueEntry):
+        """Record a successful retry."""
+        if isinstance(entry, dict):
+            self._memory.remove(entry)
+            return
+        await self._release(entry, {"status": OutboundStatus.SENT, "updated_at": datetime.utcnow()})
+
+    async def mark_failed(self, entry: QueueEntry, error: str, dead: bool = False):
+        """
+        Record a failed retry, scheduling the next attempt or dead-lettering.
+
+        Args:
+            entry: Queue entry that failed
+            error: Error message from the attempt
+            dead: Dead-letter immediately (non-retryable failure)
+        """
+        now = datetime.utcnow()
+        attempts = (entry["attempts"] if isinstance(entry, dict) else entry.attempts) + 1
+        dead = dead or attempts >= self.max_attempts
+        status = OutboundStatus.DEAD if dead else OutboundStatus.PENDING
+        if status == OutboundStatus.DEAD:
+            self.dead_letters += 1
+            logger.error(f"Outbound message dead-lettered after {attempts} attempts: {error}")
+
+        updates = {
+            "attempts": attempts,
+            "status": status,
+            "last_error": error,
+            "next_attempt_at": now + self._backoff(attempts),
+            "updated_at": now,
+        }
+        if isinstance(entry, dict):
+            entry.update(updates)
+            if status == OutboundStatus.DEAD:
+                self._memory.remove(entry)
+            return
+        await self._release(entry, updates)
+
+    async def depth(self) -> Dict[str, int]:
+        """
+        Get queue depth.
+
+        Returns:
+            Counts of pending (including in-flight) and persisted dead entries
+        """
+        pending = len(self._memory)
+        dead = 0
+        try:
+            pending += await OutboundMessageDocument.find(
+                {"status": {"$in": [OutboundStatus.PENDING, OutboundStatus.IN_FLIGHT]}}
+            ).count()
+            dead += await OutboundMessageDocument.find(
+                OutboundMessageDocument.status == OutboundStatus.DEAD
+            ).count()
+        except Exception:
+            pass
+        return {"pending": pending, "dead": dead}
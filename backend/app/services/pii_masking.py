@@ -1,11 +1,43 @@
 """
 PII Masking Utility for CyberSathi
 Implements data privacy and security best practices
+
+Free-text masking uses one precompiled alternation of every PII pattern,
+scanned once with a single replacement callback. `PIIRedactionFilter` applies
+it to log records; installed on handlers, it only runs for records that are
+actually emitted, so disabled log calls cost nothing extra.
 """
 
+import logging
 import re
 from typing import Optional
 
+NON_DIGIT_REGEX = re.compile(r'[^\d]')
+
+# An email may only start where a token starts (not after a letter, digit or
+# email character), so the scan skips the inside of ordinary words instead of
+# retrying the branch at every character, and the local part is taken
+# possessively so a word without "@" fails in one step. Phone and Aadhaar
+# numbers only need to start a digit run, so they are masked even when glued
+# to a label ("Mob9876543210", "ph.9876543210"). Email is tried first so the
+# digits of an address are not taken for a phone; a 10-digit mobile
+# (optionally +91/91-prefixed) is tried before the 12-digit Aadhaar, and digit
+# runs must end there so a longer number is never partially masked.
+PII_REGEX = re.compile(
+    r'(?<![A-Za-z0-9._%+])(?P<email>[A-Za-z0-9._%+-]++@[A-Za-z0-9.-]+\.[A-Za-z]{2,})'
+    r'|(?<!\d)(?P<phone>(?:\+?91[-\s]?)?[6-9]\d{9}(?!\d))'
+    r'|(?<!\d)(?P<aadhaar>\d{4}[-\s]?\d{4}[-\s]?\d{4}(?!\d))'
+)
+PII_REPLACEMENTS = {
+    'email': '[EMAIL_MASKED]',
+    'phone': '[PHONE_MASKED]',
+    'aadhaar': '[AADHAAR_MASKED]',
+}
+
+
+def _replace_pii(match: re.Match) -> str:
+    return PII_REPLACEMENTS[match.lastgroup]
+
 
 class PIIMaskingService:
     """
@@ -30,7 +62,7 @@ class PIIMaskingService:
         if not phone:
             return ""
         
-        clean_phone = re.sub(r'[^\d]', '', phone)
+        clean_phone = NON_DIGIT_REGEX.sub('', phone)
         
         if len(clean_phone) <= visible_digits:
             return clean_phone
@@ -85,7 +117,7 @@ class PIIMaskingService:
         if not aadhaar:
             return ""
         
-        clean_aadhaar = re.sub(r'[^\d]', '', aadhaar)
+        clean_aadhaar = NON_DIGIT_REGEX.sub('', aadhaar)
         
         if len(clean_aadhaar) != 12:
             return aadhaar
@@ -109,7 +141,7 @@ class PIIMaskingService:
         if not account:
             return ""
         
-        clean_account = re.sub(r'[^\d]', '', account)
+        clean_account = NON_DIGIT_REGEX.sub('', account)
         
         if len(clean_account) <= visible_digits:
             return clean_account
@@ -169,18 +201,7 @@ class PIIMaskingService:
         if not text:
             return ""
         
-        result = text
-        
-        phone_pattern = r'(?:\+91[-\s]?)?[6-9]\d{9}'
-        result = re.sub(phone_pattern, '[PHONE_MASKED]', result)
-        
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        result = re.sub(email_pattern, '[EMAIL_MASKED]', result)
-        
-        aadhaar_pattern = r'\d{4}[-\s]?\d{4}[-\s]?\d{4}'
-        result = re.sub(aadhaar_pattern, '[AADHAAR_MASKED]', result)
-        
-        return result
+        return PII_REGEX.sub(_replace_pii, text)
     
     @staticmethod
     def get_masked_complaint_data(complaint_data: dict) -> dict:
@@ -212,3 +233,60 @@ class PIIMaskingService:
 
 
 pii_masking = PIIMaskingService()
+
+
+class PIIRedactionFilter(logging.Filter):
+    """
+    Logging filter that masks PII in the formatted message, the traceback
+    and the stack info.
+    
+    Attach it to handlers rather than loggers: handler filters run only after
+    the logger and handler levels have accepted the record, so suppressed
+    records are never scanned. A record passing through several handlers is
+    masked once. The traceback is formatted here and kept as the masked
+    `exc_text` (which formatters print instead of formatting `exc_info`
+    again); `exc_info` is cleared so no handler can render it unmasked.
+    """
+    
+    _formatter = logging.Formatter()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "pii_masked", False):
+            return True
+        message = record.getMessage()
+        masked = PII_REGEX.sub(_replace_pii, message)
+        if masked != message:
+            record.msg = masked
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if record.exc_text:
+            record.exc_text = PII_REGEX.sub(_replace_pii, record.exc_text)
+        if record.stack_info:
+            record.stack_info = PII_REGEX.sub(_replace_pii, record.stack_info)
+        record.pii_masked = True
+        return True
+
+
+pii_log_filter = PIIRedactionFilter()
+
+
+def install_pii_log_filter(*logger_names: str) -> int:
+    """
+    Attach the PII filter to the handlers of the given loggers.
+    
+    Args:
+        logger_names: Logger names (none means the root logger)
+        
+    Returns:
+        Number of handlers the filter was newly added to
+    """
+    added = 0
+    for name in logger_names or (None,):
+        for handler in logging.getLogger(name).handlers:
+            if pii_log_filter not in handler.filters:
+                handler.addFilter(pii_log_filter)
+                added += 1
+    return added
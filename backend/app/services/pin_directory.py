@@ -0,0 +1,230 @@
+"""
+Memory-mapped PIN code directory for CyberSathi
+
+Maps a 6-digit PIN to its post offices, district and state. The table is a
+single binary file (app/data/pin_directory.bin, built by
+scripts/build_pin_directory.py) laid out as sorted columns:
+
+    header   8-byte magic, record count N, name count M (uint32)
+    pins     N x uint32, ascending; a PIN with several offices repeats
+    office   N x uint32 index into the name table
+    district N x uint32 index into the name table
+    state    N x uint32 index into the name table
+    offsets  (M + 1) x uint32 byte offsets of each name in the blob
+    blob     UTF-8 names
+
+The file is mmap'ed read-only and the columns are memoryviews over it, so
+opening it reads nothing but the header, lookups are a C-level bisect on
+the PIN column, and every worker process maps the same page-cache pages
+instead of holding its own copy. Columns are little-endian uint32.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY_PATH = Path(__file__).resolve().parent.parent / "data" / "pin_directory.bin"
+
+MAGIC = b"CSPIN\x00\x00\x01"
+HEADER = struct.Struct("<8sII")
+PIN_DIGITS = 6
+
+
+@dataclass(frozen=True)
+class PostOffice:
+    """One post office served by a PIN code"""
+    pin: str
+    office: str
+    district: str
+    state: str
+
+
+def _pin_range(prefix: str) -> Optional[Tuple[int, int]]:
+    """Half-open range of PIN values starting with a digit prefix"""
+    if not prefix or len(prefix) > PIN_DIGITS or not prefix.isdigit() or not prefix.isascii():
+        return None
+    scale = 10 ** (PIN_DIGITS - len(prefix))
+    return int(prefix) * scale, (int(prefix) + 1) * scale
+
+
+class PinDirectory:
+    """
+    Read-only PIN code directory over a memory-mapped table.
+
+    Args:
+        path: Directory file built by `PinDirectory.build`
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != "little":  # pragma: no cover - columns are read in native order
+            raise ValueError("PIN directory requires a little-endian host")
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, names = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a PIN directory")
+
+        self._view = memoryview(self._mmap)
+        offset = HEADER.size
+        columns = []
+        for length in (count, count, count, count, names + 1):
+            columns.append(self._view[offset:offset + 4 * length].cast("I"))
+            offset += 4 * length
+        self._pins, self._offices, self._districts, self._states, self._name_offsets = columns
+        self._blob = offset
+        self._names: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._pins)
+
+    def _name(self, index: int) -> str:
+        """Decoded name from the blob (cached; there are few distinct names)"""
+        name = self._names.get(index)
+        if name is None:
+            start = self._blob + self._name_offsets[index]
+            end = self._blob + self._name_offsets[index + 1]
+            name = self._names[index] = str(self._view[start:end], "utf-8")
+        return name
+
+    def _entry(self, row: int) -> PostOffice:
+        return PostOffice(
+            pin=f"{self._pins[row]:06d}",
+            office=self._name(self._offices[row]),
+            district=self._name(self._districts[row]),
+            state=self._name(self._states[row]),
+        )
+
+    def lookup(self, pin: str) -> List[PostOffice]:
+        """
+        Post offices for a PIN code.
+
+        Args:
+            pin: 6-digit PIN (surrounding whitespace is ignored)
+
+        Returns:
+            Post offices sorted by name; empty if the PIN is unknown
+        """
+        pin = (pin or "").strip()
+        if len(pin) != PIN_DIGITS:
+            return []
+        span = _pin_range(pin)
+        if span is None:
+            return []
+        start = bisect_left(self._pins, span[0])
+        end = bisect_right(self._pins, span[0], start)
+        return [self._entry(row) for row in range(start, end)]
+
+    def __contains__(self, pin: str) -> bool:
+        span = _pin_range((pin or "").strip())
+        if span is None or span[1] - span[0] != 1:
+            return False
+        start = bisect_left(self._pins, span[0])
+        return start < len(self._pins) and self._pins[start] == span[0]
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[PostOffice]:
+        """
+        Post offices whose PIN starts with a prefix, in PIN order.
+
+        Args:
+            prefix: 1-6 leading digits, e.g. "7510"
+            limit: Maximum entries returned
+
+        Returns:
+            Matching post offices
+        """
+        span = _pin_range((prefix or "").strip())
+        if span is None:
+            return []
+        start = bisect_left(self._pins, span[0])
+        end = min(bisect_left(self._pins, span[1], start), start + limit)
+        return [self._entry(row) for row in range(start, end)]
+
+    def close(self):
+        """Unmap the table"""
+        for column in (self._pins, self._offices, self._districts, self._states, self._name_offsets, self._view):
+            column.release()
+        self._mmap.close()
+
+    @staticmethod
+    def build(rows: Iterable[Tuple[str, str, str, str]], path) -> int:
+        """
+        Write a directory file.
+
+        The file is written next to `path` and renamed over it, so processes
+        that have the old table mapped keep a consistent view.
+
+        Args:
+            rows: (pin, office, district, state) tuples in any order;
+                  duplicates and invalid PINs are dropped
+            path: Output file
+
+        Returns:
+            Number of records written
+        """
+        records = sorted({
+            (int(pin), office.strip(), district.strip(), state.strip())
+            for pin, office, district, state in ((str(p).strip(), o, d, s) for p, o, d, s in rows)
+            if len(pin) == PIN_DIGITS and pin.isdigit() and pin.isascii() and pin[0] != "0" and office.strip()
+        })
+
+        names: Dict[str, int] = {}
+        columns = [array("I") for _ in range(4)]
+        for record in records:
+            columns[0].append(record[0])
+            for column, name in zip(columns[1:], record[1:]):
+                column.append(names.setdefault(name, len(names)))
+
+        blob = bytearray()
+        offsets = array("I", [0])
+        for name in names:
+            blob += name.encode("utf-8")
+            offsets.append(len(blob))
+
+        path = Path(path)
+        temporary = path.with_name(path.name + ".tmp")
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(records), len(names)))
+            for column in (*columns, offsets):
+                if sys.byteorder != "little":  # pragma: no cover
+                    column.byteswap()
+                f.write(column.tobytes())
+            f.write(blob)
+        os.replace(temporary, path)
+        return len(records)
+
+
+def load_pin_directory(path: Optional[str] = None) -> Optional[PinDirectory]:
+    """
+    Open the PIN directory if its file is available.
+
+    Args:
+        path: Directory path (defaults to the bundled table)
+
+    Returns:
+        PinDirectory, or None when no directory is available
+    """
+    directory_path = Path(path) if path else DEFAULT_DIRECTORY_PATH
+    if not directory_path.exists():
+        logger.info(f"PIN directory not found at {directory_path} - PIN suggestions disabled")
+        return None
+    try:
+        return PinDirectory(directory_path)
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning(f"Could not load PIN directory from {directory_path}: {e}")
+        return None
+
+
+pin_directory = load_pin_directory(settings.PIN_DIRECTORY_PATH or None) if settings.PIN_DIRECTORY_ENABLED else None
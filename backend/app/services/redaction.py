@@ -0,0 +1,294 @@
+"""
+Policy-driven redaction of complaint documents for CyberSathi
+
+Each consumer of complaint data (admin exports, the NCRP portal, LLM
+prompts) gets a policy: a mapping of dotted field paths to an action, where
+`*` stands for every element of a list:
+
+    {"reporter_info.phone": "phone", "attachments.*.url": "drop"}
+
+A policy is compiled once into nested closures that visit only the paths it
+names, so redacting a document costs the same whatever else it contains.
+Redaction is copy-on-write: containers along a touched path are shallow
+copies and everything else is shared with the input, which is never
+modified. `redact_stream`/`aredact_stream` apply a policy lazily over any
+iterable or async cursor, so an export holds one document at a time.
+
+An allowlist policy (used for hand-offs outside the team) keeps only the
+paths it names, with "keep" for fields passed through as they are, so a
+field added to the model later is left out until someone allows it.
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, Mapping, Optional
+
+from app.services.pii_masking import PII_REGEX, PIIMaskingService
+
+DROP = object()  # Action marker: remove the field
+
+
+def _mask_aadhaar_text(text: str) -> str:
+    """Mask Aadhaar numbers in free text, leaving phones and emails"""
+    return PII_REGEX.sub(
+        lambda match: "[AADHAAR_MASKED]" if match.lastgroup == "aadhaar" else match.group(),
+        text,
+    )
+
+
+ACTIONS: Dict[str, Any] = {
+    "drop": DROP,
+    "keep": lambda value: value,
+    "redact": lambda value: "[REDACTED]",
+    "phone": lambda value: PIIMaskingService.mask_phone(str(value)),
+    "email": lambda value: PIIMaskingService.mask_email(str(value)),
+    "account": lambda value: PIIMaskingService.mask_bank_account(str(value)),
+    "name": lambda value: PIIMaskingService.mask_name(str(value)),
+    "text": lambda value: PIIMaskingService.mask_for_logging(str(value)),
+    "aadhaar_text": lambda value: _mask_aadhaar_text(str(value)),
+    "year": lambda value: str(value)[:4],
+    "pin": lambda value: str(value)[:3] + "***",
+}
+
+
+def _tree(rules: Mapping[str, str]) -> Dict:
+    """Nest dotted paths into a tree whose leaves are actions"""
+    tree: Dict = {}
+    for path, action_name in rules.items():
+        if action_name not in ACTIONS:
+            raise ValueError(f"Unknown redaction action '{action_name}' for '{path}'")
+        *parents, leaf = path.split(".")
+        node = tree
+        for part in parents:
+            node = node.setdefault(part, {})
+            if not isinstance(node, dict):
+                raise ValueError(f"Redaction path '{path}' is inside a field that already has an action")
+        if isinstance(node.get(leaf), dict):
+            raise ValueError(f"Redaction path '{path}' has an action and nested rules")
+        node[leaf] = ACTIONS[action_name]
+    return tree
+
+
+def _compile(tree: Dict, allowlist: bool = False) -> Callable[[Any], Any]:
+    """Turn a rule tree into a function applying it to one value"""
+    if "*" in tree:
+        if len(tree) > 1:
+            raise ValueError(f"'*' cannot be combined with named fields ({', '.join(k for k in tree if k != '*')})")
+        item = tree["*"]
+        apply_item = item if not isinstance(item, dict) else _compile(item, allowlist)
+
+        def apply_list(value):
+            if not isinstance(value, list):
+                return value
+            if apply_item is DROP:
+                return []
+            return [apply_item(element) for element in value if element is not None]
+        return apply_list
+
+    steps = [(key, rule if not isinstance(rule, dict) else _compile(rule, allowlist)) for key, rule in tree.items()]
+
+    if allowlist:
+        def apply_allowed(value):
+            if not isinstance(value, dict):
+                return value
+            return {
+                key: value[key] if value[key] is None else step(value[key])
+                for key, step in steps
+                if key in value and step is not DROP
+            }
+        return apply_allowed
+
+    def apply_dict(value):
+        if not isinstance(value, dict):
+            return value
+        result = None
+        for key, step in steps:
+            if key not in value:
+                continue
+            if result is None:
+                result = dict(value)
+            if step is DROP:
+                del result[key]
+            elif result[key] is not None:
+                result[key] = step(result[key])
+        return value if result is None else result
+    return apply_dict
+
+
+class RedactionPolicy:
+    """
+    A compiled field-path redaction policy.
+
+    Args:
+        name: Consumer name, for logs
+        rules: Dotted field path -> action name (see ACTIONS)
+        allowlist: Drop every field the rules do not name
+    """
+
+    def __init__(self, name: str, rules: Mapping[str, str], allowlist: bool = False):
+        self.name = name
+        self.rules = dict(rules)
+        self.allowlist = allowlist
+        self._apply = _compile(_tree(self.rules), allowlist)
+
+    def __call__(self, document: Any) -> Dict:
+        """
+        Redacted copy of one document.
+
+        Args:
+            document: Complaint dict, or a model (dumped in JSON mode)
+
+        Returns:
+            Redacted dict; the input is not modified
+        """
+        if hasattr(document, "model_dump"):
+            document = document.model_dump(mode="json")
+        return self._apply(document)
+
+    def extend(self, name: str, rules: Mapping[str, str]) -> "RedactionPolicy":
+        """Policy with extra or overriding rules"""
+        return RedactionPolicy(name, {**self.rules, **rules}, self.allowlist)
+
+
+# Fields that only matter inside CyberSathi and are never sent out
+_INTERNAL = {
+    "ip_address": "drop",
+    "user_agent": "drop",
+    "wa_conversation_id": "drop",
+    "wa_phone_number": "drop",
+    "phone_bidx": "drop",
+    "email_bidx": "drop",
+    "account_bidx": "drop",
+    "pii_protection": "drop",
+    "assignee": "drop",
+    "follow_up_notes": "drop",
+    "status_history.*.notes": "drop",
+    "status_history.*.changed_by": "drop",
+}
+
+POLICIES: Dict[str, RedactionPolicy] = {
+    # Analyst exports leave the system, so they are an allowlist: enough to
+    # follow a case up, no full identifiers, nothing that locates the victim
+    # below the district, no transaction identifiers
+    "export": RedactionPolicy("export", {
+        **{field: "keep" for field in (
+            "reference_id", "ps2_acknowledgement", "status", "source", "language",
+            "incident_type", "fraud_category", "financial_fraud_type", "social_media_platform",
+            "social_media_fraud_type", "platform", "date_of_incident", "amount", "district_code",
+            "portal_case_id", "ncrp_submitted_at", "follow_up_required", "follow_up_due_date",
+            "created_at", "updated_at",
+            "reporter_info.gender", "reporter_info.district",
+            "incident_details.incident_date", "incident_details.amount_lost", "incident_details.transaction_date",
+            "location.district", "location.state", "location.country",
+            "attachments.*.file_type", "attachments.*.evidence_type", "attachments.*.uploaded_at",
+            "status_history.*.status", "status_history.*.changed_at",
+        )},
+        "name": "name",
+        "phone": "phone",
+        "email": "email",
+        "bank_account": "account",
+        "description": "text",
+        "suspect_info": "text",
+        "reporter_info.name": "name",
+        "reporter_info.guardian_name": "name",
+        "reporter_info.date_of_birth": "year",
+        "reporter_info.phone": "phone",
+        "reporter_info.email": "email",
+        "reporter_info.pin_code": "pin",
+        "incident_details.description": "text",
+        "incident_details.account_number": "account",
+        "incident_details.beneficiary_account": "account",
+        "incident_details.suspect_info": "text",
+    }, allowlist=True),
+    # The national portal registers the victim, so identity is kept; only
+    # internal metadata and Aadhaar numbers typed into free text are removed
+    "ncrp": RedactionPolicy("ncrp", {
+        **_INTERNAL,
+        "description": "aadhaar_text",
+        "suspect_info": "aadhaar_text",
+        "incident_details.description": "aadhaar_text",
+        "incident_details.suspect_info": "aadhaar_text",
+    }),
+    # Third-party models see the incident, never who reported it
+    "llm": RedactionPolicy("llm", {
+        **_INTERNAL,
+        "name": "drop",
+        "phone": "drop",
+        "email": "drop",
+        "bank_account": "drop",
+        "txn_id": "drop",
+        "description": "text",
+        "suspect_info": "text",
+        "reporter_info": "drop",
+        "location.latitude": "drop",
+        "location.longitude": "drop",
+        "incident_details.description": "text",
+        "incident_details.account_number": "drop",
+        "incident_details.beneficiary_account": "drop",
+        "incident_details.beneficiary_name": "drop",
+        "incident_details.transaction_reference": "drop",
+        "incident_details.suspect_info": "text",
+        "attachments.*.url": "drop",
+        "attachments.*.filename": "drop",
+        "portal_case_id": "drop",
+    }),
+}
+
+
+def get_policy(consumer: str) -> RedactionPolicy:
+    """
+    Redaction policy for a consumer.
+
+    Args:
+        consumer: Policy name (export, ncrp, llm)
+
+    Returns:
+        RedactionPolicy
+    """
+    try:
+        return POLICIES[consumer]
+    except KeyError:
+        raise ValueError(f"No redaction policy for '{consumer}' (known: {', '.join(sorted(POLICIES))})") from None
+
+
+def redact(document: Any, consumer: str) -> Dict:
+    """Redact one document with a consumer's policy"""
+    return get_policy(consumer)(document)
+
+
+def redact_stream(documents: Iterable[Any], policy: RedactionPolicy) -> Iterator[Dict]:
+    """
+    Redact documents one at a time as they are consumed.
+
+    Args:
+        documents: Any iterable of complaint dicts or models
+        policy: Compiled policy
+
+    Yields:
+        Redacted documents
+    """
+    for document in documents:
+        yield policy(document)
+
+
+async def aredact_stream(documents: AsyncIterable[Any], policy: RedactionPolicy) -> AsyncIterator[Dict]:
+    """
+    Redact documents from an async cursor as they are consumed.
+
+    Args:
+        documents: Async iterable, e.g. a Beanie find query or a motor cursor
+        policy: Compiled policy
+
+    Yields:
+        Redacted documents
+    """
+    async for document in documents:
+        yield policy(document)
+
+
+def get_path(document: Optional[Mapping], path: str) -> Any:
+    """Value at a dotted path, or None"""
+    value: Any = document
+    for part in path.split("."):
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(part)
+    return value
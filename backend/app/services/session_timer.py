@@ -0,0 +1,224 @@
+"""
+Idle-session timers for CyberSathi complaint flows
+
+Each in-progress conversation has one pending deadline: a reminder nudge
+after `nudge_after` seconds of inactivity, then expiry `expire_after` seconds
+after the last activity. Deadlines live in a heap ordered by due time, so
+scheduling is O(log n) and the worker only ever looks at the heap top; there
+is no periodic scan over sessions.
+
+Rescheduling is lazy: every activity issues a new token for the user and
+pushes a fresh heap entry, and entries whose token is no longer current are
+discarded when they reach the top. The heap is compacted when stale entries
+outnumber live ones.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+NUDGE = 0
+EXPIRE = 1
+
+TimerCallback = Callable[[str, float], Awaitable[None]]
+
+
+class SessionTimerScheduler:
+    """
+    Heap-based nudge/expiry scheduler for idle conversations.
+
+    Callbacks receive the user ID and the seconds since the flow started.
+    Timers are process-local: after a restart they are re-armed by the
+    user's next message.
+    """
+
+    def __init__(
+        self,
+        nudge_after: float,
+        expire_after: float,
+        on_nudge: Optional[TimerCallback] = None,
+        on_expire: Optional[TimerCallback] = None,
+    ):
+        self.nudge_after = nudge_after
+        self.expire_after = expire_after
+        self.on_nudge = on_nudge
+        self.on_expire = on_expire
+        self._heap: List[Tuple[float, int, str, int]] = []  # (deadline, token, user_id, kind)
+        self._active: Dict[str, Tuple[int, float, float]] = {}  # user_id -> (token, started_at, last_activity)
+        self._tokens = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.nudges_sent = 0
+        self.sessions_expired = 0
+        self.callback_errors = 0
+
+    def _push(self, deadline: float, token: int, user_id: str, kind: int):
+        """Add a deadline, waking the worker if it is now the earliest."""
+        heapq.heappush(self._heap, (deadline, token, user_id, kind))
+        if self._heap[0][1] == token and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _compact(self):
+        """Drop superseded entries once they dominate the heap."""
+        if len(self._heap) <= 2 * len(self._active) + 1024:
+            return
+        active = self._active
+        self._heap = [entry for entry in self._heap if active.get(entry[2], (None,))[0] == entry[1]]
+        heapq.heapify(self._heap)
+
+    def touch(self, user_id: str):
+        """
+        Record activity in a user's flow, (re)arming its timers.
+
+        Args:
+            user_id: WhatsApp user identifier
+        """
+        now = time.monotonic()
+        token = next(self._tokens)
+        previous = self._active.get(user_id)
+        self._active[user_id] = (token, previous[1] if previous else now, now)
+        if 0 < self.nudge_after < self.expire_after:
+            self._push(now + self.nudge_after, token, user_id, NUDGE)
+        else:
+            self._push(now + self.expire_after, token, user_id, EXPIRE)
+        self._compact()
+
+    def cancel(self, user_id: str):
+        """
+        Stop tracking a user's flow (completed or abandoned explicitly).
+
+        Args:
+            user_id: WhatsApp user identifier
+        """
+        self._active.pop(user_id, None)
+
+    async def _call(self, callback: Optional[TimerCallback], user_id: str, started_at: float):
+        """Run a callback, containing its failures."""
+        if callback is None:
+            return
+        try:
+            await callback(user_id, time.monotonic() - started_at)
+        except Exception as e:
+            self.callback_errors += 1
+            logger.error(f"Session timer callback failed for {user_id}: {e}")
+
+    async def fire_due(self, now: Optional[float] = None) -> int:
+        """
+        Run all timers whose deadline has passed.
+
+        Args:
+            now: Monotonic time to evaluate against (defaults to now)
+
+        Returns:
+            Number of timers fired
+        """
+        now = time.monotonic() if now is None else now
+        fired = 0
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, token, user_id, kind = heapq.heappop(heap)
+            current = self._active.get(user_id)
+            if current is None or current[0] != token:
+                continue  # superseded by later activity or cancelled
+            fired += 1
+            _, started_at, last_activity = current
+            if kind == NUDGE:
+                heapq.heappush(heap, (last_activity + self.expire_after, token, user_id, EXPIRE))
+                self.nudges_sent += 1
+                await self._call(self.on_nudge, user_id, started_at)
+            else:
+                del self._active[user_id]
+                self.sessions_expired += 1
+                await self._call(self.on_expire, user_id, started_at)
+        return fired
+
+    async def _run(self):
+        """Sleep until the earliest deadline (or an earlier one arrives) and fire it."""
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            delay = self._heap[0][0] - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.fire_due()
+
+    async def start(self):
+        """Start the timer worker."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="session-timers")
+
+    async def stop(self):
+        """Stop the timer worker; pending timers are dropped."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._wakeup = None
+
+    def stats(self) -> Dict:
+        """Get timer statistics."""
+        return {
+            "active_sessions": len(self._active),
+            "scheduled_entries": len(self._heap),
+            "nudge_after_seconds": self.nudge_after,
+            "expire_after_seconds": self.expire_after,
+            "nudges_sent": self.nudges_sent,
+            "sessions_expired": self.sessions_expired,
+            "callback_errors": self.callback_errors,
+        }
+
+
+def create_complaint_timers(on_nudge: TimerCallback, on_expire: TimerCallback) -> SessionTimerScheduler:
+    """
+    Create a complaint-flow timer scheduler configured from settings.
+
+    Args:
+        on_nudge: Called when a flow has been idle for the nudge delay
+        on_expire: Called when a flow has been idle for the expiry delay
+
+    Returns:
+        Configured SessionTimerScheduler
+    """
+    return SessionTimerScheduler(
+        nudge_after=settings.COMPLAINT_NUDGE_AFTER_MINUTES * 60,
+        expire_after=settings.COMPLAINT_EXPIRE_AFTER_MINUTES * 60,
+        on_nudge=on_nudge,
+        on_expire=on_expire,
+    )
+
+
+async def record_drop_off(user_id: str, flow: str, elapsed: float, metadata: Dict[str, Any]):
+    """
+    Emit an analytics event for an abandoned complaint flow.
+
+    Args:
+        user_id: WhatsApp user identifier
+        flow: Flow the user dropped out of
+        elapsed: Seconds between the flow starting and expiry
+        metadata: Where in the flow the user stopped
+    """
+    from app.models.analytics import AnalyticsEventDocument, EventType
+
+    try:
+        await AnalyticsEventDocument.track(
+            event_type=EventType.COMPLAINT_ABANDONED,
+            user_id=user_id,
+            duration=int(elapsed),
+            metadata={"flow": flow, **metadata},
+        )
+    except Exception as e:
+        logger.warning(f"Could not record complaint drop-off for {user_id}: {e}")
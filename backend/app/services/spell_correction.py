@@ -0,0 +1,236 @@
+"""
+Typo-tolerant keyword correction for CyberSathi NLU
+
+SymSpell-style symmetric-delete index over the intent keyword vocabulary.
+At build time every vocabulary word (its first `prefix_length` characters)
+is expanded into all strings reachable by deleting up to `max_distance`
+characters, and each delete maps back to the words it came from. At lookup
+time the same deletes are generated for the misspelt token; any shared
+delete yields a candidate, which is then verified with a bounded optimal
+string alignment (Damerau-Levenshtein) distance. Lookup cost depends on the
+token length, not the vocabulary size.
+
+Only tokens of at least `min_length` characters that are not known words
+(a common-English list plus caller-supplied words) are corrected, so
+ordinary words are never rewritten into keywords. Against a small keyword
+vocabulary distance 2 is loose ("menu" is two edits from "meta"), so a
+correction must keep the token's first letter, and corrections beyond one
+edit may never shorten the token ("frod" -> "fraud" but not "banake" ->
+"bank"), nor keep the length of a short one ("swap" is not "scam"). A
+single substituted letter is only corrected in tokens of at least six
+characters, since shorter ones are usually other words ("scar", "fame").
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Frequent English words that sit within edit distance 2 of an intent keyword
+# ("back" ~ bank, "help" is a keyword but "hello" is not, "meat" ~ meta, ...)
+COMMON_WORDS = frozenset("""
+a about account after again all also am an and any are around as ask asked at away back bad bag bake
+band bang bank banks be been before being beta bill bind blank book both but by call came can card
+care case cash cat chat check come could cram cream cried crime cute data date day days dead deal
+dear did do does done down drank dream each email even ever fact fair fake farm fast fear feed feel
+felt few file fill final find fine first five for form found four frame free fresh friend from
+fund funds gave get girl give go good got great had hand happy has have he heard hello help her
+here hers him his hold home how i if in info into is it its just keep kind knew know last late
+left less let like link list live lock long look lost lot made mail make man many may me mean meat
+meet men met metal mine mom money month more most much must my name need never new news next nice
+no not now number of off often oh ok okay old on once one online only open or other our out over
+paid part pay phone photo place plan play please port post price pull put rain rang ran rate
+read real really rent reply repo right rupee said same saw say scan scare scene sent set she should
+show sign since site so some son soon sort spam stand start state stay step still stop such sure
+take talk team tell text than thank thanks that the their them then there these they thing think this
+those though three through time to today told too took track tract trade tram trap trick tried
+true try turn two under until up upon us use used very wait want was watch water way we week well
+went were what when where which while who whom why will wish with without word words work would
+wrong year yes yet you your
+""".split()) | frozenset("""
+backed blacked chatted checked chequed compliant created deduced defected detected doped duel dumped dune emit
+giggle goggle hackle haloed halted handed hated hawked identify mopey monkey monkeys mosey obscure
+presenting preventing record repost resort restock retort scanned stated states static statue statues tick
+ticked ticker tickle ticks trace transition translation truck twee tweed
+""".split())
+
+# Romanised Hindi (Hinglish) words common in chats with the bot
+HINGLISH_WORDS = frozenset("""
+abhi accha aur bata batao bhai chahiye gaya gayi hai hain haan hoga hua hui kab kaha kahan kaise
+karo karna kiya kya madad mai main mera mere meri mujhe nahi nahin paisa paise raha rahi sab sahi
+tha thi wapas yaar
+""".split())
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from `word` by deleting up to `max_distance` characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def _transposed(a: str, b: str) -> bool:
+    """Whether equal-length `a` and `b` differ only by swapped neighbours"""
+    diffs = [i for i in range(len(a)) if a[i] != b[i]]
+    return len(diffs) == 2 and diffs[1] == diffs[0] + 1 and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]]
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance, giving up above `max_distance`.
+
+    Only the diagonal band of width 2 * max_distance + 1 is filled in, since
+    cells outside it already exceed the bound.
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Largest distance of interest
+
+    Returns:
+        Distance, or max_distance + 1 if it exceeds the bound
+    """
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+    limit = max_distance + 1
+    previous_previous: List[int] = []
+    previous = [j if j < limit else limit for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        char_a = a[i - 1]
+        current = [limit] * (len_b + 1)
+        current[0] = i if i < limit else limit
+        row_min = current[0]
+        for j in range(max(1, i - max_distance), min(len_b, i + max_distance) + 1):
+            value = previous[j - 1] if char_a == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == b[j - 1] and previous_previous[j - 2] + 1 < value:
+                value = previous_previous[j - 2] + 1
+            if value > limit:
+                value = limit
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min >= limit:
+            return limit
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SymSpellIndex:
+    """
+    Symmetric-delete index for correcting tokens to a keyword vocabulary.
+
+    Args:
+        vocabulary: Mapping of word to rank; ties at equal distance go to the lower rank
+        max_distance: Largest edit distance corrected
+        prefix_length: Characters of each word indexed (bounds deletes per word)
+        min_length: Shorter tokens are never corrected
+        known_words: Valid words that must not be corrected
+        max_index_entries: Memory budget; above it the index is rebuilt at a smaller distance
+        cache_size: Corrections remembered per token before the cache is reset
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        max_distance: int = 2,
+        prefix_length: int = 7,
+        min_length: int = 4,
+        known_words: Iterable[str] = (),
+        max_index_entries: int = 200_000,
+        cache_size: int = 10_000,
+    ):
+        self.vocabulary = dict(vocabulary)
+        self.prefix_length = prefix_length
+        self.min_length = min_length
+        self.known_words = COMMON_WORDS | HINGLISH_WORDS | frozenset(known_words)
+        self.cache_size = cache_size
+        self._cache: Dict[str, Optional[str]] = {}
+        self.lookups = 0
+        self.corrections = 0
+
+        self.max_distance = max_distance
+        self.index = self._build(max_distance)
+        while len(self.index) > max_index_entries and self.max_distance > 1:
+            self.max_distance -= 1
+            logger.warning(f"Spell index over budget ({max_index_entries} entries); using distance {self.max_distance}")
+            self.index = self._build(self.max_distance)
+
+    def _build(self, max_distance: int) -> Dict[str, Tuple[str, ...]]:
+        """Map every delete of every vocabulary word to the words it came from"""
+        index: Dict[str, List[str]] = {}
+        for word in self.vocabulary:
+            for delete in _deletes(word[:self.prefix_length], max_distance):
+                index.setdefault(delete, []).append(word)
+        return {delete: tuple(words) for delete, words in index.items()}
+
+    def lookup(self, token: str) -> Optional[str]:
+        """
+        Closest vocabulary word within the edit distance bound.
+
+        Args:
+            token: Lowercased token
+
+        Returns:
+            Corrected word, or None if the token is fine or has no close match
+        """
+        if token in self.vocabulary or len(token) < self.min_length or token in self.known_words:
+            return None
+        cache = self._cache
+        if token in cache:
+            return cache[token]
+
+        self.lookups += 1
+        max_distance = self.max_distance
+        candidates = set()
+        for delete in _deletes(token[:self.prefix_length], max_distance):
+            candidates.update(self.index.get(delete, ()))
+
+        best: Optional[Tuple[int, int, str]] = None
+        first = token[0]
+        for word in candidates:
+            if word[0] != first:
+                continue
+            distance = edit_distance(token, word, max_distance)
+            if len(word) == len(token) and len(token) < 6 and (distance > 1 or not _transposed(token, word)):
+                continue
+            if distance > 1 and len(word) < len(token):
+                continue
+            if distance <= max_distance:
+                key = (distance, self.vocabulary[word], word)
+                if best is None or key < best:
+                    best = key
+
+        correction = best[2] if best else None
+        if correction is not None:
+            self.corrections += 1
+        if len(cache) >= self.cache_size:
+            cache.clear()
+        cache[token] = correction
+        return correction
+
+    def stats(self) -> Dict:
+        """Get index size and correction statistics"""
+        return {
+            "vocabulary": len(self.vocabulary),
+            "index_entries": len(self.index),
+            "max_distance": self.max_distance,
+            "lookups": self.lookups,
+            "corrections": self.corrections,
+            "cached_tokens": len(self._cache),
+        }
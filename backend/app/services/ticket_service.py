@@ -3,9 +3,13 @@ Ticket Generation Service for CyberSathi
 Generates unique ticket IDs in format: CS-YYYYMMDD-XXXXXX
 """
 
+import itertools
 import random
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
+
+SUFFIX_MIN = 100000
+SUFFIX_SPAN = 900000  # 6-digit suffixes 100000-999999
 
 
 class TicketService:
@@ -38,6 +42,33 @@ class TicketService:
         
         return ticket_id
     
+    @staticmethod
+    def ticket_sequence() -> Callable[[], str]:
+        """
+        Ticket ID factory for bulk imports.
+        
+        Random suffixes repeat within a day after about a thousand tickets.
+        The sequence starts at a random suffix and counts up, wrapping inside
+        the 6-digit range, so the IDs it returns are all distinct.
+        
+        Returns:
+            Callable returning the next ticket ID
+            
+        Raises:
+            RuntimeError: From the callable once all suffixes are used
+        """
+        start = random.randrange(SUFFIX_SPAN)
+        counter = itertools.count()
+        
+        def next_ticket() -> str:
+            issued = next(counter)
+            if issued >= SUFFIX_SPAN:
+                raise RuntimeError(f"Ticket sequence exhausted after {SUFFIX_SPAN} IDs")
+            suffix = SUFFIX_MIN + (start + issued) % SUFFIX_SPAN
+            return f"CS-{datetime.now().strftime('%Y%m%d')}-{suffix}"
+        
+        return next_ticket
+    
     @staticmethod
     def generate_reference_id(length: int = 8) -> str:
         """
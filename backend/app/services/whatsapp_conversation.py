@@ -8,16 +8,29 @@ Implements 13-field complaint collection flow as per Prompt 1 requirements
 See PS2_IMPLEMENTATION_PLAN.md for detailed refactoring guide
 """
 
-import re
-from typing import Dict, Optional, List
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 import uuid
 
+from app.config import settings
+from app.i18n import i18n
 from app.services.nlu import nlu_service, Intent
 from app.services.whatsapp_service import whatsapp_service
 from app.services.ticket_service import ticket_service
-from app.services.validation import validation_service
+from app.services.conversation_store import (
+    ConversationStore, create_conversation_store, pack_payload, unpack_payload
+)
+from app.services.session_timer import create_complaint_timers, record_drop_off
+from app.services.complaint_writer import complaint_writer, session_to_complaint
+from app.services.complaint_flow import ComplaintField, complaint_flow, prefill_fields
+from app.services.language_id import language_identifier
+from app.services.message_dispatcher import message_dispatcher
+
+logger = logging.getLogger(__name__)
 
 
 class ConversationStage(str, Enum):
@@ -33,67 +46,164 @@ class ConversationStage(str, Enum):
     TRACKING = "tracking"
 
 
-class ComplaintField(str, Enum):
-    """Complaint collection fields - PS2.pdf compliant with all 13 mandatory reporter fields"""
-    FRAUD_TYPE = "fraud_type"
-    INCIDENT_DESCRIPTION = "incident_description"
-    INCIDENT_DATE = "incident_date"
-    INCIDENT_TIME = "incident_time"
-    AMOUNT_LOST = "amount_lost"
-    SUSPECT_INFO = "suspect_info"
-    SUSPECT_CONTACT = "suspect_contact"
-    VICTIM_NAME = "victim_name"
-    GUARDIAN_NAME = "guardian_name"
-    DOB = "dob"
-    VICTIM_PHONE = "victim_phone"
-    VICTIM_EMAIL = "victim_email"
-    GENDER = "gender"
-    VILLAGE = "village"
-    POST_OFFICE = "post_office"
-    POLICE_STATION = "police_station"
-    DISTRICT = "district"
-    PIN_CODE = "pin_code"
-    LOCATION = "location"
-    POLICE_REPORT_FILED = "police_report_filed"
-    ADDITIONAL_INFO = "additional_info"
+COMPLAINT_FIELDS = tuple(ComplaintField)
+FIELD_INDEX = {field: index for index, field in enumerate(COMPLAINT_FIELDS)}
+STAGES = tuple(ConversationStage)
+STAGE_INDEX = {stage: index for index, stage in enumerate(STAGES)}
+SESSION_FORMAT_VERSION = 2
+
+# Wire row length of every readable format version (1 had no language)
+WIRE_LENGTHS = {1: 12, 2: 13}
+
+
+@dataclass(slots=True)
+class ConversationSession:
+    """
+    Compact per-user conversation state.
+
+    Complaint answers are kept in a list indexed by ComplaintField position
+    rather than a dict, and timestamps are `time.monotonic()` seconds.
+    """
+    stage: ConversationStage = ConversationStage.INITIAL
+    current_field: Optional[ComplaintField] = None
+    primary_intent: Optional[str] = None
+    sub_intent: Optional[str] = None
+    platform_intent: Optional[str] = None
+    fraud_branch: Optional[str] = None  # A1 or A2
+    ticket_id: Optional[str] = None
+    language: str = "en"
+    values: List[Any] = field(default_factory=lambda: [None] * len(COMPLAINT_FIELDS))
+    attachments: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.monotonic)
+    updated_at: float = field(default_factory=time.monotonic)
+    
+    def get_field(self, complaint_field: ComplaintField, default: Any = None) -> Any:
+        """Get a collected complaint field"""
+        value = self.values[FIELD_INDEX[complaint_field]]
+        return default if value is None else value
+    
+    def set_field(self, complaint_field: ComplaintField, value: Any):
+        """Set a collected complaint field"""
+        self.values[FIELD_INDEX[complaint_field]] = value
+        self.updated_at = time.monotonic()
+    
+    def fields(self) -> Dict[ComplaintField, Any]:
+        """Collected complaint fields as a dict"""
+        return {f: v for f, v in zip(COMPLAINT_FIELDS, self.values) if v is not None}
+    
+    def update(self, updates: Dict):
+        """Set session attributes by name"""
+        for name, value in updates.items():
+            setattr(self, name, value)
+        self.updated_at = time.monotonic()
+    
+    def to_wire(self) -> List:
+        """Positional representation for serialization; timestamps become epoch seconds"""
+        offset = time.time() - time.monotonic()
+        return [
+            SESSION_FORMAT_VERSION,
+            STAGE_INDEX[self.stage],
+            FIELD_INDEX[self.current_field] if self.current_field is not None else None,
+            self.primary_intent,
+            self.sub_intent,
+            self.platform_intent,
+            self.fraud_branch,
+            self.ticket_id,
+            self.values,
+            self.attachments,
+            self.started_at + offset,
+            self.updated_at + offset,
+            self.language,
+        ]
+    
+    @classmethod
+    def from_wire(cls, row: List) -> "ConversationSession":
+        """
+        Rebuild a session from `to_wire` output.
+        
+        Raises:
+            ValueError: If the row is from an unknown format version or malformed
+        """
+        version = row[0] if row else None
+        if version not in WIRE_LENGTHS:
+            raise ValueError(f"Unsupported session format version {version!r} (reads {sorted(WIRE_LENGTHS)})")
+        if len(row) != WIRE_LENGTHS[version]:
+            raise ValueError(f"Session format {version} has {WIRE_LENGTHS[version]} fields, got {len(row)}")
+        
+        offset = time.time() - time.monotonic()
+        (_, stage, current_field, primary_intent, sub_intent, platform_intent,
+         fraud_branch, ticket_id, values, attachments, started_at, updated_at) = row[:12]
+        language = row[12] if version >= 2 else "en"
+        return cls(
+            stage=STAGES[stage],
+            current_field=COMPLAINT_FIELDS[current_field] if current_field is not None else None,
+            primary_intent=primary_intent,
+            sub_intent=sub_intent,
+            platform_intent=platform_intent,
+            fraud_branch=fraud_branch,
+            ticket_id=ticket_id,
+            language=language,
+            values=values,
+            attachments=attachments,
+            started_at=started_at - offset,
+            updated_at=updated_at - offset,
+        )
+
+
+def encode_session(session: ConversationSession) -> bytes:
+    """Serialize a session for the shared store"""
+    return pack_payload(session.to_wire())
+
+
+def decode_session(payload: bytes) -> ConversationSession:
+    """Deserialize a session from the shared store"""
+    return ConversationSession.from_wire(unpack_payload(payload))
+
+
+# Stages during which an idle user is nudged and eventually expired
+IN_PROGRESS_STAGES = frozenset({
+    ConversationStage.AWAITING_FRAUD_TYPE,
+    ConversationStage.COLLECTING_COMPLAINT,
+    ConversationStage.CONFIRMATION,
+})
 
 
 class ConversationState:
     """Manages conversation state for each user"""
     
-    def __init__(self):
-        self.sessions: Dict[str, Dict] = {}
+    def __init__(self, store: Optional[ConversationStore] = None):
+        self.store = store or create_conversation_store("wa_flow", encode_session, decode_session)
     
-    def get_state(self, user_id: str) -> Dict:
+    async def load(self, user_id: str):
+        """Refresh user's conversation state from the shared store"""
+        await self.store.load(user_id)
+    
+    def get_state(self, user_id: str) -> ConversationSession:
         """Get user's conversation state"""
-        return self.sessions.get(user_id, {
-            "stage": ConversationStage.INITIAL,
-            "data": {},
-            "current_field": None,
-            "primary_intent": None,
-            "sub_intent": None,
-            "platform_intent": None,
-            "fraud_branch": None,  # A1 or A2
-            "attachments": [],
-            "started_at": datetime.utcnow().isoformat()
-        })
+        return self.store.get(user_id) or ConversationSession()
     
     def update_state(self, user_id: str, updates: Dict):
         """Update user's conversation state"""
-        if user_id not in self.sessions:
-            self.sessions[user_id] = self.get_state(user_id)
-        self.sessions[user_id].update(updates)
+        state = self.get_state(user_id)
+        state.update(updates)
+        self.store.put(user_id, state)
     
     def set_field(self, user_id: str, field: ComplaintField, value: any):
         """Set a specific field in user's data"""
-        if user_id not in self.sessions:
-            self.sessions[user_id] = self.get_state(user_id)
-        self.sessions[user_id]["data"][field] = value
+        state = self.get_state(user_id)
+        state.set_field(field, value)
+        self.store.put(user_id, state)
+    
+    def touch(self, user_id: str):
+        """Record activity in the user's session, even when no field changed"""
+        state = self.store.get(user_id)
+        if state is not None:
+            state.update({})
+            self.store.put(user_id, state)
     
     def clear_state(self, user_id: str):
         """Clear user's conversation state"""
-        if user_id in self.sessions:
-            del self.sessions[user_id]
+        self.store.delete(user_id)
 
 
 class WhatsAppConversationHandler:
@@ -105,6 +215,7 @@ class WhatsAppConversationHandler:
     def __init__(self):
         self.conversation_state = ConversationState()
         self.nlu = nlu_service
+        self.session_timers = create_complaint_timers(self._nudge_idle_complaint, self._expire_idle_complaint)
     
     async def process_message(self, user_id: str, message_text: str) -> Dict:
         """
@@ -117,8 +228,67 @@ class WhatsAppConversationHandler:
         Returns:
             Response dict with text and optional buttons
         """
+        await self.conversation_state.load(user_id)
+        response = await self._route_message(user_id, message_text)
+        
+        if self.conversation_state.get_state(user_id).stage in IN_PROGRESS_STAGES:
+            self.conversation_state.touch(user_id)
+            self.session_timers.touch(user_id)
+        else:
+            self.session_timers.cancel(user_id)
+        return response
+    
+    async def _nudge_idle_complaint(self, user_id: str, elapsed: float):
+        """Queue the reminder on the user's dispatcher lane, behind any message in flight"""
+        await message_dispatcher.submit(user_id, self._nudge_if_idle, user_id)
+    
+    async def _expire_idle_complaint(self, user_id: str, elapsed: float):
+        """Queue the expiry on the user's dispatcher lane, behind any message in flight"""
+        await message_dispatcher.submit(user_id, self._expire_if_idle, user_id, elapsed)
+    
+    async def _idle_session(self, user_id: str, idle_minutes: float) -> Optional[ConversationSession]:
+        """
+        The user's complaint session if it is in progress and idle, per the shared store.
+        
+        Timers are local to the worker that last saw the user, so the session may
+        have moved on elsewhere; its `updated_at` is the authority.
+        """
+        await self.conversation_state.load(user_id)
+        state = self.conversation_state.store.get(user_id)
+        if state is None or state.stage not in IN_PROGRESS_STAGES:
+            return None
+        if time.monotonic() - state.updated_at < idle_minutes * 60 - 1:  # 1s slack for clock offsets
+            return None
+        return state
+    
+    async def _nudge_if_idle(self, user_id: str):
+        """Remind the user of their unfinished complaint"""
+        state = await self._idle_session(user_id, settings.COMPLAINT_NUDGE_AFTER_MINUTES)
+        if state is None:
+            return
+        minutes = round(settings.COMPLAINT_EXPIRE_AFTER_MINUTES - settings.COMPLAINT_NUDGE_AFTER_MINUTES)
+        await whatsapp_service.send_message(
+            to=user_id, message=i18n.get("complaint_flow.nudge", state.language, minutes=minutes)
+        )
+    
+    async def _expire_if_idle(self, user_id: str, elapsed: float):
+        """Discard an abandoned complaint flow and record where the user dropped off"""
+        state = await self._idle_session(user_id, settings.COMPLAINT_EXPIRE_AFTER_MINUTES)
+        if state is None:
+            return
+        self.conversation_state.clear_state(user_id)
+        await whatsapp_service.send_message(to=user_id, message=i18n.get("errors.timeout", state.language))
+        await record_drop_off(user_id, "complaint_flow", elapsed, {
+            "stage": state.stage.value,
+            "last_field": state.current_field.value if state.current_field else None,
+            "fraud_branch": state.fraud_branch,
+            "fields_collected": len(state.fields()),
+        })
+    
+    async def _route_message(self, user_id: str, message_text: str) -> Dict:
+        """Dispatch a message to the handler for the user's current stage"""
         state = self.conversation_state.get_state(user_id)
-        current_stage = state["stage"]
+        current_stage = state.stage
         
         if current_stage == ConversationStage.INITIAL:
             return await self._handle_initial(user_id, message_text)
@@ -145,10 +315,12 @@ class WhatsAppConversationHandler:
         
         self.conversation_state.update_state(user_id, {
             "primary_intent": intent,
-            "platform_intent": nlu_result["platform"]
+            "platform_intent": nlu_result["platform"],
+            "language": language_identifier.detect(message_text)
         })
         
         if intent == Intent.NEW_COMPLAINT:
+            self._prefill_complaint(user_id, message_text)
             return await self._start_complaint_flow(user_id, nlu_result)
         
         elif intent == Intent.CHECK_STATUS:
@@ -166,11 +338,18 @@ class WhatsAppConversationHandler:
         
         elif intent in [Intent.FINANCIAL_FRAUD, Intent.FACEBOOK_FRAUD, Intent.INSTAGRAM_FRAUD,
                        Intent.X_TWITTER_FRAUD, Intent.WHATSAPP_FRAUD, Intent.TELEGRAM_FRAUD, Intent.GMAIL_FRAUD]:
+            self._prefill_complaint(user_id, message_text)
             return await self._start_complaint_flow(user_id, nlu_result)
         
         else:
             return self._get_welcome_message(user_id)
     
+    def _prefill_complaint(self, user_id: str, message_text: str):
+        """Fill complaint fields already answered by the opening message"""
+        spans = self.nlu.extract_entity_spans(message_text)
+        for complaint_field, value in prefill_fields(message_text, spans).items():
+            self.conversation_state.set_field(user_id, complaint_field, value)
+    
     async def _start_complaint_flow(self, user_id: str, nlu_result: Dict) -> Dict:
         """Start complaint collection flow"""
         intent = nlu_result["intent"]
@@ -222,218 +401,44 @@ class WhatsAppConversationHandler:
         state = self.conversation_state.get_state(user_id)
         
         self.conversation_state.set_field(user_id, ComplaintField.FRAUD_TYPE, message_text)
+        first_field = complaint_flow.next_unanswered(complaint_flow.first_field, state.fraud_branch, state.fields())
+        if first_field is None:
+            self.conversation_state.update_state(user_id, {
+                "stage": ConversationStage.CONFIRMATION
+            })
+            return await self._show_confirmation(user_id, state)
+        
         self.conversation_state.update_state(user_id, {
             "stage": ConversationStage.COLLECTING_COMPLAINT,
-            "current_field": ComplaintField.INCIDENT_DESCRIPTION
+            "current_field": first_field
         })
         
-        return {
-            "text": "📝 Please describe the incident in detail:\n\n• What happened?\n• When did it happen?\n• How did you realize it was fraud?\n\nProvide as much detail as possible."
-        }
+        return complaint_flow.prompt(first_field, state.language, state.fields())
     
-    async def _handle_complaint_collection(self, user_id: str, message_text: str, state: Dict) -> Dict:
-        """Handle step-by-step complaint field collection"""
-        current_field = state.get("current_field")
-        
-        field_sequence = [
-            ComplaintField.INCIDENT_DESCRIPTION,
-            ComplaintField.INCIDENT_DATE,
-            ComplaintField.INCIDENT_TIME,
-            ComplaintField.AMOUNT_LOST,
-            ComplaintField.SUSPECT_INFO,
-            ComplaintField.SUSPECT_CONTACT,
-            ComplaintField.VICTIM_NAME,
-            ComplaintField.GUARDIAN_NAME,
-            ComplaintField.DOB,
-            ComplaintField.GENDER,
-            ComplaintField.VICTIM_PHONE,
-            ComplaintField.VICTIM_EMAIL,
-            ComplaintField.VILLAGE,
-            ComplaintField.POST_OFFICE,
-            ComplaintField.POLICE_STATION,
-            ComplaintField.DISTRICT,
-            ComplaintField.PIN_CODE,
-            ComplaintField.LOCATION,
-            ComplaintField.POLICE_REPORT_FILED,
-            ComplaintField.ADDITIONAL_INFO
-        ]
-        
-        if current_field == ComplaintField.INCIDENT_DESCRIPTION:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.INCIDENT_DATE
-            })
-            return {"text": "📅 When did this incident occur? (DD/MM/YYYY)"}
-        
-        elif current_field == ComplaintField.INCIDENT_DATE:
-            date_pattern = re.compile(r'^\d{1,2}[/-]\d{1,2}[/-]\d{4}$')
-            if not date_pattern.match(message_text.strip()):
-                return {"text": "❌ Invalid date format. Please use DD/MM/YYYY format (e.g., 14/11/2024)"}
-            
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.INCIDENT_TIME
-            })
-            return {"text": "🕐 What time did it happen? (HH:MM format, e.g., 14:30)"}
-        
-        elif current_field == ComplaintField.INCIDENT_TIME:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.AMOUNT_LOST
-            })
-            return {"text": "💵 How much money was lost (if any)? Enter amount in ₹ or type '0' if not applicable."}
-        
-        elif current_field == ComplaintField.AMOUNT_LOST:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.SUSPECT_INFO
-            })
-            return {"text": "🔍 Do you have any information about the suspect/fraudster?\n\nProvide name, details, or type 'Unknown' if you don't have any information."}
-        
-        elif current_field == ComplaintField.SUSPECT_INFO:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.SUSPECT_CONTACT
-            })
-            return {"text": "📞 Do you have suspect's phone number, email, or social media profile? Type 'Unknown' if not available."}
-        
-        elif current_field == ComplaintField.SUSPECT_CONTACT:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.VICTIM_NAME
-            })
-            return {"text": "👤 Please provide your full name (as per Aadhaar):"}
-        
-        elif current_field == ComplaintField.VICTIM_NAME:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.GUARDIAN_NAME
-            })
-            return {"text": "👨‍👩‍👧 Please provide your Father's/Spouse's/Guardian's name:"}
-        
-        elif current_field == ComplaintField.GUARDIAN_NAME:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.DOB
-            })
-            return {"text": "📅 Please provide your Date of Birth (DD/MM/YYYY):"}
-        
-        elif current_field == ComplaintField.DOB:
-            is_valid, normalized_dob = validation_service.is_valid_dob(message_text)
-            if not is_valid:
-                return {"text": "❌ Invalid date format. Please enter your date of birth in DD/MM/YYYY format (e.g., 15/08/1990)"}
-            
-            self.conversation_state.set_field(user_id, current_field, normalized_dob)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.GENDER
-            })
-            return {
-                "text": "⚧ Please select your gender:",
-                "buttons": [
-                    {"id": "male", "title": "Male"},
-                    {"id": "female", "title": "Female"},
-                    {"id": "other", "title": "Other"},
-                    {"id": "prefer_not_to_say", "title": "Prefer not to say"}
-                ]
-            }
-        
-        elif current_field == ComplaintField.GENDER:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.VICTIM_PHONE
-            })
-            return {"text": "📱 Please provide your mobile number (10 digits):"}
-        
-        elif current_field == ComplaintField.VICTIM_PHONE:
-            if not validation_service.is_valid_phone(message_text):
-                return {"text": "❌ Invalid mobile number. Please enter a valid 10-digit mobile number starting with 6-9."}
-            
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.VICTIM_EMAIL
-            })
-            return {"text": "📧 Please provide your email address:"}
-        
-        elif current_field == ComplaintField.VICTIM_EMAIL:
-            if not validation_service.is_valid_email(message_text):
-                return {"text": "❌ Invalid email address. Please enter a valid email (e.g., user@example.com)"}
-            
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.VILLAGE
-            })
-            return {"text": "🏘️ Please provide your Village/Town name:"}
-        
-        elif current_field == ComplaintField.VILLAGE:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.POST_OFFICE
-            })
-            return {"text": "📮 Please provide your Post Office name:"}
-        
-        elif current_field == ComplaintField.POST_OFFICE:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.POLICE_STATION
-            })
-            return {"text": "🚓 Please provide your Police Station name:"}
-        
-        elif current_field == ComplaintField.POLICE_STATION:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.DISTRICT
-            })
-            return {"text": "🏛️ Please provide your District name:"}
-        
-        elif current_field == ComplaintField.DISTRICT:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.PIN_CODE
-            })
-            return {"text": "📍 Please provide your PIN code (6 digits):"}
-        
-        elif current_field == ComplaintField.PIN_CODE:
-            if not validation_service.is_valid_pin(message_text):
-                return {"text": "❌ Invalid PIN code. Please enter a valid 6-digit PIN code (cannot start with 0)."}
-            
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.LOCATION
-            })
-            return {"text": "📍 What is your current location/address (City, State):"}
-        
-        elif current_field == ComplaintField.LOCATION:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.POLICE_REPORT_FILED
-            })
-            return {
-                "text": "🚔 Have you filed a police report for this incident?",
-                "buttons": [
-                    {"id": "yes_police_report", "title": "Yes, I have filed FIR"},
-                    {"id": "no_police_report", "title": "No, not yet"}
-                ]
-            }
-        
-        elif current_field == ComplaintField.POLICE_REPORT_FILED:
-            self.conversation_state.set_field(user_id, current_field, message_text)
-            self.conversation_state.update_state(user_id, {
-                "current_field": ComplaintField.ADDITIONAL_INFO
-            })
-            return {"text": "📎 Any additional information or documents you'd like to add? (Type 'None' if not applicable)\n\nYou can also attach up to 5 files (screenshots, PDFs, etc.)"}
+    async def _handle_complaint_collection(self, user_id: str, message_text: str, state: ConversationSession) -> Dict:
+        """Handle step-by-step complaint field collection via the compiled flow table"""
+        result = complaint_flow.advance(state.current_field, message_text, state.fraud_branch, state.language,
+                                        answered=state.fields())
+        if result is None:
+            return self._get_default_response(user_id)
+        if not result.valid:
+            return result.response
         
-        elif current_field == ComplaintField.ADDITIONAL_INFO:
-            self.conversation_state.set_field(user_id, current_field, message_text)
+        self.conversation_state.set_field(user_id, state.current_field, result.value)
+        if result.completed:
             self.conversation_state.update_state(user_id, {
                 "stage": ConversationStage.CONFIRMATION
             })
             return await self._show_confirmation(user_id, state)
         
-        return self._get_default_response(user_id)
+        self.conversation_state.update_state(user_id, {
+            "current_field": result.next_field
+        })
+        return result.response
     
-    async def _show_confirmation(self, user_id: str, state: Dict) -> Dict:
+    async def _show_confirmation(self, user_id: str, state: ConversationSession) -> Dict:
         """Show complaint summary for confirmation"""
-        data = state["data"]
+        data = state.fields()
         
         summary = f"""
 📋 **COMPLAINT SUMMARY**
@@ -461,13 +466,20 @@ Please review and confirm the details are correct:
             ]
         }
     
-    async def _handle_confirmation(self, user_id: str, message_text: str, state: Dict) -> Dict:
+    async def _handle_confirmation(self, user_id: str, message_text: str, state: ConversationSession) -> Dict:
         """Handle complaint confirmation"""
         text_lower = message_text.lower()
         
         if "confirm" in text_lower or "yes" in text_lower or "submit" in text_lower:
             ticket_id = ticket_service.generate_ticket()
             
+            # Journaled now and persisted by the write-behind writer; the citizen gets the ticket now
+            try:
+                complaint_writer.submit(session_to_complaint(state, user_id, ticket_id))
+            except OSError as e:
+                logger.error(f"Could not journal complaint {ticket_id}: {e}")
+                return {"text": i18n.get("errors.generic", state.language)}
+            
             self.conversation_state.update_state(user_id, {
                 "stage": ConversationStage.COMPLETED,
                 "ticket_id": ticket_id
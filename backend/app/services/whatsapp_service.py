@@ -1,17 +1,116 @@
+import asyncio
 import httpx
 import logging
-from typing import List, Dict, Optional
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Tuple
 from app.config import settings
+from app.services.rate_limiter import TokenBucket
+from app.services.outbound_queue import OutboundRetryQueue
 
 logger = logging.getLogger(__name__)
 
 
+class SendMetrics:
+    """Rolling latency window and outcome counters for outbound sends."""
+    
+    def __init__(self, window: int = 2048):
+        self.latencies = deque(maxlen=window)
+        self.sent = 0
+        self.failed = 0
+        self.throttled = 0
+        self.queued = 0
+    
+    def record_latency(self, seconds: float):
+        self.latencies.append(seconds)
+    
+    def snapshot(self) -> Dict:
+        ordered = sorted(self.latencies)
+        
+        def percentile(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            index = min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))
+            return round(ordered[index] * 1000, 2)
+        
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "throttled": self.throttled,
+            "queued_for_retry": self.queued,
+            "latency_ms": {
+                "samples": len(ordered),
+                "p50": percentile(0.50),
+                "p99": percentile(0.99),
+                "max": round(ordered[-1] * 1000, 2) if ordered else None,
+            },
+        }
+
+
 class WhatsAppService:
     def __init__(self):
         self.api_version = settings.WHATSAPP_API_VERSION
         self.phone_number_id = settings.META_PHONE_NUMBER_ID
         self.access_token = settings.META_ACCESS_TOKEN
-        self.base_url = f"https://graph.facebook.com/{self.api_version}/{self.phone_number_id}/messages"
+        self.base_url = self._messages_url(self.phone_number_id)
+        self.headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json"
+        }
+        self.max_retries = settings.WHATSAPP_SEND_MAX_RETRIES
+        self.retry_queue = OutboundRetryQueue(
+            max_attempts=settings.WHATSAPP_RETRY_QUEUE_MAX_ATTEMPTS,
+            lease_seconds=settings.WHATSAPP_RETRY_LEASE_SECONDS,
+        )
+        self.metrics = SendMetrics()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._retry_task: Optional[asyncio.Task] = None
+    
+    def _messages_url(self, phone_number_id: str) -> str:
+        """Graph API messages endpoint of a sending phone number."""
+        return f"https://graph.facebook.com/{self.api_version}/{phone_number_id}/messages"
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared keep-alive HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(
+                    max_connections=settings.WHATSAPP_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.WHATSAPP_HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return self._client
+    
+    def _bucket_for(self, phone_number_id: str) -> TokenBucket:
+        """Get the rate limiter for a sending phone number."""
+        bucket = self._buckets.get(phone_number_id)
+        if bucket is None:
+            bucket = TokenBucket(
+                rate=settings.WHATSAPP_RATE_LIMIT_PER_SECOND,
+                capacity=settings.WHATSAPP_RATE_LIMIT_BURST,
+            )
+            self._buckets[phone_number_id] = bucket
+        return bucket
+    
+    async def start(self):
+        """Start the background retry worker."""
+        if self._retry_task is None:
+            self._retry_task = asyncio.create_task(self._run_retry_worker(), name="wa-outbound-retry")
+    
+    async def close(self):
+        """Stop the retry worker and close pooled connections."""
+        if self._retry_task is not None:
+            self._retry_task.cancel()
+            await asyncio.gather(self._retry_task, return_exceptions=True)
+            self._retry_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def send_message(
         self,
@@ -19,11 +118,6 @@ class WhatsAppService:
         message: str,
         buttons: Optional[List[Dict]] = None
     ) -> Dict:
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-        
         if buttons and len(buttons) > 0:
             payload = self._create_interactive_message(to, message, buttons)
         else:
@@ -34,19 +128,126 @@ class WhatsAppService:
                 "text": {"body": message}
             }
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"WhatsApp API error: {e}")
-            return {"error": str(e)}
+        return await self._send(to, payload)
+    
+    async def _send(self, to: str, payload: Dict) -> Dict:
+        """Send a payload, queueing it for retry if delivery fails."""
+        result, error, retryable = await self._post(payload)
+        if error is None:
+            self.metrics.sent += 1
+            return result
+        
+        self.metrics.failed += 1
+        logger.error(f"WhatsApp API error: {error}")
+        await self.retry_queue.enqueue(to, payload, self.phone_number_id, error, dead=not retryable)
+        if retryable:
+            self.metrics.queued += 1
+        return {"error": error, "queued": retryable}
+    
+    async def _post(
+        self, payload: Dict, phone_number_id: Optional[str] = None
+    ) -> Tuple[Optional[Dict], Optional[str], bool]:
+        """
+        POST a payload through the pooled client and rate limiter.
+        
+        429 responses pause the sender's bucket for the Retry-After period and
+        are retried inline up to `max_retries` times.
+        
+        Args:
+            payload: WhatsApp API payload
+            phone_number_id: Sending phone number (defaults to the configured one)
+        
+        Returns:
+            Tuple of (response_json, error_message, retryable)
+        """
+        phone_number_id = phone_number_id or self.phone_number_id
+        bucket = self._bucket_for(phone_number_id)
+        url = self.base_url if phone_number_id == self.phone_number_id else self._messages_url(phone_number_id)
+        error = None
+        
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            started = time.perf_counter()
+            try:
+                response = await self._get_client().post(url, headers=self.headers, json=payload)
+            except httpx.HTTPError as e:
+                self.metrics.record_latency(time.perf_counter() - started)
+                return None, str(e) or e.__class__.__name__, True
+            self.metrics.record_latency(time.perf_counter() - started)
+            
+            if response.status_code == 429:
+                self.metrics.throttled += 1
+                delay = self._retry_after(response, attempt)
+                bucket.pause(delay)
+                error = f"Rate limited by WhatsApp API (retry after {delay:.1f}s)"
+                continue
+            
+            if response.status_code >= 500:
+                return None, f"WhatsApp API server error {response.status_code}", True
+            if response.status_code >= 400:
+                return None, f"WhatsApp API client error {response.status_code}: {response.text[:200]}", False
+            
+            return response.json(), None, False
+        
+        return None, error, True
+    
+    @staticmethod
+    def _retry_after(response: httpx.Response, attempt: int) -> float:
+        """Parse the Retry-After header, falling back to exponential backoff."""
+        value = response.headers.get("Retry-After")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(value)
+                    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+                except (TypeError, ValueError):
+                    pass
+        return float(min(60, 2 ** attempt))
+    
+    async def retry_due(self) -> int:
+        """
+        Resend the retry queue entries that are due and claimed by this worker.
+        
+        Each entry goes out through the sending number (and its rate limiter)
+        it was originally queued for.
+        
+        Returns:
+            Number of entries attempted
+        """
+        entries = await self.retry_queue.claim_due()
+        for entry in entries:
+            if isinstance(entry, dict):
+                payload, phone_number_id = entry["payload"], entry["phone_number_id"]
+            else:
+                payload, phone_number_id = entry.payload, entry.phone_number_id
+            result, error, retryable = await self._post(payload, phone_number_id)
+            if error is None:
+                self.metrics.sent += 1
+                await self.retry_queue.mark_sent(entry)
+            else:
+                await self.retry_queue.mark_failed(entry, error, dead=not retryable)
+        return len(entries)
+    
+    async def _run_retry_worker(self, interval: float = 5.0):
+        """Periodically resend due entries from the retry queue."""
+        while True:
+            try:
+                await self.retry_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbound retry worker error: {e}")
+            await asyncio.sleep(interval)
+    
+    async def get_stats(self) -> Dict:
+        """Get send metrics, limiter state and retry queue depth."""
+        stats = self.metrics.snapshot()
+        stats["retry_queue"] = await self.retry_queue.depth()
+        stats["dead_letters"] = self.retry_queue.dead_letters
+        stats["rate_limit_per_second"] = settings.WHATSAPP_RATE_LIMIT_PER_SECOND
+        return stats
     
     def _create_interactive_message(self, to: str, message: str, buttons: List[Dict]) -> Dict:
         if len(buttons) <= 3:
@@ -105,11 +306,6 @@ class WhatsAppService:
         language_code: str = "en",
         parameters: Optional[List[str]] = None
     ) -> Dict:
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "messaging_product": "whatsapp",
             "to": to,
@@ -128,19 +324,7 @@ class WhatsAppService:
                 }
             ]
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPError as e:
-            logger.error(f"WhatsApp template API error: {e}")
-            return {"error": str(e)}
+        return await self._send(to, payload)
 
 
 whatsapp_service = WhatsAppService()
@@ -0,0 +1,33 @@
+"""
+Identity of the current worker process for CyberSathi
+
+Several uvicorn workers share one database. Background jobs that must run
+once across all of them (retrying a queued send, running a campaign) claim
+their work with an atomic update that records the claiming worker and a
+lease expiry; a worker that dies leaves an expired lease that another
+worker may take over.
+"""
+
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+_identity = {"pid": None, "id": None}
+
+
+def worker_id() -> str:
+    """
+    Unique ID of this process (host, pid and a random suffix).
+
+    Recomputed after a fork, so pre-forked workers never share an ID.
+    """
+    if _identity["pid"] != os.getpid():
+        _identity["pid"] = os.getpid()
+        _identity["id"] = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    return _identity["id"]
+
+
+def lease_until(seconds: float) -> datetime:
+    """Expiry of a lease taken now"""
+    return datetime.utcnow() + timedelta(seconds=seconds)
@@ -0,0 +1,96 @@
+"""Assign canonical district codes to existing complaints
+
+Usage:
+    python scripts/backfill_district_codes.py [--all] [--dry-run]
+
+Complaints saved before the district gazetteer have no district_code. The
+distinct (location.district, reporter_info.district) pairs among them are
+read with one aggregation, each pair is resolved once, and every complaint
+sharing it is updated with one update_many. A missing location.state is
+filled from the gazetteer at the same time. District texts that resolve to
+nothing are listed with their counts, so aliases can be added to
+app/data/districts.json and the script re-run. --all re-resolves coded
+complaints too (e.g. after the gazetteer or its matching rules change) and
+clears codes whose text no longer resolves.
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import db
+from app.models.complaint import ComplaintDocument
+from app.services.gazetteer import gazetteer, resolve_district
+
+UNCODED = {"district_code": None}
+
+
+def pairs_pipeline(scope):
+    """Distinct district text pairs among the complaints in scope"""
+    return [
+        {"$match": scope},
+        {"$group": {
+            "_id": {"location": "$location.district", "reporter": "$reporter_info.district"},
+            "count": {"$sum": 1},
+        }},
+    ]
+
+
+async def main():
+    """Resolve uncoded complaint districts and write their codes"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="Re-resolve coded complaints as well")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--show", type=int, default=20, help="Unresolved district texts to list")
+    args = parser.parse_args()
+
+    if gazetteer is None:
+        raise SystemExit("❌ District gazetteer is not available")
+
+    await db.connect_db()
+    started = time.perf_counter()
+    resolved = Counter()
+    unresolved = Counter()
+
+    try:
+        scope = {} if args.all else UNCODED
+        pairs = await ComplaintDocument.aggregate(pairs_pipeline(scope)).to_list()
+        for pair in pairs:
+            location, reporter = pair["_id"].get("location"), pair["_id"].get("reporter")
+            query = {**scope, "location.district": location, "reporter_info.district": reporter}
+            district = resolve_district(location, reporter)
+            if district is None:
+                unresolved[location or reporter or "(blank)"] += pair["count"]
+                if args.all and not args.dry_run:
+                    await ComplaintDocument.find(query).update({"$set": {"district_code": None}})
+                continue
+            resolved[district.name] += pair["count"]
+            if args.dry_run:
+                continue
+
+            await ComplaintDocument.find(
+                {**query, "location.state": {"$in": [None, ""]}, "location": {"$type": "object"}}
+            ).update({"$set": {"location.state": district.state}})
+            await ComplaintDocument.find(
+                {**query, "location": None}
+            ).update({"$set": {"location": {"district": reporter, "state": district.state, "country": "India"}}})
+            await ComplaintDocument.find(query).update({"$set": {"district_code": district.code}})
+    finally:
+        await db.close_db()
+
+    elapsed = time.perf_counter() - started
+    action = "Would code" if args.dry_run else "Coded"
+    print(f"✅ {action} {sum(resolved.values())} complaints across {len(resolved)} districts "
+          f"from {len(pairs)} distinct texts in {elapsed:.1f}s")
+    if unresolved:
+        print(f"   {sum(unresolved.values())} complaints left uncoded; most common district texts:")
+        for text, count in unresolved.most_common(args.show):
+            print(f"   {text!r}: {count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+Benchmark PII masking of log lines
+
+Compares the single-pass masker against the previous implementation (three
+re.sub calls on pattern strings) on synthetic log lines of growing size
+with phones, emails and Aadhaar numbers scattered through ordinary text,
+and measures what the logging filter costs for emitted and suppressed
+records.
+
+Usage:
+    python scripts/bench_pii_masking.py [--lines N] [--seed S]
+"""
+
+import argparse
+import io
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.pii_masking import PIIMaskingService, PIIRedactionFilter
+
+WORDS = (
+    "processed", "message", "from", "status", "delivered", "complaint", "ticket", "webhook",
+    "session", "updated", "stage", "collecting", "retry", "queued", "lane", "ok", "id=42",
+    "amount=15000", "2024-11-14", "14:30:00",
+)
+
+
+def legacy_mask(text: str) -> str:
+    """The previous mask_for_logging, kept for comparison"""
+    if not text:
+        return ""
+    result = re.sub(r'(?:\+91[-\s]?)?[6-9]\d{9}', '[PHONE_MASKED]', text)
+    result = re.sub(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', '[EMAIL_MASKED]', result)
+    return re.sub(r'\d{4}[-\s]?\d{4}[-\s]?\d{4}', '[AADHAAR_MASKED]', result)
+
+
+def pii(rng: random.Random) -> str:
+    kind = rng.choice(("phone", "wa", "email", "aadhaar"))
+    if kind == "phone":
+        return f"+91 {rng.randint(6, 9)}{rng.randrange(10 ** 9):09d}"
+    if kind == "wa":
+        return f"91{rng.randint(6, 9)}{rng.randrange(10 ** 9):09d}"
+    if kind == "email":
+        return f"user{rng.randrange(1000)}@example.com"
+    return f"{rng.randrange(1000, 9999)} {rng.randrange(1000, 9999)} {rng.randrange(1000, 9999)}"
+
+
+def make_line(rng: random.Random, words: int) -> str:
+    return " ".join(pii(rng) if rng.random() < 0.05 else rng.choice(WORDS) for _ in range(words))
+
+
+def timed(function, lines, repeats: int = 3) -> float:
+    """Best of several runs over the lines, in seconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for line in lines:
+            function(line)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_filter(lines) -> None:
+    """Logging with the filter on an emitting handler vs a suppressed level"""
+    logger = logging.getLogger("bench.pii")
+    logger.propagate = False
+    handler = logging.StreamHandler(io.StringIO())
+    handler.addFilter(PIIRedactionFilter())
+    logger.addHandler(handler)
+
+    for level, label in ((logging.INFO, "emitted"), (logging.WARNING, "suppressed")):
+        logger.setLevel(level)
+        started = time.perf_counter()
+        for line in lines:
+            logger.info("Processed %s", line)
+        elapsed = time.perf_counter() - started
+        print(f"  logger.info {label:<10} {elapsed / len(lines) * 1e6:8.1f} µs/record")
+    plain = logging.StreamHandler(io.StringIO())
+    logger.removeHandler(handler)
+    logger.addHandler(plain)
+    logger.setLevel(logging.INFO)
+    started = time.perf_counter()
+    for line in lines:
+        logger.info("Processed %s", line)
+    elapsed = time.perf_counter() - started
+    print(f"  logger.info {'unfiltered':<10} {elapsed / len(lines) * 1e6:8.1f} µs/record")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=2000, help="Log lines per size")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'words/line':>10} {'legacy µs':>10} {'single µs':>10} {'speedup':>8}")
+    for words in (20, 200, 2000):
+        lines = [make_line(rng, words) for _ in range(args.lines)]
+        legacy = timed(legacy_mask, lines)
+        single = timed(PIIMaskingService.mask_for_logging, lines)
+        print(f"{words:>10} {legacy / len(lines) * 1e6:>10.1f} {single / len(lines) * 1e6:>10.1f} "
+              f"{legacy / single:>7.1f}x")
+
+    print("\nLogging filter (200-word lines):")
+    bench_filter([make_line(rng, 200) for _ in range(args.lines)])
+
+
+if __name__ == "__main__":
+    main()
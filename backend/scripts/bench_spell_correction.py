@@ -0,0 +1,124 @@
+"""
+Benchmark the NLU spelling correction on realistic misspelt messages
+
+Misspellings are generated the way people mistype on phone keyboards: one or
+two dropped letters, swapped neighbours, doubled letters and substitutions
+with an adjacent QWERTY key, applied to intent keywords inside short
+messages. Reports how many misspelt messages recover their intent, how many
+clean messages change intent, and lookup latency.
+
+Usage:
+    python scripts/bench_spell_correction.py [--messages N] [--seed S]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.nlu import INTENT_PRIORITY, NLUService
+
+KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+NEIGHBOURS = {
+    row[i]: row[max(i - 1, 0)] + row[i + 1:i + 2]
+    for row in KEYBOARD_ROWS
+    for i in range(len(row))
+}
+TEMPLATES = (
+    "{} on my number",
+    "i got {} yesterday",
+    "please help {} issue",
+    "mera {} ho gaya",
+    "someone did {} with me",
+)
+CLEAN_MESSAGES = (
+    "hello there",
+    "thank you so much",
+    "what are your office hours",
+    "i want to talk to someone",
+    "random text here",
+    "can you send the menu",
+    "my son lost his phone at the station",
+    "how do i change my name",
+)
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Apply one or two keyboard-style typos to a word"""
+    for _ in range(rng.choice((1, 1, 2))):
+        i = rng.randrange(1, len(word))
+        kind = rng.choice(("drop", "swap", "double", "neighbour"))
+        if kind == "drop" and len(word) > 4:
+            word = word[:i] + word[i + 1:]
+        elif kind == "swap" and i < len(word) - 1:
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        elif kind == "double":
+            word = word[:i] + word[i] + word[i:]
+        elif word[i] in NEIGHBOURS:
+            word = word[:i] + rng.choice(NEIGHBOURS[word[i]]) + word[i + 1:]
+    return word
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000, help="Misspelt messages to generate")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    service = NLUService()
+    plain = NLUService()
+    plain.spell_index = None
+
+    keywords = [
+        (keyword, intent)
+        for intent in INTENT_PRIORITY
+        for keyword in service.intent_rules[intent].keywords
+        if keyword.isascii() and len(keyword) >= 5
+    ]
+    messages = []
+    for _ in range(args.messages):
+        keyword, intent = rng.choice(keywords)
+        typo = misspell(keyword, rng)
+        if typo != keyword:
+            messages.append((rng.choice(TEMPLATES).format(typo), intent, typo))
+
+    start = time.perf_counter()
+    build_service = NLUService()
+    build_ms = (time.perf_counter() - start) * 1000
+    stats = build_service.spell_index.stats()
+    print(f"Index: {stats['vocabulary']} words, {stats['index_entries']} deletes, "
+          f"distance {stats['max_distance']} (service built in {build_ms:.1f} ms)")
+
+    missed_before = sum(plain.detect_intent(text) != intent for text, intent, _ in messages)
+    missed_after = sum(service.detect_intent(text) != intent for text, intent, _ in messages)
+    changed = [text for text in CLEAN_MESSAGES if plain.detect_intent(text) != service.detect_intent(text)]
+    print(f"Misspelt messages: {len(messages)}")
+    print(f"  wrong intent without correction: {missed_before} ({missed_before / len(messages):.1%})")
+    print(f"  wrong intent with correction:    {missed_after} ({missed_after / len(messages):.1%})")
+    print(f"Clean messages changed by correction: {len(changed)} {changed}")
+
+    timings = []
+    for _, _, token in messages:
+        service.spell_index._cache.clear()
+        start = time.perf_counter_ns()
+        service.spell_index.lookup(token)
+        timings.append((time.perf_counter_ns() - start) / 1000)
+    timings.sort()
+    print(f"Uncached lookup: p50 {statistics.median(timings):.1f} µs, "
+          f"p99 {timings[int(len(timings) * 0.99)]:.1f} µs")
+
+    start = time.perf_counter()
+    for text, _, _ in messages:
+        service.detect_intent(text)
+    elapsed = time.perf_counter() - start
+    print(f"detect_intent on misspelt messages: {elapsed / len(messages) * 1e6:.1f} µs/message")
+    print("✅ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Build the memory-mapped PIN code directory from a CSV
+
+Usage:
+    python scripts/build_pin_directory.py [SOURCE.csv] [--out PATH]
+
+SOURCE is a post office list with a header naming the office, PIN,
+district and state columns - the India Post "All India Pincode Directory"
+export from data.gov.in works as downloaded (officename, pincode,
+district/Districtname, statename). Office-type suffixes (B.O, S.O, H.O)
+are dropped. Defaults to the bundled app/data/pin_directory.csv sample,
+which covers Odisha district headquarters only; build from the full
+export for production.
+"""
+import argparse
+import csv
+import re
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.pin_directory import DEFAULT_DIRECTORY_PATH, PinDirectory
+
+DEFAULT_SOURCE = DEFAULT_DIRECTORY_PATH.with_suffix(".csv")
+
+COLUMNS = {
+    "office": ("officename", "office_name", "office"),
+    "pin": ("pincode", "pin_code", "pin"),
+    "district": ("district", "districtname", "district_name"),
+    "state": ("statename", "state_name", "state"),
+}
+OFFICE_SUFFIX = re.compile(r"\s+[BSH]\.?O\.?$", re.IGNORECASE)
+
+
+def read_rows(path):
+    """Yield (pin, office, district, state) from a post office CSV"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        index = {}
+        for key, candidates in COLUMNS.items():
+            found = [header.index(name) for name in candidates if name in header]
+            if not found:
+                raise SystemExit(f"❌ {path}: no {key} column (expected one of {', '.join(candidates)})")
+            index[key] = found[0]
+        width = max(index.values()) + 1
+        for row in reader:
+            if len(row) < width:
+                continue
+            office = OFFICE_SUFFIX.sub("", row[index["office"]].strip())
+            yield (
+                row[index["pin"]],
+                office,
+                row[index["district"]].strip().title(),
+                row[index["state"]].strip().title(),
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", default=str(DEFAULT_SOURCE), help="Post office CSV")
+    parser.add_argument("--out", default=str(DEFAULT_DIRECTORY_PATH), help="Directory file to write")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = PinDirectory.build(read_rows(args.source), args.out)
+    elapsed = time.perf_counter() - started
+
+    directory = PinDirectory(args.out)
+    assert len(directory) == count
+    directory.close()
+    print(f"✅ Wrote {count} post offices to {args.out} ({os.path.getsize(args.out)} bytes) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
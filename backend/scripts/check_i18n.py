@@ -0,0 +1,33 @@
+"""
+Report translation keys missing from, or inconsistent with, the default language
+
+Usage:
+    python scripts/check_i18n.py
+
+Exits with status 1 when any language has missing keys or mismatched
+placeholders, so it can run in CI.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.i18n import i18n
+
+
+def main() -> int:
+    failed = False
+    for lang, problems in i18n.validate().items():
+        if not any(problems.values()):
+            print(f"✅ {lang}: complete")
+            continue
+        for kind in ("missing", "extra", "placeholders"):
+            for key in problems[kind]:
+                print(f"❌ {lang}: {kind} {key}")
+        failed = failed or bool(problems["missing"] or problems["placeholders"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
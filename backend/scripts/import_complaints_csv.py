@@ -0,0 +1,77 @@
+"""Bulk-import complaints from a CSV file
+
+Usage:
+    python scripts/import_complaints_csv.py complaints.csv [--batch-size N] [--dry-run] [--rejects rejects.csv]
+
+The file is streamed in batches; each batch is validated column-wise and its
+valid rows are inserted with one insert_many. Rejected rows are counted by
+failed check and, with --rejects, written out as (row, errors) for fixing.
+See app/services/csv_import.py for the expected columns.
+"""
+import argparse
+import asyncio
+import csv
+import sys
+import os
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import db
+from app.models.complaint import ComplaintDocument
+from app.services.batch_validation import describe
+from app.services.csv_import import DEFAULT_BATCH_SIZE, import_batches
+
+
+async def main():
+    """Validate and insert a complaints CSV batch by batch"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV file with a header row")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, do not connect or insert")
+    parser.add_argument("--rejects", help="Write rejected row numbers and their errors to this CSV")
+    args = parser.parse_args()
+
+    if not args.dry_run:
+        await db.connect_db()
+    errors = Counter()
+    inserted = rejected = 0
+    started = time.perf_counter()
+    rejects_file = open(args.rejects, "w", newline="", encoding="utf-8") if args.rejects else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+    if rejects_writer:
+        rejects_writer.writerow(["row", "errors"])
+
+    try:
+        with open(args.path, newline="", encoding="utf-8-sig") as stream:
+            for batch in import_batches(stream, args.batch_size):
+                failed = batch.rejected
+                records = [record for _, record in batch.accepted]
+                if records and not args.dry_run:
+                    documents = [ComplaintDocument(**record) for record in records]
+                    for document in documents:
+                        document.protect_fields()  # insert_many does not run document hooks
+                    await ComplaintDocument.insert_many(documents)
+                inserted += len(records)
+                rejected += len(failed)
+                for row, code in failed:
+                    names = describe(code)
+                    errors.update(names)
+                    if rejects_writer:
+                        rejects_writer.writerow([row, ";".join(names)])
+    finally:
+        if rejects_file:
+            rejects_file.close()
+        if not args.dry_run:
+            await db.close_db()
+
+    elapsed = time.perf_counter() - started
+    action = "Validated" if args.dry_run else "Imported"
+    print(f"✅ {action} {inserted} complaints in {elapsed:.1f}s, rejected {rejected} rows")
+    for name, count in errors.most_common():
+        print(f"   {name}: {count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
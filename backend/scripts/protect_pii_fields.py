@@ -0,0 +1,144 @@
+"""Write blind indexes (and encrypt PII when enabled) on existing records
+
+Usage:
+    python scripts/protect_pii_fields.py [--all] [--batch-size N]
+
+Complaints and account unfreeze requests written before blind indexes
+existed cannot be found by phone, email or account number. This script
+reads the protected fields of --batch-size records at a time, decrypts them
+column-wise, computes the same blind indexes as the models' save hooks and,
+with FIELD_ENCRYPTION_ENABLED, encrypts the phone, email and account
+fields. Only those fields and the `pii_protection` marker are written, as
+bulk $set updates each filtered on the values it was computed from: a
+record edited while the script runs is skipped, not overwritten, and picked
+up by the next run.
+
+By default only records not yet protected at the current level ("indexed",
+or "encrypted" once encryption is on) or without an email index are
+visited, so re-running the script finishes once every record is marked;
+--all visits everything (e.g. after changing BLIND_INDEX_KEY).
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from beanie import BulkWriter
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.database import db
+from app.models.account_unfreeze import UNFREEZE_ENCRYPTED_FIELDS, UnfreezeRequestDocument
+from app.models.complaint import ACCOUNT_FIELDS, EMAIL_FIELDS, ENCRYPTED_FIELDS, PHONE_FIELDS, ComplaintDocument
+from app.services.encryption_service import blind_index, decrypt_documents, field_cipher, protection_level
+
+
+@dataclass(frozen=True)
+class Target:
+    """A collection and the fields its protect_fields hook covers"""
+    model: type
+    encrypted: Tuple[str, ...]
+    phones: Tuple[str, ...]
+    emails: Tuple[str, ...]
+    accounts: Tuple[str, ...]
+    many: bool  # list of blind indexes (complaints) or a single one
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys((*self.encrypted, *self.phones, *self.emails, *self.accounts)))
+
+
+TARGETS = (
+    Target(ComplaintDocument, ENCRYPTED_FIELDS, PHONE_FIELDS, EMAIL_FIELDS, ACCOUNT_FIELDS, many=True),
+    Target(UnfreezeRequestDocument, UNFREEZE_ENCRYPTED_FIELDS, ("phone",), ("email",), ("account_number",), many=False),
+)
+
+
+def get_path(document: Dict, path: str):
+    """Raw value at a dotted path, or None"""
+    for part in path.split("."):
+        if not isinstance(document, dict):
+            return None
+        document = document.get(part)
+    return document
+
+
+def protection_updates(target: Target, raws: List[Dict], level: str) -> List[UpdateOne]:
+    """$set of the blind indexes, encrypted fields and marker for a batch of raw records"""
+    stored = [{path: get_path(raw, path) for path in target.paths} for raw in raws]
+    decrypt_documents(raws, target.paths)
+    operations = []
+    for raw, values in zip(raws, stored):
+        plain = {path: get_path(raw, path) for path in target.paths}
+        indexes = {
+            f"{kind}_bidx": blind_index.compute_many(kind, (plain[path] for path in paths))
+            for kind, paths in (("phone", target.phones), ("email", target.emails), ("account", target.accounts))
+        }
+        changes = {
+            **{name: found if target.many else next(iter(found), None) for name, found in indexes.items()},
+            "pii_protection": level,
+        }
+        if level == "encrypted":
+            for path in target.encrypted:
+                if plain[path] and not field_cipher.is_encrypted(values[path]):
+                    changes[path] = field_cipher.encrypt(plain[path])
+        operations.append(UpdateOne({"_id": raw["_id"], **values}, {"$set": changes}))
+    return operations
+
+
+async def protect(target: Target, query: Dict, batch_size: int, level: str) -> Tuple[int, int]:
+    """Protect every matching record; returns (updated, skipped because changed meanwhile)"""
+    projection = {path: 1 for path in target.paths}
+    updated = skipped = 0
+    batch = []
+    async for raw in target.model.aggregate([{"$match": query}, {"$project": projection}]):
+        batch.append(raw)
+        if len(batch) >= batch_size:
+            modified = await flush(target, protection_updates(target, batch, level))
+            updated, skipped = updated + modified, skipped + len(batch) - modified
+            batch = []
+    if batch:
+        modified = await flush(target, protection_updates(target, batch, level))
+        updated, skipped = updated + modified, skipped + len(batch) - modified
+    return updated, skipped
+
+
+async def flush(target: Target, operations) -> int:
+    """Write one batch of updates; returns how many records matched their read values"""
+    bulk_writer = BulkWriter(ordered=False)
+    for operation in operations:
+        bulk_writer.add_operation(target.model, operation)
+    result = await bulk_writer.commit()
+    return result.matched_count if result else 0
+
+
+async def main():
+    """Backfill blind indexes and field encryption"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="Visit every record, not only unprotected ones")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Records per bulk write")
+    args = parser.parse_args()
+
+    level = protection_level()
+    await db.connect_db()
+    started = time.perf_counter()
+    try:
+        for target in TARGETS:
+            query = {} if args.all else {"$or": [{"pii_protection": {"$ne": level}}, {"email_bidx": {"$exists": False}}]}
+            updated, skipped = await protect(target, query, args.batch_size, level)
+            note = f", {skipped} changed while running (re-run to cover them)" if skipped else ""
+            print(f"✅ {target.model.Settings.name}: {updated} records {level}{note}")
+    finally:
+        await db.close_db()
+
+    state = "encrypted and indexed" if settings.FIELD_ENCRYPTION_ENABLED else "indexed (encryption disabled)"
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s; records are {state}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
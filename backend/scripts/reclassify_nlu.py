@@ -0,0 +1,86 @@
+"""Re-run NLU classification over stored queries or complaint descriptions
+
+Usage:
+    python scripts/reclassify_nlu.py queries [--workers N] [--apply]
+    python scripts/reclassify_nlu.py complaints [--workers N]
+
+Documents are read from a MongoDB cursor page by page and each page is
+classified across a process pool. Prints the intent distribution; with
+--apply, the detected intent is written to QueryDocument.query_type.
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import db
+from app.models.account_unfreeze import QueryDocument
+from app.models.complaint import ComplaintDocument
+from app.services.nlu import create_nlu_pool, nlu_service
+
+PAGE_SIZE = 20000
+
+SOURCES = {
+    "queries": (QueryDocument, "query_text"),
+    "complaints": (ComplaintDocument, "description"),
+}
+
+
+async def reclassify_page(pool, model, page, apply: bool, intents: Counter):
+    """Classify one page of (id, text) pairs and optionally write the results"""
+    texts = [text for _, text in page]
+    results = await asyncio.to_thread(lambda: list(nlu_service.analyze_many(texts, executor=pool)))
+
+    by_intent = defaultdict(list)
+    for (doc_id, _), result in zip(page, results):
+        intents[result["intent"].value] += 1
+        by_intent[result["intent"].value].append(doc_id)
+
+    if apply:
+        for intent, ids in by_intent.items():
+            await model.find({"_id": {"$in": ids}}).update({"$set": {"query_type": intent}})
+
+
+async def main():
+    """Stream a collection through the batch NLU classifier"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", choices=sorted(SOURCES))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--apply", action="store_true", help="Write intents to QueryDocument.query_type")
+    args = parser.parse_args()
+
+    if args.apply and args.source != "queries":
+        parser.error("--apply is only supported for queries")
+
+    model, text_field = SOURCES[args.source]
+    await db.connect_db()
+    pool = create_nlu_pool(args.workers)
+    intents = Counter()
+    started = time.perf_counter()
+
+    try:
+        page = []
+        async for doc in model.find({text_field: {"$nin": [None, ""]}}):
+            page.append((doc.id, getattr(doc, text_field)))
+            if len(page) >= PAGE_SIZE:
+                await reclassify_page(pool, model, page, args.apply, intents)
+                page = []
+        if page:
+            await reclassify_page(pool, model, page, args.apply, intents)
+    finally:
+        pool.shutdown()
+        await db.close_db()
+
+    total = sum(intents.values())
+    elapsed = time.perf_counter() - started
+    print(f"✅ Classified {total} {args.source} in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f}/s)")
+    for intent, count in intents.most_common():
+        print(f"   {intent}: {count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
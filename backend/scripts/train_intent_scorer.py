@@ -0,0 +1,71 @@
+"""Train the NLU intent scorer and write its .npz artifact
+
+Usage:
+    python scripts/train_intent_scorer.py [--corpus PATH] [--from-db] [--out PATH]
+
+The bundled seed corpus (app/data/intent_corpus.jsonl) is always used.
+--from-db adds stored queries whose query_type was set by
+scripts/reclassify_nlu.py --apply or by operators.
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.intent_scorer import DEFAULT_MODEL_PATH, IntentScorer, load_corpus
+from app.services.nlu import Intent
+
+
+async def load_labelled_queries():
+    """Labelled production queries from MongoDB"""
+    from app.database import db
+    from app.models.account_unfreeze import QueryDocument
+
+    valid = {intent.value for intent in Intent}
+    texts, intents = [], []
+    await db.connect_db()
+    try:
+        async for doc in QueryDocument.find({"query_type": {"$in": sorted(valid)}}):
+            if doc.query_text:
+                texts.append(doc.query_text)
+                intents.append(doc.query_type)
+    finally:
+        await db.close_db()
+    return texts, intents
+
+
+def main():
+    """Train on the seed corpus (plus production data) and save the model"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=None, help="Extra labelled JSONL corpus")
+    parser.add_argument("--from-db", action="store_true", help="Include labelled queries from MongoDB")
+    parser.add_argument("--out", default=str(DEFAULT_MODEL_PATH))
+    parser.add_argument("--features", type=int, default=4096)
+    args = parser.parse_args()
+
+    texts, intents = load_corpus()
+    if args.corpus:
+        extra_texts, extra_intents = load_corpus(args.corpus)
+        texts += extra_texts
+        intents += extra_intents
+    if args.from_db:
+        db_texts, db_intents = asyncio.run(load_labelled_queries())
+        texts += db_texts
+        intents += db_intents
+
+    started = time.perf_counter()
+    scorer = IntentScorer.train(texts, intents, n_features=args.features)
+    predicted = [label for label, _ in scorer.predict(texts)]
+    accuracy = sum(p == t for p, t in zip(predicted, intents)) / len(intents)
+    scorer.save(args.out)
+
+    print(f"✅ Trained on {len(texts)} messages, {len(scorer.labels)} intents in {time.perf_counter() - started:.1f}s")
+    print(f"   Training accuracy: {accuracy:.1%}")
+    print(f"   Saved to {args.out} ({os.path.getsize(args.out) // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+NLU performance benchmarks
+
+Run from backend/ with `python -m tests.bench.run_nlu_bench`.
+"""
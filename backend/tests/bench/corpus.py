@@ -0,0 +1,206 @@
+"""
+Synthetic multilingual message corpus for NLU benchmarks
+
+Messages are drawn from per-intent templates in English, romanized Hindi,
+romanized Odia, Devanagari, Odia script and English/Hindi code-mixing. Entity
+slots are filled with realistic values (phone numbers, UTRs, rupee amounts,
+dates, emails, ticket IDs), and a share of messages gets chat noise: typos,
+random casing, emojis, repeated punctuation, extra whitespace and filler
+chatter. Generation is deterministic for a given seed, so runs on different
+commits measure the same input.
+"""
+
+import random
+from typing import Dict, List
+
+from app.services.nlu import Intent
+
+# (language, template) pairs per intent; {slots} are filled from ENTITY_FILLERS
+TEMPLATES: Dict[Intent, List[tuple]] = {
+    Intent.NEW_COMPLAINT: [
+        ("en", "I want to register a complaint about a {fraud_word}"),
+        ("en", "I was cheated by a caller from {phone}"),
+        ("en", "please help me, I think I got scammed"),
+        ("hi-Latn", "mujhe shikayat darj karni hai, {fraud_word} hua"),
+        ("hi-Latn", "mere saath fraud hua hai kya karu"),
+        ("od-Latn", "mo saha thakei hela, complaint kariba"),
+        ("hi", "मुझे शिकायत दर्ज करनी है"),
+        ("hi", "मेरे साथ धोखा हुआ है"),
+        ("od", "ମୁଁ ଅଭିଯୋଗ କରିବାକୁ ଚାହେଁ"),
+        ("mixed", "bhai mere saath scam ho gaya, help karo"),
+    ],
+    Intent.CHECK_STATUS: [
+        ("en", "what is the status of {ticket}"),
+        ("en", "where is my complaint {ticket}"),
+        ("en", "track my ticket please"),
+        ("hi-Latn", "mera complaint ka status kya hai {ticket}"),
+        ("od-Latn", "mo complaint ra status kana"),
+        ("hi", "मेरी शिकायत की स्थिति क्या है {ticket}"),
+        ("od", "ମୋ ଅଭିଯୋଗର ସ୍ଥିତି କଣ"),
+        ("mixed", "{ticket} ka status batao yaar"),
+    ],
+    Intent.ACCOUNT_UNFREEZE: [
+        ("en", "my bank account is frozen, please unfreeze it"),
+        ("en", "account blocked after a {amount} credit"),
+        ("hi-Latn", "mera account freeze ho gaya hai unfreeze karwa do"),
+        ("od-Latn", "mo account frozen heigala, unfreeze karantu"),
+        ("hi", "मेरा खाता अनफ्रीज करवाइए"),
+        ("mixed", "police ne account block kar diya, restore my account"),
+    ],
+    Intent.FINANCIAL_FRAUD: [
+        ("en", "{amount} was deducted from my account via UPI, UTR {utr}"),
+        ("en", "unknown transaction of {amount} on {date}"),
+        ("en", "I paid {amount} through paytm to a fake seller"),
+        ("hi-Latn", "mere account se {amount} kat gaye upi se"),
+        ("hi-Latn", "paise chale gaye bank se, utr {utr}"),
+        ("od-Latn", "mo bank ru {amount} kati gala"),
+        ("hi", "मेरे बैंक से पैसे कट गए {amount}"),
+        ("od", "ମୋ ବ୍ୟାଙ୍କ ରୁ ଟଙ୍କା କଟିଗଲା {amount}"),
+        ("mixed", "gpay pe {amount} bheja, refund nahi aaya"),
+    ],
+    Intent.FACEBOOK_FRAUD: [
+        ("en", "someone made a fake facebook profile with my photos"),
+        ("hi-Latn", "fb pe meri fake id bana di"),
+        ("hi", "फेसबुक पर मेरी फोटो डाल दी"),
+        ("od", "ଫେସବୁକ ରେ ମୋ ଫଟୋ ଦେଇଛି"),
+    ],
+    Intent.INSTAGRAM_FRAUD: [
+        ("en", "a stranger is threatening me on instagram"),
+        ("hi-Latn", "insta pe koi blackmail kar raha hai"),
+        ("hi", "इंस्टाग्राम पर कोई परेशान कर रहा है"),
+    ],
+    Intent.X_TWITTER_FRAUD: [
+        ("en", "abusive tweets about me from a fake handle"),
+        ("mixed", "twitter pe mere baare me galat post"),
+    ],
+    Intent.WHATSAPP_FRAUD: [
+        ("en", "got a whatsapp message from {phone} asking for OTP"),
+        ("hi-Latn", "whatsapp pe {phone} se video call aaya"),
+        ("od", "ହ୍ୱାଟସଆପ ରେ {phone} ରୁ ମେସେଜ ଆସିଲା"),
+        ("mixed", "whats app par lottery ka message aaya"),
+    ],
+    Intent.TELEGRAM_FRAUD: [
+        ("en", "telegram task job scam, lost {amount}"),
+        ("hi-Latn", "telegram group me invest karwaya"),
+    ],
+    Intent.GMAIL_FRAUD: [
+        ("en", "my gmail password was changed, recovery email {email}"),
+        ("en", "email hacked and contacts got spam"),
+    ],
+    Intent.HACKED_ACCOUNT: [
+        ("en", "my account was hacked yesterday"),
+        ("hi", "मेरा अकाउंट हैक हो गया"),
+        ("mixed", "account hacked ho gaya, {email} se login nahi ho raha"),
+    ],
+    Intent.IMPERSONATION: [
+        ("en", "someone is pretending to be me and asking money"),
+        ("en", "identity theft using my aadhaar"),
+    ],
+    Intent.OBSCENE_CONTENT: [
+        ("en", "morphed photo of me shared in a group"),
+        ("hi", "अश्लील वीडियो भेजने की धमकी"),
+    ],
+    Intent.OTHER_QUERY: [
+        ("en", "hello"),
+        ("en", "thank you"),
+        ("en", "what documents do I need"),
+        ("hi-Latn", "namaste ji"),
+        ("hi", "नमस्ते"),
+        ("od", "ନମସ୍କାର"),
+        ("od-Latn", "dhanyabad"),
+        ("en", "1"),
+    ],
+}
+
+INTENT_WEIGHTS = {
+    Intent.NEW_COMPLAINT: 14,
+    Intent.CHECK_STATUS: 10,
+    Intent.ACCOUNT_UNFREEZE: 5,
+    Intent.FINANCIAL_FRAUD: 22,
+    Intent.FACEBOOK_FRAUD: 5,
+    Intent.INSTAGRAM_FRAUD: 4,
+    Intent.X_TWITTER_FRAUD: 2,
+    Intent.WHATSAPP_FRAUD: 6,
+    Intent.TELEGRAM_FRAUD: 3,
+    Intent.GMAIL_FRAUD: 2,
+    Intent.HACKED_ACCOUNT: 5,
+    Intent.IMPERSONATION: 2,
+    Intent.OBSCENE_CONTENT: 2,
+    Intent.OTHER_QUERY: 18,
+}
+
+FRAUD_WORDS = ("fraud", "scam", "online fraud", "upi fraud", "cyber crime")
+EMOJIS = ("🙏", "😭", "😡", "‼️", "🆘")
+FILLERS = ("sir", "please", "urgent", "plz", "ji", "bhai", "madam")
+
+
+def _entity_value(slot: str, rng: random.Random) -> str:
+    """Realistic value for an entity slot"""
+    if slot == "phone":
+        return rng.choice(("", "+91 ", "0")) + str(rng.choice("6789")) + "".join(rng.choices("0123456789", k=9))
+    if slot == "amount":
+        value = rng.choice((499, 1500, 2999, 10000, 25000, 149999))
+        return rng.choice((f"₹{value}", f"Rs {value:,}", f"{value} rupees", f"rs.{value}"))
+    if slot == "utr":
+        return "".join(rng.choices("0123456789", k=12))
+    if slot == "date":
+        return f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2024"
+    if slot == "email":
+        return f"{rng.choice(('ravi', 'priya', 'sahu', 'das'))}{rng.randint(1, 999)}@gmail.com"
+    if slot == "ticket":
+        return f"{rng.choice(('CS', 'NCRP'))}-2024{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}-{rng.randint(0, 999999):06d}"
+    if slot == "fraud_word":
+        return rng.choice(FRAUD_WORDS)
+    raise KeyError(slot)
+
+
+def _add_noise(text: str, rng: random.Random) -> str:
+    """Apply one kind of chat noise"""
+    kind = rng.randrange(6)
+    if kind == 0:
+        words = text.split()
+        i = rng.randrange(len(words))
+        word = words[i]
+        if len(word) > 4 and word.isascii():
+            j = rng.randrange(1, len(word) - 1)
+            words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+        return " ".join(words)
+    if kind == 1:
+        return text.upper() if rng.random() < 0.5 else text.capitalize()
+    if kind == 2:
+        return f"{text} {rng.choice(EMOJIS)}"
+    if kind == 3:
+        return text + rng.choice(("!!!", "???", "...", " !!"))
+    if kind == 4:
+        return "  " + text.replace(" ", "  ", 2) + " "
+    return f"{rng.choice(FILLERS)} {text} {rng.choice(FILLERS)}"
+
+
+def generate_corpus(size: int, seed: int = 42, noise_rate: float = 0.35) -> List[Dict[str, str]]:
+    """
+    Generate a labelled benchmark corpus.
+
+    Args:
+        size: Number of messages
+        seed: Random seed
+        noise_rate: Share of messages that get chat noise
+
+    Returns:
+        List of {"text", "intent", "language"} dicts
+    """
+    rng = random.Random(seed)
+    intents = list(INTENT_WEIGHTS)
+    weights = [INTENT_WEIGHTS[intent] for intent in intents]
+    corpus = []
+    for intent in rng.choices(intents, weights=weights, k=size):
+        language, template = rng.choice(TEMPLATES[intent])
+        slots = {
+            slot: _entity_value(slot, rng)
+            for slot in ("phone", "amount", "utr", "date", "email", "ticket", "fraud_word")
+            if "{" + slot + "}" in template
+        }
+        text = template.format(**slots)
+        if rng.random() < noise_rate:
+            text = _add_noise(text, rng)
+        corpus.append({"text": text, "intent": intent.value, "language": language})
+    return corpus
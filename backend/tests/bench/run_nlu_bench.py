@@ -0,0 +1,172 @@
+"""
+NLU benchmark runner
+
+Times `detect_intent`, `extract_entities`, `detect_platform` and
+`analyze_message` over a synthetic multilingual corpus (see corpus.py) and
+writes machine-readable results. Each operation gets a warm-up pass, then
+every message is timed individually for p50/p90/p99 latency and the whole
+pass gives throughput. `analyze_message` runs on a fresh service so its memo
+starts cold, as after a deploy; `analyze_message_uncached` bypasses the memo.
+
+Usage (from backend/):
+    python -m tests.bench.run_nlu_bench [--messages N] [--seed S] [--out results.json]
+    python -m tests.bench.run_nlu_bench --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.services.nlu import NLUService
+from tests.bench.corpus import generate_corpus
+
+SCHEMA_VERSION = 1
+PERCENTILES = (50, 90, 99)
+
+
+def _percentile(sorted_values: Sequence[float], pct: int) -> float:
+    """Nearest-rank percentile of an ascending sequence"""
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def time_operation(operation: Callable[[str], object], texts: List[str], warmup: int = 500) -> Dict[str, float]:
+    """
+    Time an operation on every text.
+
+    Args:
+        operation: Function called with each text
+        texts: Benchmark messages
+        warmup: Messages run untimed first
+
+    Returns:
+        Latency percentiles and mean in microseconds, and messages per second
+    """
+    for text in texts[:warmup]:
+        operation(text)
+
+    clock = time.perf_counter_ns
+    timings = []
+    append = timings.append
+    start = clock()
+    for text in texts:
+        begin = clock()
+        operation(text)
+        append(clock() - begin)
+    total = clock() - start
+
+    timings.sort()
+    result = {f"p{pct}_us": round(_percentile(timings, pct) / 1000, 2) for pct in PERCENTILES}
+    result["mean_us"] = round(sum(timings) / len(timings) / 1000, 2)
+    result["throughput_per_s"] = round(len(texts) / (total / 1e9), 1)
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    """Current commit hash, if run inside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(messages: int = 20000, seed: int = 42) -> Dict:
+    """
+    Run every benchmark on a generated corpus.
+
+    Args:
+        messages: Corpus size
+        seed: Corpus seed
+
+    Returns:
+        Results document (see SCHEMA_VERSION)
+    """
+    corpus = generate_corpus(messages, seed=seed)
+    texts = [row["text"] for row in corpus]
+
+    service = NLUService()
+    results = {
+        "detect_intent": time_operation(service.detect_intent, texts),
+        "extract_entities": time_operation(service.extract_entities, texts),
+        "detect_platform": time_operation(service.detect_platform, texts),
+        "analyze_message_uncached": time_operation(service._analyze, texts),
+    }
+    cold = NLUService()
+    results["analyze_message"] = time_operation(cold.analyze_message, texts, warmup=0)
+    results["analyze_message"]["memo_hit_ratio"] = cold.memo_stats()["hit_ratio"]
+
+    correct = sum(service.detect_intent(row["text"]).value == row["intent"] for row in corpus)
+    return {
+        "schema": SCHEMA_VERSION,
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "corpus": {
+            "messages": messages,
+            "seed": seed,
+            "languages": dict(sorted(Counter(row["language"] for row in corpus).items())),
+        },
+        "intent_accuracy": round(correct / len(corpus), 4),
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """
+    Describe changes from a baseline results document.
+
+    Args:
+        current: Results of this run
+        baseline: Results loaded from an earlier run
+
+    Returns:
+        One line per operation and metric
+    """
+    lines = [f"baseline {baseline.get('commit')} -> current {current.get('commit')}"]
+    for operation, metrics in current["results"].items():
+        previous = baseline["results"].get(operation)
+        if not previous:
+            lines.append(f"{operation}: new")
+            continue
+        for metric in ("p50_us", "p99_us", "throughput_per_s"):
+            before, after = previous.get(metric), metrics[metric]
+            if before:
+                lines.append(f"{operation} {metric}: {before} -> {after} ({(after - before) / before:+.1%})")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000, help="Corpus size")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    parser.add_argument("--out", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.messages, args.seed)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(output + "\n", encoding="utf-8")
+        print(f"✅ Results written to {args.out}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare(report, baseline):
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
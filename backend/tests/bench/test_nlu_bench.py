@@ -0,0 +1,32 @@
+"""
+Smoke tests for the NLU benchmark suite
+"""
+
+import json
+
+from tests.bench.corpus import generate_corpus
+from tests.bench.run_nlu_bench import compare, run_benchmark
+
+
+class TestBenchmarkSuite:
+    """Keep the benchmark runnable and its output stable"""
+
+    def test_corpus_is_deterministic_and_multilingual(self):
+        """The same seed gives the same corpus, covering every script"""
+        corpus = generate_corpus(2000, seed=7)
+
+        assert corpus == generate_corpus(2000, seed=7)
+        assert {row["language"] for row in corpus} >= {"en", "hi", "od", "hi-Latn", "od-Latn", "mixed"}
+        assert any("₹" in row["text"] or "Rs" in row["text"] for row in corpus)
+
+    def test_results_document(self):
+        """A small run produces comparable, JSON-serializable results"""
+        report = run_benchmark(messages=600, seed=1)
+
+        assert json.loads(json.dumps(report))["schema"] == 1
+        assert set(report["results"]) >= {"detect_intent", "extract_entities", "detect_platform", "analyze_message"}
+        for metrics in report["results"].values():
+            assert metrics["p50_us"] <= metrics["p99_us"]
+            assert metrics["throughput_per_s"] > 0
+        assert report["intent_accuracy"] > 0.8
+        assert len(compare(report, report)) > 1
@@ -0,0 +1,200 @@
+"""
+Unit tests for the campaign dispatch engine
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.models.campaign import (
+    CampaignDocument,
+    CampaignMessage,
+    CampaignStatus,
+    CampaignTarget,
+    CampaignType,
+)
+from app.services.campaign_runner import CampaignRunner, normalize_recipient
+
+PHONES = [f"900000000{i}" for i in range(7)]
+
+
+async def collect(iterator):
+    """Drain an async iterator into a list"""
+    return [item async for item in iterator]
+
+
+class StoredRunner(CampaignRunner):
+    """Runner whose campaign persistence is an in-memory record"""
+
+    def __init__(self, campaign, send, **kwargs):
+        super().__init__(batch_size=2, flush_every=2, **kwargs)
+        self.campaign = campaign
+        self.send = send
+        self.owned = True
+        self.stats = Counter()
+        self.flushes = []
+
+    async def _claim(self, campaign_id):
+        if not self.owned or self.campaign.status in (CampaignStatus.COMPLETED, CampaignStatus.CANCELLED):
+            return None
+        self.campaign.status = CampaignStatus.RUNNING
+        return self.campaign.model_copy()
+
+    async def _flush(self, campaign_id, counts, checkpoint, release=False):
+        self.stats.update({key: value for key, value in counts.items() if value})
+        self.flushes.append((checkpoint, release))
+        if checkpoint:
+            self.campaign.checkpoint = checkpoint
+        for key in counts:
+            counts[key] = 0
+        return self.campaign.status if self.owned else None
+
+    async def _complete(self, campaign_id):
+        if self.campaign.status != CampaignStatus.CANCELLED:
+            self.campaign.status = CampaignStatus.COMPLETED
+
+    async def _send_one(self, phone, message, language):
+        return await self.send(phone)
+
+    async def on_sent(self, campaign, results):
+        pass
+
+
+def make_campaign():
+    """Campaign to the explicit PHONES list"""
+    return CampaignDocument.model_construct(
+        id=PydanticObjectId(),
+        title="Alert",
+        campaign_type=CampaignType.ALERT,
+        messages={"en": CampaignMessage(text="Beware of fake KYC calls")},
+        target=CampaignTarget(phone_numbers=PHONES),
+        status=CampaignStatus.SCHEDULED,
+        checkpoint=None,
+        started_at=None,
+        created_by="admin",
+    )
+
+
+class TestNormalizeRecipient:
+    """Test suite for recipient normalization"""
+
+    def test_formats_are_normalized(self):
+        """Common Indian number formats map to the same recipient"""
+        for phone in ["9876543210", "+91 98765 43210", "91-9876543210"]:
+            assert normalize_recipient(phone) == "919876543210"
+
+    def test_invalid_numbers_rejected(self):
+        """Landlines, short numbers and empty values are dropped"""
+        for phone in ["0112345678", "12345", "", None]:
+            assert normalize_recipient(phone) is None
+
+
+class TestCampaignRecipients:
+    """Test suite for recipient streaming"""
+
+    @pytest.mark.asyncio
+    async def test_explicit_numbers_sorted_and_deduplicated(self):
+        """Explicit numbers stream once each in ascending order"""
+        target = CampaignTarget(phone_numbers=["9876543210", "+91 7000000000", "919876543210", "bad"])
+        recipients = await collect(CampaignRunner().recipients(target))
+        assert [phone for phone, _ in recipients] == ["917000000000", "919876543210"]
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_checkpointed_numbers(self):
+        """Only numbers after the checkpoint are yielded"""
+        target = CampaignTarget(phone_numbers=["7000000000", "8000000000", "9000000000"])
+        recipients = await collect(CampaignRunner().recipients(target, after="918000000000"))
+        assert [phone for phone, _ in recipients] == ["919000000000"]
+
+    def test_unknown_segments_target_nobody(self):
+        """A target with only unknown segments does not fall back to everyone"""
+        target = CampaignTarget(user_segments=["no_such_segment"])
+        assert CampaignRunner()._complaint_pipeline(target, None) is None
+
+
+class TestCampaignRun:
+    """Test suite for dispatch, checkpointing and stats accounting"""
+
+    @pytest.mark.asyncio
+    async def test_run_counts_sent_queued_and_failed(self):
+        """Queued retries are counted apart from hard failures"""
+        async def send(phone):
+            if phone.endswith("1"):
+                return {"error": "HTTP 503", "queued": True}
+            if phone.endswith("2"):
+                return {"error": "HTTP 400", "queued": False}
+            return {"messages": [{"id": f"wamid.{phone}"}]}
+
+        runner = StoredRunner(make_campaign(), send)
+        await runner.run(str(runner.campaign.id))
+
+        assert runner.stats == Counter(total_targeted=7, sent=5, queued=1, failed=1)
+        assert runner.campaign.checkpoint == "919000000006"
+        assert runner.campaign.status == CampaignStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_cancel_during_last_batch_is_kept(self):
+        """A cancel landing after the last flush check is not overwritten by completion"""
+        runner = None
+
+        async def send(phone):
+            if phone.endswith("6"):
+                runner.campaign.status = CampaignStatus.CANCELLED
+            return {"messages": [{"id": f"wamid.{phone}"}]}
+
+        runner = StoredRunner(make_campaign(), send)
+        await runner.run(str(runner.campaign.id))
+
+        assert runner.stats["sent"] == len(PHONES)
+        assert runner.campaign.status == CampaignStatus.CANCELLED
+
+    @pytest.mark.asyncio
+    async def test_claimed_elsewhere_sends_nothing(self):
+        """A campaign leased by another worker is left alone"""
+        sent = []
+
+        async def send(phone):
+            sent.append(phone)
+            return {"messages": []}
+
+        runner = StoredRunner(make_campaign(), send)
+        runner.owned = False
+        await runner.run(str(runner.campaign.id))
+
+        assert sent == []
+        assert runner.campaign.status == CampaignStatus.SCHEDULED
+
+    @pytest.mark.asyncio
+    async def test_cancel_then_resume_from_checkpoint(self):
+        """Cancelling keeps the checkpoint of completed batches; resuming continues after it"""
+        sent = []
+        blocked = asyncio.Event()
+
+        async def send(phone):
+            if phone == "919000000004" and not blocked.is_set():
+                blocked.set()
+                await asyncio.Event().wait()
+            sent.append(phone)
+            return {"messages": [{"id": f"wamid.{phone}"}]}
+
+        runner = StoredRunner(make_campaign(), send)
+        task = asyncio.create_task(runner.run(str(runner.campaign.id)))
+        await blocked.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert runner.flushes[-1] == ("919000000003", True)
+        assert runner.campaign.checkpoint == "919000000003"
+        assert runner.stats["sent"] == 4
+
+        await runner.run(str(runner.campaign.id))
+
+        assert sorted(set(sent)) == [f"91{phone}" for phone in PHONES]
+        assert [phone for phone in sent if phone <= "919000000003"] == sent[:4]
+        # The interrupted batch is sent again and counted once
+        assert sent.count("919000000005") == 2
+        assert runner.stats["sent"] == len(PHONES)
+        assert runner.campaign.status == CampaignStatus.COMPLETED
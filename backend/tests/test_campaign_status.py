@@ -0,0 +1,129 @@
+"""
+Unit tests for campaign delivery status tracking
+"""
+
+import pytest
+
+from app.services.campaign_status import CampaignStatusTracker
+
+
+class MemoryStore:
+    """Campaign message store with the semantics of the Mongo collection"""
+
+    def __init__(self):
+        self.records = {}
+        self.queries = 0
+
+    async def add(self, message_ids, campaign_id):
+        for message_id in message_ids:
+            self.records.setdefault(message_id, [campaign_id, 0])
+
+    async def campaigns(self, message_ids):
+        self.queries += 1
+        return {message_id: self.records[message_id][0] for message_id in message_ids if message_id in self.records}
+
+    async def mark(self, message_ids, bit):
+        self.queries += 1
+        newly_set = 0
+        for message_id in message_ids:
+            record = self.records.get(message_id)
+            if record is not None and not record[1] & bit:
+                record[1] |= bit
+                newly_set += 1
+        return newly_set
+
+
+def pending_counts(tracker, campaign_id):
+    """Pending (unflushed) counts for a campaign"""
+    return dict(tracker._pending.get(campaign_id, {}))
+
+
+class TestCampaignStatusTracker:
+    """Test suite for status attribution and aggregation"""
+
+    @pytest.mark.asyncio
+    async def test_statuses_counted_once(self):
+        """Redelivered and out-of-order callbacks count each state once"""
+        tracker = CampaignStatusTracker(store=MemoryStore())
+        await tracker.register(["wamid.1", "wamid.2"], "c1")
+
+        for state in ["read", "delivered", "read"]:
+            tracker.record_status({"id": "wamid.1", "status": state})
+        tracker.record_status({"id": "wamid.2", "status": "delivered"})
+        await tracker.resolve()
+        tracker.record_status({"id": "wamid.2", "status": "delivered"})
+        await tracker.resolve()
+
+        assert pending_counts(tracker, "c1") == {"delivered": 2, "read": 1}
+
+    @pytest.mark.asyncio
+    async def test_callbacks_resolved_in_batches(self):
+        """The webhook path does no store calls; a flush resolves callbacks in bulk"""
+        store = MemoryStore()
+        tracker = CampaignStatusTracker(store=store)
+        await tracker.register([f"wamid.{i}" for i in range(50)], "c1")
+
+        for i in range(50):
+            tracker.record_status({"id": f"wamid.{i}", "status": "read"})
+        assert store.queries == 0
+
+        await tracker.resolve()
+        assert store.queries == 3  # one lookup, then the delivered and read bits
+        assert pending_counts(tracker, "c1") == {"delivered": 50, "read": 50}
+
+    @pytest.mark.asyncio
+    async def test_replies_and_unknown_messages(self):
+        """Replies are attributed through context.id; unrelated IDs are ignored"""
+        tracker = CampaignStatusTracker(store=MemoryStore())
+        await tracker.register(["wamid.1", None], "c1")
+
+        assert tracker.record_reply({"id": "in.1", "context": {"id": "wamid.1"}}) is True
+        assert tracker.record_reply({"id": "in.2"}) is False
+        tracker.record_status({"id": "wamid.other", "status": "read"})
+        await tracker.resolve()
+
+        assert pending_counts(tracker, "c1") == {"replied": 1}
+        assert tracker.stats()["callbacks_unmatched"] == 1
+
+    @pytest.mark.asyncio
+    async def test_callbacks_shared_across_workers(self):
+        """Workers sharing the store count a status once, whichever receives it"""
+        store = MemoryStore()
+        sender, first, second = (CampaignStatusTracker(store=store) for _ in range(3))
+        await sender.register(["wamid.1"], "c1")
+
+        first.record_status({"id": "wamid.1", "status": "delivered"})
+        second.record_status({"id": "wamid.1", "status": "read"})
+        await first.resolve()
+        await second.resolve()
+
+        assert pending_counts(first, "c1") == {"delivered": 1}
+        assert pending_counts(second, "c1") == {"read": 1}
+
+    @pytest.mark.asyncio
+    async def test_queue_is_bounded(self):
+        """Callbacks for new messages are dropped once the queue is full"""
+        tracker = CampaignStatusTracker(store=MemoryStore(), max_queued=1)
+
+        assert tracker.record_status({"id": "wamid.1", "status": "delivered"}) is True
+        assert tracker.record_status({"id": "wamid.1", "status": "read"}) is True
+        assert tracker.record_status({"id": "wamid.2", "status": "read"}) is False
+        assert tracker.stats()["callbacks_dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_store_errors_are_not_raised(self):
+        """An unavailable store keeps callbacks queued for the next flush"""
+        class BrokenStore:
+            async def add(self, message_ids, campaign_id):
+                raise ConnectionError("down")
+
+            async def campaigns(self, message_ids):
+                raise ConnectionError("down")
+
+        tracker = CampaignStatusTracker(store=BrokenStore())
+        await tracker.register(["wamid.1"], "c1")
+
+        assert tracker.record_status({"id": "wamid.1", "status": "delivered"}) is True
+        await tracker.resolve()
+        assert tracker.stats()["store_errors"] == 2
+        assert tracker.stats()["queued_callbacks"] == 1
@@ -0,0 +1,220 @@
+"""
+Unit tests for the compiled complaint collection flow
+"""
+
+import pytest
+
+from app.services import complaint_flow as complaint_flow_module
+from app.services.complaint_flow import (
+    COMPLAINT_FLOW, CompiledFlow, ComplaintField, FlowStep, complaint_flow, prefill_fields
+)
+from app.services.entity_extractor import entity_extractor
+from app.services.pin_directory import PinDirectory
+from app.services.whatsapp_conversation import ConversationStage, WhatsAppConversationHandler
+
+
+class TestCompiledFlow:
+    """Test suite for the flow transition table"""
+
+    def test_every_step_has_prompts_for_all_languages(self):
+        """Prompts are pre-rendered for each supported language"""
+        for step in COMPLAINT_FLOW:
+            prompts = complaint_flow.table[step.field].prompts
+            assert set(prompts) == set(complaint_flow.languages)
+            assert all(not prompt["text"].startswith("complaint_flow.") for prompt in prompts.values())
+
+    def test_invalid_answer_stays_on_field(self):
+        """A rejected answer returns the field's error and does not advance"""
+        result = complaint_flow.advance(ComplaintField.VICTIM_PHONE, "12345")
+
+        assert not result.valid
+        assert result.next_field == ComplaintField.VICTIM_PHONE
+        assert "❌" in result.response["text"]
+
+    def test_validator_normalizes_value(self):
+        """The stored value is the validator's normalized form"""
+        result = complaint_flow.advance(ComplaintField.DOB, "15/08/1990")
+
+        assert result.valid
+        assert result.value == "15-08-1990"
+        assert result.next_field == ComplaintField.GENDER
+        assert len(result.response["buttons"]) == 4
+
+    def test_branch_conditions(self):
+        """Social media complaints skip the loss amount"""
+        assert complaint_flow.advance(ComplaintField.INCIDENT_TIME, "14:30", "A1").next_field == ComplaintField.AMOUNT_LOST
+        assert complaint_flow.advance(ComplaintField.INCIDENT_TIME, "14:30", "A2").next_field == ComplaintField.SUSPECT_INFO
+
+    def test_last_step_completes(self):
+        """Answering the final question completes the flow"""
+        result = complaint_flow.advance(ComplaintField.ADDITIONAL_INFO, "None")
+        assert result.completed
+        assert result.response is None
+
+    def test_undefined_target_rejected(self):
+        """Compilation fails on transitions to undefined steps"""
+        steps = (FlowStep(ComplaintField.VICTIM_NAME, "complaint_flow.ask_name", next=ComplaintField.DOB),)
+        with pytest.raises(ValueError):
+            CompiledFlow(steps, ("en",))
+
+
+class TestComplaintCollection:
+    """Test suite for the handler driving the flow"""
+
+    @pytest.mark.asyncio
+    async def test_walks_flow_to_confirmation(self):
+        """Answering every question reaches the confirmation stage"""
+        handler = WhatsAppConversationHandler()
+        handler.conversation_state.update_state("u1", {
+            "stage": ConversationStage.COLLECTING_COMPLAINT,
+            "current_field": complaint_flow.first_field,
+            "fraud_branch": "A1",
+        })
+        answers = {
+            ComplaintField.INCIDENT_DATE: "14/11/2024",
+            ComplaintField.DOB: "15-08-1990",
+            ComplaintField.VICTIM_PHONE: "9876543210",
+            ComplaintField.VICTIM_EMAIL: "asha@example.com",
+            ComplaintField.PIN_CODE: "751024",
+            ComplaintField.POST_OFFICE: "Patia",
+        }
+
+        state = handler.conversation_state.get_state("u1")
+        for _ in range(len(COMPLAINT_FLOW)):
+            if state.stage != ConversationStage.COLLECTING_COMPLAINT:
+                break
+            await handler._handle_complaint_collection("u1", answers.get(state.current_field, "Answer text"), state)
+            state = handler.conversation_state.get_state("u1")
+
+        assert state.stage == ConversationStage.CONFIRMATION
+        assert state.get_field(ComplaintField.PIN_CODE) == "751024"
+        assert len(state.fields()) == len(COMPLAINT_FLOW)
+
+    @pytest.mark.asyncio
+    async def test_opening_message_prefills_and_skips_questions(self):
+        """Details in the first free-text message are not asked again"""
+        handler = WhatsAppConversationHandler()
+        await handler._handle_initial("u2", "I lost ₹25,000 via UPI to 9123456789 on 12/10/2024, please help")
+
+        state = handler.conversation_state.get_state("u2")
+        assert state.get_field(ComplaintField.AMOUNT_LOST) == "25000"
+        assert state.get_field(ComplaintField.SUSPECT_CONTACT) == "+919123456789"
+
+        await handler._handle_fraud_type_selection("u2", "upi_fraud")
+        state = handler.conversation_state.get_state("u2")
+        assert state.current_field == ComplaintField.INCIDENT_TIME
+
+        await handler._handle_complaint_collection("u2", "10:30", state)
+        assert state.current_field == ComplaintField.SUSPECT_INFO
+
+
+class TestPrefill:
+    """Test suite for pre-filling fields from a free-text message"""
+
+    def test_fields_from_entities(self):
+        """Dates use the flow's format; every suspect contact is kept"""
+        text = "Paid 1.5 lakh on 3 Jan 2024 to fraud@ybl and 9876543210"
+        fields = prefill_fields(text, entity_extractor.extract(text))
+
+        assert fields[ComplaintField.INCIDENT_DESCRIPTION] == text
+        assert fields[ComplaintField.INCIDENT_DATE] == "03/01/2024"
+        assert fields[ComplaintField.AMOUNT_LOST] == "150000"
+        assert fields[ComplaintField.SUSPECT_CONTACT] == "fraud@ybl, +919876543210"
+
+    def test_own_number_is_not_the_suspect(self):
+        """Contacts introduced as the user's own are left for the questions"""
+        text = "My number is 9876543210, the scammer called from 9123456789"
+        fields = prefill_fields(text, entity_extractor.extract(text))
+
+        assert fields[ComplaintField.SUSPECT_CONTACT] == "+919123456789"
+
+    def test_ambiguous_values_are_asked(self):
+        """Several dates or amounts, or an unattributed number, prefill nothing"""
+        text = "Paid Rs 500 on 10/10/2024 and Rs 2000 on 12/10/2024, number 9123456789"
+        fields = prefill_fields(text, entity_extractor.extract(text))
+
+        assert ComplaintField.INCIDENT_DATE not in fields
+        assert ComplaintField.AMOUNT_LOST not in fields
+        assert ComplaintField.SUSPECT_CONTACT not in fields
+
+    def test_short_message_is_not_a_description(self):
+        """Opening keywords like "scam" do not answer the description question"""
+        assert prefill_fields("scam", []) == {}
+
+    def test_answered_fields_are_skipped(self):
+        """The walk passes over answered fields, honouring branches"""
+        answered = {ComplaintField.INCIDENT_DESCRIPTION, ComplaintField.INCIDENT_DATE, ComplaintField.INCIDENT_TIME}
+
+        assert complaint_flow.next_unanswered(complaint_flow.first_field, "A2", answered) == ComplaintField.SUSPECT_INFO
+        assert complaint_flow.next_unanswered(complaint_flow.first_field, "A1", answered) == ComplaintField.AMOUNT_LOST
+        assert complaint_flow.next_unanswered(None, "A1", answered) is None
+
+
+@pytest.fixture
+def pin_table(tmp_path, monkeypatch):
+    """A small PIN directory in place of the bundled one"""
+    path = tmp_path / "pins.bin"
+    PinDirectory.build([
+        ("768001", "Sambalpur H.O", "Sambalpur", "Odisha"),
+        ("751024", "Patia", "Khordha", "Odisha"),
+        ("751024", "K.I.I.T.", "Khordha", "Odisha"),
+    ], path)
+    directory = PinDirectory(path)
+    monkeypatch.setattr(complaint_flow_module, "pin_directory", directory)
+    yield directory
+    directory.close()
+
+
+class TestPinSuggestions:
+    """Test suite for suggesting address fields from the PIN code"""
+
+    def test_pin_fills_nothing(self, pin_table):
+        """The PIN answer moves on to the village; nothing is filled silently"""
+        result = complaint_flow.advance(ComplaintField.PIN_CODE, " 768001 ", answered={})
+
+        assert result.value == "768001"
+        assert result.next_field == ComplaintField.VILLAGE
+
+    def test_suggestions_are_confirmed_or_overridden(self, pin_table):
+        """Post office and district are offered as buttons; other answers are kept"""
+        answered = {ComplaintField.PIN_CODE: "768001"}
+        prompt = complaint_flow.advance(ComplaintField.VILLAGE, "Ainthapali", answered=answered).response
+        assert [button["id"] for button in prompt["buttons"]] == ["Sambalpur H.O"]
+
+        typed = complaint_flow.advance(ComplaintField.POST_OFFICE, "Budharaja", answered=answered)
+        assert typed.valid and typed.value == "Budharaja"
+
+        chosen = complaint_flow.advance(ComplaintField.POST_OFFICE, "sambalpur ho", answered=answered)
+        assert chosen.value == "Sambalpur H.O"
+
+        district = complaint_flow.prompt(ComplaintField.DISTRICT, "en", answered)
+        assert [button["id"] for button in district["buttons"]] == ["Sambalpur"]
+
+    def test_several_offices_become_options(self, pin_table):
+        """Every office of the PIN is offered; an office missing from the table is accepted"""
+        answered = {ComplaintField.PIN_CODE: "751024"}
+        prompt = complaint_flow.advance(ComplaintField.VILLAGE, "Patia", answered=answered).response
+        assert [button["id"] for button in prompt["buttons"]] == ["K.I.I.T.", "Patia"]
+
+        accepted = complaint_flow.advance(ComplaintField.POST_OFFICE, "kiit", answered=answered)
+        assert accepted.value == "K.I.I.T."
+        assert complaint_flow.advance(ComplaintField.POST_OFFICE, "Infocity", answered=answered).value == "Infocity"
+
+    def test_unknown_pin_asks_everything(self, pin_table):
+        """PINs missing from the directory suggest nothing"""
+        answered = {ComplaintField.PIN_CODE: "110001"}
+
+        assert complaint_flow.advance(ComplaintField.PIN_CODE, "110001", answered={}).valid
+        assert "buttons" not in complaint_flow.prompt(ComplaintField.POST_OFFICE, "en", answered)
+        assert "buttons" not in complaint_flow.prompt(ComplaintField.DISTRICT, "en", answered)
+
+    def test_strict_mode_rejects_unknown_pin(self, pin_table, monkeypatch):
+        """With a complete directory, unknown PINs and unlisted offices can be refused"""
+        monkeypatch.setattr(complaint_flow_module.settings, "PIN_DIRECTORY_STRICT", True)
+
+        assert not complaint_flow.advance(ComplaintField.PIN_CODE, "110001").valid
+        assert complaint_flow.advance(ComplaintField.PIN_CODE, "768001").valid
+        rejected = complaint_flow.advance(ComplaintField.POST_OFFICE, "Saheed Nagar",
+                                          answered={ComplaintField.PIN_CODE: "751024"})
+        assert not rejected.valid
+        assert len(rejected.response["buttons"]) == 2
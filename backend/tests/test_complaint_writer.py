@@ -0,0 +1,129 @@
+"""
+Unit tests for WhatsApp complaint persistence
+"""
+
+import json
+
+import pytest
+
+from app.models.complaint import FinancialFraudType, FraudCategory, Gender
+from app.services.complaint_writer import DEAD_LETTER_FILE, ComplaintWriter, session_to_complaint
+from app.services.gazetteer import resolve_district
+from app.services.whatsapp_conversation import ComplaintField, ConversationSession
+
+
+def confirmed_session():
+    """A session holding a complete financial fraud complaint"""
+    session = ConversationSession(fraud_branch="A1", platform_intent="unknown")
+    answers = {
+        ComplaintField.FRAUD_TYPE: "upi_fraud",
+        ComplaintField.INCIDENT_DESCRIPTION: "Received a collect request posing as a refund",
+        ComplaintField.INCIDENT_DATE: "14/11/2024",
+        ComplaintField.INCIDENT_TIME: "14:30",
+        ComplaintField.AMOUNT_LOST: "₹15,000",
+        ComplaintField.SUSPECT_INFO: "Unknown",
+        ComplaintField.SUSPECT_CONTACT: "9123456780",
+        ComplaintField.VICTIM_NAME: "Asha Das",
+        ComplaintField.GUARDIAN_NAME: "Ravi Das",
+        ComplaintField.DOB: "15-08-1990",
+        ComplaintField.GENDER: "Female",
+        ComplaintField.VICTIM_PHONE: "9876543210",
+        ComplaintField.VICTIM_EMAIL: "asha@example.com",
+        ComplaintField.VILLAGE: "Patia",
+        ComplaintField.POST_OFFICE: "Patia",
+        ComplaintField.POLICE_STATION: "Chandrasekharpur",
+        ComplaintField.DISTRICT: "Khordha",
+        ComplaintField.PIN_CODE: "751024",
+    }
+    for field, value in answers.items():
+        session.set_field(field, value)
+    return session
+
+
+class TestSessionToComplaint:
+    """Test suite for mapping sessions onto the PS-2 model"""
+
+    def test_complete_session_maps_to_ps2_sections(self):
+        """All PS-2 sections are populated from a complete session"""
+        record = session_to_complaint(confirmed_session(), "919876543210", "CS-20241114-123456")
+
+        assert record["reference_id"] == "CS-20241114-123456"
+        assert record["fraud_category"] == FraudCategory.FINANCIAL_FRAUD
+        assert record["financial_fraud_type"] == FinancialFraudType.UPI_FRAUD
+        assert record["reporter_info"]["phone"] == "+919876543210"
+        assert record["reporter_info"]["gender"] == Gender.FEMALE
+        assert record["incident_details"]["amount_lost"] == 15000.0
+        assert record["incident_details"]["incident_date"].hour == 14
+        assert record["suspect_info"] == "9123456780"
+
+    def test_district_is_coded(self):
+        """The free-text district is resolved to its canonical code and state"""
+        session = confirmed_session()
+        session.set_field(ComplaintField.DISTRICT, "khurda dist")
+        record = session_to_complaint(session, "919876543210", "CS-1")
+
+        assert record["district_code"] == resolve_district("Khordha").code
+        assert record["location"]["state"] == "Odisha"
+
+    def test_incomplete_reporter_keeps_raw_fields(self):
+        """Invalid reporter details do not block the complaint"""
+        session = confirmed_session()
+        session.set_field(ComplaintField.PIN_CODE, "12")
+        record = session_to_complaint(session, "919876543210", "CS-1")
+
+        assert record["reporter_info"] is None
+        assert record["name"] == "Asha Das"
+        assert record["incident_details"] is not None
+
+
+class TestComplaintWriter:
+    """Test suite for write-behind durability"""
+
+    @pytest.mark.asyncio
+    async def test_submitted_complaints_survive_a_crash(self, tmp_path):
+        """Complaints are journaled on submit and taken over once their worker is gone"""
+        writer = ComplaintWriter(journal_dir=str(tmp_path))
+        writer.submit(session_to_complaint(confirmed_session(), "919876543210", "CS-1"))
+
+        other = ComplaintWriter(journal_dir=str(tmp_path))
+        other._recover_journals()
+        assert other.stats()["pending"] == 0  # the first worker is alive
+
+        writer._journal.close()  # the first worker dies without stopping
+        restarted = ComplaintWriter(journal_dir=str(tmp_path))
+        restarted._recover_journals()
+        assert restarted.stats()["pending"] == 1
+        assert restarted._pending[0]["reference_id"] == "CS-1"
+        assert len(list(tmp_path.glob("complaints-*.jsonl"))) == 2  # restarted's and other's
+
+    @pytest.mark.asyncio
+    async def test_outage_keeps_the_queue(self, tmp_path):
+        """An unreachable database leaves every complaint queued and journaled"""
+        writer = ComplaintWriter(journal_dir=str(tmp_path))
+        writer.submit(session_to_complaint(confirmed_session(), "919876543210", "CS-1"))
+        await writer.stop()  # database not initialized: nothing can be written
+
+        assert writer.stats()["dead_lettered"] == 0
+        assert len(list(tmp_path.glob("complaints-*.jsonl"))) == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_record_is_dead_lettered(self, tmp_path, monkeypatch):
+        """A record the database rejects is isolated without blocking the others"""
+        written = []
+
+        async def write_batch(batch):
+            if any(record["reference_id"] == "CS-3" for record in batch):
+                raise ValueError("document failed validation")
+            written.extend(record["reference_id"] for record in batch)
+
+        writer = ComplaintWriter(batch_size=4, journal_dir=str(tmp_path))
+        monkeypatch.setattr(writer, "_write_batch", write_batch)
+        for index in range(1, 6):
+            writer.submit({"reference_id": f"CS-{index}"})
+
+        assert await writer.flush() is True
+        assert sorted(written) == ["CS-1", "CS-2", "CS-4", "CS-5"]
+        dead = [json.loads(line) for line in (tmp_path / DEAD_LETTER_FILE).read_text().splitlines()]
+        assert [entry["record"]["reference_id"] for entry in dead] == ["CS-3"]
+        assert "failed validation" in dead[0]["error"]
+        assert writer._journal.tell() == 0  # everything settled, journal truncated
@@ -0,0 +1,148 @@
+"""
+Unit tests for conversation session storage
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.conversation_store import ConversationStore
+from app.services.nlp_service import ConversationState
+from app.services.whatsapp_conversation import (
+    ComplaintField, ConversationSession, ConversationStage, decode_session, encode_session
+)
+
+
+class DictBackend:
+    """Shared backend stand-in recording batched writes"""
+
+    name = "dict"
+
+    def __init__(self, failures=0):
+        self.data = {}
+        self.save_calls = 0
+        self.failures = failures
+
+    async def load(self, key):
+        return self.data.get(key)
+
+    async def save_many(self, payloads):
+        self.save_calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("down")
+        self.data.update(payloads)
+
+    async def delete_many(self, keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class TestConversationStore:
+    """Test suite for the local cache and shared backend"""
+
+    def test_lru_eviction(self):
+        """The least recently used session is evicted when full"""
+        store = ConversationStore("t", max_entries=2)
+        store.put("a", {"stage": "initial"})
+        store.put("b", {"stage": "initial"})
+        store.get("a")
+        store.put("c", {"stage": "initial"})
+
+        assert store.get("b") is None
+        assert store.get("a") is not None
+        assert store.stats()["evictions_capacity"] == 1
+
+    def test_idle_sessions_expire(self):
+        """Sessions idle past the TTL are dropped"""
+        store = ConversationStore("t", idle_ttl_seconds=0)
+        store.put("a", {"stage": "initial"})
+        assert store.get("a") is None
+        assert store.stats()["evictions_idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_turn_updates_coalesce_into_one_write(self):
+        """Several updates in one turn produce a single batched write"""
+        backend = DictBackend()
+        state = ConversationState(ConversationStore("nlp", backend=backend, debounce_seconds=60))
+        state.update_state("u1", "collecting_complaint", {"step": "type"})
+        state.update_state("u1", "collecting_complaint", {"step": "description"})
+        await state.store.close()
+
+        assert backend.save_calls == 1
+        assert "nlp:u1" in backend.data
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried(self):
+        """A failed debounced write is rescheduled and retried once"""
+        backend = DictBackend(failures=1)
+        store = ConversationStore("nlp", backend=backend, debounce_seconds=0.01)
+        store.put("u1", {"stage": "initial"})
+
+        await asyncio.sleep(0.1)
+
+        assert backend.save_calls == 2
+        assert "nlp:u1" in backend.data
+        assert store.stats()["backend_errors"] == 1
+        assert store.stats()["pending_writes"] == 0
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_session_continues_on_another_worker(self):
+        """A second store sharing the backend picks up the session"""
+        backend = DictBackend()
+        first = ConversationState(ConversationStore("nlp", backend=backend))
+        first.update_state("u1", "collecting_complaint", {"step": "amount"})
+        await first.store.flush()
+
+        second = ConversationState(ConversationStore("nlp", backend=backend))
+        await second.load("u1")
+        assert second.get_state("u1") == {"stage": "collecting_complaint", "data": {"step": "amount"}}
+
+        second.clear_state("u1")
+        await second.store.flush()
+        assert backend.data == {}
+
+
+class TestConversationSession:
+    """Test suite for the compact complaint-flow session"""
+
+    def test_wire_round_trip(self):
+        """A session survives serialization with fields and timestamps intact"""
+        session = ConversationSession(stage=ConversationStage.COLLECTING_COMPLAINT, fraud_branch="A1")
+        session.set_field(ComplaintField.AMOUNT_LOST, "5000")
+        session.update({"current_field": ComplaintField.SUSPECT_INFO})
+
+        restored = decode_session(encode_session(session))
+
+        assert restored.stage == ConversationStage.COLLECTING_COMPLAINT
+        assert restored.current_field == ComplaintField.SUSPECT_INFO
+        assert restored.fields() == {ComplaintField.AMOUNT_LOST: "5000"}
+        assert abs(restored.started_at - session.started_at) < 0.01
+
+    def test_format_versions(self):
+        """Version 1 rows default the language; unknown versions are rejected"""
+        row = ConversationSession(language="or").to_wire()
+
+        assert ConversationSession.from_wire([1, *row[1:12]]).language == "en"
+        assert ConversationSession.from_wire(row).language == "or"
+        with pytest.raises(ValueError):
+            ConversationSession.from_wire([3, *row[1:], "extra"])
+        with pytest.raises(ValueError):
+            ConversationSession.from_wire(row[:12])
+
+    def test_unknown_attribute_rejected(self):
+        """Slots reject misspelled state keys"""
+        with pytest.raises(AttributeError):
+            ConversationSession().update({"curent_field": None})
+
+    def test_memory_stats(self):
+        """Memory accounting reports per-session sizes"""
+        store = ConversationStore("t", encode=encode_session, decode=decode_session)
+        for i in range(10):
+            store.put(str(i), ConversationSession())
+        stats = store.memory_stats()
+
+        assert stats["sessions"] == 10
+        assert stats["bytes_per_session"] > 0
+        assert stats["serialized_bytes_per_session"] < stats["bytes_per_session"]
@@ -0,0 +1,74 @@
+"""
+Unit tests for the single-pass entity extractor
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.services.entity_extractor import entity_extractor
+
+
+def values(text, entity_type):
+    """Normalized values of one entity type"""
+    return [span.value for span in entity_extractor.extract(text, reference=date(2024, 12, 1)) if span.type == entity_type]
+
+
+class TestEntityExtractor:
+    """Test suite for spans and normalized values"""
+
+    def test_every_occurrence_with_offsets(self):
+        """Two UTRs and two phones are all returned, with exact offsets"""
+        text = "UTR 123456789012 and 987654321098765, calls from 9876543210 and +91 91234-56789"
+        spans = entity_extractor.extract(text)
+
+        assert [span.type for span in spans] == ["utr", "utr", "phone", "phone"]
+        assert all(text[span.start:span.end] == span.text for span in spans)
+        assert [span.value for span in spans[2:]] == ["+919876543210", "+919123456789"]
+
+    @pytest.mark.parametrize("text,amount", [
+        ("lost ₹15,000", Decimal("15000")),
+        ("Rs. 2,50,000 gone", Decimal("250000")),
+        ("paid 1.5 lakh", Decimal("150000")),
+        ("2 crore rupees", Decimal("20000000")),
+        ("sent 50k", Decimal("50000")),
+        ("INR 999.50", Decimal("999.50")),
+        ("700/- only", Decimal("700")),
+    ])
+    def test_amounts(self, text, amount):
+        """Currency markers and Indian multipliers give Decimal amounts"""
+        assert values(text, "amount") == [amount]
+
+    @pytest.mark.parametrize("text,iso", [
+        ("on 14/11/2024", "2024-11-14"),
+        ("on 5-1-24", "2024-01-05"),
+        ("on 2024-11-14", "2024-11-14"),
+        ("on 3rd March 2024", "2024-03-03"),
+        ("on Jan 5, 2024", "2024-01-05"),
+        ("on 12 Oct", "2024-10-12"),
+    ])
+    def test_dates(self, text, iso):
+        """Day-first numeric and month-name dates become ISO dates"""
+        assert values(text, "date") == [iso]
+
+    def test_invalid_dates_and_plain_numbers_are_dropped(self):
+        """Impossible dates and bare counts are not entities"""
+        assert entity_extractor.extract("31/02/2024, I have 3 kids") == []
+
+    def test_vpa_and_email(self):
+        """Handles without a TLD are UPI VPAs"""
+        text = "paid to Fraud.King@okaxis, mail me at asha@example.com"
+
+        assert values(text, "upi_vpa") == ["fraud.king@okaxis"]
+        assert values(text, "email") == ["asha@example.com"]
+
+    def test_ticket_ids(self):
+        """Ticket IDs are uppercased"""
+        assert values("status of cs-20241114-123456", "ticket_id") == ["CS-20241114-123456"]
+
+    def test_group_deduplicates(self):
+        """Grouping keeps distinct normalized values in order"""
+        spans = entity_extractor.extract("9876543210 / +91 98765 43210 / 9123456789")
+
+        assert entity_extractor.group(spans) == {"phone": ["+919876543210", "+919123456789"]}
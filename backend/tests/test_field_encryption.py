@@ -0,0 +1,193 @@
+"""
+Unit tests for field encryption and blind indexes
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.models.complaint import ComplaintDocument, IncidentDetails, ReporterInfo
+from app.services.encryption_service import (
+    DEFAULT_ENCRYPTION_KEY, BlindIndex, FieldCipher, blind_index, check_key_configuration, decrypt_documents,
+    derive_key, field_cipher,
+)
+
+
+def reporter(phone: str = "+919876543210") -> ReporterInfo:
+    return ReporterInfo(
+        name="Asha Das", guardian_name="Ravi Das", date_of_birth=datetime(1990, 8, 15), phone=phone,
+        gender="female", village="Patia", post_office="Patia", police_station="Chandrasekharpur",
+        district="Khordha", pin_code="751024",
+    )
+
+
+def complaint(**fields) -> ComplaintDocument:
+    """A complaint built without a database (hooks are called directly)"""
+    values = dict(phone=None, bank_account=None, reporter_info=None, incident_details=None, wa_phone_number=None)
+    values.update(fields)
+    return ComplaintDocument.model_construct(**values)
+
+
+class TestFieldCipher:
+    """Test suite for authenticated field encryption"""
+
+    def test_round_trip(self):
+        """Encryption is randomized and reversible"""
+        first, second = field_cipher.encrypt("+919876543210"), field_cipher.encrypt("+919876543210")
+
+        assert first != second and first.startswith("enc1:")
+        assert field_cipher.decrypt(first) == field_cipher.decrypt(second) == "+919876543210"
+
+    def test_plaintext_and_empty_pass_through(self):
+        """Mixed encrypted and legacy plaintext values can be read"""
+        token = field_cipher.encrypt("x")
+
+        assert field_cipher.decrypt("+919876543210") == "+919876543210"
+        assert field_cipher.encrypt(token) == token
+        assert field_cipher.encrypt(None) is None and field_cipher.decrypt("") == ""
+
+    def test_wrong_key_or_tampering_fails(self):
+        """Ciphertexts are authenticated"""
+        token = field_cipher.encrypt("123456789012")
+        other = FieldCipher(derive_key("another key", b"cybersathi field encryption"))
+
+        with pytest.raises(ValueError):
+            other.decrypt(token)
+        with pytest.raises(ValueError):
+            field_cipher.decrypt(token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB"))
+
+    def test_batches(self):
+        """Batch helpers keep order and skip empty values"""
+        values = ["9876543210", None, "", "123456789012"]
+        encrypted = field_cipher.encrypt_many(values)
+
+        assert encrypted[1:3] == [None, ""]
+        assert field_cipher.decrypt_many(encrypted) == values
+
+    def test_decrypt_documents(self):
+        """Raw documents are decrypted column-wise along dotted paths"""
+        documents = [
+            {"phone": field_cipher.encrypt("9876543210"), "reporter_info": {"phone": field_cipher.encrypt("9123456780")}},
+            {"phone": None, "reporter_info": None},
+        ]
+        decrypt_documents(documents, ["phone", "reporter_info.phone"])
+
+        assert documents == [
+            {"phone": "9876543210", "reporter_info": {"phone": "9123456780"}},
+            {"phone": None, "reporter_info": None},
+        ]
+
+
+class TestBlindIndex:
+    """Test suite for searchable keyed hashes"""
+
+    def test_phone_formats_match(self):
+        """Every way of writing a number gives the same index"""
+        indexes = {blind_index.compute("phone", phone) for phone in ("+91 98765-43210", "919876543210", "09876543210")}
+
+        assert len(indexes) == 1
+        assert blind_index.compute("phone", "9876543211") not in indexes
+
+    def test_kinds_and_keys_are_separate(self):
+        """The same digits index differently per kind and per key"""
+        other = BlindIndex(derive_key("another key", b"cybersathi blind index"))
+
+        assert blind_index.compute("phone", "9876543210") != blind_index.compute("account", "9876543210")
+        assert blind_index.compute("account", "9876543210") != other.compute("account", "9876543210")
+        assert blind_index.compute("account", "sbin-0001 234") == blind_index.compute("account", "SBIN0001234")
+        assert blind_index.compute("phone", "") is None
+
+
+class TestKeyConfiguration:
+    """Test suite for refusing the public default key"""
+
+    @pytest.mark.parametrize("environment,encryption,key,refused", [
+        ("development", False, DEFAULT_ENCRYPTION_KEY, False),
+        ("production", False, DEFAULT_ENCRYPTION_KEY, True),
+        ("development", True, DEFAULT_ENCRYPTION_KEY, True),
+        ("production", True, "a-private-key-from-the-secret-store", False),
+    ])
+    def test_default_key_refused_where_it_matters(self, environment, encryption, key, refused):
+        """The default key is fine for development, never for production or encrypted fields"""
+        config = SimpleNamespace(ENVIRONMENT=environment, FIELD_ENCRYPTION_ENABLED=encryption, ENCRYPTION_KEY=key)
+
+        if refused:
+            with pytest.raises(RuntimeError, match="ENCRYPTION_KEY"):
+                check_key_configuration(config)
+        else:
+            check_key_configuration(config)
+
+
+class TestProtectedComplaint:
+    """Test suite for complaint hooks and lookups"""
+
+    def test_models_hold_plaintext(self):
+        """Encrypted values are decrypted when a model is loaded"""
+        info = reporter(field_cipher.encrypt("+919876543210"))
+        details = IncidentDetails(description="UPI collect request", account_number=field_cipher.encrypt("1234567890"))
+
+        assert info.phone == "+919876543210"
+        assert details.account_number == "1234567890"
+
+    def test_emails_validated_after_decrypting(self):
+        """Encrypted addresses load as plaintext and must still be valid emails"""
+        stored = reporter().model_dump()
+
+        stored["email"] = field_cipher.encrypt("asha@example.com")
+        assert ReporterInfo.model_validate(stored).email == "asha@example.com"
+        stored["email"] = field_cipher.encrypt("not an email")
+        with pytest.raises(ValueError):
+            ReporterInfo.model_validate(stored)
+
+    def test_protect_and_reveal(self, monkeypatch):
+        """Saving encrypts the fields and indexes every phone and account"""
+        monkeypatch.setattr(settings, "FIELD_ENCRYPTION_ENABLED", True)
+        document = complaint(
+            phone="+919876543210",
+            wa_phone_number="919876543210",
+            reporter_info=reporter("+919123456780"),
+            incident_details=IncidentDetails(description="UPI collect request", beneficiary_account="5555 6666 7777"),
+        )
+        document.protect_fields()
+
+        assert field_cipher.is_encrypted(document.phone)
+        assert field_cipher.is_encrypted(document.reporter_info.phone)
+        assert field_cipher.is_encrypted(document.incident_details.beneficiary_account)
+        assert document.wa_phone_number == "919876543210"
+        assert len(document.phone_bidx) == 2
+        assert ComplaintDocument.phone_query("9123456780")["phone_bidx"] in document.phone_bidx
+        assert document.account_bidx == [ComplaintDocument.account_query("555566667777")["account_bidx"]]
+        assert document.pii_protection == "encrypted"
+
+        document.protect_fields()  # a second save keeps the same indexes
+        assert len(document.phone_bidx) == 2
+
+        document.reveal_fields()
+        assert document.phone == "+919876543210"
+        assert document.incident_details.beneficiary_account == "5555 6666 7777"
+
+    def test_emails_encrypted_and_indexed(self, monkeypatch):
+        """Both email fields are encrypted and found by one normalized index"""
+        monkeypatch.setattr(settings, "FIELD_ENCRYPTION_ENABLED", True)
+        info = reporter().model_copy(update={"email": "asha@example.com"})
+        document = complaint(email=" Asha@Example.com", reporter_info=info)
+        document.protect_fields()
+
+        assert field_cipher.is_encrypted(document.email)
+        assert field_cipher.is_encrypted(document.reporter_info.email)
+        assert document.email_bidx == [ComplaintDocument.email_query("ASHA@example.com ")["email_bidx"]]
+
+        document.reveal_fields()
+        assert document.reporter_info.email == "asha@example.com"
+
+    def test_disabled_encryption_still_indexes(self, monkeypatch):
+        """Blind indexes are written even while fields stay in plaintext"""
+        monkeypatch.setattr(settings, "FIELD_ENCRYPTION_ENABLED", False)
+        document = complaint(phone="+919876543210", bank_account="1234567890")
+        document.protect_fields()
+
+        assert document.phone == "+919876543210"
+        assert document.phone_bidx and document.account_bidx
+        assert document.pii_protection == "indexed"
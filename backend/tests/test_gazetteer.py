@@ -0,0 +1,128 @@
+"""
+Unit tests for the district gazetteer and district-coded analytics
+"""
+
+import pytest
+
+from app.models.complaint import ComplaintDocument, Location
+from app.routers.analytics import district_label, fold_district_stats
+from app.services.gazetteer import Gazetteer, gazetteer, normalize, resolve_district
+
+ENTRIES = [
+    {"code": 1, "name": "Khordha", "state": "Odisha", "aliases": ["Khurda", "Bhubaneswar"]},
+    {"code": 2, "name": "Cuttack", "state": "Odisha", "aliases": ["Katak"]},
+    {"code": 3, "name": "Puri", "state": "Odisha"},
+]
+
+
+@pytest.fixture
+def small():
+    return Gazetteer(ENTRIES)
+
+
+class TestGazetteer:
+    """Test suite for district resolution"""
+
+    def test_normalize(self):
+        """Case, noise words, spaces and doubled letters are ignored"""
+        assert normalize("Khorddha Dist.") == "khordha"
+        assert normalize("Mayur Bhanj, Odisha") == "mayurbhanj"
+        assert normalize("  ") == ""
+
+    @pytest.mark.parametrize("text", [
+        "Khordha", "khurda", "KHORDA DIST", "Khordha district", "Bhubaneswar, Odisha", "Khordaa", "Kordha",
+    ])
+    def test_spelling_variants(self, small, text):
+        """Every variant lands on the same code"""
+        assert small.resolve(text).code == 1
+
+    def test_unknown_and_short_texts(self, small):
+        """Unrelated or too-short texts do not match"""
+        assert small.resolve("Sambalpur") is None
+        assert small.resolve("Pur") is None
+        assert small.resolve("") is None
+        assert small.resolve(None) is None
+
+    @pytest.mark.parametrize("text", [
+        "Raipur", "Jaipur", "Baroda", "Jaipur, Rajasthan", "Katak, Bihar", "Nagpur, Maharashtra",
+    ])
+    def test_other_states_not_bent_onto_local_districts(self, text):
+        """Near-misses with another first letter, little trigram overlap or another state stay unresolved"""
+        assert resolve_district(text) is None
+
+    @pytest.mark.parametrize("text,name", [
+        ("Kordha", "Khordha"), ("Katak", "Cuttack"), ("Nuapara", "Nuapada"), ("Sambalpr", "Sambalpur"),
+        ("Cuttack, West Bengal", "Cuttack"),
+    ])
+    def test_close_misspellings_still_resolve(self, text, name):
+        """Guarded fuzzy matching keeps real misspellings, and exact names win regardless"""
+        assert resolve_district(text).name == name
+
+    def test_duplicate_codes_rejected(self):
+        """Codes identify districts and must be unique"""
+        with pytest.raises(ValueError):
+            Gazetteer([*ENTRIES, {"code": 1, "name": "Ganjam", "state": "Odisha"}])
+
+    def test_resolution_is_cached(self, small):
+        """Repeated texts are served from the cache"""
+        small.resolve("Katak")
+        small.resolve("Katak")
+
+        assert small.stats()["hit_ratio"] == 0.5
+
+    def test_bundled_gazetteer(self):
+        """The bundled file covers Odisha, including Odia names"""
+        assert gazetteer is not None
+        assert len(gazetteer.districts) == 30
+        assert resolve_district(None, "ଖୋର୍ଦ୍ଧା").name == "Khordha"
+        assert resolve_district("Nowhere", "Baleshwar").name == "Balasore"
+
+
+class TestDistrictCode:
+    """Test suite for the complaint district code hook"""
+
+    def test_code_follows_district_edits(self):
+        """The code is re-resolved on every write, and cleared when the text no longer resolves"""
+        complaint = ComplaintDocument.model_construct(
+            location=Location(district="Khordha"), reporter_info=None, district_code=None,
+        )
+        complaint.assign_district_code()
+        assert complaint.district_code == resolve_district("Khordha").code
+
+        complaint.location.district = "Cuttack"
+        complaint.assign_district_code()
+        assert complaint.district_code == resolve_district("Cuttack").code
+
+        complaint.location.district = "Raipur"
+        complaint.assign_district_code()
+        assert complaint.district_code is None
+
+
+class TestDistrictStats:
+    """Test suite for folding the district aggregation"""
+
+    def test_fold_by_code(self):
+        """Coded rows merge under the canonical name; uncoded rows keep their text"""
+        khordha = resolve_district("Khordha")
+        rows = [
+            {"_id": {"code": khordha.code, "incident_type": "upi_fraud"}, "count": 3, "amount": 1000.0},
+            {"_id": {"code": khordha.code, "incident_type": "phishing"}, "count": 2, "amount": None},
+            {"_id": {"code": None, "district": "Atlantis", "state": None, "incident_type": None}, "count": 1, "amount": 0},
+        ]
+        stats = fold_district_stats(rows)
+
+        assert stats[0] == {
+            "district_code": khordha.code,
+            "district": "Khordha",
+            "state": "Odisha",
+            "total_complaints": 5,
+            "total_amount": 1000.0,
+            "incident_types": {"upi_fraud": 3, "phishing": 2},
+        }
+        assert stats[1]["district"] == "Atlantis"
+        assert stats[1]["incident_types"] == {"other": 1}
+
+    def test_district_label(self):
+        """Labels prefer the canonical name"""
+        assert district_label(resolve_district("Khurda").code, "khurda") == "Khordha"
+        assert district_label(None, "Atlantis") == "Atlantis"
@@ -0,0 +1,39 @@
+"""
+Unit tests for the compiled i18n catalogs
+"""
+
+from app.i18n import I18nService, Template, i18n
+
+
+class TestI18nCatalog:
+    """Test suite for flattened, fallback-resolved translations"""
+
+    def test_all_languages_complete(self):
+        """Every language has every default key with matching placeholders"""
+        for lang, problems in i18n.validate().items():
+            assert problems == {"missing": [], "extra": [], "placeholders": []}, lang
+
+    def test_lookup_and_formatting(self):
+        """Dotted keys resolve per language and format their arguments"""
+        assert "30" in i18n.get("complaint_flow.nudge", "hi", minutes=30)
+        assert i18n.get("errors.timeout", "hi") != i18n.get("errors.timeout", "en")
+        assert i18n.get("errors.timeout", "od") != i18n.get("errors.timeout", "en")
+
+    def test_fallbacks(self):
+        """Unknown languages and keys missing from a language use the default"""
+        service = I18nService()
+        del service.translations["od"]["errors"]["timeout"]
+        service._compile()
+
+        assert service.get("errors.timeout", "od") == service.get("errors.timeout", "en")
+        assert service.validate()["od"]["missing"] == ["errors.timeout"]
+        assert i18n.get("errors.timeout", "fr") == i18n.get("errors.timeout", "en")
+        assert i18n.get("no.such.key", "od") == "no.such.key"
+        assert i18n.get("errors", "en") == "errors"
+
+    def test_template_matches_str_format(self):
+        """Pre-parsed templates render like str.format, leaving text unformatted on missing arguments"""
+        assert Template("Ticket {ticket_id} on {date}").render({"ticket_id": "CS-1", "date": "today"}) == "Ticket CS-1 on today"
+        assert Template("Ticket {ticket_id}").render({}) == "Ticket {ticket_id}"
+        assert Template("{{literal}}").render({}) == "{literal}"
+        assert Template("{amount:>6}").render({"amount": 15}) == "    15"
@@ -0,0 +1,80 @@
+"""
+Unit tests for the n-gram intent scorer
+"""
+
+import numpy as np
+import pytest
+
+from app.services.intent_scorer import IntentScorer, load_corpus, load_intent_scorer
+from app.services.nlu import Intent, NLUService
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    """A scorer trained on the seed corpus"""
+    texts, intents = load_corpus()
+    return IntentScorer.train(texts, intents, n_features=1024, epochs=300)
+
+
+class TestIntentScorer:
+    """Test suite for featurization, training and persistence"""
+
+    def test_features_are_normalized_and_case_insensitive(self, scorer):
+        """Rows are unit length and ignore case and surrounding whitespace"""
+        features = scorer.featurize(["Money Deducted", "  money deducted ", ""])
+
+        assert np.allclose(np.linalg.norm(features[:2], axis=1), 1.0)
+        assert np.array_equal(features[0], features[1])
+        assert not features[2].any()
+
+    def test_batch_matches_single_predictions(self, scorer):
+        """Scoring a batch gives the same results as one message at a time"""
+        texts = ["paise kat gaye", "my acount was hakced", "thank you"]
+        batch = scorer.predict(texts)
+        single = [scorer.predict([text])[0] for text in texts]
+
+        assert [label for label, _ in batch] == [label for label, _ in single]
+        assert np.allclose([c for _, c in batch], [c for _, c in single], atol=1e-5)
+
+    def test_save_and_load_round_trip(self, scorer, tmp_path):
+        """A saved artifact reproduces the model's predictions"""
+        path = tmp_path / "scorer.npz"
+        scorer.save(path)
+        loaded = load_intent_scorer(str(path))
+
+        assert loaded.labels == scorer.labels
+        assert [l for l, _ in loaded.predict(["upi money gone"])] == [l for l, _ in scorer.predict(["upi money gone"])]
+
+    def test_missing_artifact_disables_scorer(self, tmp_path):
+        """No artifact means rule-only NLU"""
+        assert load_intent_scorer(str(tmp_path / "missing.npz")) is None
+
+
+class TestScorerFallback:
+    """Test suite for the scorer behind the regex rules"""
+
+    def test_rules_take_precedence(self):
+        """Rule matches are returned with full confidence"""
+        result = NLUService().analyze_message("my facebook got hacked")
+
+        assert result["intent"] == Intent.FACEBOOK_FRAUD
+        assert result["intent_source"] == "rules"
+        assert result["confidence"] == 1.0
+
+    def test_unmatched_message_is_scored(self):
+        """Messages no rule matches fall through to the scorer"""
+        result = NLUService().analyze_message("paise kat gaye mere khate se")
+
+        assert result["intent"] == Intent.FINANCIAL_FRAUD
+        assert result["intent_source"] == "scorer"
+        assert result["fraud_type"] == "A1"
+
+    def test_low_confidence_stays_other(self):
+        """Predictions under the confidence threshold are not used"""
+        service = NLUService()
+        service.confidence_threshold = 1.01
+        result = service.analyze_message("paise kat gaye mere khate se")
+
+        assert result["intent"] == Intent.OTHER_QUERY
+        assert result["intent_source"] == "fallback"
+        assert 0 < result["confidence"] < 1
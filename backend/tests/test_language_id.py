@@ -0,0 +1,60 @@
+"""
+Unit tests for language identification
+"""
+
+from app.i18n import i18n
+from app.services.language_id import LanguageIdentifier, language_identifier
+
+
+class TestNativeScripts:
+    """Test suite for Unicode block detection"""
+
+    def test_odia_script(self):
+        """Odia script is identified as od"""
+        assert language_identifier.detect("ନମସ୍କାର, ମୋ ଟଙ୍କା କଟିଗଲା") == "od"
+
+    def test_devanagari_script(self):
+        """Devanagari script is identified as hi"""
+        assert language_identifier.detect("मेरे पैसे कट गए") == "hi"
+
+    def test_mixed_script_uses_dominant(self):
+        """A stray English word does not override native script"""
+        assert language_identifier.detect("मेरा UPI से पैसा कट गया") == "hi"
+
+
+class TestRomanizedText:
+    """Test suite for the trigram profile model"""
+
+    def test_english(self):
+        """English messages and short texts stay English"""
+        for text in ("I want to report a fraud", "hi", "status", "my son was cheated", ""):
+            assert language_identifier.detect(text) == "en", text
+
+    def test_romanized_hindi(self):
+        """Romanized Hindi is identified as hi"""
+        for text in ("mera paisa kat gaya bhai", "mujhe shikayat karni hai", "kya hua mere case ka"):
+            assert language_identifier.detect(text) == "hi", text
+
+    def test_romanized_odia(self):
+        """Romanized Odia is identified as od"""
+        for text in ("mo taka kati gala", "mu abhijoga dakhal karibi", "mora account hack heigala"):
+            assert language_identifier.detect(text) == "od", text
+
+    def test_custom_profiles(self):
+        """Profiles can be built from any seed"""
+        identifier = LanguageIdentifier({"en": ["the quick brown fox jumps"], "od": ["mu bhala achhi kana hela"]})
+        assert identifier.detect("mu kana karibi achhi") == "od"
+
+
+class TestBatchAndCallSites:
+    """Test batch detection and the shared entry points"""
+
+    def test_detect_many(self):
+        """Batch detection matches per-message detection"""
+        texts = ["hello", "ନମସ୍କାର", "paise wapas chahiye", "kana karibi ebe"]
+        assert language_identifier.detect_many(texts) == [language_identifier.detect(t) for t in texts]
+
+    def test_i18n_delegates(self):
+        """I18nService uses the shared identifier"""
+        assert i18n.detect_language("ଅଭିଯୋଗ") == "od"
+        assert i18n.detect_language("hello") == "en"
@@ -0,0 +1,66 @@
+"""
+Unit tests for webhook message deduplication
+"""
+
+import pytest
+
+from app.services.message_dedup import MessageDeduplicator
+
+
+class FakeSharedBackend:
+    """Shared backend stand-in that remembers claimed IDs"""
+
+    name = "fake"
+
+    def __init__(self):
+        self.claimed = set()
+
+    async def claim(self, message_id):
+        if message_id in self.claimed:
+            return False
+        self.claimed.add(message_id)
+        return True
+
+
+class TestMessageDeduplicator:
+    """Test suite for duplicate suppression"""
+
+    @pytest.mark.asyncio
+    async def test_redelivery_is_suppressed(self):
+        """Second delivery of the same ID is a duplicate"""
+        dedup = MessageDeduplicator(window_seconds=60, max_entries=10)
+        assert await dedup.is_duplicate("wamid.1") is False
+        assert await dedup.is_duplicate("wamid.1") is True
+        assert await dedup.is_duplicate("wamid.2") is False
+        assert dedup.duplicates_suppressed == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_id_never_duplicate(self):
+        """Messages without an ID are always processed"""
+        dedup = MessageDeduplicator()
+        assert await dedup.is_duplicate(None) is False
+        assert await dedup.is_duplicate(None) is False
+
+    def test_memory_is_bounded(self):
+        """Oldest IDs are evicted once the bound is reached"""
+        dedup = MessageDeduplicator(window_seconds=60, max_entries=3)
+        for i in range(5):
+            dedup.seen_locally(f"wamid.{i}")
+        assert dedup.stats()["tracked_ids"] == 3
+        assert dedup.seen_locally("wamid.0") is False
+
+    def test_window_expiry(self):
+        """IDs older than the window are forgotten"""
+        dedup = MessageDeduplicator(window_seconds=0, max_entries=10)
+        assert dedup.seen_locally("wamid.1") is False
+        assert dedup.seen_locally("wamid.1") is False
+
+    @pytest.mark.asyncio
+    async def test_shared_backend_across_workers(self):
+        """A redelivery to a different worker is caught by the shared backend"""
+        backend = FakeSharedBackend()
+        worker_a = MessageDeduplicator(backend=backend)
+        worker_b = MessageDeduplicator(backend=backend)
+        assert await worker_a.is_duplicate("wamid.9") is False
+        assert await worker_b.is_duplicate("wamid.9") is True
+        assert worker_b.stats()["duplicates_suppressed"] == 1
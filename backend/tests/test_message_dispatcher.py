@@ -0,0 +1,70 @@
+"""
+Unit tests for the per-sender ordered message dispatcher
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.message_dispatcher import MessageDispatcher
+
+
+class TestMessageDispatcher:
+    """Test suite for lane assignment and ordering"""
+
+    def test_sender_maps_to_stable_lane(self):
+        """Same sender always lands on the same lane"""
+        dispatcher = MessageDispatcher(lanes=4)
+        lane = dispatcher.lane_for("919876543210")
+        assert all(dispatcher.lane_for("919876543210") == lane for _ in range(10))
+        assert 0 <= lane < 4
+
+    def test_invalid_lane_count(self):
+        """Zero lanes is rejected"""
+        with pytest.raises(ValueError):
+            MessageDispatcher(lanes=0)
+
+    @pytest.mark.asyncio
+    async def test_per_sender_order_preserved(self):
+        """Messages from one sender are handled in arrival order"""
+        dispatcher = MessageDispatcher(lanes=4)
+        seen = {}
+
+        async def handler(sender, seq):
+            await asyncio.sleep(0.001 * (seq % 3))
+            seen.setdefault(sender, []).append(seq)
+
+        senders = [f"91900000000{i}" for i in range(6)]
+        for seq in range(20):
+            for sender in senders:
+                await dispatcher.submit(sender, handler, sender, seq)
+
+        await dispatcher.join()
+        stats = dispatcher.stats()
+        await dispatcher.stop()
+
+        for sender in senders:
+            assert seen[sender] == list(range(20))
+        assert sum(stats["processed"]) == 120
+        assert stats["total_backlog"] == 0
+
+    @pytest.mark.asyncio
+    async def test_handler_error_does_not_stall_lane(self):
+        """A failing handler is counted and the lane keeps draining"""
+        dispatcher = MessageDispatcher(lanes=1)
+        handled = []
+
+        async def handler(value):
+            if value == 1:
+                raise RuntimeError("boom")
+            handled.append(value)
+
+        for value in range(3):
+            await dispatcher.submit("sender", handler, value)
+
+        await dispatcher.join()
+        stats = dispatcher.stats()
+        await dispatcher.stop()
+
+        assert handled == [0, 2]
+        assert stats["failed"] == [1]
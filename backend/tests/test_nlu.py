@@ -4,7 +4,7 @@ Tests all intents and entity extraction as per Prompt 3 requirements
 """
 
 import pytest
-from app.services.nlu import nlu_service, Intent, Platform
+from app.services.nlu import NLUService, nlu_service, Intent, Platform
 
 
 class TestIntentDetection:
@@ -154,6 +154,27 @@ class TestIntentDetection:
             assert intent == Intent.OTHER_QUERY, f"Failed for: {case}"
 
 
+class TestIntentMatcher:
+    """Test suite for the combined single-pass matcher"""
+    
+    def test_priority_resolution(self):
+        """The highest-priority hit wins regardless of position"""
+        assert nlu_service.detect_intent("I was scammed, what is the status") == Intent.CHECK_STATUS
+        assert nlu_service.detect_intent("fraud on my facebook and gmail") == Intent.FACEBOOK_FRAUD
+    
+    def test_phrase_residue(self):
+        """Phrase patterns run when their anchor word is present"""
+        assert nlu_service.detect_intent("ACCOUNTS ARE FROZEN") == Intent.ACCOUNT_UNFREEZE
+        assert nlu_service.detect_intent("hellllp me") == Intent.NEW_COMPLAINT
+        assert nlu_service.detect_intent("lost ₹500") == Intent.FINANCIAL_FRAUD
+        assert nlu_service.detect_intent("someone is pretending to be me") == Intent.IMPERSONATION
+    
+    def test_keywords_are_whole_words(self):
+        """Keywords do not match inside longer words"""
+        assert nlu_service.detect_intent("banking hours") == Intent.OTHER_QUERY
+        assert nlu_service.detect_intent("upi_id") == Intent.OTHER_QUERY
+
+
 class TestPlatformDetection:
     """Test suite for platform detection"""
     
@@ -203,6 +224,12 @@ class TestEntityExtraction:
         entities = nlu_service.extract_entities("Call me at 9876543210")
         assert entities['phone_number'] == "9876543210"
     
+    def test_legacy_formats(self):
+        """Country codes and currency words are dropped as before"""
+        entities = nlu_service.extract_entities("Sent Rs.1500 to +91 6349437964")
+        assert entities['phone_number'] == "6349437964"
+        assert entities['amount'] == "1500"
+    
     def test_email_extraction(self):
         """Test email extraction"""
         entities = nlu_service.extract_entities("Contact me at user@example.com")
@@ -283,5 +310,64 @@ class TestCompleteNLUAnalysis:
         assert result['entities']['ticket_id'] == "CS-20241114-123456"
 
 
+
+class TestAnalysisMemo:
+    """Test memoization of short repeated messages"""
+    
+    def test_repeated_message_hits_memo(self):
+        """Case and surrounding whitespace variants share one entry"""
+        service = NLUService()
+        first = service.analyze_message("Help")
+        second = service.analyze_message("  help ")
+        
+        assert service.memo_stats()["hits"] == 1
+        assert second["intent"] == first["intent"] == Intent.NEW_COMPLAINT
+        assert second["original_text"] == "  help "
+    
+    def test_results_are_read_only(self):
+        """Shared results cannot be mutated by callers"""
+        result = NLUService().analyze_message("status")
+        with pytest.raises(TypeError):
+            result["intent"] = Intent.OTHER_QUERY
+        with pytest.raises(TypeError):
+            result["entities"]["email"] = "x@example.com"
+    
+    def test_long_messages_bypass_memo(self):
+        """Free-text descriptions are never memoized"""
+        service = NLUService()
+        service.analyze_message("Someone called pretending to be from my bank and asked for the OTP " * 2)
+        
+        stats = service.memo_stats()
+        assert stats["bypassed"] == 1
+        assert stats["entries"] == 0
+    
+    def test_lru_bound(self):
+        """The memo never grows past its size limit"""
+        service = NLUService()
+        service.memo_max_entries = 2
+        for text in ("hi", "hello", "yes", "hi"):
+            service.analyze_message(text)
+        
+        stats = service.memo_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 2
+
+
+class TestBatchAnalysis:
+    """Test batch analysis across worker processes"""
+    
+    def test_analyze_many_matches_single_analysis(self):
+        """Parallel results equal per-message analysis, in input order"""
+        texts = [f"My money ₹{i}000 was deducted via UPI" if i % 2 else f"facebook hacked {i}" for i in range(23)]
+        
+        results = list(nlu_service.analyze_many(iter(texts), workers=2, chunk_size=5))
+        
+        assert results == [nlu_service.analyze_message(text) for text in texts]
+    
+    def test_analyze_many_empty(self):
+        """Empty input yields nothing without starting a pool"""
+        assert list(nlu_service.analyze_many([], workers=2)) == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
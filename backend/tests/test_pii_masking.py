@@ -0,0 +1,126 @@
+"""
+Unit tests for PII masking and the log redaction filter
+"""
+
+import io
+import logging
+
+import pytest
+
+from app.services.pii_masking import PIIMaskingService, PIIRedactionFilter, install_pii_log_filter
+
+mask = PIIMaskingService.mask_for_logging
+
+
+@pytest.fixture
+def capture():
+    """A logger whose handler masks PII, and the stream it writes to"""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.addFilter(PIIRedactionFilter())
+    logger = logging.getLogger("tests.pii")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    yield logger, stream
+    logger.removeHandler(handler)
+
+
+class TestMaskForLogging:
+    """Test suite for single-pass free-text masking"""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("from 9876543210", "from [PHONE_MASKED]"),
+        ("from +91 9876543210", "from [PHONE_MASKED]"),
+        ("from 919876543210 ok", "from [PHONE_MASKED] ok"),
+        ("tel-9876543210", "tel-[PHONE_MASKED]"),
+        ("mail asha.das+cs@example.co.in now", "mail [EMAIL_MASKED] now"),
+        ("uid 1234 5678 9012", "uid [AADHAAR_MASKED]"),
+        ("uid 1234-5678-9012.", "uid [AADHAAR_MASKED]."),
+        ("ticket CS-20241114-123456 amount 15000", "ticket CS-20241114-123456 amount 15000"),
+        ("account 98765432101234", "account 98765432101234"),
+        ("", ""),
+    ])
+    def test_masks_each_kind(self, text, expected):
+        """Phones, emails and Aadhaar numbers are replaced; other numbers are kept"""
+        assert mask(text) == expected
+
+    @pytest.mark.parametrize("text,expected", [
+        ("ph.9876543210", "ph.[PHONE_MASKED]"),
+        ("Mob9876543210", "Mob[PHONE_MASKED]"),
+        ("x_9876543210", "x_[PHONE_MASKED]"),
+        ("Aadhaar1234 5678 9012", "Aadhaar[AADHAAR_MASKED]"),
+        ("id:123456789012", "id:[AADHAAR_MASKED]"),
+    ])
+    def test_numbers_glued_to_labels(self, text, expected):
+        """Numbers directly after a letter or punctuation are still masked"""
+        assert mask(text) == expected
+
+    def test_email_digits_are_not_a_phone(self):
+        """An address containing a mobile number is masked as one email"""
+        assert mask("9876543210@example.com") == "[EMAIL_MASKED]"
+
+
+class TestRedactionFilter:
+    """Test suite for masking log records"""
+
+    def test_masks_formatted_message(self, capture):
+        """Arguments are merged into the message before masking"""
+        logger, stream = capture
+        logger.info("Processed message from %s", "919876543210")
+        logger.info(f"Reply to {'asha@example.com'}")
+
+        assert stream.getvalue().splitlines() == [
+            "Processed message from [PHONE_MASKED]",
+            "Reply to [EMAIL_MASKED]",
+        ]
+
+    def test_suppressed_records_are_not_scanned(self, capture, monkeypatch):
+        """Records below the level never reach the filter"""
+        logger, _ = capture
+        calls = []
+        monkeypatch.setattr(PIIRedactionFilter, "filter", lambda self, record: calls.append(record) or True)
+        logger.debug("Session for %s", "9876543210")
+
+        assert calls == []
+
+    def test_masked_once_across_handlers(self, capture):
+        """A second handler sees the already-masked record"""
+        logger, stream = capture
+        second = io.StringIO()
+        handler = logging.StreamHandler(second)
+        handler.addFilter(PIIRedactionFilter())
+        logger.addHandler(handler)
+        try:
+            logger.warning("Failed for %s", "9876543210")
+        finally:
+            logger.removeHandler(handler)
+
+        assert stream.getvalue() == second.getvalue() == "Failed for [PHONE_MASKED]\n"
+
+    def test_masks_traceback_and_stack(self, capture):
+        """Exception messages and stack info are masked like the message"""
+        logger, stream = capture
+        try:
+            raise ValueError("No complaint for 9876543210 / asha@example.com")
+        except ValueError:
+            logger.exception("Lookup failed")
+        logger.info("Sending to %s", "9876543210", stack_info=True)
+
+        output = stream.getvalue()
+        assert "Traceback" in output and "Stack (most recent call last)" in output
+        assert "ValueError: No complaint for [PHONE_MASKED] / [EMAIL_MASKED]" in output
+        assert "9876543210" not in output and "asha@example.com" not in output
+
+    def test_install_is_idempotent(self):
+        """Installing twice adds the shared filter once per handler"""
+        handler = logging.NullHandler()
+        logger = logging.getLogger("tests.pii.install")
+        logger.addHandler(handler)
+        try:
+            install_pii_log_filter("tests.pii.install")
+            install_pii_log_filter("tests.pii.install")
+        finally:
+            logger.removeHandler(handler)
+
+        assert len(handler.filters) == 1
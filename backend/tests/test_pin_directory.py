@@ -0,0 +1,83 @@
+"""
+Unit tests for the memory-mapped PIN code directory
+"""
+
+import pytest
+
+from app.services.pin_directory import PinDirectory, PostOffice, load_pin_directory
+
+ROWS = [
+    ("751024", "Patia", "Khordha", "Odisha"),
+    ("751001", "Bhubaneswar G.P.O.", "Khordha", "Odisha"),
+    ("751024", "K.I.I.T.", "Khordha", "Odisha"),
+    ("768001", "Sambalpur H.O", "Sambalpur", "Odisha"),
+    ("751024", "Patia", "Khordha", "Odisha"),  # duplicate
+    ("051024", "Nowhere", "Nowhere", "Nowhere"),  # not a PIN
+    ("110001", "New Delhi G.P.O.", "New Delhi", "Delhi"),
+]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    path = tmp_path / "pins.bin"
+    PinDirectory.build(ROWS, path)
+    directory = PinDirectory(path)
+    yield directory
+    directory.close()
+
+
+class TestPinDirectory:
+    """Test suite for building and searching the table"""
+
+    def test_build_sorts_and_deduplicates(self, directory):
+        """Duplicates and invalid PINs are dropped"""
+        assert len(directory) == 5
+        assert [office.pin for office in directory.prefix("")] == []
+        assert [office.pin for office in directory.prefix("1")] == ["110001"]
+
+    def test_lookup(self, directory):
+        """A PIN returns all its offices, sorted by name"""
+        assert directory.lookup(" 751024 ") == [
+            PostOffice("751024", "K.I.I.T.", "Khordha", "Odisha"),
+            PostOffice("751024", "Patia", "Khordha", "Odisha"),
+        ]
+        assert directory.lookup("751002") == []
+        assert directory.lookup("7510") == []
+        assert directory.lookup("७५१०२४") == []
+
+    def test_contains(self, directory):
+        """Membership is by exact PIN"""
+        assert "768001" in directory
+        assert "768002" not in directory
+        assert "7680" not in directory
+
+    def test_prefix_search(self, directory):
+        """Prefixes return offices in PIN order, up to the limit"""
+        assert [office.pin for office in directory.prefix("751")] == ["751001", "751024", "751024"]
+        assert [office.office for office in directory.prefix("75", limit=2)] == ["Bhubaneswar G.P.O.", "K.I.I.T."]
+        assert directory.prefix("9") == []
+
+    def test_unicode_names_round_trip(self, tmp_path):
+        """Names are stored as UTF-8"""
+        path = tmp_path / "pins.bin"
+        PinDirectory.build([("751001", "ଭୁବନେଶ୍ୱର", "ଖୋର୍ଦ୍ଧା", "ଓଡ଼ିଶା")], path)
+        directory = PinDirectory(path)
+
+        assert directory.lookup("751001")[0].office == "ଭୁବନେଶ୍ୱର"
+        directory.close()
+
+    def test_load_missing_or_invalid(self, tmp_path):
+        """Missing or foreign files disable the directory instead of failing"""
+        bogus = tmp_path / "bogus.bin"
+        bogus.write_bytes(b"not a directory at all")
+
+        assert load_pin_directory(str(tmp_path / "missing.bin")) is None
+        assert load_pin_directory(str(bogus)) is None
+
+    def test_bundled_directory_loads(self):
+        """The shipped table opens and answers lookups"""
+        directory = load_pin_directory()
+
+        assert directory is not None
+        assert directory.lookup("768001")[0].district == "Sambalpur"
+        directory.close()
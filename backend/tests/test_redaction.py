@@ -0,0 +1,163 @@
+"""
+Unit tests for policy-driven complaint redaction
+"""
+
+import copy
+import csv
+import io
+import itertools
+import json
+
+import pytest
+
+from app.routers.analytics import EXPORT_COLUMNS, export_rows
+from app.services.redaction import RedactionPolicy, aredact_stream, get_policy, redact, redact_stream
+
+
+def complaint(index: int = 0):
+    """A stored complaint with PII at several depths"""
+    return {
+        "reference_id": f"CS-20241114-{index:06d}",
+        "name": "Asha Das",
+        "phone": "+919876543210",
+        "description": "Caller asked for Aadhaar 1234 5678 9012 and called from 9123456780",
+        "reporter_info": {
+            "name": "Asha Das",
+            "guardian_name": "Ravi Das",
+            "date_of_birth": "1990-08-15T00:00:00",
+            "phone": "+919876543210",
+            "email": "asha@example.com",
+            "village": "Patia",
+            "police_station": "Chandrasekharpur",
+            "district": "Khordha",
+            "pin_code": "751024",
+        },
+        "txn_id": "UTR412345678901",
+        "location": {"district": "Khordha", "state": "Odisha", "latitude": 20.35, "longitude": 85.82},
+        "incident_details": {
+            "description": "UPI collect request", "account_number": "123456789012",
+            "transaction_reference": "UTR412345678901", "beneficiary_name": "R Kumar",
+        },
+        "attachments": [{"filename": "asha-statement.pdf", "url": "https://files/1", "file_type": "pdf"}],
+        "status_history": [{"status": "registered", "notes": "called 9876543210"}],
+        "wa_phone_number": "919876543210",
+        "ip_address": "10.0.0.1",
+    }
+
+
+class TestRedactionPolicy:
+    """Test suite for compiled field-path policies"""
+
+    def test_nested_paths(self):
+        """Rules reach into sub-documents and list elements"""
+        policy = RedactionPolicy("t", {
+            "reporter_info.phone": "phone",
+            "attachments.*.url": "drop",
+            "status_history.*.notes": "text",
+        })
+        result = policy(complaint())
+
+        assert result["reporter_info"]["phone"] == "********3210"
+        assert result["attachments"] == [{"filename": "asha-statement.pdf", "file_type": "pdf"}]
+        assert result["status_history"][0]["notes"] == "called [PHONE_MASKED]"
+        assert result["phone"] == "+919876543210"
+
+    def test_input_is_not_modified(self):
+        """Only copies along redacted paths are changed"""
+        original = complaint()
+        snapshot = copy.deepcopy(original)
+        result = get_policy("export")(original)
+
+        assert original == snapshot
+        assert result["incident_details"] is not original["incident_details"]
+        assert result is not original
+
+    def test_missing_and_null_fields(self):
+        """Absent or null fields are left alone"""
+        policy = get_policy("export")
+
+        assert policy({"reference_id": "CS-1", "reporter_info": None}) == {"reference_id": "CS-1", "reporter_info": None}
+
+    def test_invalid_rules(self):
+        """Unknown actions and overlapping paths fail at compile time"""
+        with pytest.raises(ValueError, match="Unknown"):
+            RedactionPolicy("t", {"phone": "scramble"})
+        with pytest.raises(ValueError):
+            RedactionPolicy("t", {"reporter_info": "drop", "reporter_info.phone": "phone"})
+        with pytest.raises(ValueError):
+            get_policy("analytics")
+
+
+class TestConsumerPolicies:
+    """Test suite for the export, NCRP and LLM policies"""
+
+    def test_export(self):
+        """Exports keep case details but no full identifiers"""
+        result = redact(complaint(), "export")
+
+        assert result["reporter_info"]["name"] == "Asha D."
+        assert result["reporter_info"]["date_of_birth"] == "1990"
+        assert result["reporter_info"]["email"] == "as**@example.com"
+        assert "village" not in result["reporter_info"]
+        assert result["incident_details"]["account_number"] == "********9012"
+        assert "[AADHAAR_MASKED]" in result["description"]
+        assert "wa_phone_number" not in result and "ip_address" not in result
+
+    def test_export_is_an_allowlist(self):
+        """Locations, transaction identifiers and unlisted fields are left out of exports"""
+        result = redact({**complaint(), "added_later": "secret"}, "export")
+
+        assert result["location"] == {"district": "Khordha", "state": "Odisha"}
+        assert result["reporter_info"]["pin_code"] == "751***"
+        assert "police_station" not in result["reporter_info"]
+        assert "txn_id" not in result and "added_later" not in result
+        assert "transaction_reference" not in result["incident_details"]
+        assert "beneficiary_name" not in result["incident_details"]
+        assert result["attachments"] == [{"file_type": "pdf"}]
+        assert result["status_history"] == [{"status": "registered"}]
+
+    def test_ncrp_keeps_identity(self):
+        """The portal gets the victim's contact but no Aadhaar numbers"""
+        result = redact(complaint(), "ncrp")
+
+        assert result["reporter_info"]["phone"] == "+919876543210"
+        assert result["description"] == "Caller asked for Aadhaar [AADHAAR_MASKED] and called from 9123456780"
+        assert "notes" not in result["status_history"][0]
+
+    def test_llm_drops_reporter(self):
+        """Model prompts carry the incident only"""
+        result = redact(complaint(), "llm")
+
+        assert "reporter_info" not in result and "name" not in result and "phone" not in result
+        assert result["attachments"] == [{"file_type": "pdf"}]
+        assert "9123456780" not in result["description"]
+
+
+class TestStreaming:
+    """Test suite for lazy redaction"""
+
+    def test_stream_is_lazy(self):
+        """Documents are redacted only as they are consumed"""
+        stream = redact_stream((complaint(i) for i in itertools.count()), get_policy("llm"))
+
+        assert [doc["reference_id"] for doc in itertools.islice(stream, 2)] == ["CS-20241114-000000", "CS-20241114-000001"]
+
+    @pytest.mark.asyncio
+    async def test_async_export_rows(self):
+        """CSV and NDJSON exports are written row by row from a cursor"""
+        async def cursor():
+            for i in range(3):
+                yield complaint(i)
+
+        rows = [chunk async for chunk in export_rows(cursor(), get_policy("export"), "csv")]
+        table = list(csv.DictReader(io.StringIO("".join(rows))))
+
+        assert len(rows) == 4
+        assert list(table[0]) == list(EXPORT_COLUMNS)
+        assert table[2]["reporter_info.phone"] == "********3210"
+
+        lines = [chunk async for chunk in export_rows(cursor(), get_policy("export"), "json")]
+        assert json.loads(lines[1])["reference_id"] == "CS-20241114-000001"
+
+        redacted = [doc async for doc in aredact_stream(cursor(), get_policy("ncrp"))]
+        assert len(redacted) == 3
@@ -0,0 +1,127 @@
+"""
+Unit tests for idle complaint-flow timers
+"""
+
+import time
+
+import pytest
+
+from app.config import settings
+from app.i18n import i18n
+from app.services.message_dispatcher import message_dispatcher
+from app.services.session_timer import SessionTimerScheduler
+from app.services.whatsapp_conversation import ConversationStage, WhatsAppConversationHandler
+from app.services.whatsapp_service import whatsapp_service
+
+
+def make_scheduler(events, nudge_after=10, expire_after=30):
+    """Build a scheduler recording callback invocations"""
+    async def on_nudge(user_id, elapsed):
+        events.append(("nudge", user_id))
+
+    async def on_expire(user_id, elapsed):
+        events.append(("expire", user_id))
+
+    return SessionTimerScheduler(nudge_after, expire_after, on_nudge, on_expire)
+
+
+class TestSessionTimerScheduler:
+    """Test suite for nudge and expiry scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_nudge_then_expire(self):
+        """An idle flow is nudged first and expired later"""
+        events = []
+        timers = make_scheduler(events)
+        timers.touch("u1")
+        now = time.monotonic()
+
+        assert await timers.fire_due(now + 5) == 0
+        await timers.fire_due(now + 11)
+        assert events == [("nudge", "u1")]
+        await timers.fire_due(now + 31)
+        assert events == [("nudge", "u1"), ("expire", "u1")]
+        assert timers.stats()["active_sessions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_activity_reschedules(self):
+        """Activity supersedes the pending deadline"""
+        events = []
+        timers = make_scheduler(events)
+        timers.touch("u1")
+        timers.touch("u1")
+        timers.touch("u2")
+        timers.cancel("u2")
+
+        await timers.fire_due(time.monotonic() + 11)
+        assert events == [("nudge", "u1")]
+
+    @pytest.mark.asyncio
+    async def test_heap_compaction(self):
+        """Superseded entries are compacted away"""
+        timers = make_scheduler([])
+        for _ in range(5000):
+            timers.touch("u1")
+        assert timers.stats()["scheduled_entries"] <= 1026
+
+
+class TestIdleCallbacks:
+    """Test suite for the handler's nudge and expiry callbacks"""
+
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        messages = []
+
+        async def send_message(to, message, **kwargs):
+            messages.append((to, message))
+            return {}
+
+        monkeypatch.setattr(whatsapp_service, "send_message", send_message)
+        return messages
+
+    @staticmethod
+    async def fire(callback, user_id):
+        """Run a timer callback and wait for its dispatcher lane"""
+        await callback(user_id, 0.0)
+        await message_dispatcher.join()
+        await message_dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_recent_activity_is_not_expired(self, sent):
+        """A flow updated after the timer was armed (e.g. on another worker) is kept"""
+        handler = WhatsAppConversationHandler()
+        handler.conversation_state.update_state("u1", {"stage": ConversationStage.COLLECTING_COMPLAINT})
+
+        await self.fire(handler._expire_idle_complaint, "u1")
+        await self.fire(handler._nudge_idle_complaint, "u1")
+
+        assert handler.conversation_state.store.get("u1") is not None
+        assert sent == []
+
+    @pytest.mark.asyncio
+    async def test_idle_flow_nudged_in_its_language_then_expired(self, sent):
+        """Idle flows get the user's language and are cleared on expiry"""
+        handler = WhatsAppConversationHandler()
+        handler.conversation_state.update_state("u1", {
+            "stage": ConversationStage.COLLECTING_COMPLAINT, "language": "od",
+        })
+        handler.conversation_state.get_state("u1").updated_at -= settings.COMPLAINT_EXPIRE_AFTER_MINUTES * 60
+
+        await self.fire(handler._nudge_idle_complaint, "u1")
+        await self.fire(handler._expire_idle_complaint, "u1")
+
+        minutes = round(settings.COMPLAINT_EXPIRE_AFTER_MINUTES - settings.COMPLAINT_NUDGE_AFTER_MINUTES)
+        assert sent[0] == ("u1", i18n.get("complaint_flow.nudge", "od", minutes=minutes))
+        assert sent[1] == ("u1", i18n.get("errors.timeout", "od"))
+        assert handler.conversation_state.store.get("u1") is None
+
+    @pytest.mark.asyncio
+    async def test_finished_flow_is_left_alone(self, sent):
+        """Timers of a completed flow do nothing"""
+        handler = WhatsAppConversationHandler()
+        handler.conversation_state.update_state("u1", {"stage": ConversationStage.COMPLETED})
+        handler.conversation_state.get_state("u1").updated_at -= settings.COMPLAINT_EXPIRE_AFTER_MINUTES * 60
+
+        await self.fire(handler._nudge_idle_complaint, "u1")
+
+        assert sent == []
@@ -0,0 +1,101 @@
+"""
+Unit tests for typo-tolerant keyword correction
+"""
+
+import pytest
+
+from app.services.nlu import Intent, NLUService, Platform
+from app.services.spell_correction import SymSpellIndex, edit_distance
+
+
+class TestSymSpellIndex:
+    """Test suite for the symmetric-delete index"""
+
+    @pytest.fixture
+    def index(self):
+        return SymSpellIndex({"fraud": 0, "scammed": 1, "unfreeze": 2, "whatsapp": 3, "meta": 4})
+
+    def test_edit_distance_counts_transpositions_once(self):
+        """Swapped neighbours are a single edit and the bound is respected"""
+        assert edit_distance("hakced", "hacked", 2) == 1
+        assert edit_distance("frod", "fraud", 2) == 2
+        assert edit_distance("abcdef", "uvwxyz", 2) == 3
+
+    @pytest.mark.parametrize("typo,word", [
+        ("frod", "fraud"),
+        ("scamed", "scammed"),
+        ("unfrezze", "unfreeze"),
+        ("whtsapp", "whatsapp"),
+    ])
+    def test_common_typos_are_corrected(self, index, typo, word):
+        """Misspellings within two edits map back to the keyword"""
+        assert index.lookup(typo) == word
+
+    def test_ordinary_words_are_left_alone(self, index):
+        """Known words, short tokens and loose matches are not corrected"""
+        assert index.lookup("meat") is None  # common English word
+        assert index.lookup("fra") is None  # under min_length
+        assert index.lookup("menu") is None  # two edits, same length
+        assert index.lookup("druad") is None  # different first letter
+
+    def test_short_substitutions_are_not_corrected(self):
+        """One changed letter in a short token is another word; swapped letters are a typo"""
+        index = SymSpellIndex({"scam": 0, "fake": 1, "ticket": 2})
+
+        assert index.lookup("scar") is None
+        assert index.lookup("fame") is None
+        assert index.lookup("sacm") == "scam"
+        assert index.lookup("tikcet") == "ticket"
+
+    def test_budget_lowers_distance(self):
+        """An index over its entry budget is rebuilt at a smaller distance"""
+        index = SymSpellIndex({"whatsapp": 0, "telegram": 1}, max_index_entries=40)
+
+        assert index.max_distance == 1
+        assert index.stats()["index_entries"] <= 40
+        assert index.lookup("whatsap") == "whatsapp"
+        assert index.lookup("whtsap") is None
+
+
+class TestNLUSpellCorrection:
+    """Test suite for spelling correction inside intent detection"""
+
+    def test_misspelt_keywords_match_intents(self):
+        """Typos reach the right intent and platform"""
+        service = NLUService()
+        result = service.analyze_message("my facebok acount was hakced")
+
+        assert service.detect_intent("got a frod call") == Intent.NEW_COMPLAINT
+        assert service.detect_intent("pls unfrezze my acount") == Intent.ACCOUNT_UNFREEZE
+        assert result["intent"] == Intent.FACEBOOK_FRAUD
+        assert result["platform"] == Platform.FACEBOOK
+
+    def test_native_script_keywords(self):
+        """Hindi and Odia keywords are matched as whole words"""
+        service = NLUService()
+
+        assert service.detect_intent("मेरे साथ धोखा हुआ") == Intent.NEW_COMPLAINT
+        assert service.detect_intent("ମୋ ଟଙ୍କା କଟିଗଲା") == Intent.FINANCIAL_FRAUD
+
+    def test_only_whole_words_are_targets(self):
+        """Stems and optional-letter fragments are never substituted into text"""
+        service = NLUService()
+        vocabulary = service.spell_index.vocabulary
+
+        assert "hacke" not in vocabulary and "cyber" not in vocabulary
+        assert "hacked" in vocabulary
+        assert service._correct_spelling("my account was hacked by a hacker") is None
+        assert service._correct_spelling("the scammers called") is None
+        assert service.detect_intent("my acount got hakced") == Intent.HACKED_ACCOUNT
+
+    @pytest.mark.parametrize("text", ["monkey", "my monkey is sick", "ticked", "i checked it", "mera record"])
+    def test_english_words_are_not_rewritten(self, text):
+        """Valid words one edit away from a keyword keep their meaning"""
+        assert NLUService().detect_intent(text) == Intent.OTHER_QUERY
+
+    def test_correction_disabled(self):
+        """Without the index, misspellings fall through"""
+        service = NLUService()
+        service.spell_index = None
+
+        assert service.detect_intent("i got scamed") == Intent.OTHER_QUERY
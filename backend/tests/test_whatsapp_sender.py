@@ -0,0 +1,102 @@
+"""
+Unit tests for the pooled, rate-limited WhatsApp sender
+"""
+
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.services.rate_limiter import TokenBucket
+from app.services.whatsapp_service import WhatsAppService
+
+
+def make_service(handler):
+    """Build a service whose pooled client uses a mock transport"""
+    service = WhatsAppService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+class TestTokenBucket:
+    """Test suite for the token bucket limiter"""
+
+    def test_burst_then_empty(self):
+        """Capacity tokens are available at once, then the bucket is empty"""
+        bucket = TokenBucket(rate=1.0, capacity=3)
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    def test_pause_blocks_acquisition(self):
+        """A Retry-After pause blocks even a full bucket"""
+        bucket = TokenBucket(rate=100.0, capacity=10)
+        bucket.pause(60)
+        assert bucket.try_acquire() is False
+
+
+class TestWhatsAppSender:
+    """Test suite for send, throttling and retry queue behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_429_is_retried_after_pause(self):
+        """A 429 with Retry-After is retried inline and then succeeds"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"messages": [{"id": "wamid.1"}]})
+
+        service = make_service(handler)
+        result = await service.send_message("919876543210", "hello")
+        stats = await service.get_stats()
+        await service.close()
+
+        assert result["messages"][0]["id"] == "wamid.1"
+        assert len(calls) == 2
+        assert stats["throttled"] == 1
+        assert stats["sent"] == 1
+
+    @pytest.mark.asyncio
+    async def test_server_error_is_queued(self):
+        """A 5xx failure lands in the retry queue"""
+        service = make_service(lambda request: httpx.Response(503))
+        result = await service.send_message("919876543210", "hello")
+        depth = await service.retry_queue.depth()
+        await service.close()
+
+        assert result["queued"] is True
+        assert depth["pending"] == 1
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_dead_lettered(self):
+        """A non-retryable 4xx is not retried"""
+        service = make_service(lambda request: httpx.Response(400, json={"error": "bad number"}))
+        result = await service.send_message("000", "hello")
+        depth = await service.retry_queue.depth()
+        await service.close()
+
+        assert result["queued"] is False
+        assert depth["pending"] == 0
+        assert service.retry_queue.dead_letters == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_uses_entry_sender(self):
+        """A queued send is retried from the number it was queued for"""
+        urls = []
+
+        def handler(request):
+            urls.append(str(request.url))
+            return httpx.Response(200, json={"messages": [{"id": "wamid.2"}]})
+
+        service = make_service(handler)
+        await service.retry_queue.enqueue("919876543210", {"to": "919876543210"}, "other", "503")
+        service.retry_queue._memory[0]["next_attempt_at"] = datetime.utcnow()
+        attempted = await service.retry_due()
+        depth = await service.retry_queue.depth()
+        await service.close()
+
+        assert attempted == 1
+        assert urls[0].endswith("/other/messages")
+        assert "other" in service._buckets
+        assert depth["pending"] == 0